@@ -0,0 +1,152 @@
+"""
+Job Manager
+비동기 작업(Job) 관리 모듈
+
+오래 걸리는 에이전트 파이프라인(3D 생성 등)을 워커 풀에서 실행하고,
+클라이언트는 job_id로 상태와 결과를 폴링하거나 진행 이벤트를 스트리밍받는다.
+"""
+
+from typing import Dict, List, Optional, Any, Callable
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+import threading
+import uuid
+
+
+class JobManager:
+    """
+    Job Manager
+
+    역할:
+    - 작업을 워커 스레드 풀에 제출하고 즉시 job_id 반환
+    - 작업 상태(queued → running → completed/failed) 및 결과 보관
+    - 작업별 진행 이벤트 보관 (SSE 스트리밍용)
+    - 완료된 작업은 max_jobs를 넘으면 오래된 순서로 정리
+    """
+
+    def __init__(self, max_workers: int = 2, max_jobs: int = 1000):
+        self.max_workers = max(1, max_workers)
+        self.max_jobs = max_jobs
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_workers,
+            thread_name_prefix="agent-job"
+        )
+        self._jobs: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def submit(
+        self,
+        func: Callable[..., Any],
+        *args,
+        with_progress: bool = False,
+        **kwargs
+    ) -> str:
+        """
+        작업 제출
+
+        Args:
+            func: 워커에서 실행할 함수 (반환값이 작업 결과가 됨)
+            with_progress: True이면 func에 progress_callback 키워드 인자를 전달하여
+                진행 이벤트를 작업 이벤트 목록에 기록
+
+        Returns:
+            str: job_id
+        """
+        job_id = f"job_{uuid.uuid4().hex}"
+        with self._lock:
+            self._jobs[job_id] = {
+                "job_id": job_id,
+                "status": "queued",
+                "created_at": datetime.now().isoformat(),
+                "started_at": None,
+                "finished_at": None,
+                "result": None,
+                "error": None,
+                "events": []
+            }
+            self._evict_finished_jobs()
+
+        if with_progress:
+            kwargs["progress_callback"] = lambda event: self.add_event(job_id, event)
+        self.add_event(job_id, {"event": "job_queued"})
+        self._executor.submit(self._run_job, job_id, func, args, kwargs)
+        print(f"[JobManager] 작업 제출: job_id={job_id}")
+        return job_id
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """작업 상태 조회 (없으면 None)"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            record = {k: v for k, v in job.items() if k != "events"}
+            record["event_count"] = len(job["events"])
+            return record
+
+    def get_events(self, job_id: str, start: int = 0) -> Optional[List[Dict[str, Any]]]:
+        """start 인덱스 이후의 진행 이벤트 조회 (작업이 없으면 None)"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            return list(job["events"][start:])
+
+    def shutdown(self, wait: bool = False):
+        """워커 풀 종료"""
+        self._executor.shutdown(wait=wait)
+
+    def _run_job(self, job_id: str, func: Callable[..., Any], args: tuple, kwargs: Dict[str, Any]):
+        """워커 스레드에서 작업 실행"""
+        self._update(job_id, status="running", started_at=datetime.now().isoformat())
+        self.add_event(job_id, {"event": "job_started"})
+        print(f"[JobManager] 작업 시작: job_id={job_id}")
+        try:
+            result = func(*args, **kwargs)
+            self._update(
+                job_id,
+                status="completed",
+                result=result,
+                finished_at=datetime.now().isoformat()
+            )
+            self.add_event(job_id, {"event": "job_completed", "result": result})
+            print(f"[JobManager] 작업 완료: job_id={job_id}")
+        except Exception as e:
+            import traceback
+            traceback.print_exc()
+            self._update(
+                job_id,
+                status="failed",
+                error=str(e),
+                finished_at=datetime.now().isoformat()
+            )
+            self.add_event(job_id, {"event": "job_failed", "error": str(e)})
+            print(f"[JobManager] 작업 실패: job_id={job_id}, error={str(e)}")
+
+    def _update(self, job_id: str, **fields):
+        """작업 레코드 갱신"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is not None:
+                job.update(fields)
+
+    def add_event(self, job_id: str, event: Dict[str, Any]):
+        """작업 진행 이벤트 추가 (순번과 시각을 붙여 저장)"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return
+            record = dict(event)
+            record.setdefault("timestamp", datetime.now().isoformat())
+            record["seq"] = len(job["events"])
+            job["events"].append(record)
+
+    def _evict_finished_jobs(self):
+        """완료된 작업 중 오래된 것부터 정리 (lock 보유 상태에서 호출)"""
+        if len(self._jobs) <= self.max_jobs:
+            return
+        for job_id in list(self._jobs.keys()):
+            if len(self._jobs) <= self.max_jobs:
+                break
+            if self._jobs[job_id]["status"] in ("completed", "failed"):
+                del self._jobs[job_id]
@@ -5,13 +5,17 @@ Fashion Agentic AI System API 서버
 
 from fastapi import FastAPI, HTTPException, UploadFile, File, Form, Query
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, FileResponse
-from typing import Optional
+from fastapi.responses import JSONResponse, FileResponse, StreamingResponse
+from starlette.concurrency import run_in_threadpool
+from typing import Optional, Dict, Any, Callable
 import uvicorn
 import sys
 from pathlib import Path
 import os
 import subprocess
+import asyncio
+import json
+import threading
 
 # 프로젝트 루트 경로 추가
 project_root = Path(__file__).parent.parent.parent
@@ -57,7 +61,10 @@ from agentic_system.core import CustomUI, AgentRuntime, FLLM
 from agentic_system.core.memory import MemoryManager
 from agentic_system.tools.extensions import extensions_2d_to_3d_tool
 from agentic_system.tools.functions import product_search_function_tool
+from agentic_system.tools.registry import tool_registry
 from agentic_system.data_stores.rag import RAGStore
+from agentic_system.api.jobs import JobManager
+from agentic_system.api.uploads import save_upload
 
 app = FastAPI(
     title="Fashion Agentic AI System API",
@@ -96,6 +103,48 @@ agent_runtime.register_tool("function_product_search", product_search_function_t
 
 custom_ui = CustomUI()
 
+# 비동기 작업 관리자 (파이프라인은 워커 풀에서 실행)
+job_manager = JobManager(
+    max_workers=int(os.environ.get("AGENT_JOB_WORKERS", "2")),
+    max_jobs=int(os.environ.get("AGENT_JOB_MAX_RECORDS", "1000"))
+)
+SSE_POLL_INTERVAL = 0.2
+SSE_HEARTBEAT_SECONDS = 15.0
+
+
+async def _save_upload_image(image: UploadFile, session_id: Optional[str]) -> str:
+    """
+    업로드된 이미지를 uploads 디렉토리에 스트리밍 저장하고 경로 반환
+    
+    파일명은 내용 해시이므로 사용자 파일명끼리 충돌하지 않고 같은 이미지는 한 번만 저장된다.
+    """
+    saved = await save_upload(image, project_root / "uploads")
+    print(
+        f"[API] 이미지 저장 완료: {saved.path} "
+        f"({saved.size} bytes, {'신규' if saved.created else '기존 파일 재사용'}, session_id={session_id})"
+    )
+    return str(saved.path)
+
+
+def _run_agent_request(
+    payload: Dict[str, Any],
+    session_id: Optional[str],
+    progress_callback: Optional[Callable[[Dict[str, Any]], None]] = None
+) -> Dict[str, Any]:
+    """
+    Agent Runtime 실행 및 결과 포맷팅 (블로킹)
+    
+    이벤트 루프를 막지 않도록 스레드 풀 또는 작업 워커에서 호출한다.
+    """
+    print("[API] Agent Runtime 요청 처리 시작...")
+    result = agent_runtime.process_request(
+        payload,
+        session_id=session_id,
+        progress_callback=progress_callback
+    )
+    print(f"[API] Agent Runtime 요청 처리 완료: status={result.get('status')}")
+    return custom_ui.format_output(result)
+
 
 @app.get("/")
 async def root():
@@ -134,14 +183,7 @@ async def process_request(
         # 이미지 파일 저장 (있는 경우)
         image_path = None
         if image:
-            upload_dir = project_root / "uploads"
-            upload_dir.mkdir(parents=True, exist_ok=True)
-            image_path = upload_dir / f"{session_id or 'temp'}_{image.filename}"
-            with open(image_path, "wb") as f:
-                content = await image.read()
-                f.write(content)
-            image_path = str(image_path)
-            print(f"[API] 이미지 저장 완료: {image_path}")
+            image_path = await _save_upload_image(image, session_id)
         
         # Custom UI를 통한 입력 처리
         print("[API] Custom UI 입력 처리 시작...")
@@ -153,21 +195,17 @@ async def process_request(
         )
         print(f"[API] Custom UI 입력 처리 완료: session_id={payload.session_id}")
         
-        # Agent Runtime을 통한 요청 처리
-        print("[API] Agent Runtime 요청 처리 시작...")
-        result = agent_runtime.process_request(
+        # Agent Runtime을 통한 요청 처리 (이벤트 루프 블로킹 방지)
+        response = await run_in_threadpool(
+            _run_agent_request,
             payload.dict(),
-            session_id=session_id or payload.session_id
+            session_id or payload.session_id
         )
-        print(f"[API] Agent Runtime 요청 처리 완료: status={result.get('status')}")
-        
-        # 결과 포맷팅
-        print("[API] 결과 포맷팅 시작...")
-        response = custom_ui.format_output(result)
-        print("[API] 결과 포맷팅 완료")
         
         return JSONResponse(content=response)
     
+    except HTTPException:
+        raise
     except Exception as e:
         import traceback
         error_trace = traceback.format_exc()
@@ -198,32 +236,138 @@ async def process_request_json(request_data: dict):
             session_id=request_data.get("session_id")
         )
         
-        # Agent Runtime을 통한 요청 처리
-        result = agent_runtime.process_request(
+        # Agent Runtime을 통한 요청 처리 (이벤트 루프 블로킹 방지)
+        response = await run_in_threadpool(
+            _run_agent_request,
             payload.dict(),
-            session_id=request_data.get("session_id") or payload.session_id
+            request_data.get("session_id") or payload.session_id
         )
         
-        # 결과 포맷팅
-        response = custom_ui.format_output(result)
-        
         return JSONResponse(content=response)
     
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.post("/api/v1/jobs", status_code=202)
+async def submit_job(
+    text: Optional[str] = Form(None),
+    image: Optional[UploadFile] = File(None),
+    user_id: Optional[str] = Form(None),
+    session_id: Optional[str] = Form(None)
+):
+    """
+    비동기 작업 제출
+    
+    /api/v1/request와 같은 입력을 받지만, 파이프라인을 워커 풀에서 실행하고
+    job_id를 즉시 반환한다. 결과는 GET /api/v1/jobs/{job_id}로 조회한다.
+    """
+    try:
+        image_path = None
+        if image:
+            image_path = await _save_upload_image(image, session_id)
+        
+        payload = custom_ui.process_user_input(
+            text=text,
+            image_path=image_path,
+            user_id=user_id,
+            session_id=session_id
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    job_id = job_manager.submit(
+        _run_agent_request,
+        payload.dict(),
+        session_id or payload.session_id,
+        with_progress=True
+    )
+    return {
+        "job_id": job_id,
+        "status": "queued",
+        "session_id": payload.session_id,
+        "status_url": f"/api/v1/jobs/{job_id}",
+        "events_url": f"/api/v1/jobs/{job_id}/events"
+    }
+
+
+@app.get("/api/v1/jobs/{job_id}")
+async def get_job(job_id: str):
+    """작업 상태 및 결과 조회"""
+    job = job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"작업을 찾을 수 없습니다: {job_id}")
+    return job
+
+
+@app.get("/api/v1/jobs/{job_id}/events")
+async def stream_job_events(job_id: str):
+    """
+    작업 진행 이벤트 스트림 (Server-Sent Events)
+    
+    단계별 step_started / step_finished 이벤트(소요 시간 및 단계 결과 포함)를
+    발생 순서대로 전송하고, job_completed 또는 job_failed 이벤트 후 종료한다.
+    """
+    if job_manager.get(job_id) is None:
+        raise HTTPException(status_code=404, detail=f"작업을 찾을 수 없습니다: {job_id}")
+    
+    async def event_stream():
+        next_index = 0
+        idle_seconds = 0.0
+        while True:
+            events = job_manager.get_events(job_id, next_index)
+            if events is None:
+                break
+            for event in events:
+                next_index += 1
+                data = json.dumps(event, ensure_ascii=False, default=str)
+                yield f"id: {event['seq']}\nevent: {event['event']}\ndata: {data}\n\n"
+                if event["event"] in ("job_completed", "job_failed"):
+                    return
+            if events:
+                idle_seconds = 0.0
+            elif idle_seconds >= SSE_HEARTBEAT_SECONDS:
+                # 프록시 타임아웃 방지용 주석 라인
+                yield ": keep-alive\n\n"
+                idle_seconds = 0.0
+            await asyncio.sleep(SSE_POLL_INTERVAL)
+            idle_seconds += SSE_POLL_INTERVAL
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
 @app.get("/api/v1/session/{session_id}/history")
-async def get_session_history(session_id: str):
-    """세션 대화 기록 조회"""
+async def get_session_history(
+    session_id: str,
+    before: Optional[int] = Query(None, ge=1, description="이 seq보다 이전 기록 조회 (이전 응답의 next_cursor)"),
+    limit: int = Query(20, ge=1, le=100, description="페이지 크기"),
+    include_context: bool = Query(True, description="첫 페이지에 세션 컨텍스트 포함 여부")
+):
+    """
+    세션 대화 기록 조회 (커서 페이지네이션)
+    
+    최신 기록부터 limit개씩 반환하며, next_cursor를 before로 넘기면 이전 페이지를 조회한다.
+    세션 컨텍스트는 첫 페이지(before 없음)에만 포함한다.
+    
+    세션당 최근 MEMORY_MAX_HISTORY개(기본 100)의 기록만 보관하므로 그보다 오래된 기록은 조회되지 않는다.
+    각 기록의 timestamp는 ISO 문자열, ts는 같은 시각의 epoch 초이다.
+    """
     try:
         memory = memory_manager.get_short_term_memory(session_id)
-        history = memory.get_conversation_history()
-        return {
+        records, next_cursor = memory.get_conversation_page(before=before, limit=limit)
+        response = {
             "session_id": session_id,
-            "history": history,
-            "context": memory.get_context()
+            "history": [record.to_dict() for record in records],
+            "next_cursor": next_cursor,
+            "has_more": next_cursor is not None
         }
+        if include_context and before is None:
+            response["context"] = memory.get_context()
+        return response
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -268,6 +412,25 @@ async def get_file(path: str = Query(..., description="파일 경로")):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.on_event("startup")
+async def startup_event():
+    """서버 시작 시 도구 인스턴스 warmup (백그라운드, 요청 처리를 막지 않음)"""
+    if os.environ.get("TOOL_WARMUP", "true").lower() == "true":
+        threading.Thread(
+            target=tool_registry.warmup,
+            name="tool-warmup",
+            daemon=True
+        ).start()
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """서버 종료 시 작업 워커 및 도구 인스턴스 정리, 메모리 백엔드에 남은 쓰기 기록"""
+    job_manager.shutdown(wait=False)
+    tool_registry.shutdown()
+    memory_manager.close()
+
+
 if __name__ == "__main__":
     uvicorn.run(
         "agentic_system.api.main:app",
@@ -0,0 +1,106 @@
+"""
+Blob Store - 해시로 주소 지정되는 업로드 이미지 저장소
+
+업로드 이미지는 내용 SHA-256 이름의 파일로 저장된다 (같은 이미지는 파일 하나).
+결과 캐시(ResultCache)와 같은 방식으로 파일 수정 시각을 마지막 사용 시각으로 쓰고,
+최대 개수 / 용량을 넘으면 오래 사용하지 않은 blob부터 삭제한다.
+- HEAD / PUT(이미 있음) / image_hash 참조 / 업로드 저장 시 수정 시각 갱신
+- 업로드 중인 임시 파일(.upload_*.tmp)은 정리 대상에서 제외
+"""
+
+from typing import Dict, Optional
+from pathlib import Path
+import os
+import re
+import threading
+import time
+
+SHA256_PATTERN = re.compile(r"^[0-9a-f]{64}$")
+
+
+class BlobStore:
+    """
+    디스크 기반 이미지 blob 저장소 (mtime 기반 LRU 정리)
+    """
+
+    def __init__(
+        self,
+        blob_dir: Path,
+        max_entries: int = 10000,
+        max_bytes: int = 2 * 1024 * 1024 * 1024
+    ):
+        self.blob_dir = Path(blob_dir)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.blob_dir.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        # sha256 -> (크기, 마지막 사용 시각)
+        self._index: Dict[str, tuple] = {}
+        self._load_index()
+
+    def path_for(self, sha256: str) -> Path:
+        """해시에 해당하는 blob 경로 (형식이 잘못되면 ValueError)"""
+        if not SHA256_PATTERN.match(sha256):
+            raise ValueError(f"잘못된 SHA-256 해시: {sha256}")
+        return self.blob_dir / sha256
+
+    def touch(self, sha256: str) -> Optional[Path]:
+        """
+        blob 사용 기록 (수정 시각 갱신)
+
+        Returns:
+            Optional[Path]: blob 경로 (없으면 None)
+        """
+        path = self.path_for(sha256)
+        now = time.time()
+        try:
+            os.utime(path, (now, now))
+            size = path.stat().st_size
+        except OSError:
+            with self._lock:
+                self._index.pop(sha256, None)
+            return None
+        with self._lock:
+            self._index[sha256] = (size, now)
+        return path
+
+    def add(self, sha256: str) -> Optional[Path]:
+        """새로 저장(또는 다시 업로드)된 blob을 인덱스에 반영하고 정리 실행"""
+        path = self.touch(sha256)
+        if path is not None:
+            with self._lock:
+                self._evict_locked()
+        return path
+
+    def total_bytes(self) -> int:
+        with self._lock:
+            return sum(size for size, _ in self._index.values())
+
+    def _load_index(self):
+        """기존 blob 파일로부터 인덱스 구성"""
+        for path in self.blob_dir.iterdir():
+            if not SHA256_PATTERN.match(path.name):
+                continue
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            self._index[path.name] = (stat.st_size, stat.st_mtime)
+        with self._lock:
+            self._evict_locked()
+
+    def _evict_locked(self):
+        """최대 개수 / 용량을 넘으면 LRU 순서로 삭제 (lock 보유 상태에서 호출)"""
+        total_bytes = sum(size for size, _ in self._index.values())
+        if len(self._index) <= self.max_entries and total_bytes <= self.max_bytes:
+            return
+        for sha256, (size, _) in sorted(self._index.items(), key=lambda item: item[1][1]):
+            if len(self._index) <= self.max_entries and total_bytes <= self.max_bytes:
+                break
+            del self._index[sha256]
+            total_bytes -= size
+            try:
+                os.remove(self.blob_dir / sha256)
+            except OSError:
+                pass
+            print(f"[BlobStore] blob 정리: {sha256[:12]} ({size} bytes)")
@@ -0,0 +1,306 @@
+"""
+ChatGarment Inference Worker - 추론 전용 프로세스
+
+ChatGarmentPipeline(모델)을 소유하는 장기 실행 프로세스를 띄우고,
+요청 큐로 작업을 받아 결과 큐로 돌려준다.
+API / 서비스 프로세스는 모델을 로딩하지 않고 Future로 결과만 기다린다.
+
+- 프로세스 시작 방식: spawn (CUDA는 fork 이후 재초기화할 수 없음)
+- GPU가 없거나 CHATGARMENT_WORKER_MOCK=true이면 Mock 모드로 동작
+  (CHATGARMENT_WORKER_CPU=true이면 GPU 없이 CPU로 실제 모델 실행)
+- 워커 프로세스가 종료되면 대기 중인 요청은 실패 처리되고, 다음 요청 시 재시작
+- 워커 안에서 요청을 CHATGARMENT_WORKER_CONCURRENCY개(기본: CHATGARMENT_MAX_BATCH_SIZE)
+  스레드로 동시에 처리하여 파이프라인의 마이크로 배칭이 동시 요청을 묶을 수 있게 함
+
+이 모듈은 워커 프로세스에서 다시 임포트되므로 최상위에서는 표준 라이브러리만 임포트한다.
+"""
+
+from typing import Dict, Optional, Any
+from concurrent.futures import Future, ThreadPoolExecutor
+import multiprocessing as mp
+import os
+import queue
+import threading
+import traceback
+import uuid
+
+SUPPORTED_OPS = ("process_image_to_garment", "analyze_image", "warmup")
+
+
+def _resolve_device(mock: Optional[bool]) -> Optional[str]:
+    """
+    워커 실행 모드 결정
+
+    Returns:
+        "cuda" / "cpu": 실제 모델 실행 디바이스, None: Mock 모드
+    """
+    if mock is None:
+        mock = os.getenv("CHATGARMENT_WORKER_MOCK", "false").lower() == "true"
+    if mock:
+        return None
+    try:
+        import torch
+    except ImportError:
+        print("[InferenceWorker] torch를 찾을 수 없어 Mock 모드로 동작합니다")
+        return None
+    if torch.cuda.is_available():
+        return "cuda"
+    if os.getenv("CHATGARMENT_WORKER_CPU", "false").lower() == "true":
+        return "cpu"
+    print("[InferenceWorker] GPU를 사용할 수 없어 Mock 모드로 동작합니다")
+    return None
+
+
+def _mock_result(op: str, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+    """Mock 모드 결과 (서비스의 Mock 응답과 같은 형식)"""
+    if op == "warmup":
+        return {"status": "success", "mock": True, "model_loaded": False}
+    analysis = {
+        "garment_type": "상의",
+        "style": "캐주얼",
+        "color": "검정색",
+        "type": "hoodie"
+    }
+    if op == "analyze_image":
+        return {
+            "status": "success",
+            "mock": True,
+            "analysis": analysis,
+            "message": "이미지 분석이 완료되었습니다. (Mock 모드)"
+        }
+    output_dir = kwargs.get("output_dir") or ""
+    garment_id = kwargs.get("garment_id") or f"garment_{uuid.uuid4().hex[:12]}"
+    return {
+        "status": "success",
+        "mock": True,
+        "garment_id": garment_id,
+        "analysis": analysis,
+        "pattern_path": os.path.join(output_dir, "pattern.json"),
+        "mesh_path": os.path.join(output_dir, "garment.obj"),
+        "render_path": os.path.join(output_dir, "garment_render.png"),
+        "message": "전체 파이프라인이 완료되었습니다. (Mock 모드)"
+    }
+
+
+def _worker_main(request_queue, result_queue, pipeline_kwargs: Dict[str, Any], mock: Optional[bool]):
+    """워커 프로세스 진입점: 파이프라인을 소유하고 요청 큐를 처리"""
+    device = _resolve_device(mock)
+    pipeline = None
+    if device is not None:
+        try:
+            from agentic_system.tools.chatgarment_integration import ChatGarmentPipeline
+            pipeline = ChatGarmentPipeline(device=device, **pipeline_kwargs)
+        except Exception as e:
+            print(f"[InferenceWorker] 파이프라인 초기화 실패, Mock 모드로 전환: {str(e)}")
+            pipeline = None
+    result_queue.put({"type": "ready", "mock": pipeline is None, "pid": os.getpid()})
+    print(f"[InferenceWorker] 워커 시작 (pid={os.getpid()}, mode={'mock' if pipeline is None else device})")
+
+    concurrency = int(os.getenv(
+        "CHATGARMENT_WORKER_CONCURRENCY",
+        os.getenv("CHATGARMENT_MAX_BATCH_SIZE", "4")
+    ))
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+        while True:
+            request = request_queue.get()
+            if request is None:
+                break
+            executor.submit(_handle_request, pipeline, request, result_queue)
+    print(f"[InferenceWorker] 워커 종료 (pid={os.getpid()})")
+
+
+def _handle_request(pipeline, request: Dict[str, Any], result_queue):
+    """요청 하나를 처리하고 결과 큐에 응답 작성 (워커 프로세스 내부)"""
+    request_id = request["id"]
+    op = request["op"]
+    kwargs = request.get("kwargs", {})
+    try:
+        if op not in SUPPORTED_OPS:
+            raise ValueError(f"Unknown op: {op}")
+        if pipeline is None:
+            value = _mock_result(op, kwargs)
+        elif op == "warmup":
+            value = {**pipeline.warmup(), "mock": False}
+        elif op == "analyze_image":
+            value = pipeline.analyze_image(**kwargs)
+        else:
+            value = pipeline.process_image_to_garment(**kwargs)
+        result_queue.put({"id": request_id, "ok": True, "value": value})
+    except Exception as e:
+        result_queue.put({
+            "id": request_id,
+            "ok": False,
+            "error": str(e),
+            "traceback": traceback.format_exc()
+        })
+
+
+class InferenceWorker:
+    """
+    추론 워커 프로세스 클라이언트
+
+    submit()은 즉시 Future를 반환하고, 디스패처 스레드가 결과 큐를 읽어
+    요청 ID에 해당하는 Future를 완료시킨다.
+    """
+
+    def __init__(self, pipeline_kwargs: Optional[Dict[str, Any]] = None, mock: Optional[bool] = None):
+        """
+        Args:
+            pipeline_kwargs: ChatGarmentPipeline 생성 인자 (model_path, checkpoint_path)
+            mock: True/False로 Mock 모드 강제 (None이면 환경 변수와 GPU 유무로 결정)
+        """
+        self.pipeline_kwargs = dict(pipeline_kwargs or {})
+        self._mock_override = mock
+        # 워커가 보고한 실제 동작 모드 (시작 전에는 None)
+        self.mock: Optional[bool] = None
+        self._ctx = mp.get_context("spawn")
+        self._lock = threading.Lock()
+        # request_id -> (Future, 요청을 보낸 워커 프로세스)
+        self._pending: Dict[str, tuple] = {}
+        self._process = None
+        self._request_queue = None
+        self._ready = threading.Event()
+
+    @property
+    def is_alive(self) -> bool:
+        return self._process is not None and self._process.is_alive()
+
+    def start(self):
+        """워커 프로세스 시작 (이미 실행 중이면 무시)"""
+        with self._lock:
+            self._start_locked()
+
+    def _start_locked(self):
+        """워커 프로세스와 디스패처 스레드 시작 (_lock 보유 상태에서 호출)"""
+        if self.is_alive:
+            return
+        request_queue = self._ctx.Queue()
+        result_queue = self._ctx.Queue()
+        process = self._ctx.Process(
+            target=_worker_main,
+            args=(request_queue, result_queue, self.pipeline_kwargs, self._mock_override),
+            name="chatgarment-inference-worker",
+            daemon=True
+        )
+        process.start()
+        self._ready.clear()
+        self._process = process
+        self._request_queue = request_queue
+        threading.Thread(
+            target=self._dispatch_results,
+            args=(process, result_queue),
+            name="chatgarment-inference-dispatcher",
+            daemon=True
+        ).start()
+        print(f"[InferenceWorker] 워커 프로세스 시작: pid={process.pid}")
+
+    def wait_ready(self, timeout: Optional[float] = None) -> bool:
+        """워커가 파이프라인 초기화를 마칠 때까지 대기"""
+        return self._ready.wait(timeout)
+
+    def submit(self, op: str, **kwargs) -> Future:
+        """
+        작업 제출
+
+        Args:
+            op: 작업 종류 ("process_image_to_garment", "analyze_image", "warmup")
+            **kwargs: 작업 인자 (pickle 가능해야 함)
+
+        Returns:
+            Future: 결과 Dict로 완료되는 Future
+        """
+        request_id = uuid.uuid4().hex
+        future: Future = Future()
+        with self._lock:
+            self._start_locked()
+            self._pending[request_id] = (future, self._process)
+            self._request_queue.put({"id": request_id, "op": op, "kwargs": kwargs})
+        return future
+
+    def process_image_to_garment(
+        self,
+        image_path: str,
+        output_dir: Optional[str] = None,
+        garment_id: Optional[str] = None,
+        timeout: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """ChatGarmentPipeline.process_image_to_garment를 워커에서 실행하고 결과 대기"""
+        return self.submit(
+            "process_image_to_garment",
+            image_path=image_path,
+            output_dir=output_dir,
+            garment_id=garment_id
+        ).result(timeout)
+
+    def analyze_image(
+        self,
+        image_path: str,
+        text: Optional[str] = None,
+        timeout: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """ChatGarmentPipeline.analyze_image(Step 1만)를 워커에서 실행하고 결과 대기"""
+        return self.submit("analyze_image", image_path=image_path, text=text).result(timeout)
+
+    def warmup(self, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """워커에서 모델을 미리 로딩하고 더미 추론 1회 실행"""
+        return self.submit("warmup").result(timeout)
+
+    def stop(self, timeout: float = 10.0):
+        """워커 프로세스 종료"""
+        with self._lock:
+            process, request_queue = self._process, self._request_queue
+            self._process = None
+            self._request_queue = None
+        if process is None:
+            return
+        try:
+            request_queue.put(None)
+            process.join(timeout)
+        finally:
+            if process.is_alive():
+                process.terminate()
+                process.join(1.0)
+        print("[InferenceWorker] 워커 프로세스 종료")
+
+    def _dispatch_results(self, process, result_queue):
+        """결과 큐를 읽어 대기 중인 Future 완료 (워커 프로세스당 하나)"""
+        while True:
+            try:
+                message = result_queue.get(timeout=1.0)
+            except queue.Empty:
+                if process.is_alive():
+                    continue
+                break
+            except (EOFError, OSError):
+                break
+
+            if message.get("type") == "ready":
+                self.mock = message["mock"]
+                self._ready.set()
+                continue
+
+            with self._lock:
+                entry = self._pending.pop(message["id"], None)
+            if entry is None:
+                continue
+            future = entry[0]
+            if message["ok"]:
+                future.set_result(message["value"])
+            else:
+                print(f"[InferenceWorker] 작업 실패: {message['error']}")
+                future.set_exception(RuntimeError(message["error"]))
+
+        # 워커가 종료되면 이 프로세스로 보낸 요청은 더 이상 응답을 받을 수 없음
+        with self._lock:
+            if self._process is process:
+                self._process = None
+                self._request_queue = None
+            orphaned = [
+                request_id for request_id, (_, owner) in self._pending.items()
+                if owner is process
+            ]
+            futures = [self._pending.pop(request_id)[0] for request_id in orphaned]
+        for future in futures:
+            if not future.done():
+                future.set_exception(RuntimeError("추론 워커 프로세스가 종료되었습니다"))
+        print(f"[InferenceWorker] 워커 프로세스 종료 감지: exitcode={process.exitcode}")
@@ -7,18 +7,26 @@ ChatGarment 마이크로서비스
 
 import sys
 import os
-import uuid
+import threading
+import time
 from pathlib import Path
-from fastapi import FastAPI, HTTPException, UploadFile, File, Form
+from fastapi import FastAPI, HTTPException, UploadFile, File, Form, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
-from typing import Optional
+from fastapi.concurrency import run_in_threadpool
+from typing import Optional, Dict, Any
+import asyncio
 import uvicorn
 
 # ChatGarment 경로 추가 (자동 감지)
 # Windows 또는 Linux 경로 자동 감지
 script_dir = Path(__file__).parent
 project_root = script_dir.parent.parent  # agentic_system/chatgarment_service -> agentic_system -> ChatGarment
+sys.path.insert(0, str(project_root))
+
+from agentic_system.chatgarment_service.inference_worker import InferenceWorker
+from agentic_system.chatgarment_service.blob_store import BlobStore
+from agentic_system.chatgarment_service.uploads import save_upload, stream_to_file
 
 # 가능한 경로들 시도
 possible_paths = [
@@ -33,9 +41,7 @@ for path in possible_paths:
         chatgarment_root = path
         print(f"[ChatGarment Service] ChatGarment 경로 발견: {chatgarment_root}")
         sys.path.insert(0, str(chatgarment_root))
-        # 작업 디렉토리를 ChatGarment로 변경 (상대 경로 문제 해결)
-        os.chdir(str(chatgarment_root))
-        print(f"[ChatGarment Service] 작업 디렉토리 변경: {os.getcwd()}")
+        # 작업 디렉토리는 변경하지 않음 (상대 경로가 필요한 GarmentCode 파서는 격리된 프로세스에서 실행)
         break
 
 if chatgarment_root is None:
@@ -59,6 +65,175 @@ app.add_middleware(
 # ChatGarment Pipeline 인스턴스
 chatgarment_pipeline = None
 
+# 추론 워커 프로세스 사용 여부 (true이면 모델은 워커 프로세스에서만 로딩)
+USE_INFERENCE_WORKER = os.getenv("CHATGARMENT_INFERENCE_WORKER", "false").lower() == "true"
+
+# 모델 없이 Mock 응답만 하는 모드 (여러 인스턴스 로드 밸런싱을 로컬에서 시험할 때 사용)
+SERVICE_MOCK = os.getenv("CHATGARMENT_SERVICE_MOCK", "false").lower() == "true"
+SERVICE_PORT = int(os.getenv("CHATGARMENT_SERVICE_PORT", "9000"))
+inference_worker: Optional[InferenceWorker] = None
+
+# 백엔드와 함께 마운트한 공유 볼륨 루트 (설정 시 image_ref로 업로드 없이 경로만 전달 가능)
+SHARED_ROOT = os.getenv("CHATGARMENT_SHARED_ROOT")
+
+# 업로드 이미지 blob 저장소 (get_blob_store에서 생성)
+blob_store: Optional[BlobStore] = None
+_blob_store_lock = threading.Lock()
+
+# 시작 시 모델 로딩 + 더미 추론 실행 여부 (false이면 첫 요청에서 지연 로딩)
+WARMUP_ON_STARTUP = os.getenv("CHATGARMENT_WARMUP", "true").lower() == "true"
+
+# 준비 상태: starting -> loading_model -> warming_up -> ready (실패 시 failed)
+readiness: Dict[str, Any] = {
+    "state": "starting",
+    "mock": None,
+    "started_at": time.time(),
+    "ready_at": None,
+    "load_seconds": None,
+    "warmup_seconds": None,
+    "error": None
+}
+_readiness_lock = threading.Lock()
+
+
+def set_readiness(state: str, **fields):
+    """준비 상태 갱신 (백그라운드 워밍업 스레드 / 워커 콜백에서 호출)"""
+    with _readiness_lock:
+        readiness["state"] = state
+        readiness.update(fields)
+        if state == "ready":
+            readiness["ready_at"] = time.time()
+    print(f"[ChatGarment Service] 준비 상태: {state}")
+
+
+def apply_warmup_result(result: Dict[str, Any]):
+    """warmup 결과(Dict)를 준비 상태에 반영"""
+    if result.get("status") == "success":
+        set_readiness(
+            "ready",
+            mock=bool(result.get("mock")),
+            load_seconds=result.get("load_seconds"),
+            warmup_seconds=result.get("warmup_seconds")
+        )
+    else:
+        set_readiness("failed", error=result.get("message") or result.get("error"))
+
+
+def warmup_in_background():
+    """인프로세스 파이프라인 로딩 + 더미 추론 (서비스 시작을 막지 않도록 별도 스레드에서 실행)"""
+    try:
+        pipeline = load_chatgarment_pipeline()
+        if pipeline == "mock":
+            print("[ChatGarment Service] ⚠️ Mock 모드로 동작합니다")
+            print("[ChatGarment Service] 실제 모델을 사용하려면:")
+            print("[ChatGarment Service] 1. 체크포인트 경로 확인")
+            print("[ChatGarment Service] 2. 모든 의존성 설치 확인")
+            print("[ChatGarment Service] 3. 서비스 로그 확인")
+            set_readiness("ready", mock=True)
+            return
+        if not WARMUP_ON_STARTUP:
+            # 모델은 첫 요청에서 로딩 (기존 동작)
+            set_readiness("ready", mock=False)
+            return
+        
+        set_readiness("loading_model", mock=False)
+        load_start = time.time()
+        pipeline.load_model()
+        load_seconds = time.time() - load_start
+        if not pipeline.model_loaded:
+            set_readiness("failed", load_seconds=load_seconds, error="ChatGarment 모델을 로딩할 수 없습니다.")
+            return
+        
+        set_readiness("warming_up", load_seconds=load_seconds)
+        result = pipeline.warmup()
+        apply_warmup_result({**result, "load_seconds": load_seconds})
+    except Exception as e:
+        import traceback
+        traceback.print_exc()
+        set_readiness("failed", error=str(e))
+
+
+def find_checkpoint_path() -> Optional[Path]:
+    """체크포인트 경로 탐색 (프로젝트 루트 기준, 없으면 None)"""
+    possible_checkpoint_paths = [
+        project_root / "checkpoints" / "try_7b_lr1e_4_v3_garmentcontrol_4h100_v4_final" / "pytorch_model.bin",
+        project_root.parent / "checkpoints" / "try_7b_lr1e_4_v3_garmentcontrol_4h100_v4_final" / "pytorch_model.bin",
+    ]
+    if chatgarment_root:
+        possible_checkpoint_paths.append(
+            chatgarment_root / "checkpoints" / "try_7b_lr1e_4_v3_garmentcontrol_4h100_v4_final" / "pytorch_model.bin"
+        )
+    
+    for cp_path in possible_checkpoint_paths:
+        if cp_path.exists():
+            print(f"[ChatGarment Service] 체크포인트 발견: {cp_path}")
+            return cp_path
+    
+    print(f"[ChatGarment Service] 체크포인트를 찾을 수 없습니다.")
+    print(f"    시도한 경로들:")
+    for cp_path in possible_checkpoint_paths:
+        print(f"      - {cp_path} (존재: {cp_path.exists()})")
+    return None
+
+
+def get_inference_worker() -> InferenceWorker:
+    """추론 워커 클라이언트 (처음 호출 시 워커 프로세스 시작)"""
+    global inference_worker
+    if inference_worker is None:
+        checkpoint_path = find_checkpoint_path() if chatgarment_root and not SERVICE_MOCK else None
+        inference_worker = InferenceWorker(
+            pipeline_kwargs={"checkpoint_path": str(checkpoint_path)} if checkpoint_path else {},
+            # 경로나 체크포인트가 없으면 기존 서비스와 같이 Mock 모드
+            mock=True if checkpoint_path is None else None
+        )
+        inference_worker.start()
+    return inference_worker
+
+
+async def run_garment_pipeline(image_path: str, output_dir: Optional[str] = None):
+    """
+    의류 생성 실행 (이벤트 루프를 막지 않음)
+    
+    Returns:
+        Dict 또는 "mock" (인프로세스 파이프라인이 Mock 모드인 경우)
+    """
+    if USE_INFERENCE_WORKER:
+        future = get_inference_worker().submit(
+            "process_image_to_garment",
+            image_path=image_path,
+            output_dir=output_dir
+        )
+        return await asyncio.wrap_future(future)
+    
+    pipeline = load_chatgarment_pipeline()
+    if pipeline == "mock":
+        return "mock"
+    return await run_in_threadpool(
+        pipeline.process_image_to_garment,
+        image_path,
+        output_dir=output_dir
+    )
+
+async def run_garment_analysis(image_path: str, text: Optional[str] = None):
+    """
+    이미지 분석 실행 (Step 1만, 이벤트 루프를 막지 않음)
+    
+    Returns:
+        Dict 또는 "mock" (인프로세스 파이프라인이 Mock 모드인 경우)
+    """
+    if USE_INFERENCE_WORKER:
+        future = get_inference_worker().submit(
+            "analyze_image",
+            image_path=image_path,
+            text=text
+        )
+        return await asyncio.wrap_future(future)
+    
+    pipeline = load_chatgarment_pipeline()
+    if pipeline == "mock":
+        return "mock"
+    return await run_in_threadpool(pipeline.analyze_image, image_path, text=text)
+
 def load_chatgarment_pipeline():
     """ChatGarment Pipeline 로딩 (실패 시 Mock 모드)"""
     global chatgarment_pipeline
@@ -66,43 +241,21 @@ def load_chatgarment_pipeline():
     if chatgarment_pipeline is not None:
         return chatgarment_pipeline
     
-    # ChatGarment 경로가 없으면 Mock 모드
-    if chatgarment_root is None:
-        print("[ChatGarment Service] Mock 모드로 동작합니다 (경로 없음)")
+    # ChatGarment 경로가 없거나 Mock 모드가 지정되면 Mock 모드
+    if chatgarment_root is None or SERVICE_MOCK:
+        print("[ChatGarment Service] Mock 모드로 동작합니다 (경로 없음 또는 CHATGARMENT_SERVICE_MOCK)")
         chatgarment_pipeline = "mock"
         return chatgarment_pipeline
     
     try:
         # 실제 Pipeline 로딩 시도
-        # 체크포인트 경로: 프로젝트 루트 기준으로 찾기
-        # 가능한 경로들 시도
-        possible_checkpoint_paths = [
-            project_root / "checkpoints" / "try_7b_lr1e_4_v3_garmentcontrol_4h100_v4_final" / "pytorch_model.bin",
-            project_root.parent / "checkpoints" / "try_7b_lr1e_4_v3_garmentcontrol_4h100_v4_final" / "pytorch_model.bin",
-        ]
-        if chatgarment_root:
-            possible_checkpoint_paths.append(
-                chatgarment_root / "checkpoints" / "try_7b_lr1e_4_v3_garmentcontrol_4h100_v4_final" / "pytorch_model.bin"
-            )
-        
-        checkpoint_path = None
-        for cp_path in possible_checkpoint_paths:
-            if cp_path.exists():
-                checkpoint_path = cp_path
-                print(f"[ChatGarment Service] 체크포인트 발견: {checkpoint_path}")
-                break
+        checkpoint_path = find_checkpoint_path()
         
         if checkpoint_path is None:
-            print(f"[ChatGarment Service] 체크포인트를 찾을 수 없습니다.")
-            print(f"    시도한 경로들:")
-            for cp_path in possible_checkpoint_paths:
-                print(f"      - {cp_path} (존재: {cp_path.exists()})")
             print("[ChatGarment Service] Mock 모드로 동작합니다")
             chatgarment_pipeline = "mock"
             return chatgarment_pipeline
         
-        # 임포트 경로 수정
-        sys.path.insert(0, str(project_root / "agentic_system"))
         from agentic_system.tools.chatgarment_integration import ChatGarmentPipeline
         
         # CUDA 사용 가능 여부 확인
@@ -132,51 +285,162 @@ def load_chatgarment_pipeline():
         chatgarment_pipeline = "mock"
         return chatgarment_pipeline
 
+def get_blob_store() -> BlobStore:
+    """
+    해시로 주소 지정되는 업로드 이미지 저장소
+    
+    환경 변수:
+        CHATGARMENT_BLOB_DIR: 저장 디렉토리 (기본: <ChatGarment>/uploads/blobs)
+        CHATGARMENT_BLOB_MAX_ENTRIES: 최대 blob 수 (기본 10000)
+        CHATGARMENT_BLOB_MAX_BYTES: 최대 용량 (기본 2GB)
+    """
+    global blob_store
+    if blob_store is None:
+        with _blob_store_lock:
+            if blob_store is None:
+                base = chatgarment_root / "uploads" if chatgarment_root else project_root / "outputs" / "uploads"
+                blob_store = BlobStore(
+                    Path(os.getenv("CHATGARMENT_BLOB_DIR") or base / "blobs"),
+                    max_entries=int(os.getenv("CHATGARMENT_BLOB_MAX_ENTRIES", "10000")),
+                    max_bytes=int(os.getenv("CHATGARMENT_BLOB_MAX_BYTES", str(2 * 1024 * 1024 * 1024)))
+                )
+    return blob_store
+
+
+def blob_path(sha256: str) -> Path:
+    """해시에 해당하는 blob 경로 (형식이 잘못되면 400)"""
+    try:
+        return get_blob_store().path_for(sha256)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+def touch_blob(sha256: str) -> Optional[Path]:
+    """blob 사용 시각 갱신 (없으면 None, 형식이 잘못되면 400)"""
+    blob_path(sha256)
+    return get_blob_store().touch(sha256)
+
+
+async def resolve_image_input(
+    image: Optional[UploadFile],
+    image_hash: Optional[str],
+    image_ref: Optional[str]
+) -> Path:
+    """
+    요청의 이미지 입력을 로컬 파일 경로로 변환
+    
+    - image: multipart 업로드 (스트리밍으로 blob 저장소에 저장)
+    - image_hash: PUT /api/v1/blobs/{sha256}로 미리 올린 이미지
+    - image_ref: 공유 볼륨(CHATGARMENT_SHARED_ROOT) 기준 상대 경로
+    """
+    if image is not None:
+        # 내용 해시 이름으로 저장하므로 이후 같은 이미지는 image_hash로 참조 가능
+        saved = await save_upload(image, get_blob_store().blob_dir, suffix="")
+        get_blob_store().add(saved.sha256)
+        return saved.path
+    
+    if image_hash:
+        image_path = touch_blob(image_hash.lower())
+        if image_path is None:
+            raise HTTPException(status_code=404, detail=f"업로드되지 않은 이미지 해시: {image_hash}")
+        return image_path
+    
+    if image_ref:
+        if not SHARED_ROOT:
+            raise HTTPException(status_code=400, detail="공유 볼륨(CHATGARMENT_SHARED_ROOT)이 설정되지 않았습니다.")
+        shared_root = Path(SHARED_ROOT).resolve()
+        image_path = (shared_root / image_ref).resolve()
+        # 공유 볼륨 밖의 파일은 읽지 않음
+        if shared_root not in image_path.parents or not image_path.is_file():
+            raise HTTPException(status_code=404, detail=f"공유 볼륨에서 이미지를 찾을 수 없습니다: {image_ref}")
+        return image_path
+    
+    raise HTTPException(status_code=400, detail="image, image_hash, image_ref 중 하나가 필요합니다.")
+
 @app.get("/health")
 async def health_check():
-    """헬스 체크"""
-    return {"status": "healthy", "service": "chatgarment"}
+    """헬스 체크 (프로세스 생존 여부, 모델 준비 여부는 /ready)"""
+    return {"status": "healthy", "service": "chatgarment", "ready": readiness["state"] == "ready"}
+
+@app.get("/ready")
+async def readiness_check():
+    """
+    준비 상태 확인
+    
+    모델 로딩과 워밍업이 끝나기 전에는 503을 반환하여
+    로드 밸런서가 트래픽을 보내지 않도록 한다.
+    """
+    with _readiness_lock:
+        content = dict(readiness)
+    content["elapsed_seconds"] = round(time.time() - content["started_at"], 1)
+    if USE_INFERENCE_WORKER and inference_worker is not None:
+        content["worker_alive"] = inference_worker.is_alive
+    content["service"] = "chatgarment"
+    return JSONResponse(
+        status_code=200 if content["state"] == "ready" else 503,
+        content=content
+    )
+
+@app.head("/api/v1/blobs/{sha256}")
+async def head_blob(sha256: str):
+    """이미지 blob 존재 여부 (있으면 200, 없으면 404, 사용 시각 갱신)"""
+    path = touch_blob(sha256)
+    if path is None:
+        return Response(status_code=404)
+    return Response(status_code=200, headers={"Content-Length": str(path.stat().st_size)})
+
+@app.put("/api/v1/blobs/{sha256}")
+async def put_blob(sha256: str, request: Request):
+    """
+    이미지 blob 업로드 (요청 본문 = 이미지 바이트)
+    
+    본문의 SHA-256이 경로의 해시와 다르면 저장하지 않고 400을 반환한다.
+    """
+    if touch_blob(sha256) is not None:
+        return {"status": "success", "sha256": sha256, "created": False}
+    
+    saved = await stream_to_file(request.stream(), get_blob_store().blob_dir, expected_sha256=sha256)
+    get_blob_store().add(sha256)
+    return JSONResponse(
+        status_code=201 if saved.created else 200,
+        content={"status": "success", "sha256": sha256, "created": saved.created}
+    )
 
 @app.post("/api/v1/analyze")
 async def analyze_image(
-    image: UploadFile = File(...),
-    text: Optional[str] = Form(None)
+    image: Optional[UploadFile] = File(None),
+    text: Optional[str] = Form(None),
+    image_hash: Optional[str] = Form(None),
+    image_ref: Optional[str] = Form(None)
 ):
     """
-    이미지 분석
+    이미지 분석 (Step 1: Geometry features만 실행, 3D 생성은 /api/v1/process)
     
     Args:
         image: 업로드된 이미지 파일
-        text: 선택적 텍스트 설명
+        text: 선택적 텍스트 설명 (분석 프롬프트에 덧붙임)
+        image_hash: 미리 업로드한 blob의 SHA-256 (image 대신 사용)
+        image_ref: 공유 볼륨 기준 이미지 경로 (image 대신 사용)
         
     Returns:
         분석 결과 (JSON)
     """
     try:
         # ChatGarment 경로 확인
-        if chatgarment_root is None:
+        if chatgarment_root is None and not SERVICE_MOCK:
             raise HTTPException(
                 status_code=500, 
                 detail="ChatGarment 경로를 찾을 수 없습니다. Mock 모드를 사용하세요."
             )
         
-        # 이미지 저장
-        upload_dir = chatgarment_root / "uploads"
-        upload_dir.mkdir(parents=True, exist_ok=True)
-        
-        # 파일명 처리
-        if image.filename is None:
-            image.filename = f"{uuid.uuid4()}.jpg"
-        image_path = upload_dir / image.filename
-        with open(image_path, "wb") as f:
-            content = await image.read()
-            f.write(content)
+        # 이미지 입력 (업로드 / blob 해시 / 공유 볼륨 경로)
+        image_path = await resolve_image_input(image, image_hash, image_ref)
         
-        # Pipeline 로딩
-        pipeline = load_chatgarment_pipeline()
+        # 분석 실행 (추론 워커 또는 인프로세스 파이프라인)
+        result = await run_garment_analysis(str(image_path), text)
         
         # Mock 모드 처리
-        if pipeline == "mock":
+        if result == "mock" or result.get("mock"):
             return JSONResponse(content={
                 "status": "success",
                 "analysis": {
@@ -188,15 +452,18 @@ async def analyze_image(
                 "message": "이미지 분석이 완료되었습니다. (Mock 모드)"
             })
         
-        # 실제 Pipeline 사용
-        result = pipeline.analyze_image(str(image_path), text)
+        if result.get("status") != "success":
+            raise RuntimeError(result.get("error") or result.get("message"))
         
         return JSONResponse(content={
             "status": "success",
-            "analysis": result,
+            "analysis": result.get("json_output"),
+            "geometry_features": result.get("geometry_features"),
             "message": "이미지 분석이 완료되었습니다."
         })
         
+    except HTTPException:
+        raise
     except Exception as e:
         import traceback
         traceback.print_exc()
@@ -204,9 +471,11 @@ async def analyze_image(
 
 @app.post("/api/v1/process")
 async def process_image(
-    image: UploadFile = File(...),
+    image: Optional[UploadFile] = File(None),
     text: Optional[str] = Form(None),
-    output_dir: Optional[str] = Form(None)
+    output_dir: Optional[str] = Form(None),
+    image_hash: Optional[str] = Form(None),
+    image_ref: Optional[str] = Form(None)
 ):
     """
     전체 파이프라인 실행 (이미지 분석 + 3D 생성)
@@ -215,43 +484,35 @@ async def process_image(
         image: 업로드된 이미지 파일
         text: 선택적 텍스트 설명
         output_dir: 출력 디렉토리 (선택사항)
+        image_hash: 미리 업로드한 blob의 SHA-256 (image 대신 사용)
+        image_ref: 공유 볼륨 기준 이미지 경로 (image 대신 사용)
         
     Returns:
         전체 처리 결과
     """
     try:
         # ChatGarment 경로 확인
-        if chatgarment_root is None:
+        if chatgarment_root is None and not SERVICE_MOCK:
             raise HTTPException(
                 status_code=500, 
                 detail="ChatGarment 경로를 찾을 수 없습니다. Mock 모드를 사용하세요."
             )
         
-        # 이미지 저장
-        upload_dir = chatgarment_root / "uploads"
-        upload_dir.mkdir(parents=True, exist_ok=True)
-        
-        # 파일명 처리
-        if image.filename is None:
-            import uuid
-            image.filename = f"{uuid.uuid4()}.jpg"
-        image_path = upload_dir / image.filename
-        with open(image_path, "wb") as f:
-            content = await image.read()
-            f.write(content)
+        # 이미지 입력 (업로드 / blob 해시 / 공유 볼륨 경로)
+        image_path = await resolve_image_input(image, image_hash, image_ref)
         
         # 출력 디렉토리 설정
         if output_dir is None:
-            output_dir = chatgarment_root / "outputs" / "chatgarment"
+            output_dir = (chatgarment_root or project_root) / "outputs" / "chatgarment"
         else:
             output_dir = Path(output_dir)
         output_dir.mkdir(parents=True, exist_ok=True)
         
-        # Pipeline 로딩
-        pipeline = load_chatgarment_pipeline()
+        # Pipeline 실행 (추론 워커 또는 인프로세스 파이프라인)
+        result = await run_garment_pipeline(str(image_path), output_dir=str(output_dir))
         
         # Mock 모드 처리
-        if pipeline == "mock":
+        if result == "mock" or result.get("mock"):
             # Mock 결과 생성 (기존 extensions.py의 Mock 로직과 유사)
             return JSONResponse(content={
                 "status": "success",
@@ -271,19 +532,14 @@ async def process_image(
                 "message": "처리가 완료되었습니다. (Mock 모드)"
             })
         
-        # 실제 Pipeline 사용
-        result = pipeline.process_image(
-            str(image_path),
-            output_dir=str(output_dir),
-            text_description=text
-        )
-        
         return JSONResponse(content={
             "status": "success",
             "result": result,
             "message": "처리가 완료되었습니다."
         })
         
+    except HTTPException:
+        raise
     except Exception as e:
         import traceback
         traceback.print_exc()
@@ -296,22 +552,40 @@ async def startup_event():
     print("[ChatGarment Service] 서비스 시작 이벤트")
     print("=" * 60)
     
-    # Pipeline 로딩 시도
-    print("[ChatGarment Service] Pipeline 로딩 시도...")
-    pipeline = load_chatgarment_pipeline()
+    if USE_INFERENCE_WORKER:
+        # 모델은 워커 프로세스에서 로딩 (결과를 기다리지 않고 백그라운드에서 warmup)
+        print("[ChatGarment Service] 추론 워커 프로세스 시작...")
+        set_readiness("loading_model")
+        future = get_inference_worker().submit("warmup")
+        
+        def on_warmup_done(done_future):
+            try:
+                apply_warmup_result(done_future.result())
+            except Exception as e:
+                set_readiness("failed", error=str(e))
+        
+        future.add_done_callback(on_warmup_done)
+        print("=" * 60)
+        print()
+        return
     
-    if pipeline == "mock":
-        print("[ChatGarment Service] ⚠️ Mock 모드로 동작합니다")
-        print("[ChatGarment Service] 실제 모델을 사용하려면:")
-        print("[ChatGarment Service] 1. 체크포인트 경로 확인")
-        print("[ChatGarment Service] 2. 모든 의존성 설치 확인")
-        print("[ChatGarment Service] 3. 서비스 로그 확인")
-    else:
-        print("[ChatGarment Service] ✅ 실제 ChatGarment Pipeline이 로드되었습니다!")
+    # Pipeline 로딩 + 워밍업은 백그라운드에서 진행 (진행 상황은 /ready)
+    print("[ChatGarment Service] Pipeline 로딩 시도 (백그라운드)...")
+    threading.Thread(
+        target=warmup_in_background,
+        name="chatgarment-warmup",
+        daemon=True
+    ).start()
     
     print("=" * 60)
     print()
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """서비스 종료 시 추론 워커 프로세스 정리"""
+    if inference_worker is not None:
+        inference_worker.stop()
+
 if __name__ == "__main__":
     # ChatGarment 경로 확인
     if chatgarment_root:
@@ -321,8 +595,9 @@ if __name__ == "__main__":
     else:
         print("[ChatGarment Service] ChatGarment 경로를 찾을 수 없습니다. Mock 모드로 동작합니다.")
     
-    print("[ChatGarment Service] 서비스 시작: http://0.0.0.0:9000")
-    print("[ChatGarment Service] 헬스 체크: http://localhost:9000/health")
+    print(f"[ChatGarment Service] 서비스 시작: http://0.0.0.0:{SERVICE_PORT}")
+    print(f"[ChatGarment Service] 헬스 체크: http://localhost:{SERVICE_PORT}/health")
+    print(f"[ChatGarment Service] 준비 상태: http://localhost:{SERVICE_PORT}/ready")
     print()
     print("[ChatGarment Service] 서비스가 시작되면 Pipeline 로딩을 시도합니다...")
     print("=" * 60)
@@ -331,7 +606,7 @@ if __name__ == "__main__":
     uvicorn.run(
         app,
         host="0.0.0.0",
-        port=9000,
+        port=SERVICE_PORT,
         log_level="info"
     )
 
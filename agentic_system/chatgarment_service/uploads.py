@@ -0,0 +1,113 @@
+"""
+Upload Storage - ChatGarment 서비스용 업로드 스트리밍 저장
+
+업로드 본문을 한 번에 메모리로 읽지 않고 청크 단위로 고유한 임시 파일에 쓰면서
+크기 제한 확인과 SHA-256 계산을 함께 한다. 완료되면 내용 해시 이름으로 원자적 교체한다.
+
+서비스 디렉토리만 따로 배포(리눅스 서버)할 수 있도록 API 서버(agentic_system.api.uploads)를
+임포트하지 않고 같은 동작을 이 모듈에 둔다. 한쪽을 고치면 다른 쪽도 함께 고친다.
+"""
+
+from typing import AsyncIterator, Optional
+from pathlib import Path
+import hashlib
+import os
+import uuid
+
+from fastapi import HTTPException, UploadFile
+from pydantic import BaseModel
+from starlette.concurrency import run_in_threadpool
+
+# 업로드 최대 크기 (기본 20MB)
+UPLOAD_MAX_BYTES = int(os.getenv("UPLOAD_MAX_BYTES", str(20 * 1024 * 1024)))
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+
+class SavedUpload(BaseModel):
+    """저장된 업로드 정보"""
+    path: Path
+    sha256: str
+    size: int
+    created: bool
+
+
+async def iter_upload(upload: UploadFile, chunk_size: int = UPLOAD_CHUNK_SIZE) -> AsyncIterator[bytes]:
+    """UploadFile을 청크 단위로 읽기"""
+    while True:
+        chunk = await upload.read(chunk_size)
+        if not chunk:
+            break
+        yield chunk
+
+
+async def stream_to_file(
+    chunks: AsyncIterator[bytes],
+    dest_dir: Path,
+    suffix: str = "",
+    max_bytes: Optional[int] = None,
+    expected_sha256: Optional[str] = None
+) -> SavedUpload:
+    """
+    청크 스트림을 dest_dir/<sha256><suffix>에 저장
+
+    Args:
+        chunks: 바이트 청크 비동기 이터레이터
+        dest_dir: 저장 디렉토리
+        suffix: 파일 확장자 ("" 이면 해시만 사용)
+        max_bytes: 최대 크기 (None이면 UPLOAD_MAX_BYTES, 초과 시 413)
+        expected_sha256: 기대 해시 (다르면 400)
+
+    Returns:
+        SavedUpload: 최종 경로, 해시, 크기, 새로 저장했는지 여부
+    """
+    max_bytes = max_bytes or UPLOAD_MAX_BYTES
+    dest_dir = Path(dest_dir)
+    dest_dir.mkdir(parents=True, exist_ok=True)
+    tmp_path = dest_dir / f".upload_{uuid.uuid4().hex}.tmp"
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        with open(tmp_path, "wb") as f:
+            async for chunk in chunks:
+                size += len(chunk)
+                if size > max_bytes:
+                    raise HTTPException(
+                        status_code=413,
+                        detail=f"업로드 크기 제한 초과 (최대 {max_bytes} bytes)"
+                    )
+                digest.update(chunk)
+                await run_in_threadpool(f.write, chunk)
+
+        sha256 = digest.hexdigest()
+        if expected_sha256 is not None and sha256 != expected_sha256:
+            raise HTTPException(status_code=400, detail="업로드된 내용의 해시가 일치하지 않습니다.")
+
+        final_path = dest_dir / f"{sha256}{suffix}"
+        created = not final_path.exists()
+        if created:
+            os.replace(tmp_path, final_path)
+        return SavedUpload(path=final_path, sha256=sha256, size=size, created=created)
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+
+
+async def save_upload(
+    upload: UploadFile,
+    dest_dir: Path,
+    suffix: str = "",
+    max_bytes: Optional[int] = None
+) -> SavedUpload:
+    """
+    UploadFile을 스트리밍으로 저장 (서비스 blob 저장소는 확장자 없이 해시 이름만 사용)
+
+    Args:
+        upload: 업로드 파일
+        dest_dir: 저장 디렉토리
+        suffix: 확장자
+        max_bytes: 최대 크기 (None이면 UPLOAD_MAX_BYTES)
+    """
+    try:
+        return await stream_to_file(iter_upload(upload), dest_dir, suffix=suffix, max_bytes=max_bytes)
+    finally:
+        await upload.close()
@@ -0,0 +1,64 @@
+"""
+ChatGarment 체크포인트 병합 / safetensors 변환 스크립트
+
+베이스 모델(LLaVA) + 파인튜닝 체크포인트(pytorch_model.bin)를 한 번 합쳐
+safetensors 형식으로 저장합니다. 이후 ChatGarmentPipeline은 병합본을
+메모리 매핑으로 바로 로딩하므로 서비스 시작 시간이 짧아집니다.
+
+사용법:
+    python convert_checkpoint_to_safetensors.py [--output-dir DIR] [--cpu]
+
+체크포인트가 바뀌면 다시 실행해야 합니다 (원본 버전이 다르면 병합본은 무시됨).
+"""
+import argparse
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ChatGarment 체크포인트를 safetensors로 병합 저장")
+    parser.add_argument("--model-path", default=None, help="베이스 모델 경로 (기본: 파이프라인 기본값)")
+    parser.add_argument("--checkpoint-path", default=None, help="파인튜닝 체크포인트 경로 (기본: 파이프라인 기본값)")
+    parser.add_argument("--output-dir", default=None, help="저장 디렉토리 (기본: CHATGARMENT_MERGED_CHECKPOINT)")
+    parser.add_argument("--cpu", action="store_true", help="GPU 없이 CPU에서 변환")
+    args = parser.parse_args()
+
+    from agentic_system.tools.chatgarment_integration import ChatGarmentPipeline, CHATGARMENT_AVAILABLE
+
+    if not CHATGARMENT_AVAILABLE:
+        print("[오류] ChatGarment 모듈을 임포트할 수 없습니다.")
+        sys.exit(1)
+
+    pipeline = ChatGarmentPipeline(
+        model_path=args.model_path,
+        checkpoint_path=args.checkpoint_path,
+        device="cpu" if args.cpu else "cuda",
+        merged_path=args.output_dir
+    )
+    if not Path(pipeline.checkpoint_path).exists():
+        print(f"[오류] 체크포인트를 찾을 수 없습니다: {pipeline.checkpoint_path}")
+        sys.exit(1)
+
+    print("=" * 60)
+    print("ChatGarment 체크포인트 변환")
+    print("=" * 60)
+    print(f"베이스 모델: {pipeline.model_path}")
+    print(f"체크포인트: {pipeline.checkpoint_path}")
+    print(f"출력: {pipeline.merged_path}")
+    print()
+
+    try:
+        output_dir = pipeline.save_merged_checkpoint()
+    except Exception as e:
+        print(f"[오류] 변환 실패: {e}")
+        sys.exit(1)
+
+    print()
+    print(f"[OK] 변환 완료: {output_dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -7,6 +7,7 @@ from .custom_ui import CustomUI
 from .agent_runtime import AgentRuntime
 from .f_llm import FLLM, Agent2
 from .memory import MemoryManager, Memory, ShortTermMemory, LongTermMemory
+from .memory_backends import MemoryBackend, SQLiteMemoryBackend, RedisMemoryBackend
 
 __all__ = [
     'CustomUI',
@@ -17,5 +18,8 @@ __all__ = [
     'Memory',
     'ShortTermMemory',
     'LongTermMemory',
+    'MemoryBackend',
+    'SQLiteMemoryBackend',
+    'RedisMemoryBackend',
 ]
 
@@ -5,13 +5,15 @@ Agent Runtime Component - Agent 1
 역할:
 - 사용자 요청을 분석하여 큰 그림의 작업 계획 수립
 - Agent 2에게 계획 전달 및 결과 수신
-- 도구 실행 오케스트레이션
+- 도구 실행 오케스트레이션 (의존성 기반 DAG 병렬 실행)
 - 자기 수정 루프 관리
 """
 
 from typing import Dict, List, Optional, Any, Callable
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, Future, wait, FIRST_COMPLETED
 import json
+import time
 
 from .f_llm import FLLM, ExecutionPlan
 from .memory import MemoryManager, ShortTermMemory
@@ -38,11 +40,16 @@ class AgentRuntime:
         self,
         agent2: Optional[FLLM] = None,
         memory_manager: Optional[MemoryManager] = None,
-        max_retries: int = 1
+        max_retries: int = 1,
+        max_parallel_steps: int = 4,
+        skip_on_dependency_failure: bool = False
     ):
         self.agent2 = agent2 or FLLM()
         self.memory_manager = memory_manager or MemoryManager()
         self.max_retries = max_retries
+        self.max_parallel_steps = max(1, max_parallel_steps)
+        # True이면 의존 단계가 실패한 단계를 실행하지 않고 오류로 처리 (기본: 실패 결과를 전달하고 실행)
+        self.skip_on_dependency_failure = skip_on_dependency_failure
         self.name = "Agent Runtime (Agent 1)"
         self.tools_registry: Dict[str, Callable] = {}
     
@@ -53,7 +60,8 @@ class AgentRuntime:
     def process_request(
         self,
         payload: Dict[str, Any],
-        session_id: Optional[str] = None
+        session_id: Optional[str] = None,
+        progress_callback: Optional[Callable[[Dict[str, Any]], None]] = None
     ) -> Dict[str, Any]:
         """
         사용자 요청 처리
@@ -62,10 +70,16 @@ class AgentRuntime:
         1. 인식 (Perception): 요청 분석
         2. 판단 (Judgment): 계획 수립
         3. 행동 (Action): 도구 실행
+        
+        Args:
+            payload: Custom UI가 생성한 JSON Payload
+            session_id: 세션 ID
+            progress_callback: 진행 이벤트 수신 콜백 (plan_created, step_started, step_finished)
         """
         # 세션 메모리 가져오기
         session_id = session_id or payload.get("session_id", "default")
-        memory = self.memory_manager.get_short_term_memory(session_id)
+        # 요청 처리 중 읽고 수정하므로 캐시가 아닌 최신 상태 사용
+        memory = self.memory_manager.get_short_term_memory(session_id, refresh=True)
         
         # 1. 인식 (Perception): 요청 분석
         user_intent = self._analyze_user_intent(payload)
@@ -82,15 +96,29 @@ class AgentRuntime:
             user_text=input_data.get("text"),
             image_path=input_data.get("image_path")
         )
+        self._emit_progress(progress_callback, {
+            "event": "plan_created",
+            "plan_id": execution_plan.plan_id,
+            "steps": [
+                {
+                    "step_id": step["step_id"],
+                    "tool": step["tool"],
+                    "action": step["action"],
+                    "dependencies": step.get("dependencies", [])
+                }
+                for step in execution_plan.steps
+            ]
+        })
         
         # 3. 행동 (Action): 실행 계획에 따라 도구 실행
-        execution_result = self._execute_plan(execution_plan, memory)
+        execution_result = self._execute_plan(execution_plan, memory, progress_callback)
         
         # 결과 검증 및 재시도 (자기 수정 루프)
         final_result = self._self_correction_loop(
             execution_plan,
             execution_result,
-            memory
+            memory,
+            progress_callback=progress_callback
         )
         
         # 메모리에 대화 기록 저장
@@ -176,72 +204,96 @@ class AgentRuntime:
     def _execute_plan(
         self,
         execution_plan: ExecutionPlan,
-        memory: ShortTermMemory
+        memory: ShortTermMemory,
+        progress_callback: Optional[Callable[[Dict[str, Any]], None]] = None
     ) -> Dict[str, Any]:
         """
-        실행 계획에 따라 도구 실행
+        실행 계획에 따라 도구 실행 (DAG 스케줄링)
         
-        순차적으로 각 단계를 실행하고 결과를 수집
+        각 단계의 dependencies를 기준으로 위상 정렬하여, 의존성이 모두
+        충족된 단계들을 스레드 풀에서 동시에 실행한다.
+        각 단계에는 선언된 의존 단계의 결과만 전달된다.
+        의존 단계가 실패해도 그 오류 결과를 전달하여 실행하며,
+        skip_on_dependency_failure가 True이면 실행하지 않고 건너뛴다.
         """
-        results = {}
-        execution_context = {}
-        
-        # 단계별 실행 (의존성 고려)
-        print(f"[AgentRuntime._execute_plan] 총 {len(execution_plan.steps)}개 단계 실행 시작")
-        for step_idx, step in enumerate(execution_plan.steps, 1):
-            step_id = step["step_id"]
-            tool_name = step["tool"]
-            action = step["action"]
-            parameters = step.get("parameters", {})
-            dependencies = step.get("dependencies", [])
-            print(f"[AgentRuntime._execute_plan] 단계 {step_idx}/{len(execution_plan.steps)}: {tool_name}.{action} (step_id={step_id})")
-            
-            # 의존성 확인
-            if dependencies:
-                # 의존성 결과를 파라미터에 포함
-                for dep_id in dependencies:
-                    if dep_id in results:
-                        # results[dep_id]는 {"status": "success", "result": {...}, "step_id": ...} 구조
-                        # 실제 결과는 "result" 키에 있음
-                        dep_result = results[dep_id]
-                        if isinstance(dep_result, dict) and "result" in dep_result:
-                            parameters["_dependency_result"] = dep_result["result"]
-                        else:
-                            parameters["_dependency_result"] = dep_result
-            
-            # 도구 실행
-            if tool_name in self.tools_registry:
-                try:
-                    print(f"[AgentRuntime._execute_plan] 도구 실행 중: {tool_name}.{action}")
-                    tool_func = self.tools_registry[tool_name]
-                    step_result = tool_func(action, parameters, execution_context)
-                    print(f"[AgentRuntime._execute_plan] 도구 실행 완료: {tool_name}.{action}")
-                    results[step_id] = {
-                        "status": "success",
-                        "result": step_result,
-                        "step_id": step_id
-                    }
-                    # 컨텍스트에 실제 결과 저장 (다음 단계에서 사용)
-                    execution_context[f"step_{step_id}"] = step_result
-                    execution_context[f"step_{step_id}_result"] = step_result
-                except Exception as e:
-                    print(f"[AgentRuntime._execute_plan] 도구 실행 오류: {tool_name}.{action} - {str(e)}")
-                    import traceback
-                    traceback.print_exc()
-                    results[step_id] = {
-                        "status": "error",
-                        "error": str(e),
-                        "step_id": step_id
-                    }
-            else:
-                results[step_id] = {
-                    "status": "error",
-                    "error": f"Tool '{tool_name}' not found",
-                    "step_id": step_id
-                }
+        steps = execution_plan.steps
+        steps_by_id = {step["step_id"]: step for step in steps}
+        results: Dict[Any, Dict[str, Any]] = {}
+        
+        print(f"[AgentRuntime._execute_plan] 총 {len(steps)}개 단계 실행 시작 (최대 동시 실행: {self.max_parallel_steps})")
+        
+        pending = {step["step_id"]: list(step.get("dependencies", [])) for step in steps}
+        running: Dict[Future, Any] = {}
+        
+        with ThreadPoolExecutor(max_workers=self.max_parallel_steps) as executor:
+            while pending or running:
+                # 실행 가능한 단계 선별 (건너뛰기 전파가 끝날 때까지 반복)
+                propagated = True
+                while propagated:
+                    propagated = False
+                    for step_id in list(pending.keys()):
+                        dependencies = pending[step_id]
+                        if not all(dep_id in results for dep_id in dependencies):
+                            continue
+                        del pending[step_id]
+                        failed_deps = [
+                            dep_id for dep_id in dependencies
+                            if results[dep_id].get("status") != "success"
+                        ]
+                        if failed_deps and self.skip_on_dependency_failure:
+                            results[step_id] = {
+                                "status": "error",
+                                "error": f"의존 단계 실패: {failed_deps}",
+                                "step_id": step_id
+                            }
+                            print(f"[AgentRuntime._execute_plan] 단계 건너뜀 (의존 단계 실패): step_id={step_id}, failed={failed_deps}")
+                            self._emit_progress(progress_callback, {
+                                "event": "step_skipped",
+                                "step_id": step_id,
+                                "error": results[step_id]["error"]
+                            })
+                            propagated = True
+                            continue
+                        # 성공한 의존 단계는 실제 결과, 실패한 의존 단계는 오류 결과 전체를 전달
+                        # (도구가 의존 단계 실패를 직접 보고 처리할 수 있도록 그대로 실행)
+                        dep_results = {
+                            dep_id: results[dep_id].get("result", results[dep_id])
+                            for dep_id in dependencies
+                        }
+                        step = steps_by_id[step_id]
+                        future = executor.submit(
+                            self._execute_step, step, dep_results, progress_callback,
+                            execution_plan.plan_id
+                        )
+                        running[future] = step_id
+                
+                if not running:
+                    # 남은 단계는 존재하지 않는 단계에 의존하거나 순환 의존성이 있음
+                    for step_id, dependencies in pending.items():
+                        results[step_id] = {
+                            "status": "error",
+                            "error": f"의존성을 해결할 수 없습니다: {dependencies}",
+                            "step_id": step_id
+                        }
+                        print(f"[AgentRuntime._execute_plan] 의존성 해결 불가: step_id={step_id}, dependencies={dependencies}")
+                        self._emit_progress(progress_callback, {
+                            "event": "step_skipped",
+                            "step_id": step_id,
+                            "error": results[step_id]["error"]
+                        })
+                    pending.clear()
+                    break
+                
+                done, _ = wait(list(running.keys()), return_when=FIRST_COMPLETED)
+                for future in done:
+                    step_id = running.pop(future)
+                    results[step_id] = future.result()
+        
+        # 완료 순서와 무관하게 계획 순서대로 결과 정렬
+        results = {step_id: results[step_id] for step_id in steps_by_id}
         
         # 최종 결과 반환
-        final_result_id = max([s["step_id"] for s in execution_plan.steps])
+        final_result_id = max([s["step_id"] for s in steps])
         final_result = results.get(final_result_id, {})
         
         return {
@@ -252,12 +304,123 @@ class AgentRuntime:
             "all_results": results
         }
     
+    def _execute_step(
+        self,
+        step: Dict[str, Any],
+        dep_results: Dict[Any, Any],
+        progress_callback: Optional[Callable[[Dict[str, Any]], None]] = None,
+        plan_id: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        단일 단계 실행
+        
+        Args:
+            step: 실행할 단계
+            dep_results: 선언된 의존 단계의 실제 결과 ({step_id: result})
+            progress_callback: 진행 이벤트 수신 콜백
+            plan_id: 실행 계획 ID (도구가 작업 공간을 구분하는 데 사용)
+            
+        Returns:
+            Dict: {"status": ..., "result" 또는 "error": ..., "step_id": ...}
+        """
+        step_id = step["step_id"]
+        tool_name = step["tool"]
+        action = step["action"]
+        started_at = time.perf_counter()
+        self._emit_progress(progress_callback, {
+            "event": "step_started",
+            "step_id": step_id,
+            "tool": tool_name,
+            "action": action
+        })
+        step_result = self._run_step_tool(step, dep_results, plan_id)
+        finished_event = {
+            "event": "step_finished",
+            "step_id": step_id,
+            "tool": tool_name,
+            "action": action,
+            "status": step_result["status"],
+            "elapsed": round(time.perf_counter() - started_at, 3)
+        }
+        if step_result["status"] == "success":
+            finished_event["result"] = step_result["result"]
+        else:
+            finished_event["error"] = step_result.get("error")
+        self._emit_progress(progress_callback, finished_event)
+        return step_result
+    
+    def _run_step_tool(
+        self,
+        step: Dict[str, Any],
+        dep_results: Dict[Any, Any],
+        plan_id: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """단계의 도구 호출 (예외는 error 결과로 변환)"""
+        step_id = step["step_id"]
+        tool_name = step["tool"]
+        action = step["action"]
+        # 재시도 시 계획이 오염되지 않도록 파라미터는 복사하여 사용
+        parameters = dict(step.get("parameters", {}))
+        
+        # 의존성 결과를 파라미터와 컨텍스트에 포함 (선언된 의존 단계만)
+        # plan_id는 같은 계획의 단계들이 하나의 작업 공간을 공유하도록 전달
+        execution_context: Dict[str, Any] = {"plan_id": plan_id} if plan_id else {}
+        if dep_results:
+            # 단일 의존성 도구와의 호환을 위해 마지막 의존 단계 결과를 _dependency_result로 전달
+            parameters["_dependency_result"] = list(dep_results.values())[-1]
+            parameters["_dependency_results"] = dict(dep_results)
+            for dep_id, dep_result in dep_results.items():
+                execution_context[f"step_{dep_id}"] = dep_result
+                execution_context[f"step_{dep_id}_result"] = dep_result
+        
+        if tool_name not in self.tools_registry:
+            return {
+                "status": "error",
+                "error": f"Tool '{tool_name}' not found",
+                "step_id": step_id
+            }
+        
+        try:
+            print(f"[AgentRuntime._execute_plan] 도구 실행 중: {tool_name}.{action} (step_id={step_id})")
+            tool_func = self.tools_registry[tool_name]
+            step_result = tool_func(action, parameters, execution_context)
+            print(f"[AgentRuntime._execute_plan] 도구 실행 완료: {tool_name}.{action} (step_id={step_id})")
+            return {
+                "status": "success",
+                "result": step_result,
+                "step_id": step_id
+            }
+        except Exception as e:
+            print(f"[AgentRuntime._execute_plan] 도구 실행 오류: {tool_name}.{action} - {str(e)}")
+            import traceback
+            traceback.print_exc()
+            return {
+                "status": "error",
+                "error": str(e),
+                "step_id": step_id
+            }
+    
+    def _emit_progress(
+        self,
+        progress_callback: Optional[Callable[[Dict[str, Any]], None]],
+        event: Dict[str, Any]
+    ):
+        """진행 이벤트 전달 (콜백 오류는 실행에 영향을 주지 않음)"""
+        if progress_callback is None:
+            return
+        event.setdefault("timestamp", datetime.now().isoformat())
+        try:
+            progress_callback(event)
+        except Exception as e:
+            print(f"[AgentRuntime] 진행 이벤트 전달 실패: {event.get('event')} - {str(e)}")
+    
     def _self_correction_loop(
         self,
         execution_plan: ExecutionPlan,
         execution_result: Dict[str, Any],
         memory: ShortTermMemory,
-        retry_count: int = 0
+        retry_count: int = 0,
+        progress_callback: Optional[Callable[[Dict[str, Any]], None]] = None
     ) -> Dict[str, Any]:
         """
         자기 수정 루프 (Self-Correction Loop)
@@ -279,12 +442,19 @@ class AgentRuntime:
         # 실패 시 재시도
         if retry_count < self.max_retries:
             # 계획 수정 (간단한 재시도)
-            retry_result = self._execute_plan(execution_plan, memory)
+            self._emit_progress(progress_callback, {
+                "event": "plan_retry",
+                "plan_id": execution_plan.plan_id,
+                "retry_count": retry_count + 1,
+                "failed_steps": evaluation["failed_steps"]
+            })
+            retry_result = self._execute_plan(execution_plan, memory, progress_callback)
             return self._self_correction_loop(
                 execution_plan,
                 retry_result,
                 memory,
-                retry_count + 1
+                retry_count + 1,
+                progress_callback=progress_callback
             )
         else:
             return {
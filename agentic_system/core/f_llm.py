@@ -14,6 +14,7 @@ from pydantic import BaseModel
 import json
 from datetime import datetime
 import sys
+import uuid
 from pathlib import Path
 import threading
 
@@ -131,7 +132,7 @@ class FLLM:
         
         # 실행 계획 생성
         execution_plan = ExecutionPlan(
-            plan_id=f"plan_{datetime.now().strftime('%Y%m%d%H%M%S%f')}",
+            plan_id=f"plan_{datetime.now().strftime('%Y%m%d%H%M%S%f')}_{uuid.uuid4().hex[:8]}",
             steps=steps,
             tools_required=tools_required,
             parameters=self._extract_parameters(enhanced_plan),
@@ -4,9 +4,22 @@ Memory Management Component
 PoC 단계에서는 단기 메모리(Session-based)만 사용
 """
 
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Callable, Iterator, Tuple
 from datetime import datetime, timedelta
-from collections import deque
+from collections import deque, defaultdict, OrderedDict
+from bisect import bisect_left, bisect_right
+from itertools import islice
+from concurrent.futures import Future
+import copy
+import os
+import sys
+import threading
+import time
+
+from .memory_backends import MemoryBackend, KIND_SESSION, KIND_USER, get_memory_backend
+
+# 세션당 보관하는 대화 기록 수 (오래된 기록부터 지워지며, 대화 기록 조회 API의 페이지네이션 범위도 이 값까지)
+SHORT_TERM_MAX_HISTORY = int(os.getenv("MEMORY_MAX_HISTORY", "100"))
 
 
 class Memory:
@@ -28,19 +41,130 @@ class Memory:
         self.storage.clear()
 
 
+class ConversationRecord:
+    """
+    대화 기록 1건
+
+    세션마다 많이 쌓이므로 __slots__로 인스턴스 dict를 없애고,
+    타임스탬프는 ISO 문자열 대신 epoch 초(float)로 보관한다.
+    API 응답(to_dict)의 timestamp는 기존과 같은 ISO 문자열이고, epoch 초는 ts로 함께 준다.
+    metadata가 비어 있으면 None으로 두어 빈 dict를 만들지 않는다.
+    seq는 세션 안에서 단조 증가하는 번호로, 페이지네이션 커서로 사용한다.
+    """
+
+    __slots__ = ("seq", "timestamp", "user_input", "agent_response", "metadata")
+
+    def __init__(
+        self,
+        seq: int,
+        timestamp: float,
+        user_input: str,
+        agent_response: str,
+        metadata: Optional[Dict[str, Any]] = None
+    ):
+        self.seq = seq
+        self.timestamp = timestamp
+        self.user_input = user_input
+        self.agent_response = agent_response
+        self.metadata = metadata or None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """API 응답용 dict"""
+        return {
+            "seq": self.seq,
+            "timestamp": datetime.fromtimestamp(self.timestamp).isoformat(),
+            "ts": self.timestamp,
+            "user_input": self.user_input,
+            "agent_response": self.agent_response,
+            "metadata": self.metadata or {}
+        }
+
+    def to_row(self) -> List[Any]:
+        """백엔드 저장용 압축 형식 (키 이름 없이 값만)"""
+        return [self.seq, self.timestamp, self.user_input, self.agent_response, self.metadata]
+
+    @classmethod
+    def from_row(cls, row: Any, seq: int = 0) -> "ConversationRecord":
+        """
+        저장된 값으로 복원
+
+        압축 형식(list)과 이전 형식(ISO 타임스탬프 dict)을 모두 읽는다.
+        이전 형식에는 seq가 없으므로 인자로 받은 seq를 사용한다.
+        """
+        if isinstance(row, dict):
+            return cls(
+                seq=row.get("seq", seq),
+                timestamp=_to_epoch(row.get("timestamp")),
+                user_input=row.get("user_input", ""),
+                agent_response=row.get("agent_response", ""),
+                metadata=row.get("metadata")
+            )
+        return cls(*row)
+
+
 class ShortTermMemory(Memory):
     """
     단기 메모리 (Session-based)
     
     PoC 단계에서 사용하는 메모리로, 현재 세션의 컨텍스트만 유지
+    대화 기록은 최근 max_size개만 보관한다.
     """
     
-    def __init__(self, session_id: str, max_size: int = 10):
+    def __init__(self, session_id: str, max_size: Optional[int] = None):
+        """
+        Args:
+            session_id: 세션 ID
+            max_size: 보관할 대화 기록 수 (None이면 MEMORY_MAX_HISTORY, 기본 100)
+        """
         super().__init__()
         self.session_id = session_id
-        self.max_size = max_size
-        self.conversation_history: deque = deque(maxlen=max_size)
+        self.max_size = max_size or SHORT_TERM_MAX_HISTORY
+        self.conversation_history: deque = deque(maxlen=self.max_size)
         self.context: Dict[str, Any] = {}
+        # 다음 대화 기록 번호 (기록은 seq 순서로 연속 저장됨)
+        self._next_seq = 1
+        # 변경 시 변경 기록(op)과 함께 호출 (영구 백엔드 기록용, MemoryManager가 설정)
+        self.on_change: Optional[Callable[["ShortTermMemory", tuple], None]] = None
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """백엔드 저장용 직렬화"""
+        return {
+            "conversation_history": [record.to_row() for record in self.conversation_history],
+            "next_seq": self._next_seq,
+            "context": dict(self.context)
+        }
+    
+    @classmethod
+    def from_dict(cls, session_id: str, data: Dict[str, Any], max_size: Optional[int] = None) -> "ShortTermMemory":
+        """백엔드에서 읽은 데이터로 복원"""
+        memory = cls(session_id, max_size=max_size)
+        for row in data.get("conversation_history", []):
+            memory.conversation_history.append(ConversationRecord.from_row(row, seq=memory._next_seq))
+            memory._next_seq = memory.conversation_history[-1].seq + 1
+        memory._next_seq = max(memory._next_seq, data.get("next_seq", 1))
+        memory.context.update(data.get("context", {}))
+        return memory
+    
+    def _changed(self, op: tuple):
+        if self.on_change is not None:
+            self.on_change(self, op)
+    
+    def apply_op(self, op: tuple):
+        """
+        변경 기록 재적용 (on_change는 호출하지 않음)
+        
+        백엔드는 전체 상태 대신 변경 기록을 모아 두었다가, 기록 시점의 최신 저장본에
+        다시 적용하므로 다른 워커가 먼저 기록한 대화가 덮어써지지 않는다.
+        """
+        name, *args = op
+        if name == "add_conversation":
+            self._add_record(*args)
+        elif name == "update_context":
+            self.context[args[0]] = args[1]
+        elif name == "clear_context":
+            self.context.clear()
+        else:
+            raise ValueError(f"알 수 없는 단기 메모리 변경: {name}")
     
     def add_conversation(
         self, 
@@ -49,21 +173,61 @@ class ShortTermMemory(Memory):
         metadata: Optional[Dict] = None
     ):
         """대화 기록 추가"""
-        conversation = {
-            "timestamp": datetime.now().isoformat(),
-            "user_input": user_input,
-            "agent_response": agent_response,
-            "metadata": metadata or {}
-        }
-        self.conversation_history.append(conversation)
+        timestamp = time.time()
+        self._add_record(user_input, agent_response, metadata, timestamp)
+        self._changed(("add_conversation", user_input, agent_response, metadata, timestamp))
+    
+    def _add_record(
+        self,
+        user_input: str,
+        agent_response: str,
+        metadata: Optional[Dict],
+        timestamp: float
+    ):
+        self.conversation_history.append(ConversationRecord(
+            seq=self._next_seq,
+            timestamp=timestamp,
+            user_input=user_input,
+            agent_response=agent_response,
+            metadata=metadata
+        ))
+        self._next_seq += 1
     
     def get_conversation_history(self) -> List[Dict]:
         """대화 기록 조회"""
-        return list(self.conversation_history)
+        return [record.to_dict() for record in self.conversation_history]
+    
+    def get_conversation_page(
+        self,
+        before: Optional[int] = None,
+        limit: int = 20
+    ) -> Tuple[List[ConversationRecord], Optional[int]]:
+        """
+        대화 기록 페이지 조회 (최신 기록부터 과거 방향)
+        
+        기록은 seq가 연속이므로 커서 위치를 계산으로 찾고 필요한 만큼만 잘라낸다.
+        
+        Args:
+            before: 이 seq보다 이전 기록만 조회 (None이면 가장 최근부터)
+            limit: 최대 개수
+        
+        Returns:
+            (시간 순서로 정렬된 기록 목록, 다음 페이지 커서 또는 None)
+        """
+        history = self.conversation_history
+        if not history or limit <= 0:
+            return [], None
+        first_seq = history[0].seq
+        end = len(history) if before is None else max(0, min(len(history), before - first_seq))
+        start = max(0, end - limit)
+        records = list(islice(history, start, end))
+        next_cursor = records[0].seq if start > 0 else None
+        return records, next_cursor
     
     def update_context(self, key: str, value: Any):
         """컨пас 업데이트"""
         self.context[key] = value
+        self._changed(("update_context", key, value))
     
     def get_context(self, key: Optional[str] = None) -> Any:
         """컨텍스트 조회"""
@@ -74,62 +238,562 @@ class ShortTermMemory(Memory):
     def clear_context(self):
         """컨텍스트 초기화"""
         self.context.clear()
+        self._changed(("clear_context",))
 
 
 class LongTermMemory(Memory):
     """
     장기 메모리
     
-    Pilot 단계에서 구현 예정
-    사용자의 과거 대화 및 선호도 기억
+    사용자의 과거 이벤트 및 선호도 기억
+    
+    - history는 시간 순서로 쌓이므로 시간 범위는 이분 탐색으로 찾는다.
+    - 이벤트 종류 / 의류 속성별 보조 인덱스는 이벤트 번호(seq) 목록이며,
+      조건이 여러 개면 가장 짧은 목록만 순회하면서 나머지 조건을 확인한다.
+    - aggregates는 종류별 누적 통계(개수, 기간, 속성 값 빈도)로, 압축(compact)으로
+      오래된 이벤트를 지워도 유지되므로 선호도 조회는 이벤트 수와 무관하다.
     """
     
-    def __init__(self, user_id: str):
+    # 인덱싱할 의류 속성
+    INDEXED_ATTRIBUTES = ("garment_type", "category", "style", "color", "material", "size")
+    DEFAULT_EVENT_TYPE = "event"
+    
+    def __init__(
+        self,
+        user_id: str,
+        max_events: Optional[int] = None,
+        retention_seconds: Optional[float] = None
+    ):
+        """
+        Args:
+            user_id: 사용자 ID
+            max_events: 보관할 최대 이벤트 수, 넘으면 절반으로 압축
+                (None이면 MEMORY_LONG_TERM_MAX_EVENTS, 기본 1000)
+            retention_seconds: 이벤트 원본 보관 기간, 지나면 통계로만 남김
+                (None이면 MEMORY_LONG_TERM_RETENTION_DAYS, 기본 90일 / 0이면 기간 제한 없음)
+        """
         super().__init__()
         self.user_id = user_id
+        if max_events is None:
+            max_events = int(os.getenv("MEMORY_LONG_TERM_MAX_EVENTS", "1000"))
+        if retention_seconds is None:
+            retention_seconds = float(os.getenv("MEMORY_LONG_TERM_RETENTION_DAYS", "90")) * 86400
+        self.max_events = max(2, max_events)
+        self.retention_seconds = retention_seconds or None
         self.preferences: Dict[str, Any] = {}
         self.history: List[Dict] = []
+        # 이벤트 종류 -> 누적 통계
+        self.aggregates: Dict[str, Dict[str, Any]] = {}
+        # history[i]의 seq는 _first_seq + i
+        self._first_seq = 0
+        self._timestamps: List[float] = []
+        self._by_type: Dict[str, List[int]] = defaultdict(list)
+        self._by_attribute: Dict[Tuple[str, str], List[int]] = defaultdict(list)
+        # 변경 시 변경 기록(op)과 함께 호출 (영구 백엔드 기록용, MemoryManager가 설정)
+        self.on_change: Optional[Callable[["LongTermMemory", tuple], None]] = None
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """백엔드 저장용 직렬화"""
+        return {
+            "preferences": dict(self.preferences),
+            "history": list(self.history),
+            "aggregates": copy.deepcopy(self.aggregates)
+        }
+    
+    @classmethod
+    def from_dict(cls, user_id: str, data: Dict[str, Any]) -> "LongTermMemory":
+        """백엔드에서 읽은 데이터로 복원 (ISO 타임스탬프의 이전 형식 포함)"""
+        memory = cls(user_id)
+        memory.preferences.update(data.get("preferences", {}))
+        aggregates = data.get("aggregates")
+        for event in data.get("history", []):
+            event = dict(event)
+            event["timestamp"] = _to_epoch(event.get("timestamp"))
+            memory._append(event, update_aggregates=aggregates is None)
+        if aggregates is not None:
+            memory.aggregates = copy.deepcopy(aggregates)
+        return memory
+    
+    def _changed(self, op: tuple):
+        if self.on_change is not None:
+            self.on_change(self, op)
+    
+    def apply_op(self, op: tuple):
+        """변경 기록 재적용 (on_change는 호출하지 않음, ShortTermMemory.apply_op 참고)"""
+        name, *args = op
+        if name == "save_preference":
+            self.preferences[args[0]] = args[1]
+        elif name == "add_to_history":
+            self._add_event(args[0])
+        else:
+            raise ValueError(f"알 수 없는 장기 메모리 변경: {name}")
     
     def save_preference(self, key: str, value: Any):
         """선호도 저장"""
         self.preferences[key] = value
+        self._changed(("save_preference", key, value))
     
     def get_preference(self, key: str) -> Optional[Any]:
         """선호도 조회"""
         return self.preferences.get(key)
     
     def add_to_history(self, event: Dict):
-        """히스토리에 이벤트 추가"""
-        self.history.append({
-            "timestamp": datetime.now().isoformat(),
-            **event
-        })
+        """
+        히스토리에 이벤트 추가
+        
+        event의 "event_type"(없으면 "event")과 INDEXED_ATTRIBUTES 값
+        (최상위 또는 "attributes" 안)이 인덱싱된다. timestamp는 추가 시각(epoch 초)이다.
+        """
+        event = {**event, "timestamp": time.time()}
+        self._add_event(event)
+        self._changed(("add_to_history", event))
+    
+    def _add_event(self, event: Dict):
+        self._append(event)
+        if len(self.history) > self.max_events or self._oldest_expired():
+            self.compact()
+    
+    def query_events(
+        self,
+        event_type: Optional[str] = None,
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+        attributes: Optional[Dict[str, Any]] = None,
+        limit: Optional[int] = None
+    ) -> List[Dict]:
+        """
+        이벤트 조회 (최신 순)
+        
+        Args:
+            event_type: 이벤트 종류
+            start: 시작 시각 (epoch 초, 포함)
+            end: 종료 시각 (epoch 초, 포함)
+            attributes: 의류 속성 조건 (예: {"color": "검정색"})
+            limit: 최대 개수
+        """
+        lo = bisect_left(self._timestamps, start) if start is not None else 0
+        hi = bisect_right(self._timestamps, end) if end is not None else len(self._timestamps)
+        if lo >= hi:
+            return []
+        lo_seq, hi_seq = self._first_seq + lo, self._first_seq + hi
+        
+        candidates: List[List[int]] = []
+        if event_type is not None:
+            candidates.append(self._by_type.get(event_type, []))
+        for name, value in (attributes or {}).items():
+            candidates.append(self._by_attribute.get((name, str(value)), []))
+        
+        if candidates:
+            seqs = min(candidates, key=len)
+            seqs = seqs[bisect_left(seqs, lo_seq):bisect_left(seqs, hi_seq)]
+        else:
+            seqs = range(lo_seq, hi_seq)
+        
+        results = []
+        for seq in reversed(seqs):
+            event = self.history[seq - self._first_seq]
+            if event_type is not None and _event_type(event) != event_type:
+                continue
+            if attributes and any(_event_attributes(event).get(name) != str(value) for name, value in attributes.items()):
+                continue
+            results.append(event)
+            if limit is not None and len(results) >= limit:
+                break
+        return results
+    
+    def get_top_attribute_values(
+        self,
+        attribute: str,
+        event_type: Optional[str] = None,
+        top_k: int = 5
+    ) -> List[Tuple[str, int]]:
+        """
+        속성 값 빈도 상위 목록 (압축된 이벤트 포함, 개인화용)
+        
+        Args:
+            attribute: 의류 속성 (예: "style")
+            event_type: 이벤트 종류 (None이면 전체)
+            top_k: 최대 개수
+        """
+        counts: Dict[str, int] = defaultdict(int)
+        types = [event_type] if event_type is not None else list(self.aggregates)
+        for name in types:
+            for value, count in self.aggregates.get(name, {}).get("attributes", {}).get(attribute, {}).items():
+                counts[value] += count
+        return sorted(counts.items(), key=lambda item: (-item[1], item[0]))[:top_k]
     
-    # Pilot 단계에서 구현 예정
-    pass
+    def compact(self, before: Optional[float] = None, keep_recent: Optional[int] = None) -> int:
+        """
+        오래된 이벤트를 지우고 통계(aggregates)로만 남김
+        
+        Args:
+            before: 이 시각 이전 이벤트 제거 (None이면 보관 기간 기준)
+            keep_recent: 최근 이벤트를 이 개수만 유지 (None이면 max_events 초과 시 절반 유지)
+        
+        Returns:
+            제거한 이벤트 수
+        """
+        if before is None and self.retention_seconds:
+            before = time.time() - self.retention_seconds
+        if keep_recent is None:
+            keep_recent = self.max_events // 2 if len(self.history) > self.max_events else len(self.history)
+        cut = max(
+            bisect_left(self._timestamps, before) if before is not None else 0,
+            len(self.history) - keep_recent
+        )
+        if cut <= 0:
+            return 0
+        
+        self._first_seq += cut
+        del self.history[:cut]
+        del self._timestamps[:cut]
+        for index in (self._by_type, self._by_attribute):
+            for key in list(index):
+                seqs = index[key]
+                del seqs[:bisect_left(seqs, self._first_seq)]
+                if not seqs:
+                    del index[key]
+        return cut
+    
+    def _oldest_expired(self) -> bool:
+        return bool(self.retention_seconds) and bool(self._timestamps) and \
+            self._timestamps[0] < time.time() - self.retention_seconds
+    
+    def _append(self, event: Dict, update_aggregates: bool = True):
+        """이벤트 추가 및 인덱스 / 통계 갱신"""
+        seq = self._first_seq + len(self.history)
+        timestamp = event["timestamp"]
+        event_type = _event_type(event)
+        attributes = _event_attributes(event)
+        
+        self.history.append(event)
+        self._timestamps.append(timestamp)
+        self._by_type[event_type].append(seq)
+        for name, value in attributes.items():
+            self._by_attribute[(name, value)].append(seq)
+        
+        if update_aggregates:
+            aggregate = self.aggregates.setdefault(event_type, {
+                "count": 0,
+                "first_timestamp": timestamp,
+                "last_timestamp": timestamp,
+                "attributes": {}
+            })
+            aggregate["count"] += 1
+            aggregate["last_timestamp"] = timestamp
+            for name, value in attributes.items():
+                values = aggregate["attributes"].setdefault(name, {})
+                values[value] = values.get(value, 0) + 1
+
+
+def _to_epoch(value: Any) -> float:
+    """타임스탬프(epoch 초 또는 ISO 문자열)를 epoch 초로 변환"""
+    if isinstance(value, str):
+        try:
+            return datetime.fromisoformat(value).timestamp()
+        except ValueError:
+            return 0.0
+    return float(value or 0.0)
+
+
+def _event_type(event: Dict) -> str:
+    return str(event.get("event_type") or LongTermMemory.DEFAULT_EVENT_TYPE)
+
+
+def _event_attributes(event: Dict) -> Dict[str, str]:
+    """이벤트의 인덱싱 대상 의류 속성 (최상위 값 우선)"""
+    nested = event.get("attributes")
+    nested = nested if isinstance(nested, dict) else {}
+    attributes = {}
+    for name in LongTermMemory.INDEXED_ATTRIBUTES:
+        value = event.get(name, nested.get(name))
+        if value is not None and not isinstance(value, (dict, list)):
+            attributes[name] = str(value)
+    return attributes
+
+
+class SessionStore:
+    """
+    세션 저장소 (TTL + LRU)
+    
+    - 마지막 접근 후 ttl_seconds가 지난 세션은 만료
+    - 세션 수가 max_sessions를 넘으면 가장 오래 접근하지 않은 세션부터 제거
+    - 백그라운드 스레드가 sweep_interval마다 만료 세션 정리
+    
+    항목은 마지막 접근 순서로 유지되므로 정리는 앞쪽의 만료 항목만 확인한다.
+    refresh_on_access=False이면 TTL을 생성 시점부터 계산한다 (공유 백엔드 앞의 읽기 캐시용).
+    
+    factory(백엔드 조회 등)는 잠금 밖에서 호출한다. 같은 세션을 동시에 요청하면
+    먼저 온 요청만 생성하고 나머지는 그 결과(Future)를 기다리며, 다른 세션의 조회는 막지 않는다.
+    """
+    
+    def __init__(
+        self,
+        factory: Callable[[str], Any],
+        ttl_seconds: float = 3600,
+        max_sessions: int = 10000,
+        sweep_interval: float = 60,
+        refresh_on_access: bool = True
+    ):
+        """
+        Args:
+            factory: 세션 ID로 새 세션 값을 만드는 함수
+            ttl_seconds: 마지막 접근 후 유지 시간 (초)
+            max_sessions: 최대 세션 수
+            sweep_interval: 백그라운드 정리 간격 (초)
+            refresh_on_access: 접근할 때마다 TTL을 연장할지 여부
+        """
+        self.factory = factory
+        self.refresh_on_access = refresh_on_access
+        self.ttl_seconds = ttl_seconds
+        self.max_sessions = max(1, max_sessions)
+        self.sweep_interval = sweep_interval
+        # session_id -> (값, 마지막 접근 시각)
+        self._items: "OrderedDict[str, tuple]" = OrderedDict()
+        # session_id -> 생성 중인 값의 Future
+        self._loading: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self._sweeper: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+    
+    def get_or_create(self, session_id: str) -> Any:
+        """세션 조회 (없거나 만료되었으면 생성) 후 접근 시각 갱신"""
+        self._ensure_sweeper()
+        now = time.monotonic()
+        with self._lock:
+            entry = self._items.get(session_id)
+            if entry is not None and now - entry[1] <= self.ttl_seconds:
+                self._items[session_id] = (entry[0], now if self.refresh_on_access else entry[1])
+                self._items.move_to_end(session_id)
+                return entry[0]
+            future = self._loading.get(session_id)
+            owner = future is None
+            if owner:
+                future = self._loading[session_id] = Future()
+        
+        if not owner:
+            return future.result()
+        
+        try:
+            value = self.factory(session_id)
+        except BaseException as e:
+            with self._lock:
+                if self._loading.get(session_id) is future:
+                    del self._loading[session_id]
+            future.set_exception(e)
+            raise
+        
+        with self._lock:
+            # 생성 중 pop()으로 취소되었으면 저장하지 않음
+            if self._loading.get(session_id) is future:
+                del self._loading[session_id]
+                self._items[session_id] = (value, time.monotonic())
+                self._items.move_to_end(session_id)
+                while len(self._items) > self.max_sessions:
+                    self._items.popitem(last=False)
+        future.set_result(value)
+        return value
+    
+    def get(self, session_id: str) -> Optional[Any]:
+        """만료되지 않은 세션 조회 (없으면 None, 생성하지 않음)"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._items.get(session_id)
+            if entry is None:
+                return None
+            if now - entry[1] > self.ttl_seconds:
+                del self._items[session_id]
+                return None
+            self._items[session_id] = (entry[0], now if self.refresh_on_access else entry[1])
+            self._items.move_to_end(session_id)
+            return entry[0]
+    
+    def pop(self, session_id: str) -> Optional[Any]:
+        """세션 삭제 (삭제한 값 반환, 생성 중이면 결과를 저장하지 않음)"""
+        with self._lock:
+            self._loading.pop(session_id, None)
+            entry = self._items.pop(session_id, None)
+        return entry[0] if entry is not None else None
+    
+    def sweep(self) -> int:
+        """
+        만료 세션 정리
+        
+        Returns:
+            int: 삭제한 세션 수
+        """
+        cutoff = time.monotonic() - self.ttl_seconds
+        removed = 0
+        with self._lock:
+            if self.refresh_on_access:
+                while self._items:
+                    session_id, (_, last_access) = next(iter(self._items.items()))
+                    if last_access >= cutoff:
+                        break
+                    del self._items[session_id]
+                    removed += 1
+            else:
+                # 생성 시각 기준이면 접근 순서와 만료 순서가 다르므로 전체 확인
+                expired = [session_id for session_id, (_, created) in self._items.items() if created < cutoff]
+                for session_id in expired:
+                    del self._items[session_id]
+                removed = len(expired)
+        if removed:
+            print(f"[SessionStore] 만료 세션 {removed}개 정리 (남은 세션: {len(self)})")
+        return removed
+    
+    def stop(self):
+        """백그라운드 정리 스레드 종료"""
+        self._stop.set()
+    
+    def _ensure_sweeper(self):
+        """처음 사용할 때 백그라운드 정리 스레드 시작"""
+        if self._sweeper is not None or self.sweep_interval <= 0:
+            return
+        with self._lock:
+            if self._sweeper is not None:
+                return
+            self._sweeper = threading.Thread(target=self._sweep_loop, name="session-sweeper", daemon=True)
+            self._sweeper.start()
+    
+    def _sweep_loop(self):
+        while not self._stop.wait(self.sweep_interval):
+            try:
+                self.sweep()
+            except Exception as e:
+                print(f"[SessionStore] 세션 정리 실패: {str(e)}")
+    
+    def __contains__(self, session_id: str) -> bool:
+        return self.get(session_id) is not None
+    
+    def __len__(self) -> int:
+        return len(self._items)
+    
+    def __iter__(self) -> Iterator[str]:
+        with self._lock:
+            return iter(list(self._items.keys()))
 
 
 class MemoryManager:
     """메모리 관리자"""
     
-    def __init__(self):
-        self.short_term_memories: Dict[str, ShortTermMemory] = {}
-        self.long_term_memories: Dict[str, LongTermMemory] = {}
+    def __init__(
+        self,
+        session_ttl_seconds: Optional[float] = None,
+        max_sessions: Optional[int] = None,
+        backend: Optional[MemoryBackend] = None
+    ):
+        """
+        Args:
+            session_ttl_seconds: 단기 메모리 유지 시간 (None이면 MEMORY_SESSION_TTL_SECONDS, 기본 1시간)
+            max_sessions: 최대 세션 수 (None이면 MEMORY_MAX_SESSIONS, 기본 10000)
+            backend: 영구 / 공유 저장소 (None이면 MEMORY_BACKEND 환경 변수로 결정,
+                설정이 없으면 프로세스 메모리만 사용)
+        """
+        if session_ttl_seconds is None:
+            session_ttl_seconds = float(os.getenv("MEMORY_SESSION_TTL_SECONDS", "3600"))
+        if max_sessions is None:
+            max_sessions = int(os.getenv("MEMORY_MAX_SESSIONS", "10000"))
+        self.backend = backend or get_memory_backend(session_ttl_seconds=session_ttl_seconds)
+        
+        if self.backend is None:
+            self.short_term_memories = SessionStore(
+                ShortTermMemory,
+                ttl_seconds=session_ttl_seconds,
+                max_sessions=max_sessions
+            )
+            # 장기 메모리는 저장소가 따로 없으므로 만료 / 제거하지 않음
+            self.long_term_memories = SessionStore(
+                LongTermMemory,
+                ttl_seconds=float("inf"),
+                max_sessions=sys.maxsize,
+                sweep_interval=0
+            )
+        else:
+            # 백엔드가 원본이고 프로세스 안의 저장소는 읽기 캐시
+            # (다른 워커가 기록한 내용을 보도록 캐시 TTL은 짧게, 생성 시점 기준)
+            # 변경은 변경 기록(op)으로 백엔드에 보내고, 백엔드가 최신 저장본에 다시 적용한 뒤
+            # 기록이 끝난 항목은 캐시에서 지워 다음 조회 때 병합된 상태를 읽는다.
+            self.backend.attach(self._apply_ops, on_flushed=self._invalidate)
+            cache_ttl = float(os.getenv("MEMORY_CACHE_TTL_SECONDS", "5"))
+            self.short_term_memories = SessionStore(
+                self._load_short_term_memory,
+                ttl_seconds=cache_ttl,
+                max_sessions=max_sessions,
+                refresh_on_access=False
+            )
+            self.long_term_memories = SessionStore(
+                self._load_long_term_memory,
+                ttl_seconds=cache_ttl,
+                max_sessions=max_sessions,
+                refresh_on_access=False
+            )
+    
+    def _load_short_term_memory(self, session_id: str) -> ShortTermMemory:
+        """백엔드에서 단기 메모리 읽기 (없으면 새로 생성)"""
+        data = self.backend.load(KIND_SESSION, session_id)
+        memory = self._restore(KIND_SESSION, session_id, data)
+        memory.on_change = lambda changed, op: self.backend.update(KIND_SESSION, changed.session_id, op)
+        return memory
+    
+    def _load_long_term_memory(self, user_id: str) -> LongTermMemory:
+        """백엔드에서 장기 메모리 읽기 (없으면 새로 생성)"""
+        data = self.backend.load(KIND_USER, user_id)
+        memory = self._restore(KIND_USER, user_id, data)
+        memory.on_change = lambda changed, op: self.backend.update(KIND_USER, changed.user_id, op)
+        return memory
     
-    def get_short_term_memory(self, session_id: str) -> ShortTermMemory:
-        """단기 메모리 조회 또는 생성"""
-        if session_id not in self.short_term_memories:
-            self.short_term_memories[session_id] = ShortTermMemory(session_id)
-        return self.short_term_memories[session_id]
+    @staticmethod
+    def _restore(kind: str, key: str, data: Optional[Dict[str, Any]]):
+        """저장본으로 메모리 객체 복원 (없으면 새로 생성)"""
+        if kind == KIND_SESSION:
+            return ShortTermMemory.from_dict(key, data) if data else ShortTermMemory(key)
+        return LongTermMemory.from_dict(key, data) if data else LongTermMemory(key)
     
-    def get_long_term_memory(self, user_id: str) -> LongTermMemory:
-        """장기 메모리 조회 또는 생성"""
-        if user_id not in self.long_term_memories:
-            self.long_term_memories[user_id] = LongTermMemory(user_id)
-        return self.long_term_memories[user_id]
+    def _apply_ops(self, kind: str, key: str, data: Optional[Dict[str, Any]], ops: List[tuple]) -> Dict[str, Any]:
+        """백엔드 기록 시 최신 저장본(data)에 변경 기록을 순서대로 다시 적용"""
+        memory = self._restore(kind, key, data)
+        for op in ops:
+            memory.apply_op(op)
+        return memory.to_dict()
+    
+    def _invalidate(self, kind: str, key: str):
+        """백엔드 기록이 끝난 항목의 캐시 제거"""
+        store = self.short_term_memories if kind == KIND_SESSION else self.long_term_memories
+        store.pop(key)
+    
+    def get_short_term_memory(self, session_id: str, refresh: bool = False) -> ShortTermMemory:
+        """
+        단기 메모리 조회 또는 생성 (만료되었으면 새로 생성)
+        
+        Args:
+            session_id: 세션 ID
+            refresh: True이면 캐시 대신 백엔드의 최신 상태를 읽음 (요청 처리처럼 읽고 수정하는 경우)
+        """
+        if refresh and self.backend is not None:
+            self.short_term_memories.pop(session_id)
+        return self.short_term_memories.get_or_create(session_id)
+    
+    def get_long_term_memory(self, user_id: str, refresh: bool = False) -> LongTermMemory:
+        """
+        장기 메모리 조회 또는 생성
+        
+        Args:
+            user_id: 사용자 ID
+            refresh: True이면 캐시 대신 백엔드의 최신 상태를 읽음
+        """
+        if refresh and self.backend is not None:
+            self.long_term_memories.pop(user_id)
+        return self.long_term_memories.get_or_create(user_id)
     
     def clear_session(self, session_id: str):
         """세션 메모리 삭제"""
-        if session_id in self.short_term_memories:
-            del self.short_term_memories[session_id]
+        self.short_term_memories.pop(session_id)
+        if self.backend is not None:
+            self.backend.delete(KIND_SESSION, session_id)
+    
+    def close(self):
+        """백엔드에 남은 쓰기 기록"""
+        if self.backend is not None:
+            self.backend.close()
 
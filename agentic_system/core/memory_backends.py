@@ -0,0 +1,417 @@
+"""
+Memory Backends
+메모리 영구 저장소 (여러 워커 / 노드가 공유)
+
+MemoryManager는 프로세스 안의 SessionStore를 읽기 캐시로 사용하고,
+변경은 전체 상태가 아니라 변경 기록(op)으로 백엔드에 모아서(write-behind) 보낸다.
+백엔드는 기록 시점에 최신 저장본을 읽어 변경 기록을 다시 적용(reducer)한 뒤
+비교 후 교체(compare-and-swap)로 기록하므로, 오래된 캐시를 가진 워커가
+다른 워커의 대화 기록을 덮어쓰지 않는다.
+
+- SQLiteMemoryBackend: 내장 SQLite (WAL 모드, 같은 호스트의 여러 워커가 공유), version 컬럼으로 CAS
+- RedisMemoryBackend: Redis 프로토콜 (Redis, KeyDB, Dragonfly 등 / 테스트 시 fakeredis 클라이언트 주입 가능), WATCH/MULTI로 CAS
+
+쓰기는 flush_interval마다 또는 batch_size개가 모이면 한 번의 트랜잭션으로 기록하며,
+아직 기록되지 않은 변경도 같은 프로세스의 읽기에는 바로 반영된다.
+"""
+
+from typing import Dict, List, Optional, Any, Tuple, Callable
+from pathlib import Path
+import json
+import os
+import sqlite3
+import threading
+import time
+
+try:
+    import redis
+    from redis.exceptions import WatchError
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
+    class WatchError(Exception):
+        """WATCH 충돌 (redis 미설치 시 주입한 호환 클라이언트가 사용)"""
+
+# 저장 항목 종류
+KIND_SESSION = "session"
+KIND_USER = "user"
+
+# 항목 삭제 변경 기록 (이후 변경은 빈 상태에서 다시 적용)
+DELETE_OP = ("__delete__",)
+
+# (kind, key, 저장본 또는 None, 변경 기록 목록) -> 새 저장본
+Reducer = Callable[[str, str, Optional[Dict[str, Any]], List[tuple]], Optional[Dict[str, Any]]]
+
+
+class MemoryConflictError(Exception):
+    """다른 워커가 먼저 기록해서 비교 후 교체(CAS)가 실패함"""
+
+
+class MemoryBackend:
+    """
+    메모리 백엔드 기본 클래스 (write-behind 변경 기록 버퍼 포함)
+    
+    하위 클래스는 _read / _write_batch만 구현한다.
+    _write_batch는 트랜잭션 안에서 각 항목의 최신 저장본을 읽고 _reduce로 변경 기록을 적용해 기록하며,
+    동시 기록을 감지하면 MemoryConflictError를 발생시킨다 (flush가 다시 시도).
+    """
+    
+    # CAS 충돌 시 재시도 횟수
+    MAX_CONFLICT_RETRIES = 5
+    
+    def __init__(
+        self,
+        flush_interval: float = 0.5,
+        batch_size: int = 100,
+        session_ttl_seconds: Optional[float] = None
+    ):
+        """
+        Args:
+            flush_interval: 모아 둔 쓰기를 기록하는 최대 지연 (초)
+            batch_size: 변경 기록이 이 개수만큼 모이면 즉시 기록
+            session_ttl_seconds: 세션 보존 시간 (None이면 만료 없음)
+        """
+        self.flush_interval = flush_interval
+        self.batch_size = max(1, batch_size)
+        self.session_ttl_seconds = session_ttl_seconds
+        self.reducer: Optional[Reducer] = None
+        self.on_flushed: Optional[Callable[[str, str], None]] = None
+        # (kind, key) -> 변경 기록 목록 (순서 유지)
+        self._pending: Dict[Tuple[str, str], List[tuple]] = {}
+        self._pending_count = 0
+        # 기록 중인 항목
+        self._inflight: set = set()
+        self._pending_lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._closed = threading.Event()
+        self._flusher = threading.Thread(
+            target=self._flush_loop,
+            name=f"{type(self).__name__}-flusher",
+            daemon=True
+        )
+        self._flusher.start()
+    
+    def attach(self, reducer: Reducer, on_flushed: Optional[Callable[[str, str], None]] = None):
+        """
+        변경 기록 적용 함수 연결 (MemoryManager가 설정)
+        
+        Args:
+            reducer: 저장본에 변경 기록을 적용해 새 저장본을 만드는 함수
+            on_flushed: 항목 기록이 끝난 뒤 (kind, key)로 호출 (캐시 무효화용)
+        """
+        self.reducer = reducer
+        self.on_flushed = on_flushed
+    
+    def load(self, kind: str, key: str) -> Optional[Dict[str, Any]]:
+        """저장된 데이터 조회 (기록 대기 중인 변경 반영)"""
+        item_key = (kind, key)
+        with self._pending_lock:
+            busy = item_key in self._pending or item_key in self._inflight
+        if not busy:
+            return self._read(kind, key)
+        # 기록 중에 읽으면 저장본과 대기 변경이 어긋나므로 기록이 끝난 뒤 함께 읽음
+        with self._flush_lock:
+            data = self._read(kind, key)
+            with self._pending_lock:
+                ops = list(self._pending.get(item_key, ()))
+        return self._reduce(kind, key, data, ops) if ops else data
+    
+    def update(self, kind: str, key: str, op: tuple):
+        """변경 기록 추가 (버퍼에 넣고 나중에 일괄 기록)"""
+        self._enqueue(kind, key, op)
+    
+    def delete(self, kind: str, key: str):
+        """항목 삭제 (버퍼에 넣고 나중에 일괄 기록)"""
+        self._enqueue(kind, key, DELETE_OP)
+    
+    def flush(self):
+        """버퍼의 변경을 즉시 기록"""
+        with self._flush_lock:
+            with self._pending_lock:
+                batch = list(self._pending.items())
+                self._pending.clear()
+                self._pending_count = 0
+                self._inflight = {item_key for item_key, _ in batch}
+            if not batch:
+                return
+            try:
+                for attempt in range(self.MAX_CONFLICT_RETRIES):
+                    try:
+                        self._write_batch(batch)
+                        break
+                    except MemoryConflictError:
+                        if attempt == self.MAX_CONFLICT_RETRIES - 1:
+                            raise
+            except Exception:
+                # 기록 실패 시 그 사이 들어온 변경 앞에 되돌려 놓음 (순서 유지)
+                with self._pending_lock:
+                    for item_key, ops in batch:
+                        self._pending[item_key] = ops + self._pending.get(item_key, [])
+                        self._pending_count += len(ops)
+                raise
+            finally:
+                with self._pending_lock:
+                    self._inflight = set()
+        if self.on_flushed is not None:
+            for kind, key in (item_key for item_key, _ in batch):
+                self.on_flushed(kind, key)
+    
+    def close(self):
+        """남은 쓰기를 기록하고 백그라운드 스레드 종료"""
+        self._closed.set()
+        self._wakeup.set()
+        self._flusher.join(timeout=5)
+        self.flush()
+    
+    def _enqueue(self, kind: str, key: str, op: tuple):
+        with self._pending_lock:
+            self._pending.setdefault((kind, key), []).append(op)
+            self._pending_count += 1
+            full = self._pending_count >= self.batch_size
+        if full:
+            self._wakeup.set()
+    
+    def _reduce(self, kind: str, key: str, data: Optional[Dict[str, Any]], ops: List[tuple]) -> Optional[Dict[str, Any]]:
+        """저장본에 변경 기록 적용 (마지막 삭제 이후의 변경만 빈 상태에 적용, 삭제로 끝나면 None)"""
+        for i in range(len(ops) - 1, -1, -1):
+            if ops[i] == DELETE_OP:
+                data, ops = None, ops[i + 1:]
+                break
+        if not ops:
+            return data
+        if self.reducer is None:
+            raise RuntimeError("변경 기록을 적용할 reducer가 연결되지 않았습니다. attach()를 먼저 호출하세요.")
+        return self.reducer(kind, key, data, ops)
+    
+    def _flush_loop(self):
+        while not self._closed.is_set():
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                print(f"[{type(self).__name__}] 메모리 기록 실패 (다음 주기에 재시도): {str(e)}")
+    
+    def _read(self, kind: str, key: str) -> Optional[Dict[str, Any]]:
+        raise NotImplementedError
+    
+    def _write_batch(self, batch: List[Tuple[Tuple[str, str], List[tuple]]]):
+        raise NotImplementedError
+
+
+class SQLiteMemoryBackend(MemoryBackend):
+    """
+    SQLite 메모리 백엔드
+    
+    WAL 모드로 열어 여러 프로세스가 동시에 읽는 동안에도 쓰기가 가능하다.
+    연결은 스레드별로 하나씩 사용한다.
+    일괄 기록은 BEGIN IMMEDIATE 트랜잭션 안에서 읽기-적용-기록하고,
+    UPDATE는 읽은 version과 같을 때만 적용한다 (다르면 충돌로 보고 재시도).
+    """
+    
+    # 만료 세션 정리 간격 (초)
+    CLEANUP_INTERVAL = 600
+    
+    def __init__(self, db_path: str, **kwargs):
+        """
+        Args:
+            db_path: SQLite 파일 경로
+            **kwargs: MemoryBackend 설정 (flush_interval, batch_size, session_ttl_seconds)
+        """
+        self.db_path = str(db_path)
+        Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        self._last_cleanup = 0.0
+        conn = self._connection()
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS memory ("
+            " kind TEXT NOT NULL,"
+            " key TEXT NOT NULL,"
+            " data TEXT NOT NULL,"
+            " version INTEGER NOT NULL DEFAULT 0,"
+            " updated_at REAL NOT NULL,"
+            " PRIMARY KEY (kind, key))"
+        )
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(memory)")}
+        if "version" not in columns:
+            conn.execute("ALTER TABLE memory ADD COLUMN version INTEGER NOT NULL DEFAULT 0")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_memory_updated ON memory (kind, updated_at)")
+        super().__init__(**kwargs)
+    
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # 트랜잭션은 직접 관리 (autocommit 모드)
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+    
+    def _read(self, kind: str, key: str) -> Optional[Dict[str, Any]]:
+        row = self._connection().execute(
+            "SELECT data, updated_at FROM memory WHERE kind = ? AND key = ?",
+            (kind, key)
+        ).fetchone()
+        if row is None:
+            return None
+        if kind == KIND_SESSION and self._expired(row[1]):
+            return None
+        return json.loads(row[0])
+    
+    def _write_batch(self, batch):
+        now = time.time()
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            for (kind, key), ops in batch:
+                row = conn.execute(
+                    "SELECT data, version, updated_at FROM memory WHERE kind = ? AND key = ?",
+                    (kind, key)
+                ).fetchone()
+                current = None
+                if row is not None and not (kind == KIND_SESSION and self._expired(row[2])):
+                    current = json.loads(row[0])
+                data = self._reduce(kind, key, current, ops)
+                
+                if data is None:
+                    conn.execute("DELETE FROM memory WHERE kind = ? AND key = ?", (kind, key))
+                    continue
+                encoded = json.dumps(data, ensure_ascii=False, default=str)
+                if row is None:
+                    conn.execute(
+                        "INSERT INTO memory (kind, key, data, version, updated_at) VALUES (?, ?, ?, 1, ?)",
+                        (kind, key, encoded, now)
+                    )
+                else:
+                    cursor = conn.execute(
+                        "UPDATE memory SET data = ?, version = version + 1, updated_at = ?"
+                        " WHERE kind = ? AND key = ? AND version = ?",
+                        (encoded, now, kind, key, row[1])
+                    )
+                    if cursor.rowcount != 1:
+                        raise MemoryConflictError(f"{kind}:{key} 동시 기록 감지")
+            
+            if self.session_ttl_seconds and now - self._last_cleanup > self.CLEANUP_INTERVAL:
+                self._last_cleanup = now
+                conn.execute(
+                    "DELETE FROM memory WHERE kind = ? AND updated_at < ?",
+                    (KIND_SESSION, now - self.session_ttl_seconds)
+                )
+            conn.execute("COMMIT")
+        except sqlite3.IntegrityError as e:
+            conn.execute("ROLLBACK")
+            raise MemoryConflictError(str(e))
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+    
+    def _expired(self, updated_at: float) -> bool:
+        return bool(self.session_ttl_seconds) and time.time() - updated_at > self.session_ttl_seconds
+
+
+class RedisMemoryBackend(MemoryBackend):
+    """
+    Redis 프로토콜 메모리 백엔드
+    
+    항목은 "<prefix><kind>:<key>" 키의 JSON 문자열로 저장하고,
+    세션은 session_ttl_seconds로 만료시킨다.
+    일괄 기록은 WATCH로 키를 감시한 채 읽고, MULTI/EXEC 트랜잭션 1회로 기록한다
+    (그 사이 다른 워커가 기록하면 WatchError -> 충돌로 보고 재시도).
+    """
+    
+    def __init__(
+        self,
+        url: str = "redis://localhost:6379/0",
+        client: Any = None,
+        prefix: str = "fashion_agent:",
+        **kwargs
+    ):
+        """
+        Args:
+            url: Redis URL (client가 없을 때 사용)
+            client: redis.Redis 호환 클라이언트 (fakeredis 등 로컬 대체 구현 주입용)
+            prefix: 키 접두사
+            **kwargs: MemoryBackend 설정 (flush_interval, batch_size, session_ttl_seconds)
+        """
+        if client is None:
+            if not REDIS_AVAILABLE:
+                raise ImportError("redis 패키지가 필요합니다. pip install redis 실행 필요")
+            client = redis.Redis.from_url(url)
+        self.client = client
+        self.prefix = prefix
+        super().__init__(**kwargs)
+    
+    def _key(self, kind: str, key: str) -> str:
+        return f"{self.prefix}{kind}:{key}"
+    
+    @staticmethod
+    def _decode(raw: Any) -> Optional[Dict[str, Any]]:
+        if raw is None:
+            return None
+        if isinstance(raw, bytes):
+            raw = raw.decode("utf-8")
+        return json.loads(raw)
+    
+    def _read(self, kind: str, key: str) -> Optional[Dict[str, Any]]:
+        return self._decode(self.client.get(self._key(kind, key)))
+    
+    def _write_batch(self, batch):
+        redis_keys = [self._key(kind, key) for (kind, key), _ in batch]
+        pipe = self.client.pipeline(transaction=True)
+        try:
+            pipe.watch(*redis_keys)
+            current = pipe.mget(redis_keys)
+            pipe.multi()
+            for ((kind, key), ops), redis_key, raw in zip(batch, redis_keys, current):
+                data = self._reduce(kind, key, self._decode(raw), ops)
+                if data is None:
+                    pipe.delete(redis_key)
+                    continue
+                encoded = json.dumps(data, ensure_ascii=False, default=str)
+                if kind == KIND_SESSION and self.session_ttl_seconds:
+                    pipe.set(redis_key, encoded, ex=int(self.session_ttl_seconds))
+                else:
+                    pipe.set(redis_key, encoded)
+            pipe.execute()
+        except WatchError as e:
+            raise MemoryConflictError(str(e))
+        finally:
+            pipe.reset()
+
+
+def get_memory_backend(session_ttl_seconds: Optional[float] = None) -> Optional[MemoryBackend]:
+    """
+    환경 변수로 메모리 백엔드 생성
+
+    환경 변수:
+        MEMORY_BACKEND: memory (기본, 프로세스 메모리만 사용) / sqlite / redis
+        MEMORY_SQLITE_PATH: SQLite 파일 경로 (기본: agentic_system/memory_db/memory.sqlite3)
+        MEMORY_REDIS_URL: Redis URL (기본: redis://localhost:6379/0)
+        MEMORY_FLUSH_INTERVAL: 쓰기 일괄 기록 간격 (초, 기본 0.5)
+
+    Returns:
+        MemoryBackend, 프로세스 메모리만 사용하면 None
+    """
+    backend_type = os.getenv("MEMORY_BACKEND", "memory").lower()
+    options = {
+        "flush_interval": float(os.getenv("MEMORY_FLUSH_INTERVAL", "0.5")),
+        "session_ttl_seconds": session_ttl_seconds
+    }
+    try:
+        if backend_type == "sqlite":
+            db_path = os.getenv(
+                "MEMORY_SQLITE_PATH",
+                str(Path(__file__).parent.parent / "memory_db" / "memory.sqlite3")
+            )
+            print(f"[MemoryBackend] SQLite 메모리 백엔드 사용: {db_path}")
+            return SQLiteMemoryBackend(db_path, **options)
+        if backend_type == "redis":
+            url = os.getenv("MEMORY_REDIS_URL", "redis://localhost:6379/0")
+            print(f"[MemoryBackend] Redis 메모리 백엔드 사용: {url}")
+            return RedisMemoryBackend(url=url, **options)
+    except Exception as e:
+        print(f"[MemoryBackend] {backend_type} 백엔드를 사용할 수 없어 프로세스 메모리만 사용합니다: {str(e)}")
+    return None
@@ -5,13 +5,20 @@ Data Stores Module - RAG (Retrieval-Augmented Generation)
 PoC 단계에서는 Mock RAG 사용
 """
 
+from .keyword_index import KeywordIndex, tokenize
 from .rag import MockRAG, RAGStore
+from .numpy_index import NumpyVectorIndex
+from .doc_store import SQLiteDocStore
 from .rag_vector import VectorRAG, VectorRAGStore
 
 __all__ = [
+    'KeywordIndex',
+    'tokenize',
     'MockRAG',
     'RAGStore',
     'VectorRAG',
     'VectorRAGStore',
+    'NumpyVectorIndex',
+    'SQLiteDocStore',
 ]
 
@@ -0,0 +1,141 @@
+"""
+Document Store
+벡터 인덱스와 짝을 이루는 SQLite 문서 / 메타데이터 저장소
+
+문서 id는 벡터 인덱스 안의 위치(0부터 연속)와 같으므로 검색 결과 인덱스로 바로 조회한다.
+doc_key(사용자 지정 ID 또는 문서 내용 해시)로 이미 임베딩한 문서를 확인해 재임베딩을 건너뛴다.
+info 테이블에는 인덱스와 맞춰 볼 정보(임베딩 모델, 차원 등)를 기록한다.
+"""
+
+from typing import Dict, List, Optional, Any, Iterable, Set, Tuple
+from pathlib import Path
+import json
+import sqlite3
+import threading
+
+# SQLite IN 절 한 번에 넣을 최대 개수
+_IN_CHUNK = 500
+
+
+class SQLiteDocStore:
+    """
+    SQLite 문서 저장소 (id -> 문서, 메타데이터)
+    """
+
+    def __init__(self, db_path: str):
+        """
+        Args:
+            db_path: SQLite 파일 경로
+        """
+        self.db_path = str(db_path)
+        Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS documents ("
+                " id INTEGER PRIMARY KEY,"
+                " doc_key TEXT NOT NULL UNIQUE,"
+                " document TEXT NOT NULL,"
+                " metadata TEXT NOT NULL)"
+            )
+            self._conn.execute("CREATE TABLE IF NOT EXISTS info (name TEXT PRIMARY KEY, value TEXT NOT NULL)")
+
+    def add(
+        self,
+        start_id: int,
+        documents: List[str],
+        metadatas: List[Dict[str, Any]],
+        keys: List[str]
+    ):
+        """
+        문서 추가 (id는 start_id부터 연속)
+
+        Args:
+            start_id: 첫 문서 id (벡터 인덱스에 추가하기 전 ntotal)
+            documents: 문서 텍스트
+            metadatas: 메타데이터
+            keys: 문서 키 (중복 확인용)
+        """
+        rows = [
+            (start_id + i, key, document, json.dumps(metadata, ensure_ascii=False, default=str))
+            for i, (document, metadata, key) in enumerate(zip(documents, metadatas, keys))
+        ]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT INTO documents (id, doc_key, document, metadata) VALUES (?, ?, ?, ?)",
+                rows
+            )
+
+    def delete_from(self, start_id: int):
+        """id가 start_id 이상인 문서 삭제 (벡터 인덱스 추가 실패 시 되돌리기용)"""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM documents WHERE id >= ?", (start_id,))
+
+    def get(self, ids: Iterable[int]) -> Dict[int, Tuple[str, Dict[str, Any]]]:
+        """
+        id로 문서 조회
+
+        Returns:
+            Dict[int, Tuple[str, Dict]]: id -> (문서, 메타데이터), 없는 id는 빠짐
+        """
+        found = {}
+        for chunk, placeholders in self._chunks([int(i) for i in ids]):
+            with self._lock:
+                rows = self._conn.execute(
+                    f"SELECT id, document, metadata FROM documents WHERE id IN ({placeholders})",
+                    chunk
+                ).fetchall()
+            for doc_id, document, metadata in rows:
+                found[doc_id] = (document, json.loads(metadata))
+        return found
+
+    def existing_keys(self, keys: Iterable[str]) -> Set[str]:
+        """이미 저장된 문서 키"""
+        existing = set()
+        for chunk, placeholders in self._chunks(list(keys)):
+            with self._lock:
+                rows = self._conn.execute(
+                    f"SELECT doc_key FROM documents WHERE doc_key IN ({placeholders})",
+                    chunk
+                ).fetchall()
+            existing.update(row[0] for row in rows)
+        return existing
+
+    def count(self) -> int:
+        """저장된 문서 수"""
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM documents").fetchone()[0]
+
+    def get_info(self, name: str) -> Optional[str]:
+        """인덱스 정보 조회"""
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM info WHERE name = ?", (name,)).fetchone()
+        return row[0] if row else None
+
+    def set_info(self, name: str, value: str):
+        """인덱스 정보 기록"""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO info (name, value) VALUES (?, ?)"
+                " ON CONFLICT(name) DO UPDATE SET value = excluded.value",
+                (name, value)
+            )
+
+    def clear(self):
+        """모든 문서와 정보 삭제"""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM documents")
+            self._conn.execute("DELETE FROM info")
+
+    def close(self):
+        """연결 종료"""
+        with self._lock:
+            self._conn.close()
+
+    @staticmethod
+    def _chunks(values: List[Any]):
+        for start in range(0, len(values), _IN_CHUNK):
+            chunk = values[start:start + _IN_CHUNK]
+            yield chunk, ",".join("?" * len(chunk))
@@ -0,0 +1,143 @@
+"""
+Keyword Index
+규칙 기반 RAG용 역색인 (토큰 / 한글 bigram)
+
+문서를 추가할 때 한 번만 정규화(NFKC, 소문자)와 토큰화를 하고,
+검색은 쿼리 토큰의 posting 목록만 합산하므로 지식 베이스 크기와 무관하게 빠르다.
+
+토큰화 규칙:
+- 영문/숫자: 단어 단위
+- 한글: 2글자 bigram (조사가 붙어도 "후드티를" -> 후드, 드티, 티를 로 "후드티"와 매칭)
+  1글자 한글 단어("면")는 그대로 토큰으로 사용
+"""
+
+from typing import Dict, List, Tuple, Any, Iterable
+from collections import defaultdict
+import heapq
+import math
+import re
+import unicodedata
+
+_WORD_PATTERN = re.compile(r"[0-9a-z]+|[가-힣]+")
+
+
+def normalize_text(text: str) -> str:
+    """검색용 정규화 (NFKC + 소문자)"""
+    return unicodedata.normalize("NFKC", str(text)).lower()
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    검색 토큰 추출 (중복 제거, 등장 순서 유지)
+
+    Args:
+        text: 원문
+
+    Returns:
+        List[str]: 토큰 목록
+    """
+    tokens: Dict[str, None] = {}
+    for word in _WORD_PATTERN.findall(normalize_text(text)):
+        if len(word) == 1 or not ("가" <= word[0] <= "힣"):
+            tokens[word] = None
+            continue
+        for i in range(len(word) - 1):
+            tokens[word[i:i + 2]] = None
+    return list(tokens)
+
+
+class KeywordIndex:
+    """
+    가중치 필드를 가진 문서의 역색인
+
+    점수는 쿼리 토큰 중 문서에 있는 토큰의 IDF x 필드 가중치 합을
+    가능한 최대값으로 나눈 0~1 값이다.
+
+    문서의 common_ratio 이상(최소 min_common_df개)에 등장하는 흔한 토큰은 후보 문서를 찾는 데 쓰지 않고
+    (긴 posting 목록 순회 방지), 드문 토큰으로 찾은 후보의 점수 계산에만 반영한다.
+    """
+
+    def __init__(self, common_ratio: float = 0.2, min_common_df: int = 256):
+        """
+        Args:
+            common_ratio: 흔한 토큰으로 보는 문서 비율
+            min_common_df: 흔한 토큰으로 보는 최소 문서 수 (작은 지식 베이스는 모든 토큰 사용)
+        """
+        self.common_ratio = common_ratio
+        self.min_common_df = min_common_df
+        # 토큰 -> [(문서 번호, 필드 가중치)]
+        self._postings: Dict[str, List[Tuple[int, float]]] = defaultdict(list)
+        # 문서 번호 -> {토큰: 필드 가중치}
+        self._doc_terms: List[Dict[str, float]] = []
+        self.documents: List[Any] = []
+        self._max_weight = 1.0
+
+    def add(self, document: Any, fields: Iterable[Tuple[str, float]]) -> int:
+        """
+        문서 추가
+
+        Args:
+            document: 검색 결과로 돌려줄 값
+            fields: (텍스트, 가중치) 목록, 같은 토큰이 여러 필드에 있으면 큰 가중치 사용
+
+        Returns:
+            int: 문서 번호
+        """
+        doc_id = len(self.documents)
+        self.documents.append(document)
+        weights: Dict[str, float] = {}
+        for text, weight in fields:
+            for token in tokenize(text):
+                weights[token] = max(weight, weights.get(token, 0.0))
+        for token, weight in weights.items():
+            self._postings[token].append((doc_id, weight))
+            self._max_weight = max(self._max_weight, weight)
+        self._doc_terms.append(weights)
+        return doc_id
+
+    def idf(self, token: str) -> float:
+        """토큰 IDF (없는 토큰은 0)"""
+        postings = self._postings.get(token)
+        if not postings:
+            return 0.0
+        return math.log(1.0 + len(self.documents) / len(postings))
+
+    def search(self, query: str, top_k: int = 5) -> List[Tuple[Any, float]]:
+        """
+        검색
+
+        Args:
+            query: 검색어
+            top_k: 최대 결과 수
+
+        Returns:
+            List[Tuple[Any, float]]: (문서, 점수) 목록, 점수 내림차순
+        """
+        tokens = [token for token in tokenize(query) if token in self._postings]
+        if not tokens:
+            return []
+
+        idfs = {token: self.idf(token) for token in tokens}
+        max_score = sum(idfs.values()) * self._max_weight
+        common_df = max(self.min_common_df, int(len(self.documents) * self.common_ratio))
+        rare = [token for token in tokens if len(self._postings[token]) < common_df]
+
+        scores: Dict[int, float] = defaultdict(float)
+        if rare:
+            # 드문 토큰으로 후보를 모으고, 후보마다 전체 쿼리 토큰 점수 계산
+            for token in rare:
+                for doc_id, _ in self._postings[token]:
+                    scores[doc_id] = 0.0
+            for doc_id in scores:
+                terms = self._doc_terms[doc_id]
+                scores[doc_id] = sum(idf * terms[token] for token, idf in idfs.items() if token in terms)
+        else:
+            for token, idf in idfs.items():
+                for doc_id, weight in self._postings[token]:
+                    scores[doc_id] += idf * weight
+
+        ranked = heapq.nsmallest(top_k, scores.items(), key=lambda item: (-item[1], item[0]))
+        return [(self.documents[doc_id], score / max_score) for doc_id, score in ranked]
+
+    def __len__(self) -> int:
+        return len(self.documents)
@@ -0,0 +1,175 @@
+"""
+NumPy Vector Index
+FAISS / Chroma가 없을 때 사용하는 순수 NumPy 벡터 인덱스
+
+- 벡터는 추가할 때 정규화해서 연속된 float32 행렬 하나에 보관 (용량은 2배씩 증가)
+- 검색은 쿼리 묶음 단위 행렬 곱 + argpartition으로 상위 k개만 정렬
+- 저장은 .npy 형식의 np.memmap으로 기록하고, 불러올 때도 memmap으로 열어 복사 없이 검색
+
+search()는 faiss.Index.search와 같은 (distances, indices) 형식을 반환하므로
+FAISS와 같은 코드로 벤치마크할 수 있다. 거리는 코사인 거리(1 - 코사인 유사도)이다.
+"""
+
+from typing import Optional, Tuple, Union
+from pathlib import Path
+import numpy as np
+
+
+class NumpyVectorIndex:
+    """
+    코사인 유사도 Flat 인덱스 (전수 검색)
+    """
+
+    # 한 번에 계산할 쿼리 수 (유사도 행렬 메모리 상한)
+    QUERY_BATCH_SIZE = 256
+
+    def __init__(self, dimension: Optional[int] = None, initial_capacity: int = 1024):
+        """
+        Args:
+            dimension: 벡터 차원 (None이면 처음 추가하는 벡터로 결정)
+            initial_capacity: 처음 할당할 행 수
+        """
+        self.dimension = dimension
+        self.ntotal = 0
+        self._initial_capacity = max(1, initial_capacity)
+        self._data: Optional[np.ndarray] = None
+        if dimension is not None:
+            self._data = np.empty((self._initial_capacity, dimension), dtype=np.float32)
+
+    @property
+    def vectors(self) -> np.ndarray:
+        """저장된 정규화 벡터 (ntotal x dimension)"""
+        if self._data is None:
+            return np.empty((0, self.dimension or 0), dtype=np.float32)
+        return self._data[:self.ntotal]
+
+    def add(self, vectors: Union[np.ndarray, list]):
+        """
+        벡터 추가
+
+        Args:
+            vectors: (n, dimension) 벡터 또는 벡터 1개
+        """
+        vectors = self._as_matrix(vectors)
+        if len(vectors) == 0:
+            return
+        if self.dimension is None:
+            self.dimension = vectors.shape[1]
+        elif vectors.shape[1] != self.dimension:
+            raise ValueError(f"벡터 차원이 다릅니다: {vectors.shape[1]} (인덱스: {self.dimension})")
+
+        self._reserve(self.ntotal + len(vectors))
+        self._data[self.ntotal:self.ntotal + len(vectors)] = self._normalize(vectors)
+        self.ntotal += len(vectors)
+
+    def search(self, queries: Union[np.ndarray, list], k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        상위 k개 검색
+
+        Args:
+            queries: (nq, dimension) 쿼리 벡터 또는 쿼리 1개
+            k: 반환 개수
+
+        Returns:
+            (distances, indices): 각각 (nq, k), 결과가 k개보다 적으면 거리 inf / 인덱스 -1로 채움
+        """
+        queries = self._as_matrix(queries)
+        nq = len(queries)
+        distances = np.full((nq, k), np.inf, dtype=np.float32)
+        indices = np.full((nq, k), -1, dtype=np.int64)
+        if self.ntotal == 0 or k <= 0 or nq == 0:
+            return distances, indices
+        if queries.shape[1] != self.dimension:
+            raise ValueError(f"쿼리 차원이 다릅니다: {queries.shape[1]} (인덱스: {self.dimension})")
+
+        vectors = self.vectors
+        kk = min(k, self.ntotal)
+        for start in range(0, nq, self.QUERY_BATCH_SIZE):
+            batch = self._normalize(queries[start:start + self.QUERY_BATCH_SIZE])
+            similarities = batch @ vectors.T
+            if kk < self.ntotal:
+                top = np.argpartition(-similarities, kk - 1, axis=1)[:, :kk]
+            else:
+                top = np.broadcast_to(np.arange(self.ntotal), (len(batch), self.ntotal))
+            top_similarities = np.take_along_axis(similarities, top, axis=1)
+            order = np.argsort(-top_similarities, axis=1, kind="stable")
+            end = start + len(batch)
+            indices[start:end, :kk] = np.take_along_axis(top, order, axis=1)
+            distances[start:end, :kk] = 1.0 - np.take_along_axis(top_similarities, order, axis=1)
+        return distances, indices
+
+    def reset(self):
+        """모든 벡터 삭제"""
+        self.ntotal = 0
+        if self.dimension is not None:
+            self._data = np.empty((self._initial_capacity, self.dimension), dtype=np.float32)
+
+    def save(self, path: Union[str, Path]):
+        """
+        인덱스 저장 (.npy 형식, np.memmap으로 기록)
+
+        Args:
+            path: 저장 경로
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(path.name + ".tmp")
+        out = np.lib.format.open_memmap(
+            tmp_path,
+            mode="w+",
+            dtype=np.float32,
+            shape=(self.ntotal, self.dimension or 0)
+        )
+        out[:] = self.vectors
+        out.flush()
+        del out
+        tmp_path.replace(path)
+
+    @classmethod
+    def load(cls, path: Union[str, Path], mmap: bool = True) -> "NumpyVectorIndex":
+        """
+        인덱스 불러오기
+
+        Args:
+            path: save()로 저장한 경로
+            mmap: True이면 읽기 전용 memmap으로 열어 필요한 페이지만 읽음
+                (이후 add()하면 그때 메모리로 복사)
+
+        Returns:
+            NumpyVectorIndex
+        """
+        data = np.load(path, mmap_mode="r" if mmap else None)
+        if data.ndim != 2 or data.dtype != np.float32:
+            raise ValueError(f"NumPy 벡터 인덱스 파일이 아닙니다: {path}")
+        index = cls(dimension=data.shape[1] if data.shape[1] else None)
+        index._data = data
+        index.ntotal = data.shape[0]
+        return index
+
+    def _reserve(self, size: int):
+        """size행 이상 쓸 수 있도록 용량 확보 (읽기 전용 memmap이면 메모리로 복사)"""
+        data = self._data
+        if data is not None and size <= len(data) and data.flags.writeable:
+            return
+        capacity = max(self._initial_capacity, len(data) if data is not None else 0)
+        while capacity < size:
+            capacity *= 2
+        grown = np.empty((capacity, self.dimension), dtype=np.float32)
+        if self.ntotal:
+            grown[:self.ntotal] = data[:self.ntotal]
+        self._data = grown
+
+    def _as_matrix(self, vectors: Union[np.ndarray, list]) -> np.ndarray:
+        array = np.asarray(vectors, dtype=np.float32)
+        if array.ndim == 1:
+            array = array.reshape(1, -1)
+        return array
+
+    @staticmethod
+    def _normalize(vectors: np.ndarray) -> np.ndarray:
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return (vectors / norms).astype(np.float32, copy=False)
+
+    def __len__(self) -> int:
+        return self.ntotal
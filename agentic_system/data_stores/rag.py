@@ -8,6 +8,8 @@ Pilot 단계에서 실제 Vector DB 기반 RAG로 확장 예정
 from typing import Dict, List, Optional, Any
 import json
 
+from .keyword_index import KeywordIndex
+
 
 class MockRAG:
     """
@@ -15,11 +17,37 @@ class MockRAG:
     
     PoC 단계에서 사용하는 단순한 규칙/데이터 기반 RAG
     실제 RAG 파이프라인 대신 JSON 데이터 사용
+    
+    지식 베이스는 초기화 시 KeywordIndex(토큰 / 한글 bigram 역색인)로 컴파일한다.
     """
     
-    def __init__(self):
-        self.knowledge_base = self._init_knowledge_base()
+    # 항목 키가 값보다 더 강한 근거가 되도록 필드 가중치를 다르게 둔다
+    KEY_WEIGHT = 2.0
+    VALUE_WEIGHT = 1.0
+    # 이보다 낮은 점수(쿼리 일부 토큰만 값에 우연히 걸린 경우)는 제안에서 제외
+    MIN_SCORE = 0.1
+    
+    def __init__(self, knowledge_base: Optional[Dict[str, Any]] = None):
+        """
+        Args:
+            knowledge_base: {카테고리: {키: 값}} 형식의 지식 베이스 (None이면 기본 Mock 데이터)
+        """
+        self.knowledge_base = knowledge_base if knowledge_base is not None else self._init_knowledge_base()
         self.name = "MockRAG"
+        self.rebuild_index()
+    
+    def rebuild_index(self):
+        """지식 베이스를 역색인으로 컴파일 (knowledge_base를 바꾼 뒤 호출)"""
+        index = KeywordIndex()
+        for category, data in self.knowledge_base.items():
+            if isinstance(data, dict):
+                for key, value in data.items():
+                    value_text = " ".join(map(str, value)) if isinstance(value, (list, tuple)) else str(value)
+                    index.add(
+                        (category, key),
+                        [(key, self.KEY_WEIGHT), (value_text, self.VALUE_WEIGHT)]
+                    )
+        self.index = index
     
     def _init_knowledge_base(self) -> Dict[str, Any]:
         """Mock 지식 베이스 초기화"""
@@ -47,39 +75,45 @@ class MockRAG:
             }
         }
     
-    def retrieve(self, query: str, context: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    def retrieve(
+        self,
+        query: str,
+        context: Optional[Dict[str, Any]] = None,
+        top_k: int = 10
+    ) -> Dict[str, Any]:
         """
         지식 검색
         
         Args:
             query: 검색 쿼리
             context: 추가 컨텍스트
+            top_k: 최대 제안 수
             
         Returns:
-            Dict: 검색된 지식 정보
+            Dict: 검색된 지식 정보 (suggestions는 score 내림차순, confidence는 최고 score)
         """
-        query_lower = query.lower()
         results = {
             "suggestions": [],
             "relevant_info": {},
             "confidence": 0.0
         }
         
-        # 간단한 키워드 매칭
-        for category, data in self.knowledge_base.items():
-            if isinstance(data, dict):
-                for key, value in data.items():
-                    if query_lower in key.lower() or query_lower in str(value).lower():
-                        results["suggestions"].append({
-                            "category": category,
-                            "key": key,
-                            "value": value
-                        })
-                        results["relevant_info"][category] = data
+        # 역색인 키워드 매칭
+        for (category, key), score in self.index.search(query, top_k=top_k):
+            if score < self.MIN_SCORE:
+                break
+            data = self.knowledge_base[category]
+            results["suggestions"].append({
+                "category": category,
+                "key": key,
+                "value": data[key],
+                "score": round(score, 4)
+            })
+            results["relevant_info"][category] = data
         
-        # 신뢰도 계산
+        # 신뢰도: 가장 잘 맞는 항목의 정규화 점수 (결과 개수와 무관)
         if results["suggestions"]:
-            results["confidence"] = min(1.0, len(results["suggestions"]) / 5.0)
+            results["confidence"] = results["suggestions"][0]["score"]
         
         return results
     
@@ -125,7 +159,7 @@ class RAGStore:
     
     def retrieve(self, query: str, top_k: int = 5) -> Dict[str, Any]:
         """지식 검색"""
-        return self.rag.retrieve(query)
+        return self.rag.retrieve(query, top_k=top_k)
     
     def get_context(self, plan_type: str, user_input: str) -> Dict[str, Any]:
         """RAG 컨텍스트 생성"""
@@ -3,13 +3,22 @@ Vector DB 기반 RAG 구현
 
 Pilot 단계에서 사용할 실제 RAG 시스템
 Chroma 또는 FAISS를 사용한 벡터 검색
+(둘 다 설치되지 않은 환경에서는 내장 NumPy 인덱스 사용)
+
+FAISS / NumPy 인덱스는 persist_directory에 인덱스 파일과 SQLite 문서 저장소로 영구 저장되며,
+재시작 시 인덱스를 memory-map으로 열고 이미 임베딩한 문서는 다시 임베딩하지 않는다.
 """
 
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
+import hashlib
 import json
+import os
 from pathlib import Path
 import numpy as np
 
+from .doc_store import SQLiteDocStore
+from .numpy_index import NumpyVectorIndex
+
 try:
     import chromadb
     from chromadb.config import Settings
@@ -25,6 +34,10 @@ except ImportError:
     FAISS_AVAILABLE = False
     print("FAISS를 사용할 수 없습니다. pip install faiss-cpu 실행 필요")
 
+DEFAULT_EMBEDDING_MODEL = "sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2"
+# 저장된 인덱스를 memory-map으로 열지 여부 (기본 true)
+RAG_INDEX_MMAP = os.getenv("RAG_INDEX_MMAP", "true").lower() == "true"
+
 
 class VectorRAG:
     """
@@ -33,6 +46,11 @@ class VectorRAG:
     실제 벡터 데이터베이스를 사용한 지식 검색
     """
     
+    # persist_directory 안의 파일 이름
+    FAISS_INDEX_FILE = "faiss.index"
+    NUMPY_INDEX_FILE = "numpy_index.npy"
+    DOC_STORE_FILE = "documents.sqlite3"
+    
     def __init__(
         self,
         vector_db_type: str = "chroma",
@@ -43,7 +61,8 @@ class VectorRAG:
         Vector RAG 초기화
         
         Args:
-            vector_db_type: "chroma" 또는 "faiss"
+            vector_db_type: "chroma", "faiss" 또는 "numpy"
+                (요청한 DB를 사용할 수 없으면 "numpy"로 대체)
             persist_directory: 데이터 영구 저장 디렉토리
             embedding_model: 임베딩 모델 이름 (기본: sentence-transformers)
         """
@@ -56,9 +75,9 @@ class VectorRAG:
         elif vector_db_type == "faiss" and FAISS_AVAILABLE:
             self._init_faiss()
         else:
-            print("벡터 DB를 사용할 수 없습니다. Mock 모드로 동작합니다.")
-            self.vector_db = None
-            self.use_vector_db = False
+            if vector_db_type != "numpy":
+                print(f"{vector_db_type} 벡터 DB를 사용할 수 없습니다. 내장 NumPy 인덱스로 동작합니다.")
+            self._init_numpy()
         
         # 임베딩 모델 로딩 (지연 로딩)
         self.embedder = None
@@ -83,23 +102,95 @@ class VectorRAG:
     def _init_faiss(self):
         """FAISS 초기화"""
         try:
-            # FAISS 인덱스 생성 (384차원, L2 거리)
+            # FAISS 인덱스 (384차원, L2 거리), 저장된 인덱스가 있으면 불러옴
             self.dimension = 384
-            self.index = faiss.IndexFlatL2(self.dimension)
-            self.texts = []
-            self.metadata = []
+            self._open_persistent_index(lambda: faiss.IndexFlatL2(self.dimension))
             self.use_vector_db = True
-            print("FAISS 초기화 완료")
+            print(f"FAISS 초기화 완료 (문서 {self.index.ntotal}개)")
         except Exception as e:
             print(f"FAISS 초기화 실패: {e}")
             self.use_vector_db = False
     
+    def _init_numpy(self):
+        """내장 NumPy 인덱스 초기화 (차원은 첫 문서 추가 시 결정)"""
+        self.vector_db_type = "numpy"
+        self._open_persistent_index(NumpyVectorIndex)
+        self.use_vector_db = True
+        print(f"NumPy 벡터 인덱스 초기화 완료 (문서 {self.index.ntotal}개)")
+    
+    def _index_path(self) -> Path:
+        name = self.FAISS_INDEX_FILE if self.vector_db_type == "faiss" else self.NUMPY_INDEX_FILE
+        return Path(self.persist_directory) / name
+    
+    def _index_signature(self) -> str:
+        """인덱스를 다시 써도 되는지 확인할 값 (인덱스 종류 + 임베딩 모델)"""
+        return f"{self.vector_db_type}:{self.embedding_model or DEFAULT_EMBEDDING_MODEL}"
+    
+    def _open_persistent_index(self, create_index):
+        """
+        저장된 인덱스와 문서 저장소 열기
+        
+        인덱스 파일이 없거나, 임베딩 모델이 바뀌었거나, 문서 수가 맞지 않으면
+        (저장 도중 중단 등) 둘 다 비우고 새 인덱스를 만든다.
+        """
+        self.doc_store = SQLiteDocStore(str(Path(self.persist_directory) / self.DOC_STORE_FILE))
+        self.index = None
+        self._index_mmapped = False
+        index_path = self._index_path()
+        if index_path.exists() and self.doc_store.get_info("signature") == self._index_signature():
+            try:
+                self.index, self._index_mmapped = self._read_index(index_path, mmap=RAG_INDEX_MMAP)
+            except Exception as e:
+                print(f"저장된 벡터 인덱스를 읽을 수 없습니다: {e}")
+        if self.index is not None and self.index.ntotal != self.doc_store.count():
+            print(f"벡터 인덱스({self.index.ntotal})와 문서 저장소({self.doc_store.count()})가 맞지 않아 새로 생성합니다.")
+            self.index = None
+        if self.index is None:
+            self.doc_store.clear()
+            self.doc_store.set_info("signature", self._index_signature())
+            self.index = create_index()
+            self._index_mmapped = False
+    
+    def _read_index(self, path: Path, mmap: bool) -> Tuple[Any, bool]:
+        """
+        인덱스 파일 읽기 (mmap이 가능하면 memory-map, 반환: (인덱스, 실제 mmap 여부))
+        
+        IndexFlat의 벡터(codes)는 IO_FLAG_MMAP_IFC로만 매핑된다
+        (IO_FLAG_MMAP은 IVF inverted list만 매핑하므로 Flat 인덱스는 결국 전체를 메모리로 읽음).
+        IO_FLAG_MMAP_IFC가 없는 FAISS 버전에서는 일반 읽기를 사용한다.
+        """
+        if self.vector_db_type == "numpy":
+            return NumpyVectorIndex.load(path, mmap=mmap), mmap
+        mmap_flag = getattr(faiss, "IO_FLAG_MMAP_IFC", None)
+        if mmap and mmap_flag is not None:
+            try:
+                return faiss.read_index(str(path), mmap_flag | faiss.IO_FLAG_READ_ONLY), True
+            except RuntimeError as e:
+                print(f"FAISS 인덱스를 memory-map으로 열 수 없어 메모리로 읽습니다: {e}")
+        return faiss.read_index(str(path)), False
+    
+    def _write_index(self):
+        """인덱스 파일 저장 (임시 파일에 쓴 뒤 교체)"""
+        path = self._index_path()
+        if self.vector_db_type == "numpy":
+            self.index.save(path)
+            return
+        tmp_path = path.with_name(path.name + ".tmp")
+        faiss.write_index(self.index, str(tmp_path))
+        os.replace(tmp_path, path)
+    
+    def _ensure_writable_index(self):
+        """실제로 memory-map된 FAISS 인덱스만 추가 전에 메모리로 다시 읽음 (NumPy는 add()가 직접 복사)"""
+        if self._index_mmapped and self.vector_db_type == "faiss":
+            self.index = faiss.read_index(str(self._index_path()))
+        self._index_mmapped = False
+    
     def _get_embedder(self):
         """임베딩 모델 로딩 (지연 로딩)"""
         if self.embedder is None:
             try:
                 from sentence_transformers import SentenceTransformer
-                model_name = self.embedding_model or "sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2"
+                model_name = self.embedding_model or DEFAULT_EMBEDDING_MODEL
                 self.embedder = SentenceTransformer(model_name)
                 print(f"임베딩 모델 로딩 완료: {model_name}")
             except ImportError:
@@ -119,12 +210,17 @@ class VectorRAG:
         Args:
             documents: 문서 텍스트 리스트
             metadatas: 메타데이터 리스트
-            ids: 문서 ID 리스트
+            ids: 문서 ID 리스트 (FAISS / NumPy는 없으면 문서 내용 해시, 이미 있는 ID는 재임베딩 생략)
         """
         if not self.use_vector_db:
             print("벡터 DB가 사용 불가능합니다.")
             return
         
+        if self.vector_db_type in ("faiss", "numpy"):
+            documents, metadatas, ids = self._filter_new_documents(documents, metadatas, ids)
+            if not documents:
+                return
+        
         embedder = self._get_embedder()
         if embedder is None:
             print("임베딩 모델을 사용할 수 없습니다.")
@@ -135,9 +231,36 @@ class VectorRAG:
         
         if self.vector_db_type == "chroma":
             self._add_to_chroma(documents, embeddings, metadatas, ids)
-        elif self.vector_db_type == "faiss":
+        elif self.vector_db_type in ("faiss", "numpy"):
             self._add_to_faiss(documents, embeddings, metadatas, ids)
     
+    def _filter_new_documents(
+        self,
+        documents: List[str],
+        metadatas: Optional[List[Dict[str, Any]]],
+        ids: Optional[List[str]]
+    ) -> Tuple[List[str], List[Dict[str, Any]], List[str]]:
+        """문서 저장소에 없는 문서만 남김 (같은 호출 안의 중복 포함)"""
+        if ids is None:
+            ids = [hashlib.sha256(document.encode("utf-8")).hexdigest() for document in documents]
+        if metadatas is None:
+            metadatas = [{}] * len(documents)
+        
+        existing = self.doc_store.existing_keys(ids)
+        new_documents, new_metadatas, new_ids = [], [], []
+        for document, metadata, doc_id in zip(documents, metadatas, ids):
+            if doc_id in existing:
+                continue
+            existing.add(doc_id)
+            new_documents.append(document)
+            new_metadatas.append(metadata)
+            new_ids.append(doc_id)
+        
+        skipped = len(documents) - len(new_documents)
+        if skipped:
+            print(f"이미 임베딩된 문서 {skipped}개는 건너뜁니다.")
+        return new_documents, new_metadatas, new_ids
+    
     def _add_to_chroma(
         self,
         documents: List[str],
@@ -166,15 +289,25 @@ class VectorRAG:
         metadatas: Optional[List[Dict[str, Any]]],
         ids: Optional[List[str]]
     ):
-        """FAISS에 문서 추가"""
+        """
+        FAISS(또는 같은 인터페이스의 NumPy 인덱스)에 문서 추가
+        
+        문서 id는 추가 전 ntotal부터 연속이다. 문서 저장소에 먼저 기록해서, 기록이 실패하면
+        (같은 persist_directory를 쓰는 다른 프로세스와의 doc_key 충돌 등) 인덱스는 바뀌지 않는다.
+        인덱스 추가가 실패하면 방금 기록한 문서를 지워 id와 벡터 위치를 맞춘다.
+        인덱스 파일은 마지막에 교체한다 (중간에 중단되면 다음 시작 시 개수가 맞지 않아 새로 생성).
+        """
         embeddings_array = np.array(embeddings).astype('float32')
-        self.index.add(embeddings_array)
-        self.texts.extend(documents)
-        if metadatas:
-            self.metadata.extend(metadatas)
-        else:
-            self.metadata.extend([{}] * len(documents))
-        print(f"FAISS에 {len(documents)}개 문서 추가 완료")
+        self._ensure_writable_index()
+        start_id = self.index.ntotal
+        self.doc_store.add(start_id, documents, metadatas or [{}] * len(documents), ids)
+        try:
+            self.index.add(embeddings_array)
+        except Exception:
+            self.doc_store.delete_from(start_id)
+            raise
+        self._write_index()
+        print(f"{self.vector_db_type}에 {len(documents)}개 문서 추가 완료")
     
     def search(
         self,
@@ -205,7 +338,7 @@ class VectorRAG:
         
         if self.vector_db_type == "chroma":
             return self._search_chroma(query, query_embedding, top_k, filter_metadata)
-        elif self.vector_db_type == "faiss":
+        elif self.vector_db_type in ("faiss", "numpy"):
             return self._search_faiss(query, query_embedding, top_k)
         
         return []
@@ -241,16 +374,18 @@ class VectorRAG:
         query_embedding: np.ndarray,
         top_k: int
     ) -> List[Dict[str, Any]]:
-        """FAISS 검색"""
+        """FAISS(또는 같은 인터페이스의 NumPy 인덱스) 검색"""
         query_array = np.array([query_embedding]).astype('float32')
-        distances, indices = self.index.search(query_array, min(top_k, len(self.texts)))
+        distances, indices = self.index.search(query_array, min(top_k, self.index.ntotal))
+        documents = self.doc_store.get(int(idx) for idx in indices[0] if idx >= 0)
         
         search_results = []
         for i, idx in enumerate(indices[0]):
-            if idx < len(self.texts):
+            if int(idx) in documents:
+                document, metadata = documents[int(idx)]
                 search_results.append({
-                    "document": self.texts[idx],
-                    "metadata": self.metadata[idx] if idx < len(self.metadata) else {},
+                    "document": document,
+                    "metadata": metadata,
                     "distance": float(distances[0][i])
                 })
         
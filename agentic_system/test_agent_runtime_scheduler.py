@@ -0,0 +1,181 @@
+"""
+AgentRuntime 스케줄러 테스트 스크립트
+
+_execute_plan의 의존성 순서, 독립 단계 병렬 실행, 의존 단계 실패 시 결과 전달
+(및 skip_on_dependency_failure 옵션), 해결할 수 없는 / 순환 의존성 처리를 확인합니다.
+실제 도구 대신 호출을 기록하는 도구를 등록하므로 모델 없이 실행됩니다.
+pytest로도 실행할 수 있습니다.
+
+사용법:
+    python test_agent_runtime_scheduler.py
+"""
+import sys
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from agentic_system.core.agent_runtime import AgentRuntime
+from agentic_system.core.f_llm import ExecutionPlan
+
+
+class RecordingTool:
+    """호출 순서와 전달된 의존 결과를 기록하는 도구 (fail_actions는 예외 발생)"""
+
+    def __init__(self, delay=0.0, fail_actions=()):
+        self.delay = delay
+        self.fail_actions = set(fail_actions)
+        self.calls = []
+        self.lock = threading.Lock()
+        self.active = 0
+        self.max_active = 0
+
+    def __call__(self, action, parameters, context):
+        with self.lock:
+            self.calls.append((action, parameters.get("_dependency_results")))
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        try:
+            time.sleep(self.delay)
+            if action in self.fail_actions:
+                raise RuntimeError(f"{action} failed")
+            return {"action": action}
+        finally:
+            with self.lock:
+                self.active -= 1
+
+
+def make_runtime(tool, **kwargs):
+    # 스케줄러만 사용하므로 Agent 2 / 메모리는 사용하지 않음
+    runtime = AgentRuntime(agent2=object(), memory_manager=object(), **kwargs)
+    runtime.register_tool("stub", tool)
+    return runtime
+
+
+def make_plan(*steps):
+    """(step_id, dependencies) 목록으로 실행 계획 생성 (action은 a{step_id})"""
+    return ExecutionPlan(
+        plan_id="plan-test",
+        steps=[
+            {"step_id": step_id, "tool": "stub", "action": f"a{step_id}", "parameters": {},
+             "dependencies": list(dependencies)}
+            for step_id, dependencies in steps
+        ],
+        tools_required=["stub"],
+        parameters={},
+        created_at=datetime.now().isoformat()
+    )
+
+
+def run(runtime, plan):
+    events = []
+    result = runtime._execute_plan(plan, memory=None, progress_callback=events.append)
+    return result, events
+
+
+def test_topological_order():
+    tool = RecordingTool()
+    runtime = make_runtime(tool, max_parallel_steps=1)
+    # 계획 순서와 의존성 순서가 다름: 3 -> 1 -> 2
+    result, _ = run(runtime, make_plan((2, [1]), (1, [3]), (3, [])))
+    assert [action for action, _ in tool.calls] == ["a3", "a1", "a2"]
+    assert tool.calls[1][1] == {3: {"action": "a3"}}
+    assert tool.calls[2][1] == {1: {"action": "a1"}}
+    # 결과는 계획 순서대로, 최종 결과는 가장 큰 step_id
+    assert list(result["steps"]) == [2, 1, 3]
+    assert result["final_result"]["result"] == {"action": "a3"}
+
+
+def test_parallel_branches():
+    tool = RecordingTool(delay=0.2)
+    runtime = make_runtime(tool, max_parallel_steps=4)
+    start = time.monotonic()
+    result, _ = run(runtime, make_plan((1, []), (2, []), (3, []), (4, [1, 2, 3])))
+    elapsed = time.monotonic() - start
+
+    assert tool.max_active == 3
+    # 독립 단계 3개를 순서대로 실행하면 0.8초 이상 걸림
+    assert elapsed < 0.7, f"독립 단계가 직렬 실행됨 ({elapsed:.2f}초)"
+    assert tool.calls[-1] == ("a4", {1: {"action": "a1"}, 2: {"action": "a2"}, 3: {"action": "a3"}})
+    assert all(step["status"] == "success" for step in result["steps"].values())
+
+
+def test_failure_passed_to_dependents():
+    """의존 단계가 실패해도 하위 단계는 실행되고 오류 결과를 전달받음"""
+    tool = RecordingTool(fail_actions={"a1"})
+    runtime = make_runtime(tool)
+    result, events = run(runtime, make_plan((1, []), (2, [1]), (3, [2])))
+
+    assert [action for action, _ in tool.calls] == ["a1", "a2", "a3"]
+    failed = tool.calls[1][1][1]
+    assert failed["status"] == "error" and failed["error"] == "a1 failed"
+    assert result["steps"][1]["status"] == "error"
+    assert result["steps"][2]["status"] == "success"
+    assert not any(event["event"] == "step_skipped" for event in events)
+
+
+def test_skip_on_dependency_failure():
+    tool = RecordingTool(fail_actions={"a1"})
+    runtime = make_runtime(tool, skip_on_dependency_failure=True)
+    result, events = run(runtime, make_plan((1, []), (2, [1]), (3, [2]), (4, [])))
+
+    # 실패는 하위 단계 전체로 전파되고, 독립 단계는 그대로 실행
+    assert sorted(action for action, _ in tool.calls) == ["a1", "a4"]
+    assert "의존 단계 실패" in result["steps"][2]["error"]
+    assert "의존 단계 실패" in result["steps"][3]["error"]
+    assert result["steps"][4]["status"] == "success"
+    assert sorted(event["step_id"] for event in events if event["event"] == "step_skipped") == [2, 3]
+
+
+def test_unresolvable_dependencies():
+    """존재하지 않는 단계 / 순환 의존성은 실행하지 않고 오류로 처리"""
+    tool = RecordingTool()
+    runtime = make_runtime(tool)
+    result, events = run(runtime, make_plan((1, []), (2, [99]), (3, [4]), (4, [3])))
+
+    assert [action for action, _ in tool.calls] == ["a1"]
+    for step_id in (2, 3, 4):
+        assert "의존성을 해결할 수 없습니다" in result["steps"][step_id]["error"]
+    assert sorted(event["step_id"] for event in events if event["event"] == "step_skipped") == [2, 3, 4]
+    assert result["status"] == "completed"
+
+
+def test_progress_events():
+    tool = RecordingTool()
+    runtime = make_runtime(tool)
+    _, events = run(runtime, make_plan((1, []), (2, [1])))
+    names = [(event["event"], event["step_id"]) for event in events]
+    assert names == [("step_started", 1), ("step_finished", 1), ("step_started", 2), ("step_finished", 2)]
+    assert all("timestamp" in event for event in events)
+
+
+def main():
+    tests = [
+        test_topological_order,
+        test_parallel_branches,
+        test_failure_passed_to_dependents,
+        test_skip_on_dependency_failure,
+        test_unresolvable_dependencies,
+        test_progress_events,
+    ]
+    print("=" * 60)
+    print("AgentRuntime Scheduler Test")
+    print("=" * 60)
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"[OK] {test.__name__}")
+        except Exception as e:
+            failed += 1
+            print(f"[FAIL] {test.__name__}: {e!r}")
+    print()
+    print(f"{len(tests) - failed}/{len(tests)} passed")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
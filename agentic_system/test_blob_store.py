@@ -0,0 +1,146 @@
+"""
+ChatGarment 서비스 blob 저장소 테스트 스크립트
+
+BlobStore의 mtime 기반 LRU 정리(최대 용량 / 개수), 기존 파일 인덱스 구성과,
+서비스의 PUT / HEAD /api/v1/blobs/{sha256} 엔드포인트(해시 불일치 거부, 사용 시각 갱신)를
+임시 디렉토리에서 확인합니다. pytest로도 실행할 수 있습니다.
+
+사용법:
+    python test_blob_store.py
+"""
+import hashlib
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+from unittest import mock
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from fastapi.testclient import TestClient
+
+from agentic_system.chatgarment_service import main as service
+from agentic_system.chatgarment_service.blob_store import BlobStore
+
+
+def sha256_of(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def write_blob(blob_dir: Path, data: bytes, mtime: float) -> str:
+    """blob 파일을 만들고 마지막 사용 시각을 mtime으로 설정"""
+    sha256 = sha256_of(data)
+    path = Path(blob_dir) / sha256
+    path.write_bytes(data)
+    os.utime(path, (mtime, mtime))
+    return sha256
+
+
+def test_evicts_least_recently_used():
+    with tempfile.TemporaryDirectory() as tmp:
+        now = time.time()
+        first = write_blob(tmp, b"a" * 100, now - 30)
+        second = write_blob(tmp, b"b" * 100, now - 20)
+        store = BlobStore(Path(tmp), max_bytes=250)
+
+        # 먼저 올린 blob을 사용하면 두 번째 blob이 가장 오래된 항목이 됨
+        assert store.touch(first) is not None
+        third = write_blob(tmp, b"c" * 100, now)
+        store.add(third)
+
+        assert sorted(p.name for p in Path(tmp).iterdir()) == sorted([first, third])
+        assert store.touch(second) is None
+        assert store.total_bytes() == 200
+
+
+def test_max_entries():
+    with tempfile.TemporaryDirectory() as tmp:
+        now = time.time()
+        store = BlobStore(Path(tmp), max_entries=2)
+        hashes = []
+        for i in range(3):
+            hashes.append(write_blob(tmp, bytes([i]) * 10, now - 10 + i))
+            store.add(hashes[-1])
+        assert sorted(p.name for p in Path(tmp).iterdir()) == sorted(hashes[1:])
+
+
+def test_load_index_skips_temp_files():
+    """시작 시 기존 blob으로 인덱스를 만들고 용량 초과분을 정리 (업로드 임시 파일은 그대로)"""
+    with tempfile.TemporaryDirectory() as tmp:
+        now = time.time()
+        old = write_blob(tmp, b"x" * 100, now - 10)
+        new = write_blob(tmp, b"y" * 100, now)
+        temp_file = Path(tmp) / ".upload_0123.tmp"
+        temp_file.write_bytes(b"z" * 1000)
+
+        store = BlobStore(Path(tmp), max_bytes=150)
+        assert not (Path(tmp) / old).exists()
+        assert (Path(tmp) / new).exists() and temp_file.exists()
+        assert store.total_bytes() == 100
+
+
+def test_put_digest_mismatch_rejected():
+    with tempfile.TemporaryDirectory() as tmp:
+        with mock.patch.object(service, "blob_store", BlobStore(Path(tmp))):
+            client = TestClient(service.app)
+            claimed = sha256_of(b"expected image")
+            response = client.put(f"/api/v1/blobs/{claimed}", content=b"other image")
+            assert response.status_code == 400
+            # 저장된 blob도 업로드 임시 파일도 남지 않음
+            assert list(Path(tmp).iterdir()) == []
+            assert client.head(f"/api/v1/blobs/{claimed}").status_code == 404
+            assert client.put("/api/v1/blobs/not-a-hash", content=b"x").status_code == 400
+
+
+def test_put_and_head_touch_blob():
+    with tempfile.TemporaryDirectory() as tmp:
+        with mock.patch.object(service, "blob_store", BlobStore(Path(tmp))):
+            client = TestClient(service.app)
+            data = b"image bytes"
+            sha256 = sha256_of(data)
+            response = client.put(f"/api/v1/blobs/{sha256}", content=data)
+            assert response.status_code == 201 and response.json()["created"] is True
+            assert (Path(tmp) / sha256).read_bytes() == data
+
+            # HEAD / 중복 PUT은 마지막 사용 시각을 갱신
+            path = Path(tmp) / sha256
+            os.utime(path, (0, 0))
+            response = client.head(f"/api/v1/blobs/{sha256}")
+            assert response.status_code == 200
+            assert response.headers["content-length"] == str(len(data))
+            assert path.stat().st_mtime > 0
+
+            os.utime(path, (0, 0))
+            response = client.put(f"/api/v1/blobs/{sha256}", content=data)
+            assert response.status_code == 200 and response.json()["created"] is False
+            assert path.stat().st_mtime > 0
+
+
+def main():
+    tests = [
+        test_evicts_least_recently_used,
+        test_max_entries,
+        test_load_index_skips_temp_files,
+        test_put_digest_mismatch_rejected,
+        test_put_and_head_touch_blob,
+    ]
+    print("=" * 60)
+    print("ChatGarment Blob Store Test")
+    print("=" * 60)
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"[OK] {test.__name__}")
+        except Exception as e:
+            failed += 1
+            print(f"[FAIL] {test.__name__}: {e!r}")
+    print()
+    print(f"{len(tests) - failed}/{len(tests)} passed")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,236 @@
+"""
+ChatGarment 마이크로 배칭 테스트 스크립트
+
+MicroBatcher의 배치 수집 / 요청별 예외 전달과, ChatGarmentPipeline이 길이가 다른 동시 요청을
+이미지 토큰 뒤 패딩으로 한 배치에 묶고 패딩 위치를 attention_mask / position_ids에 반영하는지,
+float_preds를 seg_token_mask 기준으로 요청별로 나누어 돌려주는지 확인합니다.
+실제 모델 대신 evaluate / 언어 모델 forward 호출을 기록하는 가짜 모델을 사용합니다.
+torch가 없으면 건너뜁니다. pytest로도 실행할 수 있습니다.
+
+사용법:
+    python test_chatgarment_batching.py
+"""
+import sys
+import threading
+import types
+from pathlib import Path
+from unittest import mock
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+try:
+    import torch
+    from agentic_system.tools import chatgarment_integration
+    from agentic_system.tools.batching import MicroBatcher
+    from agentic_system.tools.chatgarment_integration import ChatGarmentPipeline
+    TORCH_AVAILABLE = True
+except ImportError:
+    TORCH_AVAILABLE = False
+
+# LLaVA IMAGE_TOKEN_INDEX와 같은 값
+IMAGE = -200
+PAD, BOS, EOS, SEG = 0, 1, 2, 3
+NUM_IMAGE_TOKENS = 4
+HIDDEN_SIZE = 8
+
+
+class FakeLanguageModel:
+    """forward 인자 기록 (파이프라인이 forward를 래퍼로 교체)"""
+
+    def __init__(self):
+        self.calls = []
+
+    def forward(self, **kwargs):
+        self.calls.append(kwargs)
+        return kwargs
+
+
+class FakeModel:
+    """
+    LLaVA evaluate 흉내
+
+    행마다 프롬프트 마지막 토큰(요청 번호 r)만큼 [SEG]를 생성하고,
+    float_preds는 배치 전체 [SEG]에 대해 평탄화된 [r, j] 값으로 반환한다.
+    """
+
+    def __init__(self):
+        self.language_model = FakeLanguageModel()
+        self.batches = []
+
+    def get_model(self):
+        return self.language_model
+
+    def evaluate(self, images, images_clip, input_ids, max_new_tokens, tokenizer):
+        self.batches.append(input_ids.clone())
+        batch_size, length = input_ids.shape
+        # 이미지 토큰을 특징 NUM_IMAGE_TOKENS개로 바꾼 prefill, 이어서 디코딩 1단계
+        embeds_length = length - 1 + NUM_IMAGE_TOKENS
+        self.language_model.forward(inputs_embeds=torch.zeros(batch_size, embeds_length, HIDDEN_SIZE))
+        past = ((torch.zeros(batch_size, 1, embeds_length, 2), torch.zeros(batch_size, 1, embeds_length, 2)),)
+        self.language_model.forward(inputs_embeds=torch.zeros(batch_size, 1, HIDDEN_SIZE), past_key_values=past)
+
+        request_ids = input_ids[:, -1].tolist()
+        output_ids = torch.full((batch_size, max(request_ids) + 3), PAD)
+        preds = []
+        for row, request_id in enumerate(request_ids):
+            output_ids[row, 0] = BOS
+            output_ids[row, 1:request_id + 1] = SEG
+            output_ids[row, request_id + 1] = EOS
+            preds += [[float(request_id), float(j)] for j in range(request_id)]
+        return output_ids, torch.tensor(preds), output_ids == SEG
+
+
+def make_pipeline(install_padding_mask=True):
+    pipeline = ChatGarmentPipeline(device="cpu", max_batch_size=4, batch_wait_ms=300)
+    pipeline.model = FakeModel()
+    pipeline.tokenizer = types.SimpleNamespace(pad_token_id=PAD, unk_token_id=PAD, eos_token_id=EOS)
+    if install_padding_mask:
+        pipeline._install_padding_mask()
+    return pipeline
+
+
+def prompt(request_id, text_length):
+    """[BOS, 시스템 프롬프트, 이미지, 요청별 텍스트..., 요청 번호]"""
+    return torch.tensor([[BOS, 10, 11, IMAGE] + [20] * text_length + [request_id]])
+
+
+def run_concurrently(pipeline, prompts):
+    """prompts를 서로 다른 스레드에서 동시에 _generate로 실행"""
+    results = {}
+    barrier = threading.Barrier(len(prompts))
+
+    def worker(request_id, input_ids):
+        barrier.wait()
+        results[request_id] = pipeline._generate("pattern", torch.zeros(1, 3, 2, 2), input_ids)
+
+    threads = [threading.Thread(target=worker, args=item) for item in prompts.items()]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(10)
+    return results
+
+
+def skip_without_torch():
+    if not TORCH_AVAILABLE:
+        print("[SKIP] torch가 설치되지 않아 건너뜁니다")
+        return True
+    return False
+
+
+def test_micro_batcher():
+    if skip_without_torch():
+        return
+    calls = []
+
+    def run_batch(items):
+        calls.append(list(items))
+        return [ValueError(item) if item < 0 else item * 2 for item in items]
+
+    batcher = MicroBatcher(run_batch, max_batch_size=3, max_wait_ms=300, name="test")
+    futures = [batcher.submit_async(item) for item in (1, -1, 2, 3)]
+    assert futures[0].result(5) == 2 and futures[2].result(5) == 4 and futures[3].result(5) == 6
+    try:
+        futures[1].result(5)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("요청별 예외가 전달되지 않음")
+    batcher.close()
+    assert [len(items) for items in calls] == [3, 1]
+
+
+def test_padded_batch_splits_float_preds():
+    """길이가 다른 동시 요청이 한 배치로 실행되고 float_preds는 요청별로 분리"""
+    if skip_without_torch():
+        return
+    pipeline = make_pipeline()
+    lengths = {1: 5, 2: 1, 3: 3}
+    with mock.patch.object(chatgarment_integration, "IMAGE_TOKEN_INDEX", IMAGE, create=True):
+        results = run_concurrently(pipeline, {r: prompt(r, n) for r, n in lengths.items()})
+
+    model = pipeline.model
+    assert len(model.batches) == 1
+    batch = model.batches[0]
+    max_length = 4 + max(lengths.values()) + 1
+    assert batch.shape == (3, max_length)
+
+    for request_id, text_length in lengths.items():
+        output_ids, float_preds = results[request_id]
+        # 먼저 끝난 요청의 EOS 뒤 패딩은 제거되고, [SEG] 개수만큼의 float_preds만 받음
+        assert output_ids.tolist() == [BOS] + [SEG] * request_id + [EOS]
+        assert float_preds.shape == (request_id, 2)
+        assert float_preds[:, 0].tolist() == [float(request_id)] * request_id
+        assert float_preds[:, 1].tolist() == [float(j) for j in range(request_id)]
+
+    prefill, decode = model.language_model.calls
+    embeds_length = max_length - 1 + NUM_IMAGE_TOKENS
+    assert prefill["attention_mask"].shape == (3, embeds_length)
+    assert decode["attention_mask"].shape == (3, embeds_length + 1)
+    assert decode["position_ids"].shape == (3, 1)
+    for row in range(3):
+        request_id = int(batch[row, -1])
+        pad_length = max_length - (4 + lengths[request_id] + 1)
+        # 패딩은 이미지 토큰 바로 뒤
+        assert batch[row, :4].tolist() == [BOS, 10, 11, IMAGE]
+        assert batch[row, 4:4 + pad_length].tolist() == [PAD] * pad_length
+        assert batch[row, 4 + pad_length:].tolist() == [20] * lengths[request_id] + [request_id]
+        # 패딩 위치(이미지 특징 뒤)만 마스킹, 위치 번호는 패딩을 건너뜀
+        start = 3 + NUM_IMAGE_TOKENS
+        expected_mask = [1] * embeds_length
+        expected_mask[start:start + pad_length] = [0] * pad_length
+        assert prefill["attention_mask"][row].tolist() == expected_mask
+        valid_length = embeds_length - pad_length
+        assert int(prefill["position_ids"][row, -1]) == valid_length - 1
+        assert int(decode["position_ids"][row, 0]) == valid_length
+
+
+def test_equal_length_batch_unmasked():
+    if skip_without_torch():
+        return
+    pipeline = make_pipeline()
+    with mock.patch.object(chatgarment_integration, "IMAGE_TOKEN_INDEX", IMAGE, create=True):
+        results = run_concurrently(pipeline, {1: prompt(1, 2), 2: prompt(2, 2)})
+    assert len(pipeline.model.batches) == 1
+    # 패딩이 없으면 forward 인자를 바꾸지 않음
+    assert all("attention_mask" not in call for call in pipeline.model.language_model.calls)
+    assert results[2][1].shape == (2, 2)
+
+
+def test_fallback_without_padding_mask():
+    """패딩 마스크를 적용할 수 없으면 요청별로 실행"""
+    if skip_without_torch():
+        return
+    pipeline = make_pipeline(install_padding_mask=False)
+    with mock.patch.object(chatgarment_integration, "IMAGE_TOKEN_INDEX", IMAGE, create=True):
+        results = run_concurrently(pipeline, {1: prompt(1, 4), 2: prompt(2, 1)})
+    assert sorted(tuple(batch.shape) for batch in pipeline.model.batches) == [(1, 6), (1, 9)]
+    assert results[1][1].shape == (1, 2) and results[2][1].shape == (2, 2)
+
+
+def main():
+    tests = [
+        test_micro_batcher,
+        test_padded_batch_splits_float_preds,
+        test_equal_length_batch_unmasked,
+        test_fallback_without_padding_mask,
+    ]
+    print("=" * 60)
+    print("ChatGarment Batching Test")
+    print("=" * 60)
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"[OK] {test.__name__}")
+        except Exception as e:
+            failed += 1
+            print(f"[FAIL] {test.__name__}: {e!r}")
+    print()
+    print(f"{len(tests) - failed}/{len(tests)} passed")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
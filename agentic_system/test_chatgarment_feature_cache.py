@@ -0,0 +1,179 @@
+"""
+ChatGarment 비전 특징 캐시 테스트 스크립트
+
+_ImageFeatureCache의 LRU 조회 / 제거와, ChatGarmentPipeline이 교체한 encode_images가
+현재 스레드에 등록된 이미지 키(_active_image_keys)로 캐시를 조회하여 없는 행만 인코딩하는지,
+키가 없는 호출이나 다른 스레드의 호출은 그대로 원래 함수로 넘기는지 확인합니다.
+실제 모델 대신 encode_images 호출을 기록하는 가짜 모델을 사용합니다.
+torch가 없으면 건너뜁니다. pytest로도 실행할 수 있습니다.
+
+사용법:
+    python test_chatgarment_feature_cache.py
+"""
+import sys
+import threading
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+try:
+    import torch
+    from agentic_system.tools.chatgarment_integration import ChatGarmentPipeline, _ImageFeatureCache
+    TORCH_AVAILABLE = True
+except ImportError:
+    TORCH_AVAILABLE = False
+
+
+class FakeModel:
+    """encode_images 흉내 (호출마다 배치 크기 기록, 특징 = 픽셀 평탄화 x 2)"""
+
+    def __init__(self):
+        self.encoded = []
+
+    def encode_images(self, images):
+        self.encoded.append(images.shape[0])
+        return images.flatten(1) * 2
+
+
+def make_pipeline(cache_size=4):
+    pipeline = ChatGarmentPipeline(device="cpu", max_batch_size=1)
+    pipeline.model = FakeModel()
+    pipeline._feature_cache = _ImageFeatureCache(cache_size)
+    pipeline._install_feature_cache()
+    return pipeline
+
+
+def image(value):
+    return torch.full((1, 3, 2, 2), float(value))
+
+
+def skip_without_torch():
+    if not TORCH_AVAILABLE:
+        print("[SKIP] torch가 설치되지 않아 건너뜁니다")
+        return True
+    return False
+
+
+def test_lru_eviction():
+    if skip_without_torch():
+        return
+    cache = _ImageFeatureCache(2)
+    cache.put("a", torch.zeros(1))
+    cache.put("b", torch.ones(1))
+    # 조회한 항목은 가장 최근으로 이동하므로 가장 오래된 b가 제거됨
+    assert cache.get("a") is not None
+    cache.put("c", torch.ones(1))
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
+
+    cache.clear()
+    assert cache.get("a") is None
+
+    # max_entries가 0이면 캐시하지 않음
+    disabled = _ImageFeatureCache(0)
+    disabled.put("a", torch.zeros(1))
+    assert disabled.get("a") is None
+
+
+def test_cached_encode_reuses_features():
+    """같은 이미지 키는 한 번만 인코딩하고, 배치에서는 캐시에 없는 행만 인코딩"""
+    if skip_without_torch():
+        return
+    pipeline = make_pipeline()
+    model_encoded = pipeline.model.encoded
+
+    with pipeline._active_image_keys(["a"]):
+        first = pipeline.model.encode_images(image(1))
+    with pipeline._active_image_keys(["a"]):
+        second = pipeline.model.encode_images(image(1))
+    assert model_encoded == [1]
+    assert torch.equal(first, second) and first.shape == (1, 12)
+
+    with pipeline._active_image_keys(["b", "a", "c"]):
+        batch = pipeline.model.encode_images(torch.cat([image(2), image(1), image(3)]))
+    assert model_encoded == [1, 2]
+    assert batch[:, 0].tolist() == [4.0, 2.0, 6.0]
+
+    # 컨텍스트를 벗어나면 키가 지워져 캐시를 사용하지 않음
+    assert pipeline._image_keys.keys is None
+    pipeline.model.encode_images(image(1))
+    assert model_encoded == [1, 2, 1]
+
+
+def test_cache_bypassed_without_matching_keys():
+    """키가 하나라도 없거나 배치 크기와 키 개수가 다르면 원래 encode_images 사용"""
+    if skip_without_torch():
+        return
+    pipeline = make_pipeline()
+    with pipeline._active_image_keys(["a", None]):
+        pipeline.model.encode_images(torch.cat([image(1), image(2)]))
+    with pipeline._active_image_keys(["a"]):
+        pipeline.model.encode_images(torch.cat([image(1), image(2)]))
+    assert pipeline.model.encoded == [2, 2]
+    assert pipeline._feature_cache.get("a") is None
+
+
+def test_cache_eviction_by_key():
+    if skip_without_torch():
+        return
+    pipeline = make_pipeline(cache_size=1)
+    for key, value in (("a", 1), ("b", 2), ("a", 1)):
+        with pipeline._active_image_keys([key]):
+            pipeline.model.encode_images(image(value))
+    # 크기 1 캐시에서 b가 a를 밀어내므로 a는 다시 인코딩
+    assert pipeline.model.encoded == [1, 1, 1]
+    assert pipeline._feature_cache.get("b") is None
+
+
+def test_image_keys_are_thread_local():
+    """다른 스레드의 evaluate에 등록된 키는 보이지 않음"""
+    if skip_without_torch():
+        return
+    pipeline = make_pipeline()
+    registered, done = threading.Event(), threading.Event()
+
+    def holder():
+        with pipeline._active_image_keys(["a"]):
+            registered.set()
+            done.wait(5)
+
+    thread = threading.Thread(target=holder)
+    thread.start()
+    try:
+        assert registered.wait(5)
+        pipeline.model.encode_images(image(1))
+        pipeline.model.encode_images(image(1))
+    finally:
+        done.set()
+        thread.join(5)
+    assert pipeline.model.encoded == [1, 1]
+    assert pipeline._feature_cache.get("a") is None
+
+
+def main():
+    tests = [
+        test_lru_eviction,
+        test_cached_encode_reuses_features,
+        test_cache_bypassed_without_matching_keys,
+        test_cache_eviction_by_key,
+        test_image_keys_are_thread_local,
+    ]
+    print("=" * 60)
+    print("ChatGarment Feature Cache Test")
+    print("=" * 60)
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"[OK] {test.__name__}")
+        except Exception as e:
+            failed += 1
+            print(f"[FAIL] {test.__name__}: {e!r}")
+    print()
+    print(f"{len(tests) - failed}/{len(tests)} passed")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
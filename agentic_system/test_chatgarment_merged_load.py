@@ -0,0 +1,187 @@
+"""
+ChatGarment 병합 체크포인트 로딩 테스트 스크립트
+
+merged_info.json으로 병합 체크포인트 사용 여부를 판단하는지(_merged_checkpoint_ready)와,
+병합본 로딩이 실패하면 일부만 설정된 상태를 버리고 기존 방식(베이스 모델 + pytorch_model.bin)으로
+다시 로딩하는지 확인합니다. transformers / 모델 클래스는 호출을 기록하는 MagicMock으로 바꿉니다.
+torch가 없으면 건너뜁니다. pytest로도 실행할 수 있습니다.
+
+사용법:
+    python test_chatgarment_merged_load.py
+"""
+import json
+import sys
+import tempfile
+from contextlib import ExitStack
+from pathlib import Path
+from unittest import mock
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+try:
+    import torch
+    from agentic_system.tools import chatgarment_integration
+    from agentic_system.tools.chatgarment_integration import MERGED_INFO_FILE, ChatGarmentPipeline
+    TORCH_AVAILABLE = True
+except ImportError:
+    TORCH_AVAILABLE = False
+
+
+def make_pipeline(tmp):
+    """tmp 아래 베이스 모델 / 체크포인트 / 병합본 경로를 쓰는 파이프라인"""
+    tmp = Path(tmp)
+    checkpoint_path = tmp / "pytorch_model.bin"
+    checkpoint_path.write_bytes(b"weights")
+    pipeline = ChatGarmentPipeline(
+        model_path=str(tmp / "base"),
+        checkpoint_path=str(checkpoint_path),
+        device="cpu",
+        max_batch_size=1,
+        merged_path=str(tmp / "merged")
+    )
+    return pipeline
+
+
+def write_merged_info(pipeline, source_version=None):
+    merged_dir = Path(pipeline.merged_path)
+    merged_dir.mkdir(parents=True, exist_ok=True)
+    info = {"source_version": source_version or pipeline.model_version}
+    (merged_dir / MERGED_INFO_FILE).write_text(json.dumps(info), encoding="utf-8")
+
+
+def patch_loaders(pipeline, failing_path=None):
+    """
+    transformers / 모델 클래스 / 인자 클래스를 MagicMock으로 교체
+
+    failing_path에서 모델을 불러오면 예외가 발생한다. 마무리 단계(_finish_loading)는
+    대화 템플릿 / 캐시 연결 대신 model_loaded만 설정한다.
+    """
+    model_class = mock.MagicMock(name="GarmentGPTFloat50ForCausalLM")
+
+    def from_pretrained(path, **kwargs):
+        if path == failing_path:
+            raise OSError(f"로딩 실패: {path}")
+        return mock.MagicMock(name=f"model({Path(path).name})")
+
+    model_class.from_pretrained.side_effect = from_pretrained
+
+    def finish_loading():
+        pipeline.model_loaded = True
+
+    stack = ExitStack()
+    for name in ("transformers", "ModelArguments", "DataArguments", "TrainingArguments"):
+        stack.enter_context(mock.patch.object(chatgarment_integration, name, mock.MagicMock(), create=True))
+    stack.enter_context(mock.patch.object(
+        chatgarment_integration, "GarmentGPTFloat50ForCausalLM", model_class, create=True
+    ))
+    stack.enter_context(mock.patch.object(pipeline, "_finish_loading", finish_loading))
+    return stack, model_class
+
+
+def loaded_paths(model_class):
+    return [call.args[0] for call in model_class.from_pretrained.call_args_list]
+
+
+def skip_without_torch():
+    if not TORCH_AVAILABLE:
+        print("[SKIP] torch가 설치되지 않아 건너뜁니다")
+        return True
+    return False
+
+
+def test_merged_checkpoint_ready():
+    if skip_without_torch():
+        return
+    with tempfile.TemporaryDirectory() as tmp:
+        pipeline = make_pipeline(tmp)
+        assert not pipeline._merged_checkpoint_ready()
+
+        write_merged_info(pipeline)
+        assert pipeline._merged_checkpoint_ready()
+
+        # 원본 체크포인트가 바뀌면 오래된 병합본은 사용하지 않음
+        write_merged_info(pipeline, source_version="pytorch_model.bin:1:0")
+        assert not pipeline._merged_checkpoint_ready()
+
+        # 원본 체크포인트가 없으면(병합본만 배포) 버전 확인 없이 사용
+        Path(pipeline.checkpoint_path).unlink()
+        assert pipeline._merged_checkpoint_ready()
+
+        (Path(pipeline.merged_path) / MERGED_INFO_FILE).write_text("{broken", encoding="utf-8")
+        assert not pipeline._merged_checkpoint_ready()
+
+
+def test_merged_load_skips_base_model():
+    if skip_without_torch():
+        return
+    with tempfile.TemporaryDirectory() as tmp:
+        pipeline = make_pipeline(tmp)
+        write_merged_info(pipeline)
+        stack, model_class = patch_loaders(pipeline)
+        with stack:
+            pipeline.load_model()
+        assert pipeline.model_loaded
+        assert loaded_paths(model_class) == [pipeline.merged_path]
+        assert model_class.from_pretrained.call_args.kwargs["use_safetensors"] is True
+
+
+def test_falls_back_to_unmerged_load():
+    """병합본 로딩 중 예외가 나면 기존 방식으로 다시 로딩"""
+    if skip_without_torch():
+        return
+    with tempfile.TemporaryDirectory() as tmp:
+        pipeline = make_pipeline(tmp)
+        write_merged_info(pipeline)
+        Path(pipeline.checkpoint_path).unlink()
+        stack, model_class = patch_loaders(pipeline, failing_path=pipeline.merged_path)
+        with stack:
+            tokenizer_loader = chatgarment_integration.transformers.AutoTokenizer.from_pretrained
+            pipeline.load_model()
+        assert pipeline.model_loaded
+        assert loaded_paths(model_class) == [pipeline.merged_path, pipeline.model_path]
+        # 병합본에서 불러온 토크나이저는 버리고 베이스 모델에서 다시 로딩
+        tokenizer_paths = [call.args[0] for call in tokenizer_loader.call_args_list]
+        assert tokenizer_paths == [pipeline.merged_path, pipeline.model_path]
+
+
+def test_use_merged_false_ignores_merged_checkpoint():
+    """save_merged_checkpoint는 병합본이 있어도 원본 체크포인트로 로딩"""
+    if skip_without_torch():
+        return
+    with tempfile.TemporaryDirectory() as tmp:
+        pipeline = make_pipeline(tmp)
+        write_merged_info(pipeline)
+        Path(pipeline.checkpoint_path).unlink()
+        stack, model_class = patch_loaders(pipeline)
+        with stack:
+            pipeline._load_model_locked(use_merged=False)
+        assert pipeline.model_loaded
+        assert loaded_paths(model_class) == [pipeline.model_path]
+
+
+def main():
+    tests = [
+        test_merged_checkpoint_ready,
+        test_merged_load_skips_base_model,
+        test_falls_back_to_unmerged_load,
+        test_use_merged_false_ignores_merged_checkpoint,
+    ]
+    print("=" * 60)
+    print("ChatGarment Merged Checkpoint Load Test")
+    print("=" * 60)
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"[OK] {test.__name__}")
+        except Exception as e:
+            failed += 1
+            print(f"[FAIL] {test.__name__}: {e!r}")
+    print()
+    print(f"{len(tests) - failed}/{len(tests)} passed")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
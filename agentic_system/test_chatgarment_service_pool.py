@@ -0,0 +1,111 @@
+"""
+ChatGarment 서비스 로드 밸런싱 테스트 스크립트
+
+Mock 모드 서비스 인스턴스 여러 개를 로컬 포트에 띄우고
+ChatGarmentServicePool의 분산(least outstanding)과 인스턴스 장애 시 재시도를 확인합니다.
+
+사용법:
+    python test_chatgarment_service_pool.py [인스턴스 수]
+"""
+import os
+import sys
+import tempfile
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+import subprocess
+
+import requests
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+service_main = Path(__file__).parent / "chatgarment_service" / "main.py"
+BASE_PORT = 9101
+
+
+def start_instances(count):
+    """Mock 모드 서비스 인스턴스 시작"""
+    processes = []
+    for i in range(count):
+        env = dict(os.environ)
+        env["CHATGARMENT_SERVICE_MOCK"] = "true"
+        env["CHATGARMENT_SERVICE_PORT"] = str(BASE_PORT + i)
+        processes.append(subprocess.Popen(
+            [sys.executable, str(service_main)],
+            env=env,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL
+        ))
+    return processes
+
+
+def wait_ready(urls, timeout=60):
+    """모든 인스턴스가 /ready 200을 반환할 때까지 대기"""
+    deadline = time.time() + timeout
+    pending = set(urls)
+    while pending and time.time() < deadline:
+        for url in list(pending):
+            try:
+                if requests.get(f"{url}/ready", timeout=1).status_code == 200:
+                    pending.discard(url)
+            except requests.exceptions.RequestException:
+                pass
+        time.sleep(0.5)
+    return not pending
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    urls = [f"http://127.0.0.1:{BASE_PORT + i}" for i in range(count)]
+
+    print("=" * 60)
+    print(f"[테스트] Mock 서비스 인스턴스 {count}개 시작: {', '.join(urls)}")
+    print("=" * 60)
+    processes = start_instances(count)
+
+    try:
+        if not wait_ready(urls):
+            print("[오류] 서비스 인스턴스가 준비되지 않았습니다.")
+            return
+
+        from agentic_system.tools.extensions_service import ChatGarmentServicePool
+        pool = ChatGarmentServicePool(urls)
+
+        with tempfile.NamedTemporaryFile(suffix=".jpg", delete=False) as f:
+            f.write(os.urandom(1024))
+            image_path = f.name
+
+        # 1. 동시 요청 분산
+        print("\n[테스트 1] 동시 요청 분산")
+        with ThreadPoolExecutor(max_workers=count * 2) as executor:
+            results = list(executor.map(lambda _: pool.analyze_image(image_path), range(count * 6)))
+        distribution = Counter(result.get("service_url") for result in results)
+        print(f"  성공: {sum(result.get('status') == 'success' for result in results)}/{len(results)}")
+        for url, n in sorted(distribution.items(), key=lambda item: str(item[0])):
+            print(f"  {url}: {n}개")
+
+        # 2. 인스턴스 하나 종료 후 재시도
+        print(f"\n[테스트 2] 인스턴스 종료 후 재시도: {urls[0]}")
+        processes[0].terminate()
+        processes[0].wait(10)
+        results = [pool.analyze_image(image_path) for _ in range(count * 2)]
+        print(f"  성공: {sum(result.get('status') == 'success' for result in results)}/{len(results)}")
+        print(f"  종료된 인스턴스로 응답한 요청: {sum(result.get('service_url') == urls[0] for result in results)}개")
+        for backend in pool.snapshot()["backends"]:
+            print(f"  {backend['service_url']}: healthy={backend['healthy']}, circuit={backend['circuit']['state']}")
+
+        pool.close()
+        os.remove(image_path)
+    finally:
+        for process in processes:
+            if process.poll() is None:
+                process.terminate()
+                process.wait(10)
+
+    print("\n[완료] 로드 밸런싱 테스트 종료")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+"""
+대화 기록 페이지네이션 테스트 스크립트
+
+ShortTermMemory.get_conversation_page의 seq 커서, 오래된 기록 제거 후 커서,
+저장 형식(압축 / 이전 dict 형식) 복원, API 응답의 타임스탬프 형식(ISO timestamp + epoch ts)을 확인합니다.
+pytest로도 실행할 수 있습니다.
+
+사용법:
+    python test_conversation_pagination.py
+"""
+import sys
+from datetime import datetime
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from agentic_system.core.memory import ShortTermMemory, SHORT_TERM_MAX_HISTORY
+
+
+def make_memory(count, max_size=10):
+    memory = ShortTermMemory("s1", max_size=max_size)
+    for i in range(1, count + 1):
+        memory.add_conversation(f"q{i}", f"a{i}")
+    return memory
+
+
+def seqs(records):
+    return [record.seq for record in records]
+
+
+def test_empty():
+    memory = ShortTermMemory("s1")
+    assert memory.get_conversation_page() == ([], None)
+
+
+def test_walk_pages():
+    """next_cursor를 before로 넘기면 빠짐없이 과거 방향으로 이어짐"""
+    memory = make_memory(7)
+    records, cursor = memory.get_conversation_page(limit=3)
+    assert seqs(records) == [5, 6, 7]
+    assert cursor == 5
+
+    records, cursor = memory.get_conversation_page(before=cursor, limit=3)
+    assert seqs(records) == [2, 3, 4]
+    assert cursor == 2
+
+    records, cursor = memory.get_conversation_page(before=cursor, limit=3)
+    assert seqs(records) == [1]
+    assert cursor is None
+
+
+def test_exact_fit():
+    memory = make_memory(3)
+    records, cursor = memory.get_conversation_page(limit=3)
+    assert seqs(records) == [1, 2, 3]
+    assert cursor is None
+
+
+def test_after_eviction():
+    """max_size를 넘어 앞쪽 기록이 지워져도 seq는 이어지고 커서도 맞음"""
+    memory = make_memory(15, max_size=10)
+    assert seqs(memory.conversation_history) == list(range(6, 16))
+
+    records, cursor = memory.get_conversation_page(limit=4)
+    assert seqs(records) == [12, 13, 14, 15]
+    records, cursor = memory.get_conversation_page(before=cursor, limit=4)
+    assert seqs(records) == [8, 9, 10, 11]
+    records, cursor = memory.get_conversation_page(before=cursor, limit=4)
+    assert seqs(records) == [6, 7]
+    assert cursor is None
+
+
+def test_cursor_out_of_range():
+    memory = make_memory(15, max_size=10)
+    # 이미 지워진 구간의 커서는 빈 페이지
+    assert memory.get_conversation_page(before=3) == ([], None)
+    # 최신 기록보다 큰 커서는 처음부터
+    records, _ = memory.get_conversation_page(before=100, limit=2)
+    assert seqs(records) == [14, 15]
+    assert memory.get_conversation_page(limit=0) == ([], None)
+
+
+def test_restore_keeps_seq():
+    memory = make_memory(12, max_size=10)
+    restored = ShortTermMemory.from_dict("s1", memory.to_dict())
+    assert seqs(restored.conversation_history) == list(range(3, 13))
+    restored.add_conversation("q13", "a13")
+    assert restored.conversation_history[-1].seq == 13
+
+
+def test_restore_legacy_format():
+    """seq가 없는 이전 형식(dict + ISO 타임스탬프)은 1부터 번호를 매김"""
+    data = {
+        "conversation_history": [
+            {"timestamp": "2024-01-01T00:00:00", "user_input": "q1", "agent_response": "a1", "metadata": {}},
+            {"timestamp": "2024-01-01T00:01:00", "user_input": "q2", "agent_response": "a2", "metadata": {}},
+        ],
+        "context": {"style": "캐주얼"}
+    }
+    memory = ShortTermMemory.from_dict("s1", data)
+    records, cursor = memory.get_conversation_page(limit=1)
+    assert seqs(records) == [2]
+    assert records[0].user_input == "q2"
+    assert cursor == 2
+    assert memory.get_context("style") == "캐주얼"
+
+
+def test_record_dict_timestamps():
+    """timestamp는 기존 API와 같은 ISO 문자열, ts는 epoch 초"""
+    memory = make_memory(1)
+    record = memory.get_conversation_history()[0]
+    assert isinstance(record["timestamp"], str)
+    assert isinstance(record["ts"], float)
+    assert abs(datetime.fromisoformat(record["timestamp"]).timestamp() - record["ts"]) < 1e-3
+    assert record["metadata"] == {}
+
+
+def test_default_retention():
+    memory = ShortTermMemory("s1")
+    assert memory.max_size == SHORT_TERM_MAX_HISTORY
+    for i in range(SHORT_TERM_MAX_HISTORY + 5):
+        memory.add_conversation(f"q{i}", f"a{i}")
+    assert len(memory.conversation_history) == SHORT_TERM_MAX_HISTORY
+    assert memory.conversation_history[0].seq == 6
+
+
+def main():
+    tests = [
+        test_empty,
+        test_walk_pages,
+        test_exact_fit,
+        test_after_eviction,
+        test_cursor_out_of_range,
+        test_restore_keeps_seq,
+        test_restore_legacy_format,
+        test_record_dict_timestamps,
+        test_default_retention,
+    ]
+    print("=" * 60)
+    print("Conversation Pagination Test")
+    print("=" * 60)
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"[OK] {test.__name__}")
+        except Exception as e:
+            failed += 1
+            print(f"[FAIL] {test.__name__}: {e!r}")
+    print()
+    print(f"{len(tests) - failed}/{len(tests)} passed")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
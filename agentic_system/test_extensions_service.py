@@ -0,0 +1,336 @@
+"""
+ChatGarment 서비스 클라이언트 테스트 스크립트
+
+ChatGarmentServiceClient의 연결 풀 Session 공유 / 재사용, 캐시된 헬스 상태 확인,
+이미지 참조 전달(해시 확인 후 필요 시 업로드)과, ChatGarmentServicePool의
+least-outstanding 라우팅 / 다른 인스턴스로의 재시도를 가짜 Session으로 확인합니다.
+실제 서비스 없이 실행되며 pytest로도 실행할 수 있습니다.
+
+사용법:
+    python test_extensions_service.py
+"""
+import json
+import os
+import sys
+import tempfile
+import threading
+from pathlib import Path
+from unittest import mock
+from urllib.parse import urlsplit
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import requests
+
+from agentic_system.tools import extensions_service
+from agentic_system.tools.extensions_service import (
+    ChatGarmentServiceClient,
+    ChatGarmentServicePool,
+    create_pooled_session,
+)
+
+URL_A = "http://service-a:9000"
+URL_B = "http://service-b:9000"
+
+
+class StubResponse:
+    def __init__(self, status_code=200, payload=None):
+        self.status_code = status_code
+        self._payload = payload if payload is not None else {}
+        self.text = json.dumps(self._payload)
+
+    def json(self):
+        return self._payload
+
+
+def default_handler(method, path, kwargs):
+    """정상 서비스: 준비 완료, blob 있음, 요청 성공"""
+    if path == "/health":
+        return StubResponse(200, {"status": "healthy", "ready": True})
+    if method == "POST":
+        return StubResponse(200, {"status": "success"})
+    return StubResponse(200)
+
+
+class StubSession:
+    """requests.Session 흉내 (호스트별 응답 함수, 호출 기록)"""
+
+    def __init__(self, handlers=None):
+        self.handlers = handlers or {}
+        self.calls = []
+        self.closed = False
+        self._lock = threading.Lock()
+
+    def request(self, method, url, **kwargs):
+        parts = urlsplit(url)
+        host = f"{parts.scheme}://{parts.netloc}"
+        with self._lock:
+            self.calls.append((method, host, parts.path))
+        return self.handlers.get(host, default_handler)(method, parts.path, kwargs)
+
+    def get(self, url, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def head(self, url, **kwargs):
+        return self.request("HEAD", url, **kwargs)
+
+    def put(self, url, **kwargs):
+        return self.request("PUT", url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+    def close(self):
+        self.closed = True
+
+    def paths(self, method=None, host=None):
+        with self._lock:
+            return [p for m, h, p in self.calls if (method is None or m == method) and (host is None or h == host)]
+
+
+def make_image():
+    """임시 이미지 파일 경로 (호출자가 삭제)"""
+    with tempfile.NamedTemporaryFile(suffix=".jpg", delete=False) as f:
+        f.write(os.urandom(256))
+        return f.name
+
+
+def test_pooled_session():
+    session = create_pooled_session(4)
+    try:
+        adapter = session.get_adapter("http://service-a:9000")
+        assert adapter._pool_connections == 4 and adapter._pool_maxsize == 4
+        assert adapter is session.get_adapter("https://service-b")
+        assert session.headers["Connection"] == "keep-alive"
+    finally:
+        session.close()
+
+
+def test_client_reuses_injected_session():
+    session = StubSession()
+    client = ChatGarmentServiceClient(service_url=URL_A, session=session)
+    image_path = make_image()
+    try:
+        assert client.analyze_image(image_path)["status"] == "success"
+        assert client.process_image(image_path, "셔츠")["status"] == "success"
+        assert session.paths("POST") == ["/api/v1/analyze", "/api/v1/process"]
+    finally:
+        client.close()
+        os.remove(image_path)
+    assert session.closed
+
+
+def test_get_service_client_is_shared():
+    with mock.patch.object(extensions_service, "_service_clients", {}):
+        first = extensions_service.get_service_client(URL_A)
+        try:
+            assert extensions_service.get_service_client(URL_A) is first
+            assert isinstance(first.session, requests.Session)
+        finally:
+            first.close()
+
+
+def test_health_check_states():
+    responses = {
+        "ready": StubResponse(200, {"ready": True}),
+        "loading": StubResponse(200, {"ready": False}),
+        "unavailable": StubResponse(503),
+    }
+    for name, expected in (("ready", True), ("loading", False), ("unavailable", False), ("error", False)):
+        def handler(method, path, kwargs, name=name):
+            if name == "error":
+                raise requests.exceptions.ConnectionError("refused")
+            return responses[name]
+
+        client = ChatGarmentServiceClient(service_url=URL_A, session=StubSession({URL_A: handler}))
+        assert client.health_check() is expected, name
+
+
+def test_is_available_uses_cached_health():
+    """처음 한 번만 동기 헬스 체크, 이후에는 캐시된 상태와 브레이커만 확인"""
+    session = StubSession()
+    client = ChatGarmentServiceClient(service_url=URL_A, session=session)
+    try:
+        with mock.patch.object(client.health_monitor, "start"):
+            assert client.is_available() and client.is_available() and client.is_candidate()
+        assert session.paths("GET") == ["/health"]
+    finally:
+        client.close()
+
+
+def test_image_reference_uploads_once():
+    """서비스에 없는 이미지만 PUT하고, 이후에는 image_hash로 참조"""
+    stored = set()
+
+    def handler(method, path, kwargs):
+        sha256 = path.rsplit("/", 1)[-1]
+        if method == "HEAD":
+            return StubResponse(200 if sha256 in stored else 404)
+        if method == "PUT":
+            stored.add(sha256)
+            return StubResponse(201, {"status": "success"})
+        return default_handler(method, path, kwargs)
+
+    session = StubSession({URL_A: handler})
+    client = ChatGarmentServiceClient(service_url=URL_A, session=session)
+    image_path = make_image()
+    try:
+        with mock.patch.object(extensions_service, "CHATGARMENT_SHARED_ROOT", None):
+            first = client._image_reference(image_path)
+            second = client._image_reference(image_path)
+        assert first == second == {"image_hash": extensions_service.file_sha256(image_path)}
+        assert [m for m, _, _ in session.calls] == ["HEAD", "PUT", "HEAD"]
+    finally:
+        os.remove(image_path)
+
+
+def make_pool(handlers, urls=(URL_A, URL_B), max_retries=2):
+    """가짜 Session을 공유하는 풀 (헬스 모니터 스레드는 띄우지 않음)"""
+    session = StubSession(handlers)
+    with mock.patch.object(extensions_service, "create_pooled_session", lambda pool_size: session):
+        pool = ChatGarmentServicePool(list(urls), max_retries=max_retries)
+    for client in pool.clients:
+        client.health_monitor.start = lambda: None
+    return pool, session
+
+
+def test_pool_least_outstanding_routing():
+    """진행 중 요청이 있는 인스턴스는 피하고, 동률이면 번갈아 선택"""
+    entered, release = threading.Event(), threading.Event()
+
+    def slow_a(method, path, kwargs):
+        if path == "/api/v1/process":
+            entered.set()
+            release.wait(5)
+        return default_handler(method, path, kwargs)
+
+    pool, session = make_pool({URL_A: slow_a})
+    image_path = make_image()
+    try:
+        assert pool.is_available()
+        results = {}
+        worker = threading.Thread(target=lambda: results.update(slow=pool.process_image(image_path)))
+        worker.start()
+        assert entered.wait(5)
+        assert pool.snapshot()["backends"][0]["outstanding"] == 1
+
+        # A가 처리 중이므로 다음 요청들은 모두 B로
+        for _ in range(3):
+            assert pool.analyze_image(image_path)["service_url"] == URL_B
+        release.set()
+        worker.join(5)
+        assert results["slow"]["service_url"] == URL_A
+        assert [b["outstanding"] for b in pool.snapshot()["backends"]] == [0, 0]
+
+        # 진행 중 요청이 없으면 순환
+        chosen = [pool.analyze_image(image_path)["service_url"] for _ in range(4)]
+        assert sorted(chosen) == [URL_A, URL_A, URL_B, URL_B]
+    finally:
+        release.set()
+        pool.close()
+        os.remove(image_path)
+
+
+def test_pool_failover():
+    """503 / 연결 실패는 다른 인스턴스로 재시도하고 실패한 인스턴스의 브레이커에 기록"""
+    for failure in ("unavailable", "connection"):
+        def failing_a(method, path, kwargs, failure=failure):
+            if method == "POST":
+                if failure == "connection":
+                    raise requests.exceptions.ConnectionError("refused")
+                return StubResponse(503, {"detail": "not ready"})
+            return default_handler(method, path, kwargs)
+
+        pool, session = make_pool({URL_A: failing_a})
+        image_path = make_image()
+        try:
+            assert pool.is_available()
+            with mock.patch.object(pool, "_next", 0):
+                result = pool.process_image(image_path)
+            assert result["status"] == "success" and result["service_url"] == URL_B, failure
+            assert session.paths("POST", URL_A) == ["/api/v1/process"]
+            assert pool.clients[0].breaker.consecutive_failures == 1
+        finally:
+            pool.close()
+            os.remove(image_path)
+
+
+def test_pool_does_not_retry_non_retryable_errors():
+    """타임아웃 / 요청 오류(4xx)는 작업이 진행 중이거나 다시 보내도 같으므로 재시도하지 않음"""
+    for name, error in (("timeout", requests.exceptions.Timeout("slow")), ("bad_request", None)):
+        def handler(method, path, kwargs, error=error):
+            if method == "POST":
+                if error is not None:
+                    raise error
+                return StubResponse(400, {"detail": "bad image"})
+            return default_handler(method, path, kwargs)
+
+        pool, session = make_pool({URL_A: handler, URL_B: handler})
+        image_path = make_image()
+        try:
+            assert pool.is_available()
+            result = pool.analyze_image(image_path)
+            assert result["status"] == "error", name
+            assert len(session.paths("POST")) == 1, name
+        finally:
+            pool.close()
+            os.remove(image_path)
+
+
+def test_pool_skips_unhealthy_and_reports_exhaustion():
+    def unhealthy(method, path, kwargs):
+        return StubResponse(503)
+
+    pool, session = make_pool({URL_A: unhealthy})
+    image_path = make_image()
+    try:
+        assert pool.is_available()
+        for _ in range(3):
+            assert pool.analyze_image(image_path)["service_url"] == URL_B
+        assert session.paths("POST", URL_A) == []
+    finally:
+        pool.close()
+
+    pool, session = make_pool({URL_A: unhealthy, URL_B: unhealthy})
+    try:
+        assert not pool.is_available()
+        result = pool.analyze_image(image_path)
+        assert result["status"] == "error" and result["tried"] == []
+        assert session.paths("POST") == []
+    finally:
+        pool.close()
+        os.remove(image_path)
+
+
+def main():
+    tests = [
+        test_pooled_session,
+        test_client_reuses_injected_session,
+        test_get_service_client_is_shared,
+        test_health_check_states,
+        test_is_available_uses_cached_health,
+        test_image_reference_uploads_once,
+        test_pool_least_outstanding_routing,
+        test_pool_failover,
+        test_pool_does_not_retry_non_retryable_errors,
+        test_pool_skips_unhealthy_and_reports_exhaustion,
+    ]
+    print("=" * 60)
+    print("ChatGarment Service Client Test")
+    print("=" * 60)
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"[OK] {test.__name__}")
+        except Exception as e:
+            failed += 1
+            print(f"[FAIL] {test.__name__}: {e!r}")
+    print()
+    print(f"{len(tests) - failed}/{len(tests)} passed")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
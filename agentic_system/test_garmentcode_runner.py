@@ -0,0 +1,92 @@
+"""
+GarmentCode 파서 워커 테스트 스크립트
+
+GarmentCodeParserWorker가 파서 프로세스를 한 번 띄워 재사용하는지,
+프로세스의 cwd / UTF-8 모드 격리, 요청 오류 후에도 프로세스가 유지되는지,
+프로세스가 죽으면 다음 요청 때 다시 시작하는지를 확인합니다.
+파서 대신 ping 요청을 사용하므로 ChatGarment 없이 실행됩니다.
+pytest로도 실행할 수 있습니다.
+
+사용법:
+    python test_garmentcode_runner.py
+"""
+import os
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from agentic_system.tools import garmentcode_runner
+from agentic_system.tools.garmentcode_runner import GarmentCodeParserWorker
+
+
+def test_worker_reused_and_isolated():
+    worker = GarmentCodeParserWorker()
+    try:
+        first = worker.request({"op": "ping"}, timeout=30)
+        second = worker.request({"op": "ping"}, timeout=30)
+        assert first["status"] == "success"
+        assert first["pid"] == second["pid"] == worker.pid
+        assert first["pid"] != os.getpid()
+        # 파서 프로세스만 UTF-8 모드 + ChatGarment 작업 디렉토리
+        assert first["utf8_mode"] == 1
+        expected_cwd = garmentcode_runner.chatgarment_path
+        if not expected_cwd.exists():
+            expected_cwd = garmentcode_runner.project_root
+        assert Path(first["cwd"]).resolve() == expected_cwd.resolve()
+    finally:
+        worker.stop()
+    assert worker.pid is None
+
+
+def test_error_keeps_worker():
+    """파서 오류는 응답으로 돌아오고 프로세스는 계속 사용"""
+    worker = GarmentCodeParserWorker()
+    try:
+        pid = worker.request({"op": "ping"}, timeout=30)["pid"]
+        response = worker.request({"op": "parse", "json_output": None, "float_preds": None}, timeout=60)
+        assert response["status"] == "error"
+        assert response["error"] and "Traceback" in response["traceback"]
+        assert worker.request({"op": "ping"}, timeout=30)["pid"] == pid
+    finally:
+        worker.stop()
+
+
+def test_restart_after_exit():
+    worker = GarmentCodeParserWorker()
+    try:
+        pid = worker.request({"op": "ping"}, timeout=30)["pid"]
+        worker._process.kill()
+        worker._process.wait()
+        assert worker.pid is None
+        restarted = worker.request({"op": "ping"}, timeout=30)["pid"]
+        assert restarted != pid
+    finally:
+        worker.stop()
+
+
+def main():
+    tests = [
+        test_worker_reused_and_isolated,
+        test_error_keeps_worker,
+        test_restart_after_exit,
+    ]
+    print("=" * 60)
+    print("GarmentCode Parser Worker Test")
+    print("=" * 60)
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"[OK] {test.__name__}")
+        except Exception as e:
+            failed += 1
+            print(f"[FAIL] {test.__name__}: {e!r}")
+    print()
+    print(f"{len(tests) - failed}/{len(tests)} passed")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
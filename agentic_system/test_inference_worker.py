@@ -0,0 +1,156 @@
+"""
+ChatGarment 추론 워커 테스트 스크립트
+
+InferenceWorker를 Mock 모드로 실행하여 워커 프로세스 시작 / ready 보고,
+요청 ID로 결과를 돌려주는 큐 프로토콜(동시 요청, 오류 전달), 워커 종료 시 대기 중 요청 실패와
+다음 요청 때 재시작, 워커 안의 작업 분기(_handle_request)를 확인합니다.
+모델 없이 실행되며 pytest로도 실행할 수 있습니다.
+
+사용법:
+    python test_inference_worker.py
+"""
+import queue
+import sys
+import time
+from concurrent.futures import Future
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from agentic_system.chatgarment_service.inference_worker import InferenceWorker, _handle_request
+
+
+class FakePipeline:
+    """ChatGarmentPipeline 흉내 (호출 기록)"""
+
+    def __init__(self):
+        self.calls = []
+
+    def warmup(self):
+        self.calls.append(("warmup", {}))
+        return {"status": "success", "warmup_seconds": 0.1}
+
+    def analyze_image(self, **kwargs):
+        self.calls.append(("analyze_image", kwargs))
+        return {"status": "success", "analysis": {"text": kwargs.get("text")}}
+
+    def process_image_to_garment(self, **kwargs):
+        self.calls.append(("process_image_to_garment", kwargs))
+        if kwargs.get("image_path") == "broken.jpg":
+            raise ValueError("이미지를 읽을 수 없습니다")
+        return {"status": "success", "garment_id": kwargs.get("garment_id")}
+
+
+def handle(pipeline, op, **kwargs):
+    results = queue.Queue()
+    _handle_request(pipeline, {"id": "r1", "op": op, "kwargs": kwargs}, results)
+    return results.get_nowait()
+
+
+def test_handle_request_routes_ops():
+    pipeline = FakePipeline()
+    assert handle(pipeline, "warmup")["value"] == {"status": "success", "warmup_seconds": 0.1, "mock": False}
+    assert handle(pipeline, "analyze_image", image_path="a.jpg", text="셔츠")["value"]["analysis"] == {"text": "셔츠"}
+    message = handle(pipeline, "process_image_to_garment", image_path="a.jpg", output_dir="out", garment_id="g1")
+    assert message == {"id": "r1", "ok": True, "value": {"status": "success", "garment_id": "g1"}}
+    assert [name for name, _ in pipeline.calls] == ["warmup", "analyze_image", "process_image_to_garment"]
+
+    # 파이프라인 예외 / 알 수 없는 작업은 오류 응답 (워커는 계속 동작)
+    message = handle(pipeline, "process_image_to_garment", image_path="broken.jpg")
+    assert not message["ok"] and message["error"] == "이미지를 읽을 수 없습니다"
+    assert "ValueError" in message["traceback"]
+    assert not handle(pipeline, "train")["ok"]
+
+
+def test_handle_request_mock_mode():
+    assert handle(None, "warmup")["value"]["mock"] is True
+    value = handle(None, "process_image_to_garment", image_path="a.jpg", output_dir="out", garment_id="g1")["value"]
+    assert value["mock"] and value["garment_id"] == "g1"
+    assert Path(value["mesh_path"]) == Path("out") / "garment.obj"
+
+
+def test_mock_worker_roundtrip():
+    worker = InferenceWorker(mock=True)
+    try:
+        worker.start()
+        assert worker.wait_ready(60)
+        assert worker.mock is True and worker.is_alive
+        assert worker.warmup(timeout=30)["mock"] is True
+        assert worker.analyze_image("a.jpg", "셔츠", timeout=30)["analysis"]["type"] == "hoodie"
+
+        # 동시에 보낸 요청은 각자의 결과를 받음
+        futures = {
+            f"g{i}": worker.submit("process_image_to_garment", image_path="a.jpg", output_dir=f"out{i}", garment_id=f"g{i}")
+            for i in range(8)
+        }
+        for garment_id, future in futures.items():
+            result = future.result(30)
+            assert result["garment_id"] == garment_id
+            assert Path(result["pattern_path"]).parent == Path(f"out{garment_id[1:]}")
+
+        try:
+            worker.submit("train").result(30)
+        except RuntimeError as e:
+            assert "Unknown op" in str(e)
+        else:
+            raise AssertionError("알 수 없는 작업 오류가 전달되지 않음")
+    finally:
+        worker.stop()
+    assert not worker.is_alive
+
+
+def test_worker_exit_fails_pending_and_restarts():
+    """워커 프로세스가 죽으면 그 워커로 보낸 요청은 실패하고, 다음 요청 때 새 워커 시작"""
+    worker = InferenceWorker(mock=True)
+    try:
+        worker.start()
+        assert worker.wait_ready(60)
+        process = worker._process
+        # 응답을 받기 전에 워커가 죽은 요청
+        orphan: Future = Future()
+        with worker._lock:
+            worker._pending["orphan"] = (orphan, process)
+        process.terminate()
+        process.join(10)
+        try:
+            orphan.result(10)
+        except RuntimeError as e:
+            assert "종료" in str(e)
+        else:
+            raise AssertionError("대기 중 요청이 실패 처리되지 않음")
+
+        deadline = time.time() + 10
+        while worker._process is process and time.time() < deadline:
+            time.sleep(0.05)
+        assert worker.warmup(timeout=60)["mock"] is True
+        assert worker._process is not process and worker.is_alive
+    finally:
+        worker.stop()
+
+
+def main():
+    tests = [
+        test_handle_request_routes_ops,
+        test_handle_request_mock_mode,
+        test_mock_worker_roundtrip,
+        test_worker_exit_fails_pending_and_restarts,
+    ]
+    print("=" * 60)
+    print("Inference Worker Test")
+    print("=" * 60)
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"[OK] {test.__name__}")
+        except Exception as e:
+            failed += 1
+            print(f"[FAIL] {test.__name__}: {e!r}")
+    print()
+    print(f"{len(tests) - failed}/{len(tests)} passed")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,205 @@
+"""
+비동기 작업(Job) API 테스트 스크립트
+
+JobManager의 상태 전이 / 진행 이벤트 / 완료 작업 정리와,
+POST /api/v1/jobs(202) → GET /api/v1/jobs/{job_id} 폴링 → GET /api/v1/jobs/{job_id}/events(SSE)
+흐름을 확인합니다. 엔드포인트 테스트는 Agent Runtime을 가짜 런타임으로 바꿔 모델 없이 실행하며,
+API 서버를 임포트할 수 없으면(torch 미설치 등) 건너뜁니다. pytest로도 실행할 수 있습니다.
+
+사용법:
+    python test_jobs_api.py
+"""
+import sys
+import threading
+import time
+from pathlib import Path
+from unittest import mock
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from agentic_system.api.jobs import JobManager
+
+try:
+    from fastapi.testclient import TestClient
+    from agentic_system.api import main as api_main
+    API_AVAILABLE = True
+except ImportError:
+    API_AVAILABLE = False
+
+
+class StubRuntime:
+    """AgentRuntime.process_request 흉내 (단계 이벤트 2개, delay초 대기)"""
+
+    def __init__(self, delay: float = 0.0, fail: bool = False):
+        self.delay = delay
+        self.fail = fail
+        self.calls = []
+
+    def process_request(self, payload, session_id=None, progress_callback=None):
+        self.calls.append((payload, session_id))
+        progress_callback({"event": "step_started", "step_id": "step_1"})
+        time.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError("stub failure")
+        progress_callback({"event": "step_finished", "step_id": "step_1", "status": "success"})
+        return {"status": "success", "message": "done", "data": {"text": payload["input_data"]["text"]}}
+
+
+def wait_for(job_manager, job_id, timeout=5.0):
+    """작업이 끝날 때까지 상태 폴링"""
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        job = job_manager.get(job_id)
+        if job["status"] in ("completed", "failed"):
+            return job
+        time.sleep(0.01)
+    raise AssertionError(f"작업이 끝나지 않음: {job_manager.get(job_id)}")
+
+
+def parse_sse(body: str):
+    """SSE 본문 -> (이벤트 이름 목록, keep-alive 주석 수)"""
+    events, heartbeats = [], 0
+    for block in body.split("\n\n"):
+        for line in block.splitlines():
+            if line.startswith("event: "):
+                events.append(line[len("event: "):])
+            elif line.startswith(": keep-alive"):
+                heartbeats += 1
+    return events, heartbeats
+
+
+def skip_without_api():
+    if not API_AVAILABLE:
+        print("[SKIP] API 서버를 임포트할 수 없어 건너뜁니다 (torch 등 미설치)")
+        return True
+    return False
+
+
+def test_job_manager_success():
+    manager = JobManager(max_workers=1)
+    release = threading.Event()
+
+    def work(value, progress_callback=None):
+        progress_callback({"event": "step_started"})
+        release.wait(5)
+        return value * 2
+
+    job_id = manager.submit(work, 21, with_progress=True)
+    assert manager.get(job_id)["status"] in ("queued", "running")
+    release.set()
+    job = wait_for(manager, job_id)
+    manager.shutdown(wait=True)
+
+    assert job["status"] == "completed" and job["result"] == 42 and job["error"] is None
+    assert job["started_at"] and job["finished_at"]
+    events = manager.get_events(job_id)
+    assert [e["event"] for e in events] == ["job_queued", "job_started", "step_started", "job_completed"]
+    assert [e["seq"] for e in events] == [0, 1, 2, 3]
+    assert [e["event"] for e in manager.get_events(job_id, 2)] == ["step_started", "job_completed"]
+    assert manager.get("job_missing") is None and manager.get_events("job_missing") is None
+
+
+def test_job_manager_failure():
+    manager = JobManager(max_workers=1)
+
+    def work():
+        raise ValueError("boom")
+
+    job = wait_for(manager, manager.submit(work))
+    manager.shutdown(wait=True)
+    assert job["status"] == "failed" and job["error"] == "boom"
+    assert manager.get_events(job["job_id"])[-1]["event"] == "job_failed"
+
+
+def test_job_manager_evicts_finished_jobs():
+    """max_jobs를 넘으면 끝난 작업부터 정리 (실행 중인 작업은 유지)"""
+    manager = JobManager(max_workers=1, max_jobs=2)
+    finished = [manager.submit(lambda: None) for _ in range(2)]
+    for job_id in finished:
+        wait_for(manager, job_id)
+    release = threading.Event()
+    running = manager.submit(release.wait, 5)
+    assert manager.get(finished[0]) is None
+    assert manager.get(finished[1]) is not None and manager.get(running) is not None
+    release.set()
+    manager.shutdown(wait=True)
+
+
+def test_submit_and_poll():
+    if skip_without_api():
+        return
+    runtime = StubRuntime()
+    with mock.patch.object(api_main, "agent_runtime", runtime):
+        client = TestClient(api_main.app)
+        response = client.post("/api/v1/jobs", data={"text": "셔츠 3D로 만들어줘", "session_id": "s1"})
+        assert response.status_code == 202
+        body = response.json()
+        assert body["status"] == "queued" and body["session_id"] == "s1"
+        assert body["status_url"] == f"/api/v1/jobs/{body['job_id']}"
+
+        deadline = time.time() + 5
+        while True:
+            job = client.get(body["status_url"]).json()
+            if job["status"] in ("completed", "failed") or time.time() > deadline:
+                break
+            time.sleep(0.02)
+    assert job["status"] == "completed"
+    assert job["result"]["status"] == "success"
+    assert job["result"]["data"] == {"text": "셔츠 3D로 만들어줘"}
+    assert runtime.calls[0][1] == "s1"
+
+    assert client.get("/api/v1/jobs/job_missing").status_code == 404
+    assert client.get("/api/v1/jobs/job_missing/events").status_code == 404
+    # 텍스트 / 이미지가 모두 없으면 작업을 만들지 않음
+    assert client.post("/api/v1/jobs", data={}).status_code == 400
+
+
+def test_event_stream_heartbeat_and_terminal_event():
+    """작업이 진행 중이면 keep-alive 주석을 보내고, 종료 이벤트 후 스트림을 닫음"""
+    if skip_without_api():
+        return
+    for fail, terminal in ((False, "job_completed"), (True, "job_failed")):
+        with mock.patch.object(api_main, "agent_runtime", StubRuntime(delay=0.5, fail=fail)), \
+                mock.patch.object(api_main, "SSE_POLL_INTERVAL", 0.02), \
+                mock.patch.object(api_main, "SSE_HEARTBEAT_SECONDS", 0.1):
+            client = TestClient(api_main.app)
+            job = client.post("/api/v1/jobs", data={"text": "원피스"}).json()
+            with client.stream("GET", job["events_url"]) as response:
+                assert response.status_code == 200
+                assert response.headers["content-type"].startswith("text/event-stream")
+                body = "".join(response.iter_text())
+
+        events, heartbeats = parse_sse(body)
+        assert events[0] == "job_queued"
+        assert "step_started" in events
+        assert events[-1] == terminal
+        assert heartbeats >= 1
+
+
+def main():
+    tests = [
+        test_job_manager_success,
+        test_job_manager_failure,
+        test_job_manager_evicts_finished_jobs,
+        test_submit_and_poll,
+        test_event_stream_heartbeat_and_terminal_event,
+    ]
+    print("=" * 60)
+    print("Job API Test")
+    print("=" * 60)
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"[OK] {test.__name__}")
+        except Exception as e:
+            failed += 1
+            print(f"[FAIL] {test.__name__}: {e!r}")
+    print()
+    print(f"{len(tests) - failed}/{len(tests)} passed")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
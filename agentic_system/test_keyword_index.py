@@ -0,0 +1,130 @@
+"""
+키워드 역색인 테스트 스크립트
+
+KeywordIndex 토큰화(한글 bigram, NFKC / 소문자), 점수 정규화, 흔한 토큰 처리와
+MockRAG.retrieve의 점수 정렬 / 신뢰도를 확인합니다.
+pytest로도 실행할 수 있습니다.
+
+사용법:
+    python test_keyword_index.py
+"""
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from agentic_system.data_stores.keyword_index import KeywordIndex, tokenize
+from agentic_system.data_stores.rag import MockRAG
+
+
+def test_tokenize():
+    assert tokenize("후드티") == ["후드", "드티"]
+    # 조사가 붙어도 같은 bigram 포함
+    assert set(tokenize("후드티")) <= set(tokenize("후드티를"))
+    assert tokenize("면") == ["면"]
+    # NFKC + 소문자, 중복 제거
+    assert tokenize("ＤＥＮＩＭ Denim denim") == ["denim"]
+    assert tokenize("!!! ...") == []
+
+
+def test_search_scores():
+    index = KeywordIndex()
+    index.add("hoodie", [("후드티", 2.0), ("오버사이즈 스트리트", 1.0)])
+    index.add("jeans", [("청바지", 2.0), ("데님 캐주얼", 1.0)])
+    index.add("coat", [("코트", 2.0), ("겨울 아우터", 1.0)])
+
+    results = index.search("후드티를 만들어줘")
+    assert [doc for doc, _ in results] == ["hoodie"]
+    assert results[0][1] == 1.0
+
+    # 키 필드 매칭이 값 필드 매칭보다 높은 점수
+    index.add("street_jeans", [("스트리트 청바지", 1.0)])
+    results = index.search("청바지")
+    assert [doc for doc, _ in results] == ["jeans", "street_jeans"]
+    assert results[0][1] > results[1][1] > 0
+
+    for _, score in index.search("스트리트 청바지 캐주얼"):
+        assert 0.0 < score <= 1.0
+    assert index.search("없는단어") == []
+
+
+def test_top_k_order():
+    index = KeywordIndex()
+    for i in range(20):
+        index.add(i, [("티셔츠 " * (i % 3 + 1), 1.0 + i % 3)])
+    results = index.search("티셔츠", top_k=5)
+    assert len(results) == 5
+    scores = [score for _, score in results]
+    assert scores == sorted(scores, reverse=True)
+    # 같은 점수는 먼저 추가한 문서 우선
+    assert [doc for doc, _ in results] == [2, 5, 8, 11, 14]
+
+
+def test_common_tokens():
+    """흔한 토큰은 후보 탐색에서 빠지지만 점수에는 반영"""
+    index = KeywordIndex(common_ratio=0.5, min_common_df=1)
+    for i in range(10):
+        index.add(f"basic{i}", [("기본 스타일", 1.0)])
+    index.add("special", [("스페셜 스타일", 1.0)])
+    index.add("special_only", [("스페셜", 1.0)])
+
+    results = index.search("스페셜 스타일")
+    assert [doc for doc, _ in results] == ["special", "special_only"]
+    assert results[0][1] == 1.0
+    # 흔한 토큰만 있으면 전체 posting으로 검색
+    assert len(index.search("스타일", top_k=20)) == 11
+
+
+def test_mock_rag_retrieve():
+    rag = MockRAG()
+    results = rag.retrieve("검정색 후드티 만들어줘")
+    suggestions = results["suggestions"]
+    assert suggestions[0]["key"] == "검정색"
+    assert [s["score"] for s in suggestions] == sorted((s["score"] for s in suggestions), reverse=True)
+    assert {s["category"] for s in suggestions} == set(results["relevant_info"])
+    # 신뢰도는 결과 개수가 아니라 가장 잘 맞는 항목의 점수
+    assert results["confidence"] == suggestions[0]["score"]
+
+    assert rag.retrieve("안녕하세요") == {"suggestions": [], "relevant_info": {}, "confidence": 0.0}
+
+
+def test_mock_rag_min_score():
+    rag = MockRAG()
+    results = rag.retrieve("스트리트 스타일 면 티셔츠")
+    assert all(s["score"] >= MockRAG.MIN_SCORE for s in results["suggestions"])
+    assert results["confidence"] <= 1.0
+
+    # 지식 베이스를 바꾸면 rebuild_index 후 검색에 반영
+    rag.knowledge_base["materials"]["린넨"] = "시원함, 여름 소재"
+    rag.rebuild_index()
+    assert rag.retrieve("린넨 셔츠")["suggestions"][0]["key"] == "린넨"
+
+
+def main():
+    tests = [
+        test_tokenize,
+        test_search_scores,
+        test_top_k_order,
+        test_common_tokens,
+        test_mock_rag_retrieve,
+        test_mock_rag_min_score,
+    ]
+    print("=" * 60)
+    print("Keyword Index Test")
+    print("=" * 60)
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"[OK] {test.__name__}")
+        except Exception as e:
+            failed += 1
+            print(f"[FAIL] {test.__name__}: {e!r}")
+    print()
+    print(f"{len(tests) - failed}/{len(tests)} passed")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
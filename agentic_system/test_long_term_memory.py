@@ -0,0 +1,163 @@
+"""
+장기 메모리 테스트 스크립트
+
+LongTermMemory.query_events(종류 / 속성 / 시간 범위 인덱스), compact(개수 / 보관 기간 압축),
+압축 후에도 유지되는 통계(aggregates)와 저장 / 복원을 확인합니다.
+pytest로도 실행할 수 있습니다.
+
+사용법:
+    python test_long_term_memory.py
+"""
+import sys
+import time
+from pathlib import Path
+from unittest import mock
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from agentic_system.core import memory as memory_module
+from agentic_system.core.memory import LongTermMemory
+
+BASE_TIME = 1_700_000_000.0
+
+
+def add_event_at(memory, timestamp, event_type="generation", **attributes):
+    """지정한 시각에 add_to_history 호출"""
+    with mock.patch.object(memory_module.time, "time", return_value=timestamp):
+        memory.add_to_history({"event_type": event_type, **attributes})
+
+
+def add_event(memory, offset, event_type="generation", **attributes):
+    add_event_at(memory, BASE_TIME + offset, event_type, **attributes)
+
+
+def make_memory(**kwargs):
+    kwargs.setdefault("max_events", 1000)
+    kwargs.setdefault("retention_seconds", 0)
+    return LongTermMemory("u1", **kwargs)
+
+
+def offsets(events):
+    return [event["timestamp"] - BASE_TIME for event in events]
+
+
+def test_query_events():
+    memory = make_memory()
+    add_event(memory, 0, color="검정색", style="스트리트")
+    add_event(memory, 10, color="흰색", style="캐주얼")
+    add_event(memory, 20, event_type="feedback", color="검정색")
+    add_event(memory, 30, attributes={"color": "검정색", "style": "캐주얼"})
+    add_event(memory, 40, color="검정색", style="캐주얼")
+
+    # 최신 순
+    assert offsets(memory.query_events()) == [40, 30, 20, 10, 0]
+    assert offsets(memory.query_events(event_type="feedback")) == [20]
+    # "attributes" 안의 값도 인덱싱
+    assert offsets(memory.query_events(attributes={"color": "검정색"})) == [40, 30, 20, 0]
+    assert offsets(memory.query_events(
+        event_type="generation",
+        attributes={"color": "검정색", "style": "캐주얼"}
+    )) == [40, 30]
+    assert offsets(memory.query_events(start=BASE_TIME + 10, end=BASE_TIME + 30)) == [30, 20, 10]
+    assert offsets(memory.query_events(attributes={"color": "검정색"}, limit=2)) == [40, 30]
+    assert memory.query_events(attributes={"color": "빨간색"}) == []
+    assert memory.query_events(start=BASE_TIME + 100) == []
+
+
+def test_compact_by_count():
+    """max_events를 넘으면 최근 절반만 남기고, 통계는 전체 이벤트 기준 유지"""
+    memory = make_memory(max_events=4)
+    for i in range(5):
+        add_event(memory, i, style="스트리트" if i < 3 else "캐주얼")
+
+    assert offsets(memory.history) == [3, 4]
+    assert memory.aggregates["generation"]["count"] == 5
+    assert memory.get_top_attribute_values("style") == [("스트리트", 3), ("캐주얼", 2)]
+    # 압축 후에도 인덱스의 이벤트 번호가 맞음
+    assert offsets(memory.query_events(attributes={"style": "캐주얼"})) == [4, 3]
+    assert memory.query_events(attributes={"style": "스트리트"}) == []
+
+    add_event(memory, 5, style="스트리트")
+    assert offsets(memory.query_events(attributes={"style": "스트리트"})) == [5]
+
+
+def test_compact_explicit():
+    memory = make_memory()
+    for i in range(6):
+        add_event(memory, i * 10, color="회색")
+    assert memory.compact(before=BASE_TIME + 25) == 3
+    assert offsets(memory.history) == [30, 40, 50]
+    assert memory.compact(keep_recent=1) == 2
+    assert offsets(memory.query_events(attributes={"color": "회색"})) == [50]
+    assert memory.compact() == 0
+    assert memory.aggregates["generation"]["count"] == 6
+
+
+def test_compact_by_retention():
+    """보관 기간이 지난 이벤트는 새 이벤트를 추가할 때 통계로만 남김"""
+    memory = make_memory(retention_seconds=3600)
+    add_event_at(memory, time.time() - 7200, color="흰색")
+    assert len(memory.history) == 1
+    memory.add_to_history({"event_type": "generation", "color": "검정색"})
+
+    assert [event["color"] for event in memory.history] == ["검정색"]
+    assert memory.get_top_attribute_values("color") == [("검정색", 1), ("흰색", 1)]
+
+
+def test_round_trip_keeps_aggregates():
+    memory = make_memory(max_events=4)
+    for i in range(6):
+        add_event(memory, i, style="스트리트")
+    memory.save_preference("size", "L")
+
+    restored = LongTermMemory.from_dict("u1", memory.to_dict())
+    assert offsets(restored.history) == offsets(memory.history)
+    assert restored.aggregates["generation"]["count"] == 6
+    assert restored.get_preference("size") == "L"
+    assert len(restored.query_events(attributes={"style": "스트리트"})) == len(memory.history)
+
+
+def test_restore_legacy_format():
+    """통계가 없는 이전 형식(ISO 타임스탬프)은 history로 통계를 다시 계산"""
+    data = {
+        "preferences": {"style": "캐주얼"},
+        "history": [
+            {"timestamp": "2024-01-01T00:00:00", "garment_type": "후드티"},
+            {"timestamp": "2024-01-02T00:00:00", "garment_type": "후드티"},
+        ]
+    }
+    memory = LongTermMemory.from_dict("u1", data)
+    assert memory.aggregates[LongTermMemory.DEFAULT_EVENT_TYPE]["count"] == 2
+    assert memory.get_top_attribute_values("garment_type") == [("후드티", 2)]
+    events = memory.query_events(start=memory.history[1]["timestamp"])
+    assert [event["timestamp"] for event in events] == [memory.history[1]["timestamp"]]
+
+
+def main():
+    tests = [
+        test_query_events,
+        test_compact_by_count,
+        test_compact_explicit,
+        test_compact_by_retention,
+        test_round_trip_keeps_aggregates,
+        test_restore_legacy_format,
+    ]
+    print("=" * 60)
+    print("Long-Term Memory Test")
+    print("=" * 60)
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"[OK] {test.__name__}")
+        except Exception as e:
+            failed += 1
+            print(f"[FAIL] {test.__name__}: {e!r}")
+    print()
+    print(f"{len(tests) - failed}/{len(tests)} passed")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
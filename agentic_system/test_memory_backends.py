@@ -0,0 +1,354 @@
+"""
+메모리 백엔드 테스트 스크립트
+
+SQLite / Redis(로컬 대체 클라이언트 주입) 백엔드의 write-behind 기록, flush / close,
+그리고 여러 워커(MemoryManager)가 같은 저장소를 공유할 때 대화 기록이 덮어써지지 않는지 확인합니다.
+fakeredis가 설치되어 있으면 Redis 테스트에 사용하고, 없으면 이 파일의 FakeRedis를 사용합니다.
+pytest로도 실행할 수 있습니다.
+
+사용법:
+    python test_memory_backends.py
+"""
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from agentic_system.core.memory import MemoryManager
+from agentic_system.core.memory_backends import (
+    KIND_SESSION,
+    RedisMemoryBackend,
+    SQLiteMemoryBackend,
+    WatchError,
+)
+
+try:
+    import fakeredis
+    FAKEREDIS_AVAILABLE = True
+except ImportError:
+    FAKEREDIS_AVAILABLE = False
+
+
+class FakeRedis:
+    """
+    RedisMemoryBackend가 사용하는 명령만 구현한 메모리 내 Redis 대체 클라이언트
+
+    WATCH한 키가 EXEC 전에 바뀌면 WatchError를 발생시킨다.
+    before_execute를 설정하면 EXEC 직전에 호출한다 (다른 워커의 동시 기록 재현용).
+    """
+
+    def __init__(self):
+        self._data = {}
+        self._versions = {}
+        self._lock = threading.Lock()
+        self.before_execute = None
+
+    def get(self, key):
+        with self._lock:
+            return self._data.get(key)
+
+    def mget(self, keys):
+        with self._lock:
+            return [self._data.get(key) for key in keys]
+
+    def set(self, key, value, ex=None):
+        with self._lock:
+            self._data[key] = value.encode("utf-8") if isinstance(value, str) else value
+            self._versions[key] = self._versions.get(key, 0) + 1
+
+    def delete(self, *keys):
+        with self._lock:
+            for key in keys:
+                self._data.pop(key, None)
+                self._versions[key] = self._versions.get(key, 0) + 1
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+
+class FakePipeline:
+    def __init__(self, client):
+        self.client = client
+        self._watched = {}
+        self._commands = []
+
+    def watch(self, *keys):
+        with self.client._lock:
+            self._watched = {key: self.client._versions.get(key, 0) for key in keys}
+
+    def mget(self, keys):
+        return self.client.mget(keys)
+
+    def multi(self):
+        self._commands = []
+
+    def set(self, key, value, ex=None):
+        self._commands.append(("set", key, value))
+
+    def delete(self, key):
+        self._commands.append(("delete", key))
+
+    def execute(self):
+        if self.client.before_execute is not None:
+            self.client.before_execute()
+        with self.client._lock:
+            for key, version in self._watched.items():
+                if self.client._versions.get(key, 0) != version:
+                    raise WatchError("Watched variable changed.")
+        for command in self._commands:
+            if command[0] == "set":
+                self.client.set(command[1], command[2])
+            else:
+                self.client.delete(command[1])
+        return [True] * len(self._commands)
+
+    def reset(self):
+        self._watched = {}
+        self._commands = []
+
+
+def make_redis_client():
+    if FAKEREDIS_AVAILABLE:
+        return fakeredis.FakeRedis()
+    return FakeRedis()
+
+
+def user_inputs(memory):
+    return [record["user_input"] for record in memory.get_conversation_history()]
+
+
+def check_write_behind(make_backend):
+    """기록 전에는 같은 백엔드에서만 보이고, flush 후 다른 워커에서도 보임"""
+    writer = MemoryManager(backend=make_backend())
+    reader_backend = make_backend()
+    reader = MemoryManager(backend=reader_backend)
+    try:
+        writer.get_short_term_memory("s1").add_conversation("hello", "hi")
+        assert reader_backend.load(KIND_SESSION, "s1") is None
+        # 같은 백엔드의 읽기는 대기 중인 변경까지 반영
+        pending = writer.backend.load(KIND_SESSION, "s1")
+        assert [row[2] for row in pending["conversation_history"]] == ["hello"]
+
+        writer.backend.flush()
+        assert user_inputs(reader.get_short_term_memory("s1", refresh=True)) == ["hello"]
+    finally:
+        writer.close()
+        reader.close()
+
+
+def check_multi_worker(make_backend):
+    """
+    두 워커가 같은 세션을 캐시한 채 각자 대화를 추가해도 양쪽 기록이 모두 남음
+    (캐시 전체를 덮어쓰지 않고 최신 저장본에 변경 기록을 다시 적용)
+    """
+    worker_a = MemoryManager(backend=make_backend())
+    worker_b = MemoryManager(backend=make_backend())
+    try:
+        worker_a.get_short_term_memory("s1").add_conversation("hi", "hello")
+        worker_a.backend.flush()
+
+        memory_a = worker_a.get_short_term_memory("s1", refresh=True)
+        memory_b = worker_b.get_short_term_memory("s1", refresh=True)
+        memory_a.add_conversation("A1", "a1")
+        memory_b.add_conversation("B1", "b1")
+        worker_a.backend.flush()
+        worker_b.backend.flush()
+
+        # A는 B의 기록을 모르는 캐시에서 이어서 추가하더라도 요청 처리 시 새로 읽음
+        worker_a.get_short_term_memory("s1", refresh=True).add_conversation("A2", "a2")
+        worker_a.backend.flush()
+
+        for worker in (worker_a, worker_b):
+            memory = worker.get_short_term_memory("s1", refresh=True)
+            assert user_inputs(memory) == ["hi", "A1", "B1", "A2"], user_inputs(memory)
+            assert [record["seq"] for record in memory.get_conversation_history()] == [1, 2, 3, 4]
+    finally:
+        worker_a.close()
+        worker_b.close()
+
+
+def check_clear_session(make_backend):
+    manager = MemoryManager(backend=make_backend())
+    try:
+        manager.get_short_term_memory("s1").add_conversation("before", "x")
+        manager.backend.flush()
+        manager.clear_session("s1")
+        manager.get_short_term_memory("s1").add_conversation("after", "y")
+        manager.backend.flush()
+        assert user_inputs(manager.get_short_term_memory("s1", refresh=True)) == ["after"]
+    finally:
+        manager.close()
+
+
+def check_long_term_memory(make_backend):
+    worker_a = MemoryManager(backend=make_backend())
+    worker_b = MemoryManager(backend=make_backend())
+    try:
+        worker_a.get_long_term_memory("u1").save_preference("style", "스트리트")
+        worker_b.get_long_term_memory("u1").add_to_history({"type": "generation", "garment_type": "후드티"})
+        worker_a.backend.flush()
+        worker_b.backend.flush()
+
+        memory = worker_a.get_long_term_memory("u1", refresh=True)
+        assert memory.get_preference("style") == "스트리트"
+        assert len(memory.history) == 1
+    finally:
+        worker_a.close()
+        worker_b.close()
+
+
+def sqlite_backend_factory(directory, **kwargs):
+    db_path = str(Path(directory) / "memory.sqlite3")
+    kwargs.setdefault("flush_interval", 60)
+    return lambda: SQLiteMemoryBackend(db_path, **kwargs)
+
+
+def redis_backend_factory(client, **kwargs):
+    kwargs.setdefault("flush_interval", 60)
+    return lambda: RedisMemoryBackend(client=client, **kwargs)
+
+
+def test_sqlite_write_behind():
+    with tempfile.TemporaryDirectory() as directory:
+        check_write_behind(sqlite_backend_factory(directory))
+
+
+def test_sqlite_multi_worker():
+    with tempfile.TemporaryDirectory() as directory:
+        check_multi_worker(sqlite_backend_factory(directory))
+
+
+def test_sqlite_clear_session():
+    with tempfile.TemporaryDirectory() as directory:
+        check_clear_session(sqlite_backend_factory(directory))
+
+
+def test_sqlite_long_term_memory():
+    with tempfile.TemporaryDirectory() as directory:
+        check_long_term_memory(sqlite_backend_factory(directory))
+
+
+def test_sqlite_batch_size_and_close():
+    """batch_size만큼 모이면 백그라운드 기록, close()는 남은 변경을 기록"""
+    with tempfile.TemporaryDirectory() as directory:
+        make_backend = sqlite_backend_factory(directory, batch_size=2)
+        manager = MemoryManager(backend=make_backend())
+        reader = make_backend()
+        memory = manager.get_short_term_memory("s1")
+        memory.add_conversation("one", "1")
+        memory.add_conversation("two", "2")
+        deadline = time.time() + 5
+        while reader.load(KIND_SESSION, "s1") is None and time.time() < deadline:
+            time.sleep(0.05)
+        assert reader.load(KIND_SESSION, "s1") is not None, "batch_size 도달 후 기록되지 않음"
+
+        manager.get_short_term_memory("s1").add_conversation("three", "3")
+        manager.close()
+        rows = reader.load(KIND_SESSION, "s1")["conversation_history"]
+        assert [row[2] for row in rows] == ["one", "two", "three"]
+        reader.close()
+
+
+def test_sqlite_concurrent_flush():
+    """여러 워커가 동시에 기록해도 모든 대화가 남음"""
+    with tempfile.TemporaryDirectory() as directory:
+        make_backend = sqlite_backend_factory(directory)
+        workers = [MemoryManager(backend=make_backend()) for _ in range(4)]
+
+        def run(index, worker):
+            for turn in range(5):
+                worker.get_short_term_memory("s1", refresh=True).add_conversation(f"w{index}-{turn}", "")
+                worker.backend.flush()
+
+        threads = [threading.Thread(target=run, args=(i, w)) for i, w in enumerate(workers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(30)
+
+        reader = make_backend()
+        # 4개 워커 x 5회 = 대화 20개 (저장은 최근 max_size개만, 번호는 이어짐)
+        data = reader.load(KIND_SESSION, "s1")
+        assert data["next_seq"] == 21, data["next_seq"]
+        reader.close()
+        for worker in workers:
+            worker.close()
+
+
+def test_redis_write_behind():
+    check_write_behind(redis_backend_factory(make_redis_client()))
+
+
+def test_redis_multi_worker():
+    check_multi_worker(redis_backend_factory(make_redis_client()))
+
+
+def test_redis_clear_session():
+    check_clear_session(redis_backend_factory(make_redis_client()))
+
+
+def test_redis_long_term_memory():
+    check_long_term_memory(redis_backend_factory(make_redis_client()))
+
+
+def test_redis_watch_conflict_retry():
+    """WATCH 충돌(EXEC 직전 다른 워커 기록)이 나면 최신 저장본으로 다시 적용"""
+    client = FakeRedis()
+    make_backend = redis_backend_factory(client)
+    worker_a = MemoryManager(backend=make_backend())
+    worker_b = MemoryManager(backend=make_backend())
+    try:
+        worker_b.get_short_term_memory("s1").add_conversation("B1", "b1")
+        worker_a.get_short_term_memory("s1").add_conversation("A1", "a1")
+
+        def interleave():
+            # A의 첫 EXEC 직전에 B가 기록
+            client.before_execute = None
+            worker_b.backend.flush()
+
+        client.before_execute = interleave
+        worker_a.backend.flush()
+
+        memory = worker_a.get_short_term_memory("s1", refresh=True)
+        assert user_inputs(memory) == ["B1", "A1"], user_inputs(memory)
+    finally:
+        worker_a.close()
+        worker_b.close()
+
+
+def main():
+    tests = [
+        test_sqlite_write_behind,
+        test_sqlite_multi_worker,
+        test_sqlite_clear_session,
+        test_sqlite_long_term_memory,
+        test_sqlite_batch_size_and_close,
+        test_sqlite_concurrent_flush,
+        test_redis_write_behind,
+        test_redis_multi_worker,
+        test_redis_clear_session,
+        test_redis_long_term_memory,
+        test_redis_watch_conflict_retry,
+    ]
+    print("=" * 60)
+    print(f"Memory Backend Test (Redis client: {'fakeredis' if FAKEREDIS_AVAILABLE else 'FakeRedis'})")
+    print("=" * 60)
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"[OK] {test.__name__}")
+        except Exception as e:
+            failed += 1
+            print(f"[FAIL] {test.__name__}: {e!r}")
+    print()
+    print(f"{len(tests) - failed}/{len(tests)} passed")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,148 @@
+"""
+NumPy 벡터 인덱스 테스트 스크립트
+
+NumpyVectorIndex 검색 결과를 전수 계산 결과와 비교하고,
+용량 증가, 저장 / memmap 불러오기 후 추가를 확인합니다.
+pytest로도 실행할 수 있습니다.
+
+사용법:
+    python test_numpy_index.py
+"""
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from agentic_system.data_stores.numpy_index import NumpyVectorIndex
+
+
+def brute_force(vectors, queries, k):
+    """정규화 후 코사인 유사도 내림차순 상위 k개"""
+    vectors = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+    queries = queries / np.linalg.norm(queries, axis=1, keepdims=True)
+    similarities = queries @ vectors.T
+    indices = np.argsort(-similarities, axis=1, kind="stable")[:, :k]
+    return 1.0 - np.take_along_axis(similarities, indices, axis=1), indices
+
+
+def test_search_matches_brute_force():
+    rng = np.random.default_rng(0)
+    vectors = rng.standard_normal((500, 32)).astype(np.float32)
+    # QUERY_BATCH_SIZE를 넘는 쿼리 묶음
+    queries = rng.standard_normal((300, 32)).astype(np.float32)
+
+    index = NumpyVectorIndex(initial_capacity=16)
+    index.add(vectors[:100])
+    index.add(vectors[100:])
+    assert index.ntotal == len(index) == 500
+
+    distances, indices = index.search(queries, k=10)
+    expected_distances, expected_indices = brute_force(vectors, queries, 10)
+    assert indices.shape == (300, 10)
+    assert np.array_equal(indices, expected_indices)
+    assert np.allclose(distances, expected_distances, atol=1e-5)
+
+
+def test_small_index_and_padding():
+    index = NumpyVectorIndex()
+    distances, indices = index.search([1.0, 0.0], k=3)
+    assert indices.tolist() == [[-1, -1, -1]]
+    assert np.isinf(distances).all()
+
+    index.add([[1.0, 0.0], [0.0, 1.0]])
+    assert index.dimension == 2
+    distances, indices = index.search([1.0, 0.1], k=3)
+    assert indices.tolist() == [[0, 1, -1]]
+    assert distances[0, 0] < distances[0, 1]
+    assert np.isinf(distances[0, 2])
+
+
+def test_dimension_mismatch():
+    index = NumpyVectorIndex(dimension=4)
+    index.add(np.ones(4))
+    for call in (lambda: index.add(np.ones((2, 3))), lambda: index.search(np.ones(3), k=1)):
+        try:
+            call()
+        except ValueError:
+            continue
+        raise AssertionError("차원이 다른 벡터가 허용됨")
+    assert index.ntotal == 1
+
+
+def test_zero_vector():
+    index = NumpyVectorIndex()
+    index.add([[0.0, 0.0], [1.0, 0.0]])
+    distances, indices = index.search([[0.0, 0.0]], k=2)
+    assert np.isfinite(distances).all()
+
+
+def test_save_and_load():
+    rng = np.random.default_rng(1)
+    vectors = rng.standard_normal((50, 8)).astype(np.float32)
+    queries = rng.standard_normal((5, 8)).astype(np.float32)
+    index = NumpyVectorIndex()
+    index.add(vectors)
+    expected = index.search(queries, k=5)
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "index.npy"
+        index.save(path)
+        assert not path.with_name(path.name + ".tmp").exists()
+
+        for mmap in (True, False):
+            loaded = NumpyVectorIndex.load(path, mmap=mmap)
+            assert loaded.ntotal == 50 and loaded.dimension == 8
+            assert isinstance(loaded.vectors, np.memmap) == mmap
+            distances, indices = loaded.search(queries, k=5)
+            assert np.array_equal(indices, expected[1])
+            assert np.allclose(distances, expected[0])
+
+        # memmap으로 불러온 인덱스에 추가하면 메모리로 복사하고 파일은 그대로
+        loaded = NumpyVectorIndex.load(path)
+        loaded.add(vectors[:1] * -1)
+        assert loaded.ntotal == 51
+        assert not isinstance(loaded.vectors, np.memmap)
+        assert NumpyVectorIndex.load(path).ntotal == 50
+        del loaded
+
+
+def test_reset():
+    index = NumpyVectorIndex()
+    index.add(np.eye(3))
+    index.reset()
+    assert index.ntotal == 0
+    index.add(np.eye(3)[:1])
+    assert index.search(np.eye(3)[0], k=1)[1].tolist() == [[0]]
+
+
+def main():
+    tests = [
+        test_search_matches_brute_force,
+        test_small_index_and_padding,
+        test_dimension_mismatch,
+        test_zero_vector,
+        test_save_and_load,
+        test_reset,
+    ]
+    print("=" * 60)
+    print("NumPy Vector Index Test")
+    print("=" * 60)
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"[OK] {test.__name__}")
+        except Exception as e:
+            failed += 1
+            print(f"[FAIL] {test.__name__}: {e!r}")
+    print()
+    print(f"{len(tests) - failed}/{len(tests)} passed")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
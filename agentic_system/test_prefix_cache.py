@@ -0,0 +1,175 @@
+"""
+접두사 KV 캐시 테스트 스크립트
+
+작은 무작위 LlamaModel에 PrefixKVCache를 연결하여, 접두사 KV를 재사용한 prefill 결과
+(hidden state, past_key_values 길이)와 이어지는 디코딩 단계가 캐시 없는 결과와 같은지,
+접두사가 다르거나 앞쪽이 마스킹된 호출은 그대로 실행되는지 확인합니다.
+torch / transformers가 없으면 건너뜁니다. pytest로도 실행할 수 있습니다.
+
+사용법:
+    python test_prefix_cache.py
+"""
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+try:
+    import torch
+    import transformers
+    from agentic_system.tools.prefix_cache import PrefixKVCache
+    TORCH_AVAILABLE = True
+except ImportError:
+    TORCH_AVAILABLE = False
+
+HIDDEN_SIZE = 32
+PREFIX_IDS = [1, 5, 9, 13, 17, 21]
+
+
+def make_model():
+    torch.manual_seed(0)
+    config = transformers.LlamaConfig(
+        vocab_size=64,
+        hidden_size=HIDDEN_SIZE,
+        intermediate_size=64,
+        num_hidden_layers=2,
+        num_attention_heads=4,
+        max_position_embeddings=128
+    )
+    return transformers.LlamaModel(config).eval()
+
+
+def make_inputs(model, batch_size=2, suffix_length=7):
+    """접두사 임베딩 + 요청별 임베딩 (이미지 특징 / 질문 자리)"""
+    prefix = model.get_input_embeddings()(torch.tensor([PREFIX_IDS]))
+    suffix = torch.randn(batch_size, suffix_length, HIDDEN_SIZE)
+    return torch.cat([prefix.expand(batch_size, -1, -1), suffix], dim=1)
+
+
+def past_length(past):
+    return past.get_seq_length() if hasattr(past, "get_seq_length") else past[0][0].shape[2]
+
+
+def prefill_and_decode(model, inputs_embeds):
+    """prefill 후 토큰 1개 디코딩 (generate의 호출 순서)"""
+    batch_size, length, _ = inputs_embeds.shape
+    prefill = model(
+        inputs_embeds=inputs_embeds,
+        attention_mask=torch.ones(batch_size, length, dtype=torch.long),
+        use_cache=True,
+        output_hidden_states=True,
+        return_dict=True
+    )
+    prefill_state = (
+        prefill.last_hidden_state.clone(),
+        tuple(h.clone() for h in prefill.hidden_states),
+        past_length(prefill.past_key_values)
+    )
+    torch.manual_seed(1)
+    decode = model(
+        inputs_embeds=torch.randn(batch_size, 1, HIDDEN_SIZE),
+        attention_mask=torch.ones(batch_size, length + 1, dtype=torch.long),
+        past_key_values=prefill.past_key_values,
+        use_cache=True,
+        return_dict=True
+    )
+    return prefill_state, decode.last_hidden_state
+
+
+def skip_without_torch():
+    if not TORCH_AVAILABLE:
+        print("[SKIP] torch / transformers가 설치되지 않아 건너뜁니다")
+        return True
+    return False
+
+
+def test_prefill_matches_full_forward():
+    if skip_without_torch():
+        return
+    with torch.no_grad():
+        model = make_model()
+        inputs_embeds = make_inputs(model)
+        expected_prefill, expected_decode = prefill_and_decode(model, inputs_embeds)
+
+        cache = PrefixKVCache(model)
+        cache.build(torch.tensor(PREFIX_IDS))
+        cache.install()
+        actual_prefill, actual_decode = prefill_and_decode(model, inputs_embeds)
+
+    # prefill은 접두사 KV를 사용하고, 디코딩 단계는 그대로 실행
+    assert cache.hits == 1
+    assert cache.prefix_length == len(PREFIX_IDS)
+    assert torch.allclose(actual_prefill[0], expected_prefill[0], atol=1e-5)
+    assert len(actual_prefill[1]) == len(expected_prefill[1])
+    for actual, expected in zip(actual_prefill[1], expected_prefill[1]):
+        assert actual.shape == expected.shape
+        assert torch.allclose(actual, expected, atol=1e-5)
+    assert actual_prefill[2] == expected_prefill[2] == inputs_embeds.shape[1]
+    assert torch.allclose(actual_decode, expected_decode, atol=1e-5)
+
+
+def test_tuple_output():
+    if skip_without_torch():
+        return
+    with torch.no_grad():
+        model = make_model()
+        inputs_embeds = make_inputs(model, batch_size=1)
+        expected = model(inputs_embeds=inputs_embeds, return_dict=True).last_hidden_state
+        cache = PrefixKVCache(model)
+        cache.build(torch.tensor(PREFIX_IDS))
+        cache.install()
+        actual = model(inputs_embeds=inputs_embeds, return_dict=False)
+    assert cache.hits == 1
+    assert isinstance(actual, tuple)
+    assert torch.allclose(actual[0], expected, atol=1e-5)
+
+
+def test_passthrough():
+    """접두사가 다르거나 앞쪽이 마스킹된 호출은 캐시를 쓰지 않음"""
+    if skip_without_torch():
+        return
+    with torch.no_grad():
+        model = make_model()
+        cache = PrefixKVCache(model)
+        cache.build(torch.tensor(PREFIX_IDS))
+        cache.install()
+
+        other = torch.randn(2, 10, HIDDEN_SIZE)
+        model(inputs_embeds=other, use_cache=True, return_dict=True)
+
+        inputs_embeds = make_inputs(model)
+        mask = torch.ones(2, inputs_embeds.shape[1], dtype=torch.long)
+        mask[1, 0] = 0
+        model(inputs_embeds=inputs_embeds, attention_mask=mask, use_cache=True, return_dict=True)
+        assert cache.hits == 0
+
+        cache.uninstall()
+        model(inputs_embeds=inputs_embeds, use_cache=True, return_dict=True)
+        assert cache.hits == 0
+
+
+def main():
+    tests = [
+        test_prefill_matches_full_forward,
+        test_tuple_output,
+        test_passthrough,
+    ]
+    print("=" * 60)
+    print("Prefix KV Cache Test")
+    print("=" * 60)
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"[OK] {test.__name__}")
+        except Exception as e:
+            failed += 1
+            print(f"[FAIL] {test.__name__}: {e!r}")
+    print()
+    print(f"{len(tests) - failed}/{len(tests)} passed")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
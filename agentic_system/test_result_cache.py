@@ -0,0 +1,142 @@
+"""
+결과 캐시 테스트 스크립트
+
+ResultCache 키 구성, 산출물의 캐시 전용 복사본 저장과 적중 시 호출자 출력 디렉토리로의 복사,
+작업 공간이 정리(GC)된 뒤의 적중, LRU 정리 시 산출물 삭제를 확인합니다.
+pytest로도 실행할 수 있습니다.
+
+사용법:
+    python test_result_cache.py
+"""
+import os
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from agentic_system.tools.result_cache import ResultCache
+
+
+def make_result(output_dir, garment_id="garment_a"):
+    """파이프라인 결과와 같은 형태의 산출물 디렉토리 생성"""
+    saved_dir = Path(output_dir) / f"valid_garment_{garment_id}"
+    (saved_dir / "design").mkdir(parents=True)
+    spec_path = saved_dir / "design" / "design_specification.json"
+    spec_path.write_text('{"panels": {}}', encoding="utf-8")
+    mesh_path = saved_dir / "garment.obj"
+    mesh_path.write_text("v 0 0 0\n", encoding="utf-8")
+    return {
+        "status": "success",
+        "garment_id": garment_id,
+        "output_dir": str(saved_dir),
+        "json_spec_path": str(spec_path),
+        "mesh_path": str(mesh_path),
+        "float_preds": [[0.1, 0.2]],
+    }
+
+
+def test_make_key():
+    with tempfile.TemporaryDirectory() as directory:
+        image_path = Path(directory) / "image.png"
+        image_path.write_bytes(b"image-bytes")
+        key = ResultCache.make_key(str(image_path), model_version="v1", namespace="garment")
+        assert key == ResultCache.make_key(str(image_path), model_version="v1", namespace="garment")
+        assert key != ResultCache.make_key(str(image_path), model_version="v2", namespace="garment")
+        assert key != ResultCache.make_key(str(image_path), model_version="v1", namespace="analysis")
+        assert key != ResultCache.make_key(str(image_path), prompt="긴팔", model_version="v1", namespace="garment")
+
+
+def test_hit_into_different_output_dir():
+    """적중 결과는 호출자의 출력 디렉토리를 가리키고, 원래 작업 공간이 정리되어도 유지"""
+    with tempfile.TemporaryDirectory() as directory:
+        cache = ResultCache(cache_dir=os.path.join(directory, "cache"))
+        job_a = os.path.join(directory, "jobs", "a")
+        result = make_result(job_a)
+        cache.put("k1", result)
+        # 저장 후에도 원래 결과는 호출자의 경로 그대로
+        assert result["output_dir"].startswith(job_a)
+
+        shutil.rmtree(job_a)
+
+        target = os.path.join(directory, "jobs", "b", "valid_garment_garment_b")
+        hit = cache.get_into("k1", target)
+        assert hit is not None
+        assert hit["output_dir"] == os.path.abspath(target)
+        assert hit["json_spec_path"] == os.path.join(target, "design", "design_specification.json")
+        assert hit["mesh_path"] == os.path.join(target, "garment.obj")
+        assert Path(hit["json_spec_path"]).read_text(encoding="utf-8") == '{"panels": {}}'
+        assert hit["float_preds"] == [[0.1, 0.2]]
+
+        # 다른 요청의 출력 디렉토리를 수정 / 삭제해도 캐시 복사본에는 영향 없음
+        os.remove(hit["mesh_path"])
+        other = cache.get_into("k1", os.path.join(directory, "jobs", "c"))
+        assert other is not None and os.path.exists(other["mesh_path"])
+        assert other["output_dir"] != hit["output_dir"]
+
+
+def test_result_without_artifacts():
+    with tempfile.TemporaryDirectory() as directory:
+        cache = ResultCache(cache_dir=directory)
+        cache.put("k1", {"status": "success", "analysis": {"type": "hoodie"}})
+        assert cache.get_into("k1", os.path.join(directory, "out")) == {
+            "status": "success", "analysis": {"type": "hoodie"}
+        }
+        assert cache.get_into("missing", os.path.join(directory, "out")) is None
+
+
+def test_missing_artifact_invalidates():
+    with tempfile.TemporaryDirectory() as directory:
+        cache = ResultCache(cache_dir=os.path.join(directory, "cache"))
+        cache.put("k1", make_result(os.path.join(directory, "jobs", "a")))
+        stored = cache.get("k1")
+        os.remove(stored["mesh_path"])
+        assert cache.get("k1") is None
+        assert not cache._artifact_dir("k1").exists()
+
+
+def test_eviction_removes_artifacts():
+    with tempfile.TemporaryDirectory() as directory:
+        cache = ResultCache(cache_dir=os.path.join(directory, "cache"), max_entries=2)
+        for i in range(3):
+            cache.put(f"k{i}", make_result(os.path.join(directory, "jobs", str(i))))
+        assert cache.get("k0") is None
+        assert not cache._artifact_dir("k0").exists()
+        assert cache.get("k1") is not None and cache.get("k2") is not None
+
+        # 산출물 크기도 용량 제한에 포함되며, 다시 열어도 같은 크기로 계산
+        assert cache._index["k1"][0] > os.path.getsize(cache._entry_path("k1"))
+        # 항목 파일 크기는 created_at 자릿수에 따라 조금씩 다르므로 큰 쪽 하나만 들어가는 용량으로 제한
+        size = max(cache._index[key][0] for key in ("k1", "k2"))
+        reopened = ResultCache(cache_dir=os.path.join(directory, "cache"), max_bytes=size)
+        assert len(reopened._index) == 1
+
+
+def main():
+    tests = [
+        test_make_key,
+        test_hit_into_different_output_dir,
+        test_result_without_artifacts,
+        test_missing_artifact_invalidates,
+        test_eviction_removes_artifacts,
+    ]
+    print("=" * 60)
+    print("Result Cache Test")
+    print("=" * 60)
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"[OK] {test.__name__}")
+        except Exception as e:
+            failed += 1
+            print(f"[FAIL] {test.__name__}: {e!r}")
+    print()
+    print(f"{len(tests) - failed}/{len(tests)} passed")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
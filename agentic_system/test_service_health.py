@@ -0,0 +1,206 @@
+"""
+서비스 상태 캐시 / 서킷 브레이커 테스트 스크립트
+
+CircuitBreaker의 closed → open → half-open 전이, 지수 백오프와 상한,
+half-open 상태의 프로브 1회 제한과, ServiceHealthMonitor의 결과 캐시 / 확인 간격 증가 /
+브레이커 반영을 가짜 시계와 가짜 프로브로 확인합니다. pytest로도 실행할 수 있습니다.
+
+사용법:
+    python test_service_health.py
+"""
+import sys
+import threading
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from agentic_system.tools.service_health import CircuitBreaker, ServiceHealthMonitor
+
+
+class FakeClock:
+    """수동으로 진행하는 단조 시계"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float):
+        self.now += seconds
+
+
+def make_breaker(**kwargs):
+    clock = FakeClock()
+    kwargs.setdefault("failure_threshold", 3)
+    kwargs.setdefault("base_backoff", 5.0)
+    return CircuitBreaker(name="test", clock=clock, **kwargs), clock
+
+
+def open_breaker(breaker):
+    for _ in range(breaker.failure_threshold):
+        breaker.record_failure()
+
+
+def test_opens_after_threshold():
+    breaker, _ = make_breaker()
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED and breaker.allow_request()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow_request() and not breaker.would_allow()
+    assert breaker.snapshot()["retry_in"] == 5.0
+
+
+def test_success_resets_failure_count():
+    breaker, _ = make_breaker()
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_half_open_allows_single_probe():
+    breaker, clock = make_breaker()
+    open_breaker(breaker)
+    clock.advance(4.9)
+    assert not breaker.allow_request()
+    clock.advance(0.1)
+
+    # 후보 확인은 프로브 자리를 차지하지 않음
+    assert breaker.would_allow() and breaker.would_allow()
+    assert breaker.allow_request()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert not breaker.allow_request() and not breaker.would_allow()
+
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.allow_request() and breaker.allow_request()
+
+
+def test_concurrent_half_open_probe():
+    """여러 스레드가 동시에 요청해도 half-open 프로브는 1개"""
+    breaker, clock = make_breaker()
+    open_breaker(breaker)
+    clock.advance(5)
+    barrier = threading.Barrier(8)
+    allowed = []
+
+    def worker():
+        barrier.wait()
+        allowed.append(breaker.allow_request())
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+    assert sorted(allowed) == [False] * 7 + [True]
+
+
+def test_exponential_backoff():
+    """프로브가 실패할 때마다 차단 시간 2배 (max_backoff까지), 성공하면 초기화"""
+    breaker, clock = make_breaker(max_backoff=30.0)
+    open_breaker(breaker)
+    backoffs = []
+    for _ in range(5):
+        backoffs.append(breaker.snapshot()["retry_in"])
+        clock.advance(backoffs[-1])
+        assert breaker.allow_request()
+        breaker.record_failure()
+        assert breaker.state == CircuitBreaker.OPEN
+    assert backoffs == [5.0, 10.0, 20.0, 30.0, 30.0]
+
+    clock.advance(30)
+    assert breaker.allow_request()
+    breaker.record_success()
+    open_breaker(breaker)
+    assert breaker.snapshot()["retry_in"] == 5.0
+
+
+def test_monitor_caches_result_and_feeds_breaker():
+    results = [True, False, False]
+    calls = []
+
+    def probe():
+        calls.append(1)
+        result = results.pop(0) if results else True
+        if result is None:
+            raise ConnectionError("down")
+        return result
+
+    breaker, _ = make_breaker(failure_threshold=2)
+    monitor = ServiceHealthMonitor(probe, interval=10, max_interval=60, breaker=breaker, name="test")
+    assert monitor.healthy is None
+    assert monitor.check_now() is True and monitor.healthy is True
+    assert monitor.next_interval() == 10
+
+    monitor.check_now()
+    assert monitor.healthy is False and monitor.next_interval() == 20
+    monitor.check_now()
+    assert monitor.next_interval() == 40
+    assert breaker.state == CircuitBreaker.OPEN
+
+    # 예외는 실패로 처리, 확인 간격은 max_interval까지
+    results.append(None)
+    assert monitor.check_now() is False
+    assert monitor.next_interval() == 60
+    assert len(calls) == 4
+
+    assert monitor.check_now() is True
+    assert monitor.next_interval() == 10 and breaker.state == CircuitBreaker.CLOSED
+
+
+def test_monitor_thread():
+    checked = threading.Event()
+    calls = []
+
+    def probe():
+        calls.append(1)
+        if len(calls) >= 2:
+            checked.set()
+        return True
+
+    monitor = ServiceHealthMonitor(probe, interval=0.01, name="test")
+    monitor.start()
+    monitor.start()
+    try:
+        assert checked.wait(5)
+        assert monitor.healthy is True and monitor.last_checked is not None
+    finally:
+        monitor.stop()
+    monitor._thread.join(5)
+    assert not monitor._thread.is_alive()
+
+
+def main():
+    tests = [
+        test_opens_after_threshold,
+        test_success_resets_failure_count,
+        test_half_open_allows_single_probe,
+        test_concurrent_half_open_probe,
+        test_exponential_backoff,
+        test_monitor_caches_result_and_feeds_breaker,
+        test_monitor_thread,
+    ]
+    print("=" * 60)
+    print("Service Health Test")
+    print("=" * 60)
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"[OK] {test.__name__}")
+        except Exception as e:
+            failed += 1
+            print(f"[FAIL] {test.__name__}: {e!r}")
+    print()
+    print(f"{len(tests) - failed}/{len(tests)} passed")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
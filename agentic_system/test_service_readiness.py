@@ -0,0 +1,160 @@
+"""
+ChatGarment 서비스 준비 상태 테스트 스크립트
+
+백그라운드 워밍업(warmup_in_background)이 starting → loading_model → warming_up → ready 순서로
+상태를 바꾸는지, 그동안 /ready가 503을 반환하다가 ready가 되면 200으로 바뀌는지,
+로딩 / 워밍업 실패 시 failed 상태와 오류 메시지, /health의 ready 표시를 확인합니다.
+서비스 시작 이벤트 없이 가짜 파이프라인으로 실행되며 pytest로도 실행할 수 있습니다.
+
+사용법:
+    python test_service_readiness.py
+"""
+import sys
+import time
+from pathlib import Path
+from unittest import mock
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from fastapi.testclient import TestClient
+
+from agentic_system.chatgarment_service import main as service
+
+
+class FakePipeline:
+    """ChatGarmentPipeline 흉내 (로딩 / 워밍업 중 /ready 응답 기록)"""
+
+    def __init__(self, client, load_ok=True, warmup_result=None):
+        self.client = client
+        self.load_ok = load_ok
+        self.warmup_result = warmup_result or {"status": "success", "warmup_seconds": 0.5}
+        self.model_loaded = False
+        self.observed = []
+
+    def observe(self):
+        response = self.client.get("/ready")
+        self.observed.append((response.status_code, response.json()["state"]))
+
+    def load_model(self):
+        self.observe()
+        self.model_loaded = self.load_ok
+
+    def warmup(self):
+        self.observe()
+        return self.warmup_result
+
+
+def fresh_readiness():
+    """테스트마다 준비 상태를 starting으로 초기화 (테스트 후 원래 값 복원)"""
+    return mock.patch.dict(service.readiness, {
+        "state": "starting",
+        "mock": None,
+        "started_at": time.time(),
+        "ready_at": None,
+        "load_seconds": None,
+        "warmup_seconds": None,
+        "error": None
+    })
+
+
+def run_warmup(pipeline):
+    """warmup_in_background를 현재 스레드에서 실행하고 거친 상태 목록 반환"""
+    states = []
+    set_readiness = service.set_readiness
+
+    def record(state, **fields):
+        states.append(state)
+        set_readiness(state, **fields)
+
+    with mock.patch.object(service, "load_chatgarment_pipeline", lambda: pipeline), \
+            mock.patch.object(service, "set_readiness", record), \
+            mock.patch.object(service, "WARMUP_ON_STARTUP", True):
+        service.warmup_in_background()
+    return states
+
+
+def make_client():
+    return TestClient(service.app)
+
+
+def test_ready_transition():
+    with fresh_readiness(), mock.patch.object(service, "USE_INFERENCE_WORKER", False):
+        client = make_client()
+        response = client.get("/ready")
+        assert response.status_code == 503 and response.json()["state"] == "starting"
+        assert client.get("/health").json()["ready"] is False
+
+        pipeline = FakePipeline(client)
+        assert run_warmup(pipeline) == ["loading_model", "warming_up", "ready"]
+        assert pipeline.observed == [(503, "loading_model"), (503, "warming_up")]
+
+        response = client.get("/ready")
+        body = response.json()
+        assert response.status_code == 200 and body["state"] == "ready"
+        assert body["mock"] is False and body["warmup_seconds"] == 0.5
+        assert body["load_seconds"] is not None and body["ready_at"] >= body["started_at"]
+        assert body["error"] is None and body["service"] == "chatgarment"
+        assert client.get("/health").json() == {"status": "healthy", "service": "chatgarment", "ready": True}
+
+
+def test_load_failure():
+    with fresh_readiness(), mock.patch.object(service, "USE_INFERENCE_WORKER", False):
+        client = make_client()
+        assert run_warmup(FakePipeline(client, load_ok=False)) == ["loading_model", "failed"]
+        response = client.get("/ready")
+        assert response.status_code == 503
+        assert response.json()["state"] == "failed" and response.json()["error"]
+        assert client.get("/health").json()["ready"] is False
+
+
+def test_warmup_failure():
+    with fresh_readiness(), mock.patch.object(service, "USE_INFERENCE_WORKER", False):
+        client = make_client()
+        pipeline = FakePipeline(client, warmup_result={"status": "error", "message": "더미 추론 실패"})
+        assert run_warmup(pipeline) == ["loading_model", "warming_up", "failed"]
+        response = client.get("/ready")
+        assert response.status_code == 503 and response.json()["error"] == "더미 추론 실패"
+
+
+def test_worker_warmup_result():
+    """추론 워커 모드: warmup 응답(Dict)을 그대로 준비 상태에 반영하고 워커 생존 여부 표시"""
+    worker = mock.MagicMock(is_alive=True)
+    with fresh_readiness(), mock.patch.object(service, "USE_INFERENCE_WORKER", True), \
+            mock.patch.object(service, "inference_worker", worker):
+        client = make_client()
+        service.set_readiness("loading_model")
+        response = client.get("/ready")
+        assert response.status_code == 503 and response.json()["worker_alive"] is True
+
+        service.apply_warmup_result({"status": "success", "mock": True, "warmup_seconds": 0.1})
+        response = client.get("/ready")
+        assert response.status_code == 200
+        assert response.json()["mock"] is True and response.json()["warmup_seconds"] == 0.1
+
+
+def main():
+    tests = [
+        test_ready_transition,
+        test_load_failure,
+        test_warmup_failure,
+        test_worker_warmup_result,
+    ]
+    print("=" * 60)
+    print("ChatGarment Service Readiness Test")
+    print("=" * 60)
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"[OK] {test.__name__}")
+        except Exception as e:
+            failed += 1
+            print(f"[FAIL] {test.__name__}: {e!r}")
+    print()
+    print(f"{len(tests) - failed}/{len(tests)} passed")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
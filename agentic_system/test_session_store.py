@@ -0,0 +1,172 @@
+"""
+SessionStore 테스트 스크립트
+
+TTL 만료, LRU 제거, 만료 세션 정리(sweep), 동시 조회 시 factory 호출을 확인합니다.
+pytest로도 실행할 수 있습니다.
+
+사용법:
+    python test_session_store.py
+"""
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from agentic_system.core.memory import SessionStore
+
+
+def make_store(**kwargs):
+    """factory 호출 기록을 남기는 저장소 (백그라운드 정리 스레드 없음)"""
+    calls = []
+
+    def factory(session_id):
+        calls.append(session_id)
+        return {"session_id": session_id, "created": len(calls)}
+
+    kwargs.setdefault("sweep_interval", 0)
+    return SessionStore(factory, **kwargs), calls
+
+
+def test_ttl_expiry():
+    store, calls = make_store(ttl_seconds=0.1)
+    first = store.get_or_create("s1")
+    assert store.get_or_create("s1") is first
+    assert calls == ["s1"]
+
+    time.sleep(0.15)
+    assert store.get("s1") is None
+    second = store.get_or_create("s1")
+    assert second is not first
+    assert calls == ["s1", "s1"]
+
+
+def test_ttl_refresh_on_access():
+    store, _ = make_store(ttl_seconds=0.2)
+    store.get_or_create("s1")
+    for _ in range(3):
+        time.sleep(0.1)
+        assert store.get("s1") is not None
+
+    store, _ = make_store(ttl_seconds=0.2, refresh_on_access=False)
+    store.get_or_create("s1")
+    time.sleep(0.1)
+    assert store.get("s1") is not None
+    time.sleep(0.15)
+    assert store.get("s1") is None
+
+
+def test_lru_eviction():
+    store, _ = make_store(max_sessions=2)
+    store.get_or_create("a")
+    store.get_or_create("b")
+    # a를 다시 사용하면 가장 오래 사용하지 않은 세션은 b
+    store.get_or_create("a")
+    store.get_or_create("c")
+    assert len(store) == 2
+    assert "a" in store and "c" in store
+    assert "b" not in store
+
+
+def test_sweep():
+    store, _ = make_store(ttl_seconds=0.1)
+    store.get_or_create("old1")
+    store.get_or_create("old2")
+    time.sleep(0.15)
+    store.get_or_create("new")
+    assert store.sweep() == 2
+    assert list(store) == ["new"]
+    assert store.sweep() == 0
+
+
+def test_concurrent_load():
+    """같은 세션 동시 조회는 factory 1회, 다른 세션의 조회는 서로 막지 않음"""
+    calls = []
+    calls_lock = threading.Lock()
+
+    def slow_factory(session_id):
+        with calls_lock:
+            calls.append(session_id)
+        time.sleep(0.2)
+        return object()
+
+    store = SessionStore(slow_factory, sweep_interval=0)
+    keys = [f"s{i % 4}" for i in range(16)]
+    start = time.monotonic()
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        values = list(executor.map(store.get_or_create, keys))
+    elapsed = time.monotonic() - start
+
+    assert sorted(calls) == ["s0", "s1", "s2", "s3"]
+    for key, value in zip(keys, values):
+        assert value is store.get(key)
+    # 세션 4개를 순서대로 만들면 0.8초 이상 걸림
+    assert elapsed < 0.6, f"조회가 직렬화됨 ({elapsed:.2f}초)"
+
+
+def test_pop_during_load():
+    """생성 중 pop()된 세션은 저장하지 않음"""
+    started = threading.Event()
+    release = threading.Event()
+
+    def blocking_factory(session_id):
+        started.set()
+        release.wait(5)
+        return session_id
+
+    store = SessionStore(blocking_factory, sweep_interval=0)
+    thread = threading.Thread(target=store.get_or_create, args=("s1",))
+    thread.start()
+    started.wait(5)
+    store.pop("s1")
+    release.set()
+    thread.join(5)
+    assert "s1" not in store
+
+
+def test_factory_error():
+    def failing_factory(session_id):
+        raise RuntimeError("load failed")
+
+    store = SessionStore(failing_factory, sweep_interval=0)
+    for _ in range(2):
+        try:
+            store.get_or_create("s1")
+        except RuntimeError:
+            pass
+        else:
+            raise AssertionError("factory 오류가 전달되지 않음")
+    assert len(store) == 0
+
+
+def main():
+    tests = [
+        test_ttl_expiry,
+        test_ttl_refresh_on_access,
+        test_lru_eviction,
+        test_sweep,
+        test_concurrent_load,
+        test_pop_during_load,
+        test_factory_error,
+    ]
+    print("=" * 60)
+    print("SessionStore Test")
+    print("=" * 60)
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"[OK] {test.__name__}")
+        except Exception as e:
+            failed += 1
+            print(f"[FAIL] {test.__name__}: {e}")
+    print()
+    print(f"{len(tests) - failed}/{len(tests)} passed")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,209 @@
+"""
+도구 레지스트리 테스트 스크립트
+
+ToolRegistry의 싱글톤 / 인스턴스 풀 모드, 풀 크기 환경 변수, warmup / shutdown 훅 호출을
+확인합니다. 실제 도구 대신 생성 / 사용 기록을 남기는 도구를 등록하므로 모델 없이 실행됩니다.
+pytest로도 실행할 수 있습니다.
+
+사용법:
+    python test_tool_registry.py
+"""
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from unittest import mock
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from agentic_system.tools.registry import ToolRegistry
+
+
+class FakeTool:
+    """warmup / shutdown 호출과 동시 사용 수를 기록하는 도구"""
+
+    created = 0
+    created_lock = threading.Lock()
+
+    def __init__(self):
+        with FakeTool.created_lock:
+            FakeTool.created += 1
+        self.warmed = 0
+        self.closed = 0
+        self.active = 0
+        self.max_active = 0
+        self.lock = threading.Lock()
+
+    def warmup(self):
+        self.warmed += 1
+
+    def shutdown(self):
+        self.closed += 1
+
+    def use(self, delay=0.05):
+        with self.lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        time.sleep(delay)
+        with self.lock:
+            self.active -= 1
+        return self
+
+
+def make_registry(pool_size):
+    FakeTool.created = 0
+    registry = ToolRegistry()
+    registry.register("fake", FakeTool, pool_size=pool_size)
+    return registry
+
+
+def borrow(registry, delay=0.05):
+    with registry.instance("fake") as tool:
+        return tool.use(delay)
+
+
+def test_singleton_shared():
+    registry = make_registry(pool_size=0)
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        tools = list(executor.map(lambda _: borrow(registry), range(8)))
+    assert FakeTool.created == 1
+    assert all(tool is tools[0] for tool in tools)
+    # 싱글톤은 스레드끼리 공유 (도구가 내부에서 직렬화해야 함)
+    assert tools[0].max_active > 1
+
+
+def test_pool_exclusive():
+    registry = make_registry(pool_size=2)
+    with ThreadPoolExecutor(max_workers=6) as executor:
+        tools = list(executor.map(lambda _: borrow(registry), range(6)))
+    assert FakeTool.created == 2
+    assert len({id(tool) for tool in tools}) == 2
+    # 풀 인스턴스는 한 번에 한 호출만 사용
+    assert all(tool.max_active == 1 for tool in tools)
+
+
+def test_pool_blocks_when_exhausted():
+    registry = make_registry(pool_size=1)
+    borrowed = threading.Event()
+    release = threading.Event()
+
+    def hold():
+        with registry.instance("fake"):
+            borrowed.set()
+            release.wait(5)
+
+    holder = threading.Thread(target=hold)
+    holder.start()
+    borrowed.wait(5)
+    waiter = threading.Thread(target=borrow, args=(registry, 0))
+    waiter.start()
+    waiter.join(0.2)
+    assert waiter.is_alive(), "풀이 비었는데 인스턴스가 추가 생성됨"
+    release.set()
+    holder.join(5)
+    waiter.join(5)
+    assert not waiter.is_alive()
+    assert FakeTool.created == 1
+
+
+def test_instance_returned_after_error():
+    registry = make_registry(pool_size=1)
+    try:
+        with registry.instance("fake"):
+            raise RuntimeError("tool failed")
+    except RuntimeError:
+        pass
+    # 예외가 나도 인스턴스는 풀로 반환되어 다시 빌릴 수 있음
+    assert borrow(registry, 0) is not None
+    assert FakeTool.created == 1
+
+
+def test_pool_size_from_env():
+    with mock.patch.dict(os.environ, {"FAKE_POOL_SIZE": "3"}):
+        registry = ToolRegistry()
+        registry.register("fake", FakeTool)
+    assert registry._specs["fake"].pool_size == 3
+    assert registry.is_registered("fake") and not registry.is_registered("other")
+    try:
+        with registry.instance("other"):
+            pass
+    except KeyError:
+        pass
+    else:
+        raise AssertionError("등록되지 않은 도구가 반환됨")
+
+
+def test_warmup():
+    registry = make_registry(pool_size=3)
+    registry.warmup()
+    # 풀을 최대 크기까지 채우고 모든 인스턴스에 warmup 호출
+    assert FakeTool.created == 3
+    tools = list(registry._specs["fake"].instances)
+    assert [tool.warmed for tool in tools] == [1, 1, 1]
+    borrow(registry, 0)
+    assert FakeTool.created == 3
+
+    registry = make_registry(pool_size=0)
+    registry.warmup(["fake"])
+    with registry.instance("fake") as tool:
+        assert tool.warmed == 1
+    assert FakeTool.created == 1
+
+
+def test_warmup_failure_isolated():
+    class BrokenTool(FakeTool):
+        def warmup(self):
+            raise RuntimeError("model missing")
+
+    registry = ToolRegistry()
+    registry.register("broken", BrokenTool, pool_size=0)
+    registry.register("fake", FakeTool, pool_size=0)
+    registry.warmup()
+    with registry.instance("fake") as tool:
+        assert tool.warmed == 1
+
+
+def test_shutdown():
+    registry = make_registry(pool_size=2)
+    registry.warmup()
+    tools = list(registry._specs["fake"].instances)
+    registry.shutdown()
+    assert [tool.closed for tool in tools] == [1, 1]
+    assert registry._specs["fake"].instances == []
+
+    # shutdown 후 다시 사용하면 새 인스턴스 생성
+    assert borrow(registry, 0) not in tools
+
+
+def main():
+    tests = [
+        test_singleton_shared,
+        test_pool_exclusive,
+        test_pool_blocks_when_exhausted,
+        test_instance_returned_after_error,
+        test_pool_size_from_env,
+        test_warmup,
+        test_warmup_failure_isolated,
+        test_shutdown,
+    ]
+    print("=" * 60)
+    print("Tool Registry Test")
+    print("=" * 60)
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"[OK] {test.__name__}")
+        except Exception as e:
+            failed += 1
+            print(f"[FAIL] {test.__name__}: {e!r}")
+    print()
+    print(f"{len(tests) - failed}/{len(tests)} passed")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
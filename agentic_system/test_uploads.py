@@ -0,0 +1,136 @@
+"""
+업로드 스트리밍 저장 테스트 스크립트
+
+API 서버(api/uploads.py)와 ChatGarment 서비스(chatgarment_service/uploads.py)의 stream_to_file이
+같은 동작을 하는지 확인합니다: SHA-256 계산과 해시 이름 저장 / 중복 제거, 크기 제한 초과 시 413,
+해시 불일치 시 400, 업로드가 중간에 끊겼을 때 임시 파일 정리.
+서비스의 PUT /api/v1/blobs/{sha256} 크기 제한(413)도 확인합니다. pytest로도 실행할 수 있습니다.
+
+사용법:
+    python test_uploads.py
+"""
+import asyncio
+import hashlib
+import sys
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+
+from agentic_system.api import uploads as api_uploads
+from agentic_system.chatgarment_service import main as service
+from agentic_system.chatgarment_service import uploads as service_uploads
+from agentic_system.chatgarment_service.blob_store import BlobStore
+
+MODULES = (api_uploads, service_uploads)
+
+
+async def chunks_of(*parts, error=None):
+    """청크 스트림 (error가 있으면 모든 청크 뒤에 발생 = 전송 중단)"""
+    for part in parts:
+        yield part
+    if error is not None:
+        raise error
+
+
+def save(module, chunks, directory, **kwargs):
+    return asyncio.run(module.stream_to_file(chunks, Path(directory), **kwargs))
+
+
+def expect_http_error(status_code, func, *args, **kwargs):
+    try:
+        func(*args, **kwargs)
+    except HTTPException as e:
+        assert e.status_code == status_code, e.status_code
+    else:
+        raise AssertionError(f"HTTP {status_code}가 발생하지 않음")
+
+
+def test_sha256_and_dedupe():
+    for module in MODULES:
+        with tempfile.TemporaryDirectory() as tmp:
+            parts = (b"abc" * 1000, b"def" * 1000)
+            expected = hashlib.sha256(b"".join(parts)).hexdigest()
+            saved = save(module, chunks_of(*parts), tmp, suffix=".jpg")
+            assert saved.sha256 == expected and saved.size == 6000 and saved.created
+            assert saved.path == Path(tmp) / f"{expected}.jpg"
+            assert saved.path.read_bytes() == b"".join(parts)
+
+            # 같은 내용은 파일 하나 (다른 청크 구성이어도)
+            again = save(module, chunks_of(b"".join(parts)), tmp, suffix=".jpg")
+            assert again.path == saved.path and not again.created
+            assert [p.name for p in Path(tmp).iterdir()] == [saved.path.name]
+
+
+def test_size_limit():
+    for module in MODULES:
+        with tempfile.TemporaryDirectory() as tmp:
+            expect_http_error(413, save, module, chunks_of(b"x" * 60, b"x" * 60), tmp, max_bytes=100)
+            assert list(Path(tmp).iterdir()) == []
+            # 제한과 같은 크기는 허용
+            assert save(module, chunks_of(b"x" * 100), tmp, max_bytes=100).size == 100
+
+
+def test_digest_mismatch():
+    for module in MODULES:
+        with tempfile.TemporaryDirectory() as tmp:
+            wrong = hashlib.sha256(b"other").hexdigest()
+            expect_http_error(400, save, module, chunks_of(b"image"), tmp, expected_sha256=wrong)
+            assert list(Path(tmp).iterdir()) == []
+
+
+def test_aborted_upload_cleans_temp_file():
+    """클라이언트 연결이 끊겨 스트림이 예외로 끝나면 임시 파일을 지우고 예외를 전달"""
+    for module in MODULES:
+        with tempfile.TemporaryDirectory() as tmp:
+            try:
+                save(module, chunks_of(b"partial", error=ConnectionResetError("client gone")), tmp)
+            except ConnectionResetError:
+                pass
+            else:
+                raise AssertionError("전송 중단 예외가 전달되지 않음")
+            assert list(Path(tmp).iterdir()) == []
+
+
+def test_service_put_size_limit():
+    with tempfile.TemporaryDirectory() as tmp:
+        with mock.patch.object(service, "blob_store", BlobStore(Path(tmp))), \
+                mock.patch.object(service_uploads, "UPLOAD_MAX_BYTES", 1024):
+            client = TestClient(service.app)
+            data = b"x" * 2048
+            response = client.put(f"/api/v1/blobs/{hashlib.sha256(data).hexdigest()}", content=data)
+            assert response.status_code == 413
+            assert list(Path(tmp).iterdir()) == []
+
+
+def main():
+    tests = [
+        test_sha256_and_dedupe,
+        test_size_limit,
+        test_digest_mismatch,
+        test_aborted_upload_cleans_temp_file,
+        test_service_put_size_limit,
+    ]
+    print("=" * 60)
+    print("Upload Storage Test")
+    print("=" * 60)
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"[OK] {test.__name__}")
+        except Exception as e:
+            failed += 1
+            print(f"[FAIL] {test.__name__}: {e!r}")
+    print()
+    print(f"{len(tests) - failed}/{len(tests)} passed")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,200 @@
+"""
+VectorRAG 영구 저장 테스트 스크립트
+
+SQLiteDocStore 동작과, VectorRAG(NumPy / FAISS 인덱스)를 같은 persist_directory로
+다시 만들었을 때 저장된 인덱스를 불러오고 이미 임베딩한 문서를 다시 임베딩하지 않는지 확인합니다.
+임베딩 모델 대신 결정적인 해시 임베딩을 사용하므로 sentence-transformers 없이 실행됩니다.
+pytest로도 실행할 수 있습니다.
+
+사용법:
+    python test_vector_rag_persistence.py
+"""
+import hashlib
+import sqlite3
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from agentic_system.data_stores.doc_store import SQLiteDocStore
+from agentic_system.data_stores.rag_vector import FAISS_AVAILABLE, VectorRAG
+
+DOCUMENTS = [
+    "후드티는 오버사이즈 스트리트 스타일에 잘 어울린다",
+    "청바지는 데님 소재로 내구성이 좋다",
+    "코트는 겨울 아우터로 포멀한 느낌을 준다",
+]
+
+
+class HashEmbedder:
+    """단어 해시 bag-of-words 임베딩 (encode 호출 문서 수 기록)"""
+
+    def __init__(self, dimension=384):
+        self.dimension = dimension
+        self.encoded = 0
+
+    def encode(self, texts):
+        self.encoded += len(texts)
+        vectors = np.zeros((len(texts), self.dimension), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for word in text.split():
+                digest = hashlib.sha256(word.encode("utf-8")).digest()
+                vectors[row, int.from_bytes(digest[:4], "little") % self.dimension] += 1.0
+        return vectors
+
+
+def open_rag(directory, vector_db_type="numpy", **kwargs):
+    rag = VectorRAG(vector_db_type=vector_db_type, persist_directory=directory, **kwargs)
+    rag.embedder = HashEmbedder()
+    return rag
+
+
+def test_doc_store():
+    with tempfile.TemporaryDirectory() as directory:
+        store = SQLiteDocStore(str(Path(directory) / "documents.sqlite3"))
+        store.add(0, ["a", "b"], [{"n": 1}, {}], ["key-a", "key-b"])
+        store.add(2, ["c"], [{"n": 3}], ["key-c"])
+        assert store.count() == 3
+        assert store.get([2, 0, 99]) == {0: ("a", {"n": 1}), 2: ("c", {"n": 3})}
+        assert store.existing_keys(["key-a", "key-x", "key-c"]) == {"key-a", "key-c"}
+
+        # 같은 doc_key는 한 번만 저장
+        try:
+            store.add(3, ["a2"], [{}], ["key-a"])
+        except sqlite3.IntegrityError:
+            pass
+        else:
+            raise AssertionError("중복 doc_key가 저장됨")
+        assert store.count() == 3
+
+        store.delete_from(1)
+        assert store.count() == 1
+        store.set_info("signature", "v1")
+        store.set_info("signature", "v2")
+        assert store.get_info("signature") == "v2"
+        assert store.get_info("missing") is None
+        store.close()
+
+        # 다시 열어도 유지
+        store = SQLiteDocStore(str(Path(directory) / "documents.sqlite3"))
+        assert store.get([0]) == {0: ("a", {"n": 1})}
+        store.clear()
+        assert store.count() == 0 and store.get_info("signature") is None
+        store.close()
+
+
+def check_restart_without_reembedding(vector_db_type):
+    with tempfile.TemporaryDirectory() as directory:
+        rag = open_rag(directory, vector_db_type)
+        rag.add_documents(DOCUMENTS, metadatas=[{"i": i} for i in range(len(DOCUMENTS))])
+        assert rag.embedder.encoded == len(DOCUMENTS)
+        expected = rag.search("데님 청바지", top_k=2)
+        assert expected[0]["document"] == DOCUMENTS[1]
+        assert expected[0]["metadata"] == {"i": 1}
+        rag.doc_store.close()
+
+        # 재시작: 저장된 인덱스를 열고, 같은 문서를 다시 추가해도 임베딩하지 않음
+        restarted = open_rag(directory, vector_db_type)
+        assert restarted.index.ntotal == len(DOCUMENTS)
+        restarted.add_documents(DOCUMENTS)
+        assert restarted.embedder.encoded == 0
+        assert restarted.search("데님 청바지", top_k=2) == expected
+
+        # 새 문서만 임베딩하고, memory-map된 인덱스에도 추가 가능
+        restarted.embedder.encoded = 0
+        restarted.add_documents(DOCUMENTS + ["패딩은 가볍고 따뜻한 겨울 아우터"])
+        assert restarted.embedder.encoded == 1
+        assert restarted.index.ntotal == restarted.doc_store.count() == len(DOCUMENTS) + 1
+        restarted.doc_store.close()
+
+        reopened = open_rag(directory, vector_db_type)
+        assert reopened.index.ntotal == len(DOCUMENTS) + 1
+        assert reopened.search("가볍고 따뜻한 패딩", top_k=1)[0]["document"].startswith("패딩")
+        reopened.doc_store.close()
+
+
+def test_numpy_restart_without_reembedding():
+    check_restart_without_reembedding("numpy")
+
+
+def test_faiss_restart_without_reembedding():
+    if not FAISS_AVAILABLE:
+        print("[SKIP] FAISS가 설치되지 않아 FAISS 재시작 테스트를 건너뜁니다")
+        return
+    check_restart_without_reembedding("faiss")
+
+
+def test_embedding_model_change_rebuilds():
+    with tempfile.TemporaryDirectory() as directory:
+        rag = open_rag(directory)
+        rag.add_documents(DOCUMENTS)
+        rag.doc_store.close()
+
+        other = open_rag(directory, embedding_model="other-model")
+        assert other.index.ntotal == 0 and other.doc_store.count() == 0
+        other.add_documents(DOCUMENTS)
+        assert other.embedder.encoded == len(DOCUMENTS)
+        other.doc_store.close()
+
+
+def test_count_mismatch_rebuilds():
+    """인덱스 파일 저장 전에 중단된 경우(문서 수 불일치)는 새로 생성"""
+    with tempfile.TemporaryDirectory() as directory:
+        rag = open_rag(directory)
+        rag.add_documents(DOCUMENTS[:2])
+        rag.doc_store.add(2, [DOCUMENTS[2]], [{}], ["orphan"])
+        rag.doc_store.close()
+
+        restarted = open_rag(directory)
+        assert restarted.index.ntotal == 0 and restarted.doc_store.count() == 0
+        restarted.doc_store.close()
+
+
+def test_failed_index_add_rolls_back_documents():
+    with tempfile.TemporaryDirectory() as directory:
+        rag = open_rag(directory)
+        rag.add_documents(DOCUMENTS[:1])
+        # 차원이 다른 임베딩은 인덱스 추가에서 실패
+        rag.embedder = HashEmbedder(dimension=16)
+        try:
+            rag.add_documents(DOCUMENTS[1:])
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("차원이 다른 임베딩이 추가됨")
+        assert rag.index.ntotal == rag.doc_store.count() == 1
+        assert rag.doc_store.existing_keys([hashlib.sha256(DOCUMENTS[1].encode("utf-8")).hexdigest()]) == set()
+        rag.doc_store.close()
+
+
+def main():
+    tests = [
+        test_doc_store,
+        test_numpy_restart_without_reembedding,
+        test_faiss_restart_without_reembedding,
+        test_embedding_model_change_rebuilds,
+        test_count_mismatch_rebuilds,
+        test_failed_index_add_rolls_back_documents,
+    ]
+    print("=" * 60)
+    print("Vector RAG Persistence Test")
+    print("=" * 60)
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"[OK] {test.__name__}")
+        except Exception as e:
+            failed += 1
+            print(f"[FAIL] {test.__name__}: {e!r}")
+    print()
+    print(f"{len(tests) - failed}/{len(tests)} passed")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
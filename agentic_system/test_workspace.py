@@ -0,0 +1,175 @@
+"""
+작업 공간 할당기 테스트 스크립트
+
+WorkspaceAllocator의 작업 공간 할당(고유 디렉토리, 같은 job_id 공유, 경로 정리),
+atomic_write_*의 원자적 쓰기, 보존 기간 / 최대 개수에 따른 정리(GC),
+작업 공간이 정리된 뒤의 결과 캐시 적중, Mock 렌더링 이미지 저장을 확인합니다.
+Mock 렌더링 테스트는 torch가 없으면 건너뜁니다. pytest로도 실행할 수 있습니다.
+
+사용법:
+    python test_workspace.py
+"""
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from agentic_system.tools.workspace import (
+    WorkspaceAllocator,
+    atomic_write_bytes,
+    atomic_write_json,
+    atomic_write_text,
+)
+from agentic_system.tools.result_cache import ResultCache
+
+try:
+    import torch
+    from agentic_system.tools.extensions import Extensions2DTo3D
+    TORCH_AVAILABLE = True
+except ImportError:
+    TORCH_AVAILABLE = False
+
+
+def age(path: Path, seconds: float):
+    """마지막 사용 시각을 seconds초 전으로 설정"""
+    mtime = time.time() - seconds
+    os.utime(path, (mtime, mtime))
+
+
+def test_allocate():
+    with tempfile.TemporaryDirectory() as tmp:
+        allocator = WorkspaceAllocator(base_dir=tmp)
+        first, second = allocator.allocate(), allocator.allocate()
+        assert first != second and first.is_dir() and second.is_dir()
+        # 같은 job_id는 계획의 여러 단계가 같은 디렉토리를 공유
+        assert allocator.allocate("plan_1") == allocator.allocate("plan_1") == Path(tmp) / "plan_1"
+        # base_dir 밖을 가리키는 ID는 base_dir 안의 이름으로 정리
+        escaped = allocator.allocate("../outside/x")
+        assert escaped.parent == Path(tmp)
+        assert not (Path(tmp).parent / "outside").exists()
+
+
+def test_atomic_write():
+    with tempfile.TemporaryDirectory() as tmp:
+        target = Path(tmp) / "nested" / "pattern.json"
+        atomic_write_json(target, {"name": "셔츠"})
+        assert target.read_text(encoding="utf-8") == '{"name": "셔츠"}'
+        atomic_write_bytes(target.with_suffix(".bin"), b"\x00\x01")
+        assert target.with_suffix(".bin").read_bytes() == b"\x00\x01"
+
+        # 쓰기 도중 실패하면 기존 파일은 그대로이고 임시 파일도 남지 않음
+        try:
+            atomic_write_text(target, "한글", encoding="ascii")
+        except UnicodeEncodeError:
+            pass
+        else:
+            raise AssertionError("인코딩 오류가 전달되지 않음")
+        assert target.read_text(encoding="utf-8") == '{"name": "셔츠"}'
+        assert sorted(p.name for p in target.parent.iterdir()) == ["pattern.bin", "pattern.json"]
+
+
+def test_gc_by_retention():
+    with tempfile.TemporaryDirectory() as tmp:
+        allocator = WorkspaceAllocator(base_dir=tmp, retention_seconds=3600, max_workspaces=10)
+        old, recent = allocator.allocate("old"), allocator.allocate("recent")
+        (old / "garment.obj").write_text("v 0 0 0\n")
+        age(old, 7200)
+        assert allocator.gc() == 1
+        assert not old.exists() and recent.exists()
+
+
+def test_gc_by_max_count():
+    """보존 기간 안이어도 최대 개수를 넘으면 오래 사용하지 않은 것부터 삭제"""
+    with tempfile.TemporaryDirectory() as tmp:
+        allocator = WorkspaceAllocator(base_dir=tmp, max_workspaces=2)
+        workspaces = [allocator.allocate(f"job_{i}") for i in range(4)]
+        for i, workspace in enumerate(workspaces):
+            age(workspace, 100 - i * 10)
+        # 다시 할당하면 사용 시각이 갱신되어 정리 대상에서 빠짐
+        allocator.allocate("job_0")
+        assert allocator.gc() == 2
+        assert sorted(p.name for p in Path(tmp).iterdir()) == ["job_0", "job_3"]
+
+
+def test_gc_interval():
+    """allocate는 gc_interval마다 한 번만 정리"""
+    with tempfile.TemporaryDirectory() as tmp:
+        allocator = WorkspaceAllocator(base_dir=tmp, retention_seconds=60, gc_interval=3600)
+        stale = Path(tmp) / "stale"
+        stale.mkdir()
+        age(stale, 120)
+        allocator.allocate("first")
+        assert not stale.exists()
+
+        stale.mkdir()
+        age(stale, 120)
+        allocator.allocate("second")
+        assert stale.exists()
+
+
+def test_cache_hit_after_workspace_gc():
+    """결과 캐시는 산출물 복사본을 가지므로 작업 공간이 정리된 뒤에도 새 작업 공간으로 복사해 줌"""
+    with tempfile.TemporaryDirectory() as tmp:
+        allocator = WorkspaceAllocator(base_dir=Path(tmp) / "jobs", retention_seconds=3600)
+        cache = ResultCache(cache_dir=str(Path(tmp) / "cache"))
+
+        workspace = allocator.allocate("plan_a") / "3d_models"
+        mesh_path = workspace / "garment.obj"
+        atomic_write_text(mesh_path, "v 0 0 0\n")
+        cache.put("key", {"status": "success", "output_dir": str(workspace), "mesh_path": str(mesh_path)})
+
+        age(workspace.parent, 7200)
+        assert allocator.gc() == 1 and not mesh_path.exists()
+
+        target = allocator.allocate("plan_b") / "3d_models"
+        cached = cache.get_into("key", str(target))
+        assert cached is not None
+        assert cached["output_dir"] == str(target)
+        assert Path(cached["mesh_path"]).read_text() == "v 0 0 0\n"
+        assert Path(cached["mesh_path"]).parent == target
+
+
+def test_mock_render_writes_png():
+    if not TORCH_AVAILABLE:
+        print("[SKIP] torch가 설치되지 않아 건너뜁니다")
+        return
+    with tempfile.TemporaryDirectory() as tmp:
+        tool = Extensions2DTo3D.__new__(Extensions2DTo3D)
+        render_path = tool._mock_render({"mesh_path": None}, Path(tmp))
+        data = Path(render_path).read_bytes()
+        assert data.startswith(b"\x89PNG\r\n\x1a\n") and data.endswith(b"IEND\xaeB`\x82")
+        assert int.from_bytes(data[16:20], "big") == int.from_bytes(data[20:24], "big") == 256
+
+
+def main():
+    tests = [
+        test_allocate,
+        test_atomic_write,
+        test_gc_by_retention,
+        test_gc_by_max_count,
+        test_gc_interval,
+        test_cache_hit_after_workspace_gc,
+        test_mock_render_writes_png,
+    ]
+    print("=" * 60)
+    print("Workspace Allocator Test")
+    print("=" * 60)
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"[OK] {test.__name__}")
+        except Exception as e:
+            failed += 1
+            print(f"[FAIL] {test.__name__}: {e!r}")
+    print()
+    print(f"{len(tests) - failed}/{len(tests)} passed")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,9 +5,12 @@ Tools Module - Extensions and Functions
 
 from .extensions import Extensions2DTo3D
 from .functions import ProductSearchFunction
+from .registry import ToolRegistry, tool_registry
 
 __all__ = [
     'Extensions2DTo3D',
     'ProductSearchFunction',
+    'ToolRegistry',
+    'tool_registry',
 ]
 
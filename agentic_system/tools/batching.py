@@ -0,0 +1,111 @@
+"""
+Micro Batcher - 동시 요청 묶음 실행
+
+여러 스레드에서 거의 동시에 들어온 요청을 짧은 시간 창(max_wait) 동안 모아
+한 번의 배치 함수 호출로 실행한다. GPU 추론처럼 배치 크기를 늘려도
+지연 시간이 크게 늘지 않는 작업의 처리량을 높이는 데 사용한다.
+
+- 첫 요청이 도착하면 최대 max_wait 동안 또는 max_batch_size개가 찰 때까지 대기
+- 배치 함수는 입력 목록과 같은 길이의 결과 목록을 반환해야 함
+- 결과가 예외 객체이면 해당 요청에만 예외 전달
+- 배치 함수가 예외를 던지면 해당 배치의 모든 요청에 예외 전달
+"""
+
+from typing import List, Optional, Any, Callable
+from concurrent.futures import Future
+import queue
+import threading
+import time
+
+
+class MicroBatcher:
+    """
+    Micro Batcher
+
+    submit()은 결과가 나올 때까지 호출 스레드를 블록하고,
+    실제 실행은 배처 전용 스레드 하나에서 순서대로 이루어진다.
+    """
+
+    def __init__(
+        self,
+        run_batch: Callable[[List[Any]], List[Any]],
+        max_batch_size: int = 4,
+        max_wait_ms: float = 20,
+        name: str = "batch"
+    ):
+        """
+        Args:
+            run_batch: 입력 목록을 받아 같은 순서의 결과 목록을 반환하는 함수
+            max_batch_size: 한 번에 실행할 최대 요청 수
+            max_wait_ms: 첫 요청 이후 추가 요청을 기다리는 최대 시간 (밀리초)
+            name: 로그/스레드 이름
+        """
+        self.run_batch = run_batch
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait_ms) / 1000.0
+        self.name = name
+        self._queue: "queue.Queue[Optional[tuple]]" = queue.Queue()
+        self._thread = threading.Thread(
+            target=self._loop,
+            name=f"micro-batcher-{name}",
+            daemon=True
+        )
+        self._thread.start()
+
+    def submit(self, item: Any, timeout: Optional[float] = None) -> Any:
+        """요청을 배치 큐에 넣고 결과를 기다림"""
+        return self.submit_async(item).result(timeout)
+
+    def submit_async(self, item: Any) -> Future:
+        """요청을 배치 큐에 넣고 Future 반환"""
+        future: Future = Future()
+        self._queue.put((item, future))
+        return future
+
+    def close(self):
+        """배처 스레드 종료 (이미 들어온 요청은 처리 후 종료)"""
+        self._queue.put(None)
+        self._thread.join()
+
+    def _collect(self, first: tuple) -> tuple:
+        """첫 요청 이후 max_wait 동안 추가 요청 수집 (종료 신호를 만나면 closing=True)"""
+        batch = [first]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                entry = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if entry is None:
+                return batch, True
+            batch.append(entry)
+        return batch, False
+
+    def _loop(self):
+        closing = False
+        while not closing:
+            first = self._queue.get()
+            if first is None:
+                break
+            batch, closing = self._collect(first)
+            items = [item for item, _ in batch]
+            futures = [future for _, future in batch]
+            try:
+                results = self.run_batch(items)
+                if len(results) != len(items):
+                    raise RuntimeError(
+                        f"배치 결과 개수 불일치: 입력 {len(items)}개, 결과 {len(results)}개"
+                    )
+            except Exception as e:
+                print(f"[MicroBatcher:{self.name}] 배치 실행 실패 (크기 {len(items)}): {str(e)}")
+                for future in futures:
+                    future.set_exception(e)
+                continue
+            if len(items) > 1:
+                print(f"[MicroBatcher:{self.name}] 배치 실행 완료 (크기 {len(items)})")
+            for future, result in zip(futures, results):
+                if isinstance(result, BaseException):
+                    future.set_exception(result)
+                else:
+                    future.set_result(result)
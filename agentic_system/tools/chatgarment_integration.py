@@ -6,24 +6,23 @@ GarmentCodeRC로 3D 옷을 생성하는 완전한 파이프라인
 """
 
 import os
-# 강제 UTF-8 환경 (Windows cp949 디코딩 오류 방지)
-os.environ.setdefault("PYTHONUTF8", "1")
 import sys
 import torch
 import json
-import random
+import uuid
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Dict, Any, Optional, Tuple
+from typing import Dict, Any, List, Optional, Tuple
 from PIL import Image
-import builtins as _builtins
 
-# Windows cp949 기본 인코딩으로 인한 디코딩 오류 방지: 텍스트 open 기본값을 UTF-8로 강제
-_orig_open = _builtins.open
-def _open_utf8(file, mode='r', buffering=-1, encoding=None, errors=None, newline=None, closefd=True, opener=None):
-    if encoding is None and 'b' not in mode:
-        encoding = 'utf-8'
-    return _orig_open(file, mode, buffering, encoding, errors, newline, closefd, opener)
-_builtins.open = _open_utf8
+from .batching import MicroBatcher
+from .prefix_cache import PrefixKVCache
+from .result_cache import get_result_cache, model_version_of, file_sha256
+from .workspace import get_workspace_allocator, atomic_write_json
+from .garmentcode_runner import run_garmentcode_parser_isolated, isolated_env
 
 # 프로젝트 경로 설정
 project_root = Path(__file__).parent.parent.parent
@@ -34,12 +33,10 @@ sys.path.insert(0, str(chatgarment_path))
 sys.path.insert(1, str(garmentcode_path))
 
 # ChatGarment 임포트
-# 작업 디렉토리를 ChatGarment로 변경 (상대 경로 문제 영구 해결)
-import os
+# 작업 디렉토리(os.chdir)와 builtins.open은 변경하지 않는다.
+# 상대 경로 / UTF-8 기본 인코딩이 필요한 GarmentCode 파서는
+# garmentcode_runner를 통해 별도 프로세스(cwd=ChatGarment, PYTHONUTF8=1)에서 실행한다.
 try:
-    if chatgarment_path.exists():
-        os.chdir(str(chatgarment_path))
-        print(f"[ChatGarment Integration] 작업 디렉토리: {os.getcwd()}")
     from llava.constants import (
         IGNORE_INDEX, IMAGE_TOKEN_INDEX, DEFAULT_IMAGE_TOKEN,
         DEFAULT_IM_START_TOKEN, DEFAULT_IM_END_TOKEN
@@ -47,10 +44,7 @@ try:
     from llava import conversation as conversation_lib
     from llava.model import *
     from llava.mm_utils import tokenizer_image_token
-    from llava.garment_utils_v2 import (
-        run_garmentcode_parser_float50,
-        try_generate_garments
-    )
+    from llava.garment_utils_v2 import try_generate_garments
     from llava.json_fixer import repair_json
     # 훈련 의존성(deepspeed 등)로 인한 ImportError 회피를 위해 우선 실제 인자 클래스를 시도
     try:
@@ -98,6 +92,53 @@ except Exception as e:
     print(f"ChatGarment 임포트 오류: {e}")
     CHATGARMENT_AVAILABLE = False
 
+# 병합 체크포인트의 비전 타워 가중치 선택 로딩용 (선택 의존성)
+try:
+    from safetensors import safe_open
+    SAFETENSORS_AVAILABLE = True
+except ImportError:
+    SAFETENSORS_AVAILABLE = False
+
+# 병합 체크포인트 디렉토리에 기록하는 원본 정보 파일
+MERGED_INFO_FILE = "merged_info.json"
+
+
+class _ImageFeatureCache:
+    """
+    이미지 해시 -> 투영된 비전 특징(encode_images 출력) LRU 캐시
+
+    특징 텐서는 모델과 같은 디바이스에 그대로 보관한다. (7B 기준 이미지당 약 4.7MB)
+    """
+    
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, torch.Tensor]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key: str) -> Optional[torch.Tensor]:
+        with self._lock:
+            features = self._entries.get(key)
+            if features is not None:
+                self._entries.move_to_end(key)
+            return features
+    
+    def put(self, key: str, features: torch.Tensor):
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = features
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+    
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+# Step 2 템플릿에서 요청별 geometry 텍스트 위치를 표시하는 자리표시자
+_PROMPT_PLACEHOLDER = "\x00GEOMETRY\x00"
+
 
 class ChatGarmentPipeline:
     """
@@ -106,11 +147,18 @@ class ChatGarmentPipeline:
     실제로 작동하는 ChatGarment → GarmentCodeRC 통합
     """
     
+    # 생성 단계별 고정 질문
+    GEOMETRY_QUESTION = 'Can you describe the geometry features of the garments worn by the model in the Json format?'
+    PATTERN_QUESTION = 'Can you estimate the sewing pattern code based on the image and Json format garment geometry description?'
+    
     def __init__(
         self,
         model_path: Optional[str] = None,
         checkpoint_path: Optional[str] = None,
-        device: str = "cuda"
+        device: str = "cuda",
+        max_batch_size: Optional[int] = None,
+        batch_wait_ms: Optional[float] = None,
+        merged_path: Optional[str] = None
     ):
         """
         ChatGarment 파이프라인 초기화
@@ -119,12 +167,44 @@ class ChatGarmentPipeline:
             model_path: ChatGarment 모델 경로
             checkpoint_path: 체크포인트 파일 경로
             device: 디바이스 ('cuda' or 'cpu')
+            max_batch_size: 동시 요청을 묶어 실행할 최대 배치 크기
+                (None이면 CHATGARMENT_MAX_BATCH_SIZE, 기본 4, 1이면 배칭 없음)
+            batch_wait_ms: 배치를 모으기 위해 기다리는 최대 시간
+                (None이면 CHATGARMENT_BATCH_WAIT_MS, 기본 20ms)
+            merged_path: 병합된 safetensors 체크포인트 디렉토리
+                (None이면 CHATGARMENT_MERGED_CHECKPOINT, 기본 checkpoints/chatgarment_merged)
         """
         self.device = device
         self.model = None
         self.tokenizer = None
         self.image_processor = None
         self.model_loaded = False
+        self._load_lock = threading.Lock()
+        
+        # 생성 단계별 마이크로 배칭 설정
+        if max_batch_size is None:
+            max_batch_size = int(os.getenv("CHATGARMENT_MAX_BATCH_SIZE", "4"))
+        if batch_wait_ms is None:
+            batch_wait_ms = float(os.getenv("CHATGARMENT_BATCH_WAIT_MS", "20"))
+        self.max_batch_size = max(1, max_batch_size)
+        self.batch_wait_ms = batch_wait_ms
+        self._batchers: Dict[str, MicroBatcher] = {}
+        self._batchers_lock = threading.Lock()
+        
+        # 비전 특징 캐시: Step 1 / Step 2와 반복 업로드에서 CLIP 인코딩을 한 번만 수행
+        self._feature_cache = _ImageFeatureCache(
+            int(os.getenv("CHATGARMENT_FEATURE_CACHE_SIZE", "32"))
+        )
+        # evaluate 호출 중인 배치의 행별 이미지 키 (호출 스레드별)
+        self._image_keys = threading.local()
+        # evaluate 호출 중인 배치의 패딩 위치 (호출 스레드별, 언어 모델 forward 래퍼가 사용)
+        self._batch_padding = threading.local()
+        self._padding_mask_installed = False
+        
+        # 고정 대화 템플릿으로 만든 프롬프트 / 토큰 캐시
+        self._prompt_cache: Dict[str, Any] = {}
+        # 템플릿 시스템 프롬프트(이미지 토큰 앞)의 past_key_values 캐시 (모델 로딩 후 연결)
+        self._prefix_cache: Optional[PrefixKVCache] = None
         
         # 경로 설정
         if model_path is None:
@@ -138,6 +218,15 @@ class ChatGarmentPipeline:
         
         self.model_path = model_path
         self.checkpoint_path = checkpoint_path
+        self.merged_path = merged_path or os.getenv(
+            "CHATGARMENT_MERGED_CHECKPOINT",
+            str(project_root / "checkpoints" / "chatgarment_merged")
+        )
+        
+    @property
+    def model_version(self) -> str:
+        """결과 캐시 키에 사용하는 모델 버전 (베이스 모델 + 체크포인트)"""
+        return model_version_of(self.model_path, self.checkpoint_path)
         
     def load_model(self):
         """ChatGarment 모델 로딩"""
@@ -146,12 +235,23 @@ class ChatGarmentPipeline:
                 print("[ChatGarment Pipeline] CHATGARMENT_AVAILABLE = False, 모델 로딩 건너뜀")
             return
         
-        # 현재 작업 디렉토리는 ChatGarment로 유지됨
-        try:
-            if chatgarment_path.exists():
-                print(f"[ChatGarment Pipeline] 작업 디렉토리: {os.getcwd()}")
-        except Exception as e:
-            print(f"[ChatGarment Pipeline] 작업 디렉토리 확인 실패: {e}")
+        # 동시 요청이 모델을 중복 로딩하지 않도록 잠금
+        with self._load_lock:
+            if self.model_loaded:
+                return
+            self._load_model_locked()
+    
+    def _load_model_locked(self, use_merged: bool = True):
+        """ChatGarment 모델 로딩 (_load_lock 보유 상태에서 호출)"""
+        # 병합 체크포인트가 있으면 safetensors를 메모리 매핑하여 바로 로딩
+        if use_merged and self._merged_checkpoint_ready():
+            try:
+                self._load_merged_model()
+                return
+            except Exception as e:
+                print(f"⚠️ 병합 체크포인트 로딩 실패, 기존 방식으로 로딩합니다: {str(e)}")
+                self.model = None
+                self.tokenizer = None
         
         try:
             print("=" * 60)
@@ -173,7 +273,7 @@ class ChatGarmentPipeline:
             )
             
             training_args = TrainingArguments(
-                output_dir="./tmp",
+                output_dir=str(chatgarment_path / "tmp"),
                 bf16=True,
                 fp16=False,
                 model_max_length=2048,
@@ -229,7 +329,11 @@ class ChatGarmentPipeline:
             # 체크포인트 로딩
             if os.path.exists(self.checkpoint_path):
                 print(f"체크포인트 로딩 중: {self.checkpoint_path}")
-                state_dict = torch.load(self.checkpoint_path, map_location="cpu")
+                try:
+                    # torch 2.1+: 파일을 메모리 매핑하여 전체를 RAM에 복사하지 않음
+                    state_dict = torch.load(self.checkpoint_path, map_location="cpu", mmap=True)
+                except (TypeError, RuntimeError):
+                    state_dict = torch.load(self.checkpoint_path, map_location="cpu")
                 # LoRA 가중치 포함으로 인한 불일치 허용 (strict=False)
                 missing_keys, unexpected_keys = self.model.load_state_dict(state_dict, strict=False)
                 if missing_keys:
@@ -253,13 +357,7 @@ class ChatGarmentPipeline:
             self.image_processor = vision_tower.image_processor
             data_args.image_processor = self.image_processor
             
-            # 대화 템플릿 설정
-            conversation_lib.default_conversation = conversation_lib.conv_templates["v1"]
-            
-            self.model_loaded = True
-            print("=" * 60)
-            print("✅ ChatGarment 모델 로딩 완료!")
-            print("=" * 60)
+            self._finish_loading()
             
         except Exception as e:
             print(f"❌ ChatGarment 모델 로딩 실패: {str(e)}")
@@ -267,6 +365,190 @@ class ChatGarmentPipeline:
             traceback.print_exc()
             self.model_loaded = False
     
+    def _finish_loading(self):
+        """로딩 경로와 무관한 마무리 (대화 템플릿, 비전 특징 캐시)"""
+        # 대화 템플릿 설정
+        conversation_lib.default_conversation = conversation_lib.conv_templates["v1"]
+        
+        # 비전 특징 캐시 / 접두사 KV 캐시 연결
+        self._install_feature_cache()
+        self._install_prefix_cache()
+        self._install_padding_mask()
+        
+        self.model_loaded = True
+        print("=" * 60)
+        print("✅ ChatGarment 모델 로딩 완료!")
+        print("=" * 60)
+    
+    def _merged_checkpoint_ready(self) -> bool:
+        """병합 체크포인트가 있고 현재 베이스 모델 / 체크포인트로 만든 것인지 확인"""
+        merged_dir = Path(self.merged_path)
+        info_path = merged_dir / MERGED_INFO_FILE
+        if not info_path.exists():
+            return False
+        try:
+            with open(info_path, "r", encoding="utf-8") as f:
+                info = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"⚠️ 병합 체크포인트 정보를 읽을 수 없습니다: {str(e)}")
+            return False
+        # 원본 체크포인트가 교체되었으면 오래된 병합본은 사용하지 않음
+        if os.path.exists(self.checkpoint_path) and info.get("source_version") != self.model_version:
+            print(f"⚠️ 병합 체크포인트가 현재 체크포인트와 다릅니다. 다시 변환하세요: {merged_dir}")
+            return False
+        return True
+    
+    def _load_merged_model(self):
+        """
+        병합된 safetensors 체크포인트 로딩
+        
+        from_pretrained가 safetensors를 메모리 매핑하고(low_cpu_mem_usage)
+        bf16 / 대상 디바이스로 바로 배치하므로, 베이스 모델 로딩 후 pytorch_model.bin을
+        통째로 읽어 덮어쓰는 기존 경로보다 빠르고 메모리 피크가 낮다.
+        """
+        print("=" * 60)
+        print("ChatGarment 병합 체크포인트 로딩 시작...")
+        print(f"병합 체크포인트: {self.merged_path}")
+        print("=" * 60)
+        
+        self.tokenizer = transformers.AutoTokenizer.from_pretrained(
+            self.merged_path,
+            model_max_length=2048,
+            padding_side="right",
+            use_fast=False,
+        )
+        self.tokenizer.pad_token = self.tokenizer.unk_token
+        seg_token_idx = self.tokenizer("[SEG]", add_special_tokens=False).input_ids[-1]
+        
+        use_cuda = self.device == "cuda" and torch.cuda.is_available()
+        load_kwargs = {
+            "torch_dtype": torch.bfloat16,
+            "seg_token_idx": seg_token_idx,
+            "low_cpu_mem_usage": True,
+            "use_safetensors": True,
+        }
+        try:
+            self.model = GarmentGPTFloat50ForCausalLM.from_pretrained(
+                self.merged_path,
+                device_map={"": 0} if use_cuda else None,
+                **load_kwargs
+            )
+        except (ImportError, ValueError) as e:
+            # device_map에는 accelerate가 필요 - 없으면 CPU로 로딩 후 이동
+            print(f"⚠️ device_map 로딩 불가, CPU 로딩 후 이동합니다: {str(e)}")
+            self.model = GarmentGPTFloat50ForCausalLM.from_pretrained(self.merged_path, **load_kwargs)
+        
+        if use_cuda and self.model.device.type != "cuda":
+            self.model = self.model.cuda()
+        self.model = self.model.eval()
+        
+        # LLaVA는 비전 타워를 지연 로딩하므로 허브 가중치를 불러온 뒤 병합본의 가중치로 덮어씀
+        vision_tower = self.model.get_vision_tower()
+        if not getattr(vision_tower, "is_loaded", True):
+            vision_tower.load_model()
+        self._load_merged_vision_tower_weights()
+        vision_tower.to(dtype=torch.bfloat16, device=self.model.device)
+        self.image_processor = vision_tower.image_processor
+        
+        self._finish_loading()
+    
+    def _load_merged_vision_tower_weights(self):
+        """병합본에 저장된 비전 타워 가중치만 선택적으로 읽어 적용 (safetensors 메모리 매핑)"""
+        if not SAFETENSORS_AVAILABLE:
+            print("⚠️ safetensors가 없어 비전 타워는 허브 가중치를 사용합니다.")
+            return
+        shard_files = sorted(Path(self.merged_path).glob("*.safetensors"))
+        state_dict = {}
+        for shard_file in shard_files:
+            with safe_open(str(shard_file), framework="pt", device="cpu") as f:
+                for key in f.keys():
+                    if ".vision_tower." in key:
+                        state_dict[key] = f.get_tensor(key)
+        if state_dict:
+            self.model.load_state_dict(state_dict, strict=False)
+            print(f"비전 타워 가중치 적용: {len(state_dict)}개")
+    
+    def save_merged_checkpoint(self, output_dir: Optional[str] = None) -> str:
+        """
+        베이스 모델 + 파인튜닝 체크포인트를 합친 모델을 safetensors로 저장 (1회성 변환)
+        
+        Args:
+            output_dir: 저장 디렉토리 (None이면 merged_path)
+            
+        Returns:
+            str: 저장된 디렉토리
+        """
+        # 병합본 자체를 다시 저장하지 않도록 원본 체크포인트 경로로 로딩
+        with self._load_lock:
+            if not self.model_loaded:
+                self._load_model_locked(use_merged=False)
+        if not self.model_loaded:
+            raise RuntimeError("ChatGarment 모델을 로딩할 수 없습니다.")
+        
+        output_dir = output_dir or self.merged_path
+        os.makedirs(output_dir, exist_ok=True)
+        print(f"병합 체크포인트 저장 중: {output_dir}")
+        self.model.save_pretrained(output_dir, safe_serialization=True, max_shard_size="5GB")
+        self.tokenizer.save_pretrained(output_dir)
+        # 정보 파일은 마지막에 기록 (저장이 중간에 실패하면 병합본으로 인식되지 않음)
+        atomic_write_json(os.path.join(output_dir, MERGED_INFO_FILE), {
+            "source_version": self.model_version,
+            "model_path": self.model_path,
+            "checkpoint_path": self.checkpoint_path
+        }, indent=2)
+        print("✅ 병합 체크포인트 저장 완료")
+        return output_dir
+    
+    def warmup(self, max_new_tokens: int = 8) -> Dict[str, Any]:
+        """
+        모델 로딩 + 짧은 더미 추론 1회
+        
+        첫 실제 요청이 CUDA 컨텍스트 / cuBLAS 초기화, 비전 타워 첫 실행 비용을
+        떠안지 않도록 서비스 시작 시 미리 실행한다. 결과 캐시와 비전 특징 캐시는 사용하지 않는다.
+        
+        Args:
+            max_new_tokens: 더미 추론에서 생성할 토큰 수
+            
+        Returns:
+            Dict: 상태, 모델 로딩 시간, 더미 추론 시간
+        """
+        load_start = time.time()
+        self.load_model()
+        load_seconds = time.time() - load_start
+        if not self.model_loaded:
+            return {
+                "status": "error",
+                "model_loaded": False,
+                "load_seconds": load_seconds,
+                "message": "ChatGarment 모델을 로딩할 수 없습니다."
+            }
+        
+        warmup_start = time.time()
+        mean_color = tuple(int(x * 255) for x in self.image_processor.image_mean)
+        crop_size = getattr(self.image_processor, "crop_size", None) or {"height": 336, "width": 336}
+        image = Image.new("RGB", (crop_size["width"], crop_size["height"]), mean_color)
+        image_clip = self.image_processor.preprocess(image, return_tensors='pt')['pixel_values'][0]
+        image_clip = image_clip.unsqueeze(0).to(self.device).bfloat16()
+        _, input_ids = self._geometry_prompt()
+        with torch.no_grad():
+            self.model.evaluate(
+                image_clip,
+                image_clip,
+                input_ids,
+                max_new_tokens=max_new_tokens,
+                tokenizer=self.tokenizer,
+            )
+        if self.device == "cuda" and torch.cuda.is_available():
+            torch.cuda.synchronize()
+        warmup_seconds = time.time() - warmup_start
+        print(f"[ChatGarment Pipeline] 워밍업 완료 (로딩 {load_seconds:.1f}초, 더미 추론 {warmup_seconds:.1f}초)")
+        return {
+            "status": "success",
+            "model_loaded": True,
+            "load_seconds": load_seconds,
+            "warmup_seconds": warmup_seconds
+        }
+    
     def process_image_to_garment(
         self,
         image_path: str,
@@ -290,24 +572,45 @@ class ChatGarmentPipeline:
         Returns:
             Dict: 처리 결과 (JSON, 패턴 경로, 3D 모델 경로 등)
         """
-        if not self.model_loaded:
-            self.load_model()
-        
-        if not self.model_loaded:
-            raise RuntimeError("ChatGarment 모델을 로딩할 수 없습니다.")
-        
         if not os.path.exists(image_path):
             raise FileNotFoundError(f"이미지를 찾을 수 없습니다: {image_path}")
         
-        # 출력 디렉토리 설정
+        # 이미지 해시는 결과 캐시 키와 비전 특징 캐시 키에 함께 사용
+        image_hash = file_sha256(image_path)
+        
+        # 출력 디렉토리 설정 (지정되지 않으면 요청 전용 작업 공간)
         if output_dir is None:
-            output_dir = str(project_root / "outputs" / "garments")
+            output_dir = str(get_workspace_allocator().allocate())
         os.makedirs(output_dir, exist_ok=True)
         
         if garment_id is None:
-            garment_id = f"garment_{random.randint(1000, 9999)}"
+            # 동시 요청끼리 충돌하지 않도록 고유 ID 사용
+            garment_id = f"garment_{uuid.uuid4().hex[:12]}"
+        
+        saved_dir = os.path.abspath(os.path.join(output_dir, f'valid_garment_{garment_id}'))
+        
+        # 동일 이미지 + 동일 모델 결과가 캐시에 있으면 추론 없이 반환
+        # (산출물은 이 요청의 출력 디렉토리로 복사하여 다른 요청의 작업 공간을 가리키지 않음)
+        cache = get_result_cache()
+        cache_key = None
+        if cache is not None:
+            cache_key = cache.make_key(
+                image_path,
+                model_version=self.model_version,
+                namespace="garment",
+                image_hash=image_hash
+            )
+            cached = cache.get_into(cache_key, saved_dir)
+            if cached is not None:
+                print(f"[ChatGarment Pipeline] 캐시 적중: {saved_dir}")
+                return {**cached, "garment_id": garment_id, "cache_hit": True}
+        
+        if not self.model_loaded:
+            self.load_model()
+        
+        if not self.model_loaded:
+            raise RuntimeError("ChatGarment 모델을 로딩할 수 없습니다.")
         
-        saved_dir = os.path.join(output_dir, f'valid_garment_{garment_id}')
         os.makedirs(saved_dir, exist_ok=True)
         
         print(f"\n{'='*60}")
@@ -319,86 +622,26 @@ class ChatGarmentPipeline:
         try:
             # 이미지 로딩 및 전처리
             print("1️⃣ 이미지 로딩 및 전처리...")
-            image = Image.open(image_path).convert('RGB')
-            
-            # 이미지 패딩 처리
-            def expand2square(pil_img, background_color=(122, 116, 104)):
-                width, height = pil_img.size
-                if width == height:
-                    return pil_img
-                elif width > height:
-                    result = Image.new(pil_img.mode, (width, width), background_color)
-                    result.paste(pil_img, (0, (width - height) // 2))
-                    return result
-                else:
-                    result = Image.new(pil_img.mode, (height, height), background_color)
-                    result.paste(pil_img, ((height - width) // 2, 0))
-                    return result
-            
-            image = expand2square(image, tuple(int(x*255) for x in self.image_processor.image_mean))
-            image_clip = self.image_processor.preprocess(image, return_tensors='pt')['pixel_values'][0]
-            image_clip = image_clip.unsqueeze(0).to(self.device)
-            image_clip = image_clip.bfloat16()
+            image_clip = self._load_image_clip(image_path)
             
             # Step 1: Geometry features 추출
             print("\n2️⃣ Step 1: Geometry features 분석 중...")
-            question1 = 'Can you describe the geometry features of the garments worn by the model in the Json format?'
-            
-            conv1 = conversation_lib.conv_templates["v1"].copy()
-            conv1.messages = []
-            prompt1 = DEFAULT_IMAGE_TOKEN + "\n" + question1
-            conv1.append_message(conv1.roles[0], prompt1)
-            conv1.append_message(conv1.roles[1], None)
-            prompt1_full = conv1.get_prompt()
-            
-            input_ids1 = tokenizer_image_token(prompt1_full, self.tokenizer, return_tensors="pt")
-            input_ids1 = input_ids1.unsqueeze(0).to(self.device)
-            
-            with torch.no_grad():
-                output_ids1, _, _ = self.model.evaluate(
-                    image_clip,
-                    image_clip,
-                    input_ids1,
-                    max_new_tokens=2048,
-                    tokenizer=self.tokenizer,
-                )
-            
-            output_ids1 = output_ids1[0, 1:]
-            text_output1 = self.tokenizer.decode(output_ids1, skip_special_tokens=False).strip().replace("</s>", "")
-            text_output1 = text_output1.replace('[STARTS]', '').replace('[SEG]', '').replace('[ENDS]', '')
+            prompt1_full, input_ids1 = self._geometry_prompt()
+            text_output1 = self._generate_text("geometry", image_clip, input_ids1, image_hash)
             
             print(f"✅ Geometry features 추출 완료")
             print(f"출력 길이: {len(text_output1)} 문자")
             
             # Step 2: Sewing pattern code 생성
             print("\n3️⃣ Step 2: Sewing pattern code 생성 중...")
-            question2 = 'Can you estimate the sewing pattern code based on the image and Json format garment geometry description?'
             
             # text_output1의 upper_garment/lower_garment를 upperbody_garment/lowerbody_garment로 변환
             text_output1_modified = text_output1.replace('upper_garment', 'upperbody_garment').replace('lower_garment', 'lowerbody_garment')
             
-            conv2 = conversation_lib.conv_templates["v1"].copy()
-            conv2.messages = []
-            prompt2 = DEFAULT_IMAGE_TOKEN + "\n" + question2 + "\n" + text_output1_modified
-            conv2.append_message(conv2.roles[0], prompt2)
-            conv2.append_message(conv2.roles[1], None)
-            prompt2_full = conv2.get_prompt()
-            
-            input_ids2 = tokenizer_image_token(prompt2_full, self.tokenizer, return_tensors="pt")
-            input_ids2 = input_ids2.unsqueeze(0).to(self.device)
-            
-            with torch.no_grad():
-                output_ids2, float_preds, seg_token_mask = self.model.evaluate(
-                    image_clip,
-                    image_clip,
-                    input_ids2,
-                    max_new_tokens=2048,
-                    tokenizer=self.tokenizer,
-                )
-            
-            output_ids2 = output_ids2[0, 1:]
-            text_output2 = self.tokenizer.decode(output_ids2, skip_special_tokens=False).strip().replace("</s>", "")
-            text_output2 = text_output2.replace('[STARTS]', '').replace('[SEG]', '').replace('[ENDS]', '')
+            prompt2_full, input_ids2 = self._pattern_prompt(text_output1_modified)
+            
+            output_ids2, float_preds = self._generate("pattern", image_clip, input_ids2, image_hash)
+            text_output2 = self._decode_output(output_ids2)
             
             print(f"✅ Sewing pattern code 생성 완료")
             print(f"출력 길이: {len(text_output2)} 문자")
@@ -434,11 +677,9 @@ class ChatGarmentPipeline:
             import shutil
             shutil.copy(image_path, os.path.join(saved_dir, f'gt_image.png'))
             
-            # GarmentCode 패턴 생성
+            # GarmentCode 패턴 생성 (격리된 프로세스)
             print("\n5️⃣ GarmentCode 패턴 생성 중...")
-            all_json_spec_files = []
-            all_json_spec_files = run_garmentcode_parser_float50(
-                all_json_spec_files,
+            all_json_spec_files = run_garmentcode_parser_isolated(
                 json_output,
                 float_preds,
                 saved_dir
@@ -471,7 +712,7 @@ class ChatGarmentPipeline:
                 print("\n6️⃣ 3D 변환 시작 (GarmentCodeRC)...")
                 mesh_path = self._convert_to_3d(json_spec_path, saved_dir)
                 
-                return {
+                result = {
                     "status": "success",
                     "garment_id": garment_id,
                     "output_dir": saved_dir,
@@ -483,6 +724,9 @@ class ChatGarmentPipeline:
                     "mesh_path": mesh_path,
                     "message": "의류 생성이 성공적으로 완료되었습니다!"
                 }
+                if cache_key is not None:
+                    cache.put(cache_key, result)
+                return result
             else:
                 raise FileNotFoundError("패턴 specification JSON 파일을 생성할 수 없었습니다.")
                 
@@ -501,6 +745,443 @@ class ChatGarmentPipeline:
                 "message": error_msg
             }
     
+    def analyze_image(self, image_path: str, text: Optional[str] = None) -> Dict[str, Any]:
+        """
+        이미지 분석 (Step 1: Geometry features만 실행)
+        
+        패턴 코드 생성, GarmentCode 패턴 생성, 3D 변환은 하지 않으므로
+        전체 파이프라인보다 훨씬 빠르다.
+        
+        Args:
+            image_path: 입력 이미지 경로
+            text: 선택적 텍스트 설명 (Step 1 질문 뒤에 덧붙임)
+            
+        Returns:
+            Dict: 분석 결과 (geometry features 원문과 파싱된 JSON)
+        """
+        if not os.path.exists(image_path):
+            raise FileNotFoundError(f"이미지를 찾을 수 없습니다: {image_path}")
+        
+        text = (text or "").strip() or None
+        image_hash = file_sha256(image_path)
+        
+        cache = get_result_cache()
+        cache_key = None
+        if cache is not None:
+            cache_key = cache.make_key(
+                image_path,
+                prompt=text,
+                model_version=self.model_version,
+                namespace="analysis",
+                image_hash=image_hash
+            )
+            cached = cache.get(cache_key)
+            if cached is not None:
+                print("[ChatGarment Pipeline] 분석 캐시 적중")
+                return {**cached, "cache_hit": True}
+        
+        if not self.model_loaded:
+            self.load_model()
+        
+        if not self.model_loaded:
+            raise RuntimeError("ChatGarment 모델을 로딩할 수 없습니다.")
+        
+        try:
+            image_clip = self._load_image_clip(image_path)
+            _, input_ids = self._geometry_prompt(text)
+            geometry_text = self._generate_text("geometry", image_clip, input_ids, image_hash)
+            result = {
+                "status": "success",
+                "geometry_features": geometry_text,
+                "json_output": repair_json(geometry_text, return_objects=True),
+                "message": "이미지 분석이 완료되었습니다."
+            }
+            if cache_key is not None:
+                cache.put(cache_key, result)
+            return result
+        except Exception as e:
+            import traceback
+            error_msg = f"이미지 분석 중 오류 발생: {str(e)}"
+            print(f"❌ {error_msg}")
+            traceback.print_exc()
+            return {
+                "status": "error",
+                "error": str(e),
+                "traceback": traceback.format_exc(),
+                "message": error_msg
+            }
+    
+    def _load_image_clip(self, image_path: str) -> torch.Tensor:
+        """이미지를 정사각형으로 패딩하고 비전 타워 입력 [1, 3, H, W]로 전처리"""
+        image = Image.open(image_path).convert('RGB')
+        background_color = tuple(int(x * 255) for x in self.image_processor.image_mean)
+        width, height = image.size
+        if width > height:
+            padded = Image.new(image.mode, (width, width), background_color)
+            padded.paste(image, (0, (width - height) // 2))
+            image = padded
+        elif height > width:
+            padded = Image.new(image.mode, (height, height), background_color)
+            padded.paste(image, ((height - width) // 2, 0))
+            image = padded
+        image_clip = self.image_processor.preprocess(image, return_tensors='pt')['pixel_values'][0]
+        return image_clip.unsqueeze(0).to(self.device).bfloat16()
+    
+    def _decode_output(self, output_ids: torch.Tensor) -> str:
+        """생성 토큰을 텍스트로 변환 (첫 토큰과 특수 태그 제거)"""
+        text = self.tokenizer.decode(output_ids[1:], skip_special_tokens=False).strip().replace("</s>", "")
+        return text.replace('[STARTS]', '').replace('[SEG]', '').replace('[ENDS]', '')
+    
+    def _generate_text(
+        self,
+        stage: str,
+        image_clip: torch.Tensor,
+        input_ids: torch.Tensor,
+        image_key: Optional[str] = None
+    ) -> str:
+        """_generate 후 출력 토큰을 텍스트로 변환"""
+        output_ids, _ = self._generate(stage, image_clip, input_ids, image_key)
+        return self._decode_output(output_ids)
+    
+    def _render_prompt(self, user_message: str) -> str:
+        """v1 대화 템플릿으로 사용자 메시지 1개짜리 프롬프트 생성"""
+        conv = conversation_lib.conv_templates["v1"].copy()
+        conv.messages = []
+        conv.append_message(conv.roles[0], user_message)
+        conv.append_message(conv.roles[1], None)
+        return conv.get_prompt()
+    
+    def _geometry_prompt(self, text: Optional[str] = None) -> Tuple[str, torch.Tensor]:
+        """
+        Step 1 프롬프트와 토큰
+        
+        기본 Step 1 프롬프트는 모든 요청에서 같으므로 템플릿 렌더링과 토크나이징을 한 번만 한다.
+        text가 있으면 질문 뒤에 덧붙여 매번 렌더링한다.
+        """
+        if text:
+            prompt = self._render_prompt(DEFAULT_IMAGE_TOKEN + "\n" + self.GEOMETRY_QUESTION + "\n" + text)
+            input_ids = tokenizer_image_token(prompt, self.tokenizer, return_tensors="pt")
+            return prompt, input_ids.unsqueeze(0).to(self.device)
+        cached = self._prompt_cache.get("geometry")
+        if cached is None:
+            prompt = self._render_prompt(DEFAULT_IMAGE_TOKEN + "\n" + self.GEOMETRY_QUESTION)
+            input_ids = tokenizer_image_token(prompt, self.tokenizer, return_tensors="pt")
+            cached = (prompt, input_ids.unsqueeze(0).to(self.device))
+            self._prompt_cache["geometry"] = cached
+        prompt, input_ids = cached
+        # 모델 쪽에서 입력 텐서를 수정해도 캐시가 오염되지 않도록 복사본 전달
+        return prompt, input_ids.clone()
+    
+    def _pattern_prompt(self, geometry_text: str) -> Tuple[str, torch.Tensor]:
+        """
+        Step 2 프롬프트와 토큰
+        
+        시스템 프롬프트 + 질문으로 이루어진 템플릿 앞/뒤 부분은 한 번만 렌더링하고
+        요청별 geometry 텍스트만 끼워 넣는다.
+        """
+        template = self._prompt_cache.get("pattern_template")
+        if template is None:
+            rendered = self._render_prompt(
+                DEFAULT_IMAGE_TOKEN + "\n" + self.PATTERN_QUESTION + "\n" + _PROMPT_PLACEHOLDER
+            )
+            parts = rendered.split(_PROMPT_PLACEHOLDER)
+            # 템플릿이 메시지를 가공하여 자리표시자가 정확히 1번 나오지 않으면 매번 렌더링
+            template = tuple(parts) if len(parts) == 2 else ()
+            self._prompt_cache["pattern_template"] = template
+        
+        if template:
+            prompt = template[0] + geometry_text + template[1]
+        else:
+            prompt = self._render_prompt(
+                DEFAULT_IMAGE_TOKEN + "\n" + self.PATTERN_QUESTION + "\n" + geometry_text
+            )
+        input_ids = tokenizer_image_token(prompt, self.tokenizer, return_tensors="pt")
+        return prompt, input_ids.unsqueeze(0).to(self.device)
+    
+    def _generate(
+        self,
+        stage: str,
+        image_clip: torch.Tensor,
+        input_ids: torch.Tensor,
+        image_key: Optional[str] = None
+    ) -> Tuple[torch.Tensor, Optional[torch.Tensor]]:
+        """
+        단일 요청 생성 (배칭이 켜져 있으면 같은 단계의 동시 요청과 묶어 실행)
+        
+        Args:
+            stage: 생성 단계 이름 ("geometry", "pattern") - 단계별로 따로 배칭
+            image_clip: 전처리된 이미지 [1, 3, H, W]
+            input_ids: 프롬프트 토큰 [1, L]
+            image_key: 비전 특징 캐시 키 (이미지 해시, 없으면 캐시 미사용)
+            
+        Returns:
+            (output_ids, float_preds): 이 요청의 출력 토큰 [L_out]과 float 예측값
+        """
+        item = (image_clip, input_ids, image_key)
+        if self.max_batch_size <= 1:
+            result = self._evaluate_batch([item])[0]
+        else:
+            result = self._get_batcher(stage).submit(item)
+        if isinstance(result, BaseException):
+            raise result
+        return result
+    
+    def _get_batcher(self, stage: str) -> MicroBatcher:
+        """생성 단계별 배처 (처음 사용 시 생성)"""
+        batcher = self._batchers.get(stage)
+        if batcher is None:
+            with self._batchers_lock:
+                batcher = self._batchers.get(stage)
+                if batcher is None:
+                    batcher = MicroBatcher(
+                        self._evaluate_batch,
+                        max_batch_size=self.max_batch_size,
+                        max_wait_ms=self.batch_wait_ms,
+                        name=f"chatgarment-{stage}"
+                    )
+                    self._batchers[stage] = batcher
+        return batcher
+    
+    def _evaluate_batch(self, items: List[Tuple[torch.Tensor, torch.Tensor, Optional[str]]]) -> List[Any]:
+        """
+        여러 요청의 model.evaluate 실행
+        
+        프롬프트 길이가 다르면 패딩하여 하나의 배치로 쌓는다 (_evaluate_stacked 참고).
+        배치 실행이 실패하면 요청별로 다시 실행한다.
+        
+        Returns:
+            요청별 (output_ids, float_preds) 또는 해당 요청의 예외
+        """
+        if len(items) == 1:
+            image_clip, input_ids, image_key = items[0]
+            try:
+                with torch.no_grad(), self._active_image_keys([image_key]):
+                    output_ids, float_preds, _ = self.model.evaluate(
+                        image_clip,
+                        image_clip,
+                        input_ids,
+                        max_new_tokens=2048,
+                        tokenizer=self.tokenizer,
+                    )
+                return [(output_ids[0], float_preds)]
+            except Exception as e:
+                return [e]
+        
+        try:
+            return self._evaluate_stacked(items)
+        except Exception as e:
+            print(f"[ChatGarment Pipeline] 배치 생성 실패, 개별 실행으로 전환: {str(e)}")
+            return [self._evaluate_batch([item])[0] for item in items]
+    
+    def _evaluate_stacked(self, items: List[Tuple[torch.Tensor, torch.Tensor, Optional[str]]]) -> List[Tuple[torch.Tensor, Optional[torch.Tensor]]]:
+        """
+        프롬프트들을 하나의 배치로 쌓아 evaluate 1회 실행
+        
+        짧은 프롬프트는 이미지 토큰 바로 뒤에 패딩 토큰을 넣어 길이를 맞춘다.
+        - 앞부분(시스템 프롬프트 + 이미지)은 모든 행에서 같은 위치라 접두사 KV 캐시를 그대로 사용
+        - 모든 행이 같은 위치에서 끝나므로 생성 토큰이 패딩 뒤에 이어 붙지 않음
+        evaluate는 attention_mask를 받지 않으므로 패딩 위치는 언어 모델 forward 래퍼
+        (_install_padding_mask)가 attention_mask / position_ids에 반영한다.
+        """
+        max_length = max(ids.shape[1] for _, ids, _ in items)
+        pad_token_id = self.tokenizer.pad_token_id
+        if pad_token_id is None:
+            pad_token_id = self.tokenizer.unk_token_id or 0
+        rows = []
+        padded = []
+        for _, ids, _ in items:
+            ids = ids[0]
+            image_positions = (ids == IMAGE_TOKEN_INDEX).nonzero()
+            if len(image_positions) != 1:
+                raise ValueError("이미지 토큰이 1개인 프롬프트만 배치로 실행할 수 있습니다.")
+            image_pos = int(image_positions[0])
+            pad_length = max_length - ids.shape[0]
+            if pad_length:
+                ids = torch.cat([
+                    ids[:image_pos + 1],
+                    ids.new_full((pad_length,), pad_token_id),
+                    ids[image_pos + 1:]
+                ])
+            rows.append((image_pos, pad_length))
+            padded.append(ids)
+        padding = (max_length, rows) if any(pad_length for _, pad_length in rows) else None
+        if padding is not None and not self._padding_mask_installed:
+            raise RuntimeError("패딩 마스크를 적용할 수 없어 길이가 다른 프롬프트를 배치로 실행할 수 없습니다.")
+        
+        image_clips = torch.cat([image_clip for image_clip, _, _ in items], dim=0)
+        input_ids = torch.stack(padded, dim=0)
+        with torch.no_grad(), self._active_image_keys([key for _, _, key in items]), self._active_padding(padding):
+            output_ids, float_preds, seg_token_mask = self.model.evaluate(
+                image_clips,
+                image_clips,
+                input_ids,
+                max_new_tokens=2048,
+                tokenizer=self.tokenizer,
+            )
+        
+        # float_preds는 배치 전체의 [SEG] 토큰에 대해 평탄화되어 있으므로 요청별 [SEG] 개수로 분할
+        if float_preds is not None:
+            counts = seg_token_mask.sum(dim=1).tolist()
+            per_request_preds = list(torch.split(float_preds, counts, dim=0))
+        else:
+            per_request_preds = [None] * len(items)
+        
+        eos_token_id = self.tokenizer.eos_token_id
+        results = []
+        for row, preds in zip(output_ids, per_request_preds):
+            # 먼저 끝난 요청의 EOS 뒤에 붙은 패딩 토큰 제거
+            if eos_token_id is not None:
+                eos_positions = (row[1:] == eos_token_id).nonzero()
+                if len(eos_positions):
+                    row = row[:int(eos_positions[0]) + 2]
+            results.append((row, preds))
+        return results
+    
+    @contextmanager
+    def _active_padding(self, padding: Optional[Tuple[int, List[Tuple[int, int]]]]):
+        """evaluate 호출 동안 배치 패딩 정보((패딩 후 토큰 길이, 행별 (이미지 위치, 패딩 길이)))를 등록"""
+        self._batch_padding.padding = padding
+        self._batch_padding.num_image_tokens = None
+        try:
+            yield
+        finally:
+            self._batch_padding.padding = None
+    
+    def _install_padding_mask(self):
+        """
+        언어 모델 forward를 배치 패딩 마스크 래퍼로 교체
+        
+        LLaVA는 attention_mask 없이 호출되면 모든 위치를 유효하게 보므로,
+        _evaluate_stacked가 넣은 패딩 위치를 attention_mask에서 0으로 바꾸고
+        position_ids를 패딩을 제외한 위치로 다시 계산한다. (prefill과 디코딩 단계 모두)
+        """
+        self._padding_mask_installed = False
+        if not hasattr(self.model, "get_model"):
+            print("[ChatGarment Pipeline] get_model이 없어 길이가 다른 프롬프트는 배치로 묶지 않습니다.")
+            return
+        language_model = self.model.get_model()
+        forward = language_model.forward
+        
+        def forward_with_padding(*args, **kwargs):
+            padding = getattr(self._batch_padding, "padding", None)
+            if padding is not None and not args:
+                kwargs = self._apply_padding_mask(padding, kwargs)
+            return forward(*args, **kwargs)
+        
+        language_model.forward = forward_with_padding
+        self._padding_mask_installed = True
+    
+    def _apply_padding_mask(self, padding: Tuple[int, List[Tuple[int, int]]], kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        """forward 인자의 attention_mask / position_ids에 패딩 위치 반영"""
+        ids_length, rows = padding
+        inputs = kwargs.get("inputs_embeds")
+        if inputs is None:
+            inputs = kwargs.get("input_ids")
+        batch_size, length = inputs.shape[0], inputs.shape[1]
+        past = kwargs.get("past_key_values")
+        past_length = 0
+        if past is not None:
+            if hasattr(past, "get_seq_length"):
+                past_length = past.get_seq_length()
+            elif len(past):
+                past_length = past[0][0].shape[2]
+        if past_length == 0:
+            # prefill: 이미지 토큰 1개가 이미지 특징 N개로 바뀐 길이
+            self._batch_padding.num_image_tokens = length - ids_length + 1
+        num_image_tokens = self._batch_padding.num_image_tokens
+        if batch_size != len(rows) or not num_image_tokens or num_image_tokens < 1:
+            raise RuntimeError("배치 패딩 위치를 계산할 수 없습니다.")
+        
+        total_length = past_length + length
+        attention_mask = kwargs.get("attention_mask")
+        if attention_mask is None:
+            attention_mask = torch.ones(batch_size, total_length, dtype=torch.long, device=inputs.device)
+        else:
+            attention_mask = attention_mask.long().clone()
+        if tuple(attention_mask.shape) != (batch_size, total_length):
+            raise RuntimeError(f"attention_mask 크기가 예상과 다릅니다: {tuple(attention_mask.shape)}")
+        for row, (image_pos, pad_length) in enumerate(rows):
+            if pad_length:
+                start = image_pos + num_image_tokens
+                attention_mask[row, start:start + pad_length] = 0
+        
+        kwargs = dict(kwargs)
+        kwargs["attention_mask"] = attention_mask
+        position_ids = (attention_mask.cumsum(dim=-1) - 1).clamp(min=0)
+        kwargs["position_ids"] = position_ids[:, past_length:]
+        return kwargs
+    
+    @contextmanager
+    def _active_image_keys(self, keys: List[Optional[str]]):
+        """evaluate 호출 동안 배치 행별 이미지 키를 현재 스레드에 등록"""
+        self._image_keys.keys = keys
+        try:
+            yield
+        finally:
+            self._image_keys.keys = None
+    
+    def _install_feature_cache(self):
+        """
+        model.encode_images를 이미지 키 기반 캐시 래퍼로 교체
+        
+        LLaVA는 generate 때마다 encode_images(CLIP 비전 타워 + mm_projector)를 호출하므로
+        같은 이미지를 쓰는 Step 1 / Step 2와 반복 업로드에서 특징을 재사용한다.
+        """
+        if not hasattr(self.model, "encode_images"):
+            print("[ChatGarment Pipeline] encode_images가 없어 비전 특징 캐시를 사용하지 않습니다.")
+            return
+        encode_images = self.model.encode_images
+        
+        def encode_images_cached(images):
+            keys = getattr(self._image_keys, "keys", None)
+            if (
+                not keys
+                or any(key is None for key in keys)
+                or not isinstance(images, torch.Tensor)
+                or images.dim() != 4
+                or images.shape[0] != len(keys)
+            ):
+                return encode_images(images)
+            
+            features: List[Optional[torch.Tensor]] = [self._feature_cache.get(key) for key in keys]
+            missing = [i for i, feature in enumerate(features) if feature is None]
+            if missing:
+                computed = encode_images(images[missing])
+                for j, i in enumerate(missing):
+                    features[i] = computed[j]
+                    self._feature_cache.put(keys[i], computed[j])
+            return torch.stack(features, dim=0)
+        
+        self.model.encode_images = encode_images_cached
+    
+    def _install_prefix_cache(self):
+        """
+        대화 템플릿 접두사의 KV를 미리 계산하여 언어 모델 forward에 연결
+        
+        Step 1 / Step 2 프롬프트는 이미지 토큰 앞부분(시스템 프롬프트 + "USER: ")이 같으므로
+        이 부분의 prefill을 요청마다 반복하지 않는다. (CHATGARMENT_PREFIX_CACHE=false이면 사용 안 함)
+        """
+        if os.getenv("CHATGARMENT_PREFIX_CACHE", "true").lower() != "true":
+            return
+        if not hasattr(self.model, "get_model"):
+            print("[ChatGarment Pipeline] get_model이 없어 접두사 KV 캐시를 사용하지 않습니다.")
+            return
+        try:
+            _, input_ids = self._geometry_prompt()
+            image_positions = (input_ids[0] == IMAGE_TOKEN_INDEX).nonzero()
+            if len(image_positions) == 0:
+                return
+            prefix_ids = input_ids[0, :int(image_positions[0])]
+            if self._prefix_cache is not None:
+                self._prefix_cache.uninstall()
+            prefix_cache = PrefixKVCache(self.model.get_model())
+            prefix_cache.build(prefix_ids)
+            prefix_cache.install()
+            self._prefix_cache = prefix_cache
+        except Exception as e:
+            print(f"[ChatGarment Pipeline] 접두사 KV 캐시 준비 실패 (캐시 없이 실행): {str(e)}")
+            self._prefix_cache = None
+    
     def _convert_to_3d(
         self,
         json_spec_path: str,
@@ -554,6 +1235,7 @@ class ChatGarmentPipeline:
             result = subprocess.run(
                 cmd,
                 cwd=str(project_root),
+                env=isolated_env(),
                 capture_output=True,
                 text=True,
                 timeout=600  # 10분 타임아웃
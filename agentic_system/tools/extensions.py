@@ -12,6 +12,14 @@ import json
 import subprocess
 import torch
 import random
+import struct
+import threading
+import zlib
+
+from .registry import tool_registry
+from .result_cache import get_result_cache, model_version_of
+from .workspace import get_workspace_allocator, atomic_write_json, atomic_write_text, atomic_write_bytes
+from .garmentcode_runner import run_garmentcode_parser_isolated
 
 # 프로젝트 루트 경로 추가
 project_root = Path(__file__).parent.parent.parent
@@ -27,7 +35,6 @@ except ImportError as e:
     try:
         from llava.garment_utils_v2 import (
             try_generate_garments,
-            run_garmentcode_parser_float50,
             recursive_change_params
         )
         from llava.json_fixer import repair_json
@@ -63,6 +70,10 @@ class Extensions2DTo3D:
         self.tokenizer = None
         self.device = "cuda" if torch.cuda.is_available() else "cpu"
         self.model_loaded = False
+        self._load_lock = threading.Lock()
+        # 레지스트리 싱글톤 모드(pool_size=0)에서는 여러 스레드가 인스턴스를 공유하므로
+        # 같은 모델의 generate를 동시에 호출하지 않도록 추론을 직렬화
+        self._inference_lock = threading.Lock()
         
         # 실제 ChatGarment 파이프라인 사용 여부
         self.chatgarment_pipeline = None
@@ -74,11 +85,32 @@ class Extensions2DTo3D:
                 print(f"⚠️ ChatGarment 파이프라인 초기화 실패: {e}")
                 self.chatgarment_pipeline = None
         
+    def warmup(self):
+        """레지스트리 warmup 훅: 모델을 미리 로딩"""
+        self._load_model()
+    
+    def shutdown(self):
+        """레지스트리 shutdown 훅: 로딩된 모델 해제"""
+        self.model = None
+        self.tokenizer = None
+        self.model_loaded = False
+        self.chatgarment_pipeline = None
+        if torch.cuda.is_available():
+            torch.cuda.empty_cache()
+    
     def _load_model(self):
         """ChatGarment 모델 로딩 (지연 로딩)"""
         if self.model_loaded or not CHATGARMENT_AVAILABLE:
             return
         
+        # 동시 실행되는 단계에서 모델을 중복 로딩하지 않도록 잠금
+        with self._load_lock:
+            if self.model_loaded:
+                return
+            self._load_model_locked()
+    
+    def _load_model_locked(self):
+        """ChatGarment 모델 로딩 (_load_lock 보유 상태에서 호출)"""
         try:
             print("ChatGarment 모델 로딩 중...")
             
@@ -125,6 +157,23 @@ class Extensions2DTo3D:
             print("Mock 모드로 동작합니다.")
             self.model_loaded = False
     
+    def _workspace_dir(self, context: Optional[Dict[str, Any]], subdir: str) -> Path:
+        """
+        작업별 출력 디렉토리
+
+        context의 output_dir가 있으면 그 아래를, 없으면 plan_id 기준 작업 공간을 사용하여
+        동시에 실행되는 요청끼리 산출물이 섞이지 않도록 한다.
+        """
+        context = context or {}
+        base_dir = context.get("output_dir")
+        if base_dir:
+            base_dir = Path(base_dir)
+        else:
+            base_dir = get_workspace_allocator().allocate(context.get("plan_id"))
+        output_dir = base_dir / subdir
+        output_dir.mkdir(parents=True, exist_ok=True)
+        return output_dir
+    
     def execute(self, action: str, parameters: Dict[str, Any], context: Dict[str, Any]) -> Dict[str, Any]:
         """
         도구 실행
@@ -188,6 +237,22 @@ class Extensions2DTo3D:
         if not os.path.exists(image_path):
             raise FileNotFoundError(f"이미지를 찾을 수 없습니다: {image_path}")
         
+        # 동일 이미지 + 프롬프트 + 체크포인트의 분석 결과가 캐시에 있으면 재사용
+        cache = get_result_cache()
+        cache_key = None
+        checkpoint_file = self.checkpoint_path / "pytorch_model.bin"
+        if cache is not None and checkpoint_file.exists():
+            cache_key = cache.make_key(
+                image_path,
+                prompt=text_description,
+                model_version=model_version_of(str(checkpoint_file)),
+                namespace="analysis"
+            )
+            cached = cache.get(cache_key)
+            if cached is not None:
+                print("[Extensions2DTo3D] 이미지 분석 캐시 적중")
+                return {**cached, "image_path": image_path, "cache_hit": True}
+        
         # 모델 로딩
         self._load_model()
         
@@ -224,7 +289,7 @@ class Extensions2DTo3D:
             input_ids = input_ids.unsqueeze(0).to(self.device)
             
             # 추론
-            with torch.no_grad():
+            with self._inference_lock, torch.no_grad():
                 output_ids, float_preds, seg_token_mask = self.model.evaluate(
                     image_clip,
                     image_clip,
@@ -241,7 +306,7 @@ class Extensions2DTo3D:
             # JSON 수정
             json_output = repair_json(text_output, return_objects=True)
             
-            return {
+            result = {
                 "status": "success",
                 "analysis": json_output,
                 "text_output": text_output,
@@ -249,6 +314,9 @@ class Extensions2DTo3D:
                 "image_path": image_path,
                 "message": "이미지 분석이 완료되었습니다."
             }
+            if cache_key is not None:
+                cache.put(cache_key, result)
+            return result
             
         except Exception as e:
             print(f"이미지 분석 오류: {str(e)}")
@@ -269,29 +337,26 @@ class Extensions2DTo3D:
         json_output = analysis.get("analysis") or analysis
         float_preds = analysis.get("float_preds")
         
-        # 출력 디렉토리 설정
-        output_dir = project_root / "outputs" / "patterns"
-        output_dir.mkdir(parents=True, exist_ok=True)
-        
-        garment_name = "garment_001"
-        
+        # 출력 디렉토리 설정 (작업별 작업 공간)
+        output_dir = self._workspace_dir(context, "patterns")
+
+        # Mock 분석 결과(float_preds 없음)는 파서를 실행할 수 없으므로 바로 Mock 패턴 생성
+        if not CHATGARMENT_AVAILABLE or float_preds is None:
+            return self._mock_generate_pattern(analysis, output_dir)
+
         try:
-            # 패턴 생성
-            all_json_spec_files = []
-            saved_dir = str(output_dir)
-            
-            all_json_spec_files = run_garmentcode_parser_float50(
-                all_json_spec_files,
+            # 패턴 생성 (작업 디렉토리 변경 없이 격리된 프로세스에서 실행)
+            run_garmentcode_parser_isolated(
                 json_output,
                 float_preds,
-                saved_dir
+                str(output_dir)
             )
             
-            # 생성된 파일 경로
-            pattern_json_path = os.path.join(saved_dir, f'valid_garment_{garment_name}', 
-                                            f'valid_garment_{garment_name}_specification.json')
+            # 생성된 파일 경로 (작업 공간 안에서 생성된 specification 파일 탐색)
+            spec_files = sorted(output_dir.glob("**/*_specification.json"))
+            pattern_json_path = str(spec_files[0]) if spec_files else None
             
-            if os.path.exists(pattern_json_path):
+            if pattern_json_path:
                 return {
                     "status": "success",
                     "pattern_path": pattern_json_path,
@@ -303,11 +368,11 @@ class Extensions2DTo3D:
                 }
             else:
                 # Mock 패턴 생성
-                return self._mock_generate_pattern(analysis)
+                return self._mock_generate_pattern(analysis, output_dir)
                 
         except Exception as e:
             print(f"패턴 생성 오류: {str(e)}")
-            return self._mock_generate_pattern(analysis)
+            return self._mock_generate_pattern(analysis, output_dir)
     
     def _convert_to_3d(self, parameters: Dict[str, Any], context: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -317,10 +382,11 @@ class Extensions2DTo3D:
         """
         # 이전 단계 결과 사용
         pattern_result = parameters.get("_dependency_result") or context.get("step_2")
+        output_dir = self._workspace_dir(context, "3d_models")
         
         if not pattern_result:
             print("[Extensions2DTo3D] 패턴 생성 결과가 없어 Mock 모드로 전환합니다.")
-            return self._mock_convert_to_3d({})
+            return self._mock_convert_to_3d({}, output_dir)
         
         pattern_json_path = pattern_result.get("pattern_path")
         
@@ -328,7 +394,7 @@ class Extensions2DTo3D:
         if not pattern_json_path or not os.path.exists(pattern_json_path):
             print(f"[Extensions2DTo3D] 패턴 파일을 찾을 수 없습니다: {pattern_json_path}")
             print("[Extensions2DTo3D] Mock 모드로 3D 변환을 수행합니다.")
-            return self._mock_convert_to_3d(pattern_result)
+            return self._mock_convert_to_3d(pattern_result, output_dir)
         
         # 실제 3D 변환 시도 (Mock 모드에서는 건너뛰기)
         # PoC 단계에서는 실제 변환 대신 Mock 변환 사용
@@ -381,7 +447,7 @@ class Extensions2DTo3D:
         
         # Mock 변환으로 전환 (PoC 단계 기본 동작)
         print("[Extensions2DTo3D] Mock 모드로 3D 변환을 수행합니다.")
-        return self._mock_convert_to_3d(pattern_result)
+        return self._mock_convert_to_3d(pattern_result, output_dir)
     
     def _render_result(self, parameters: Dict[str, Any], context: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -397,7 +463,7 @@ class Extensions2DTo3D:
         
         # TODO: 실제 렌더링 엔진 사용 (PyTorch3D 등)
         # 현재는 Mock 구현
-        render_path = self._mock_render(mesh_result)
+        render_path = self._mock_render(mesh_result, self._workspace_dir(context, "renders"))
         
         return {
             "status": "success",
@@ -418,6 +484,10 @@ class Extensions2DTo3D:
         # ChatGarment 마이크로서비스 사용 여부 확인
         use_service = os.getenv("USE_CHATGARMENT_SERVICE", "false").lower() == "true"
         
+        # 모든 단계가 같은 작업 공간을 사용하도록 미리 할당
+        if not context.get("output_dir"):
+            context["output_dir"] = str(get_workspace_allocator().allocate(context.get("plan_id")))
+        
         if use_service:
             print("[Extensions2DTo3D] ChatGarment 마이크로서비스 사용 시도...")
             try:
@@ -491,10 +561,9 @@ class Extensions2DTo3D:
             "message": "이미지 분석이 완료되었습니다. (Mock 모드)"
         }
     
-    def _mock_generate_pattern(self, analysis: Dict[str, Any]) -> Dict[str, Any]:
+    def _mock_generate_pattern(self, analysis: Dict[str, Any], output_dir: Optional[Path] = None) -> Dict[str, Any]:
         """Mock 패턴 생성"""
-        output_dir = project_root / "outputs" / "patterns"
-        output_dir.mkdir(parents=True, exist_ok=True)
+        output_dir = output_dir or self._workspace_dir(None, "patterns")
         pattern_path = str(output_dir / "pattern.json")
         
         # 실제 패턴 JSON 파일 생성 (Mock 데이터)
@@ -529,8 +598,7 @@ class Extensions2DTo3D:
         
         # 파일 쓰기
         try:
-            with open(pattern_path, 'w', encoding='utf-8') as f:
-                json.dump(pattern_data, f, ensure_ascii=False, indent=2)
+            atomic_write_json(pattern_path, pattern_data, indent=2)
             print(f"[Extensions2DTo3D] Mock 패턴 파일 생성 완료: {pattern_path}")
         except Exception as e:
             print(f"[Extensions2DTo3D] Mock 패턴 파일 생성 실패: {e}")
@@ -545,47 +613,50 @@ class Extensions2DTo3D:
             "message": "패턴 생성이 완료되었습니다. (Mock 모드)"
         }
     
-    def _mock_convert_to_3d(self, pattern_result: Dict[str, Any]) -> Dict[str, Any]:
+    def _mock_convert_to_3d(self, pattern_result: Dict[str, Any], output_dir: Optional[Path] = None) -> Dict[str, Any]:
         """Mock 3D 변환"""
-        output_dir = project_root / "outputs" / "3d_models"
-        output_dir.mkdir(parents=True, exist_ok=True)
+        output_dir = output_dir or self._workspace_dir(None, "3d_models")
         mesh_path = str(output_dir / "garment.obj")
         
         # 실제 Mock OBJ 파일 생성 (간단한 3D 메시)
         try:
-            with open(mesh_path, 'w', encoding='utf-8') as f:
-                # 간단한 Mock OBJ 파일 (큐브 형태)
-                f.write("# Mock 3D Garment Mesh\n")
-                f.write("# Generated by Mock Converter\n")
-                f.write("g garment_mock\n")
-                
-                # 정점 (vertices) - 간단한 박스 형태
-                vertices = [
-                    (-1, -1, -1),  # 0
-                    (1, -1, -1),   # 1
-                    (1, 1, -1),    # 2
-                    (-1, 1, -1),   # 3
-                    (-1, -1, 1),   # 4
-                    (1, -1, 1),    # 5
-                    (1, 1, 1),     # 6
-                    (-1, 1, 1),    # 7
-                ]
-                
-                for v in vertices:
-                    f.write(f"v {v[0]} {v[1]} {v[2]}\n")
-                
-                # 면 (faces) - 박스의 6개 면
-                faces = [
-                    (0, 1, 2, 3),  # 앞면
-                    (4, 7, 6, 5),  # 뒷면
-                    (0, 4, 5, 1),  # 아래면
-                    (2, 6, 7, 3),  # 위면
-                    (0, 3, 7, 4),  # 왼쪽면
-                    (1, 5, 6, 2),  # 오른쪽면
-                ]
-                
-                for face in faces:
-                    f.write(f"f {' '.join([str(i+1) for i in face])}\n")
+            # 간단한 Mock OBJ 파일 (큐브 형태)
+            lines = [
+                "# Mock 3D Garment Mesh",
+                "# Generated by Mock Converter",
+                "g garment_mock",
+            ]
+            
+            # 정점 (vertices) - 간단한 박스 형태
+            vertices = [
+                (-1, -1, -1),  # 0
+                (1, -1, -1),   # 1
+                (1, 1, -1),    # 2
+                (-1, 1, -1),   # 3
+                (-1, -1, 1),   # 4
+                (1, -1, 1),    # 5
+                (1, 1, 1),     # 6
+                (-1, 1, 1),    # 7
+            ]
+            
+            for v in vertices:
+                lines.append(f"v {v[0]} {v[1]} {v[2]}")
+            
+            # 면 (faces) - 박스의 6개 면
+            faces = [
+                (0, 1, 2, 3),  # 앞면
+                (4, 7, 6, 5),  # 뒷면
+                (0, 4, 5, 1),  # 아래면
+                (2, 6, 7, 3),  # 위면
+                (0, 3, 7, 4),  # 왼쪽면
+                (1, 5, 6, 2),  # 오른쪽면
+            ]
+            
+            for face in faces:
+                lines.append(f"f {' '.join([str(i+1) for i in face])}")
+            
+            # 임시 파일에 쓴 뒤 교체 (읽는 쪽이 쓰다 만 파일을 보지 않도록)
+            atomic_write_text(mesh_path, "\n".join(lines) + "\n")
             
             print(f"[Extensions2DTo3D] Mock 3D 메시 파일 생성 완료: {mesh_path}")
         except Exception as e:
@@ -602,16 +673,39 @@ class Extensions2DTo3D:
             "message": "3D 변환이 완료되었습니다. (Mock 모드)"
         }
     
-    def _mock_render(self, mesh_result: Dict[str, Any]) -> str:
-        """Mock 렌더링"""
-        output_dir = project_root / "outputs" / "renders"
-        output_dir.mkdir(parents=True, exist_ok=True)
+    def _mock_render(self, mesh_result: Dict[str, Any], output_dir: Optional[Path] = None) -> str:
+        """Mock 렌더링 (단색 PNG 자리 표시 이미지 저장)"""
+        output_dir = output_dir or self._workspace_dir(None, "renders")
         render_path = str(output_dir / "garment_render.png")
+        try:
+            atomic_write_bytes(render_path, _placeholder_png(256, 256))
+            print(f"[Extensions2DTo3D] Mock 렌더링 이미지 생성 완료: {render_path}")
+        except Exception as e:
+            print(f"[Extensions2DTo3D] Mock 렌더링 이미지 생성 실패: {e}")
         return render_path
 
 
+def _placeholder_png(width: int, height: int, rgb: tuple = (200, 200, 200)) -> bytes:
+    """단색 RGB PNG 바이트 (PIL 없이 표준 라이브러리로 생성)"""
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data) & 0xffffffff)
+
+    # 각 행은 필터 바이트(0) + 픽셀
+    rows = (b"\x00" + bytes(rgb) * width) * height
+    return (
+        b"\x89PNG\r\n\x1a\n"
+        + chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0))
+        + chunk(b"IDAT", zlib.compress(rows))
+        + chunk(b"IEND", b"")
+    )
+
+
+# 프로세스 수명 인스턴스로 등록 (모델은 워커당 한 번만 로딩)
+tool_registry.register("extensions_2d_to_3d", Extensions2DTo3D)
+
+
 # 도구 함수로 사용하기 위한 래퍼
 def extensions_2d_to_3d_tool(action: str, parameters: Dict[str, Any], context: Dict[str, Any]) -> Dict[str, Any]:
-    """도구 함수 래퍼"""
-    tool = Extensions2DTo3D()
-    return tool.execute(action, parameters, context)
+    """도구 함수 래퍼 (레지스트리의 인스턴스 재사용)"""
+    with tool_registry.instance("extensions_2d_to_3d") as tool:
+        return tool.execute(action, parameters, context)
@@ -4,11 +4,16 @@ Windows 백엔드에서 리눅스 서버의 ChatGarment 서비스 호출
 """
 
 import requests
+from requests.adapters import HTTPAdapter
 import os
-from typing import Dict, Any, Optional
+import threading
+from typing import Dict, Any, List, Optional, Union
 from pathlib import Path
 import logging
 
+from .service_health import CircuitBreaker, ServiceHealthMonitor
+from .result_cache import file_sha256
+
 # 로깅 설정
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -19,21 +24,190 @@ CHATGARMENT_SERVICE_URL = os.getenv(
     "http://localhost:9000"  # 기본값 (로컬 테스트용)
 )
 
+# 여러 서비스 인스턴스 (쉼표로 구분, 설정 시 CHATGARMENT_SERVICE_URL 대신 사용)
+CHATGARMENT_SERVICE_URLS = [
+    url.strip() for url in os.getenv("CHATGARMENT_SERVICE_URLS", "").split(",") if url.strip()
+]
+# 다른 인스턴스로 재시도하는 최대 횟수
+CHATGARMENT_SERVICE_RETRIES = int(os.getenv("CHATGARMENT_SERVICE_RETRIES", "2"))
+
+# 서비스별 연결 풀 크기 (동시에 유지할 keep-alive 연결 수)
+CHATGARMENT_HTTP_POOL_SIZE = int(os.getenv("CHATGARMENT_HTTP_POOL_SIZE", "10"))
+
+# 백그라운드 헬스 확인 간격 (초)과 서킷 브레이커 설정
+CHATGARMENT_HEALTH_INTERVAL = float(os.getenv("CHATGARMENT_HEALTH_INTERVAL", "10"))
+CHATGARMENT_BREAKER_THRESHOLD = int(os.getenv("CHATGARMENT_BREAKER_THRESHOLD", "3"))
+CHATGARMENT_BREAKER_BACKOFF = float(os.getenv("CHATGARMENT_BREAKER_BACKOFF", "5"))
+
+# 이미지 전달 방식: auto (공유 볼륨 경로 → 해시 확인 후 필요 시 업로드) / multipart (매번 업로드)
+CHATGARMENT_UPLOAD_MODE = os.getenv("CHATGARMENT_UPLOAD_MODE", "auto").lower()
+# 서비스와 함께 마운트한 공유 볼륨의 로컬 경로 (서비스 쪽도 같은 변수로 자신의 마운트 경로 지정)
+CHATGARMENT_SHARED_ROOT = os.getenv("CHATGARMENT_SHARED_ROOT")
+
+# 서비스가 살아 있다는 뜻이 아닌 응답 (게이트웨이 오류 / 준비 전)
+UNAVAILABLE_STATUS_CODES = (502, 503, 504)
+
+
+def create_pooled_session(pool_size: Optional[int] = None) -> requests.Session:
+    """
+    keep-alive 연결 풀을 사용하는 Session 생성
+    
+    같은 Session으로 보낸 요청은 풀에 남아 있는 TCP 연결을 재사용하므로
+    요청마다 연결 수립(TCP 핸드셰이크)을 반복하지 않는다.
+    """
+    pool_size = pool_size or CHATGARMENT_HTTP_POOL_SIZE
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=pool_size,
+        pool_maxsize=pool_size,
+        # 풀이 가득 차도 대기하지 않고 임시 연결 사용 (요청이 막히지 않도록)
+        pool_block=False
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers.update({"Connection": "keep-alive"})
+    return session
+
+
 class ChatGarmentServiceClient:
     """ChatGarment 마이크로서비스 클라이언트"""
     
-    def __init__(self, service_url: Optional[str] = None):
+    def __init__(
+        self,
+        service_url: Optional[str] = None,
+        session: Optional[requests.Session] = None,
+        pool_size: Optional[int] = None
+    ):
+        """
+        Args:
+            service_url: 서비스 URL (None이면 CHATGARMENT_SERVICE_URL)
+            session: 공유할 Session (None이면 연결 풀 Session 생성)
+            pool_size: 연결 풀 크기 (None이면 CHATGARMENT_HTTP_POOL_SIZE, 기본 10)
+        """
         self.service_url = service_url or CHATGARMENT_SERVICE_URL
         self.base_url = f"{self.service_url}/api/v1"
+        self.session = session or create_pooled_session(pool_size)
+        self.breaker = CircuitBreaker(
+            failure_threshold=CHATGARMENT_BREAKER_THRESHOLD,
+            base_backoff=CHATGARMENT_BREAKER_BACKOFF,
+            name=self.service_url
+        )
+        self.health_monitor = ServiceHealthMonitor(
+            self.health_check,
+            interval=CHATGARMENT_HEALTH_INTERVAL,
+            breaker=self.breaker,
+            name=self.service_url
+        )
+    
+    def close(self):
+        """헬스 모니터와 연결 풀 정리"""
+        self.health_monitor.stop()
+        self.session.close()
     
     def health_check(self) -> bool:
-        """서비스 헬스 체크"""
+        """서비스 헬스 체크 (모델 준비 전이면 ready=false로 응답하므로 비정상으로 간주)"""
         try:
-            response = requests.get(f"{self.service_url}/health", timeout=3)
-            return response.status_code == 200
+            response = self.session.get(f"{self.service_url}/health", timeout=3)
+            if response.status_code != 200:
+                return False
+            return response.json().get("ready", True) is not False
         except:
             return False
     
+    def is_available(self) -> bool:
+        """
+        캐시된 헬스 상태와 서킷 브레이커로 요청 가능 여부 확인 (네트워크 왕복 없음)
+        
+        처음 호출될 때만 헬스 체크를 1회 동기 실행하고 이후에는 백그라운드 모니터가 갱신한다.
+        """
+        self.health_monitor.start()
+        if self.health_monitor.healthy is None:
+            self.health_monitor.check_now()
+        if self.health_monitor.healthy is False:
+            return False
+        return self.breaker.allow_request()
+    
+    def is_candidate(self) -> bool:
+        """라우팅 후보 여부 (캐시된 상태만 확인, 프로브 자리를 차지하지 않음)"""
+        self.health_monitor.start()
+        return self.health_monitor.healthy is not False and self.breaker.would_allow()
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """헬스 / 회로 상태 (모니터링용)"""
+        return {
+            "service_url": self.service_url,
+            "healthy": self.health_monitor.healthy,
+            "circuit": self.breaker.snapshot()
+        }
+    
+    def _record_response(self, response: requests.Response):
+        """응답 결과를 서킷 브레이커에 반영 (요청 자체의 오류는 서비스 장애로 보지 않음)"""
+        if response.status_code in UNAVAILABLE_STATUS_CODES:
+            self.breaker.record_failure()
+        else:
+            self.breaker.record_success()
+    
+    def _image_reference(self, image_path: str) -> Optional[Dict[str, str]]:
+        """
+        이미지를 다시 업로드하지 않고 참조로 전달할 수 있으면 폼 필드 반환
+        
+        1. 공유 볼륨 안의 파일이면 상대 경로(image_ref)
+        2. 아니면 SHA-256으로 서비스 blob 존재 여부를 확인(HEAD)하고, 없을 때만 PUT 후 image_hash
+        
+        Returns:
+            폼 필드 Dict, 참조 방식을 쓸 수 없으면 None (기존 multipart 업로드)
+        """
+        if CHATGARMENT_UPLOAD_MODE == "multipart":
+            return None
+        
+        if CHATGARMENT_SHARED_ROOT:
+            shared_root = Path(CHATGARMENT_SHARED_ROOT).resolve()
+            resolved = Path(image_path).resolve()
+            if shared_root in resolved.parents:
+                return {"image_ref": resolved.relative_to(shared_root).as_posix()}
+        
+        try:
+            sha256 = file_sha256(image_path)
+            blob_url = f"{self.base_url}/blobs/{sha256}"
+            response = self.session.head(blob_url, timeout=10)
+            if response.status_code == 404:
+                with open(image_path, "rb") as f:
+                    response = self.session.put(
+                        blob_url,
+                        data=f,
+                        headers={"Content-Type": "application/octet-stream"},
+                        timeout=60
+                    )
+                # blob 엔드포인트가 없는 이전 버전 서비스는 404/405 → multipart로 대체
+                if response.status_code not in (200, 201):
+                    return None
+                logger.info(f"[ChatGarmentServiceClient] 이미지 업로드: {sha256[:12]}")
+            elif response.status_code != 200:
+                return None
+            else:
+                logger.info(f"[ChatGarmentServiceClient] 서비스에 이미 있는 이미지: {sha256[:12]}")
+            return {"image_hash": sha256}
+        except requests.exceptions.RequestException as e:
+            logger.info(f"[ChatGarmentServiceClient] 해시 업로드 실패, multipart로 전송: {str(e)}")
+            return None
+    
+    def _post_image(self, endpoint: str, image_path: str, data: Dict[str, Any], timeout: float) -> requests.Response:
+        """이미지를 참조(image_ref / image_hash) 또는 multipart로 전달하여 POST"""
+        reference = self._image_reference(image_path)
+        if reference is not None:
+            return self.session.post(
+                f"{self.base_url}/{endpoint}",
+                data={**data, **reference},
+                timeout=timeout
+            )
+        with open(image_path, "rb") as f:
+            return self.session.post(
+                f"{self.base_url}/{endpoint}",
+                files={"image": f},
+                data=data,
+                timeout=timeout
+            )
+    
     def analyze_image(self, image_path: str, text: Optional[str] = None) -> Dict[str, Any]:
         """
         이미지 분석
@@ -46,38 +220,39 @@ class ChatGarmentServiceClient:
             분석 결과
         """
         try:
-            with open(image_path, "rb") as f:
-                files = {"image": f}
-                data = {}
-                if text:
-                    data["text"] = text
-                
-                response = requests.post(
-                    f"{self.base_url}/analyze",
-                    files=files,
-                    data=data,
-                    timeout=60
-                )
-                
-                if response.status_code == 200:
-                    return response.json()
-                else:
-                    return {
-                        "status": "error",
-                        "error": f"서비스 오류: {response.status_code}",
-                        "message": response.text
-                    }
+            data = {}
+            if text:
+                data["text"] = text
+            
+            response = self._post_image("analyze", image_path, data, timeout=60)
+            self._record_response(response)
+            
+            if response.status_code == 200:
+                return response.json()
+            else:
+                return {
+                    "status": "error",
+                    "error": f"서비스 오류: {response.status_code}",
+                    "message": response.text,
+                    "retryable": response.status_code in UNAVAILABLE_STATUS_CODES
+                }
         except requests.exceptions.Timeout:
+            self.breaker.record_failure()
             return {
                 "status": "error",
                 "error": "서비스 타임아웃",
                 "message": "ChatGarment 서비스 응답 시간 초과"
             }
         except Exception as e:
+            # 연결 실패는 요청이 서비스에 도달하지 않았으므로 다른 인스턴스로 재시도 가능
+            retryable = isinstance(e, requests.exceptions.ConnectionError)
+            if retryable:
+                self.breaker.record_failure()
             return {
                 "status": "error",
                 "error": str(e),
-                "message": "서비스 연결 오류"
+                "message": "서비스 연결 오류",
+                "retryable": retryable
             }
     
     def process_image(
@@ -98,42 +273,188 @@ class ChatGarmentServiceClient:
             전체 처리 결과
         """
         try:
-            with open(image_path, "rb") as f:
-                files = {"image": f}
-                data = {}
-                if text:
-                    data["text"] = text
-                if output_dir:
-                    data["output_dir"] = output_dir
-                
-                response = requests.post(
-                    f"{self.base_url}/process",
-                    files=files,
-                    data=data,
-                    timeout=300  # 5분 타임아웃 (3D 생성 시간 고려)
-                )
-                
-                if response.status_code == 200:
-                    return response.json()
-                else:
-                    return {
-                        "status": "error",
-                        "error": f"서비스 오류: {response.status_code}",
-                        "message": response.text
-                    }
+            data = {}
+            if text:
+                data["text"] = text
+            if output_dir:
+                data["output_dir"] = output_dir
+            
+            # 5분 타임아웃 (3D 생성 시간 고려)
+            response = self._post_image("process", image_path, data, timeout=300)
+            self._record_response(response)
+            
+            if response.status_code == 200:
+                return response.json()
+            else:
+                return {
+                    "status": "error",
+                    "error": f"서비스 오류: {response.status_code}",
+                    "message": response.text,
+                    "retryable": response.status_code in UNAVAILABLE_STATUS_CODES
+                }
         except requests.exceptions.Timeout:
+            self.breaker.record_failure()
             return {
                 "status": "error",
                 "error": "서비스 타임아웃",
                 "message": "ChatGarment 서비스 응답 시간 초과 (5분)"
             }
         except Exception as e:
+            # 연결 실패는 요청이 서비스에 도달하지 않았으므로 다른 인스턴스로 재시도 가능
+            retryable = isinstance(e, requests.exceptions.ConnectionError)
+            if retryable:
+                self.breaker.record_failure()
             return {
                 "status": "error",
                 "error": str(e),
-                "message": "서비스 연결 오류"
+                "message": "서비스 연결 오류",
+                "retryable": retryable
             }
 
+class ChatGarmentServicePool:
+    """
+    여러 ChatGarment 서비스 인스턴스 로드 밸런서
+    
+    - 라우팅: 사용 가능한 인스턴스 중 진행 중 요청 수가 가장 적은 곳 (least outstanding)
+    - 인스턴스별 헬스 모니터 / 서킷 브레이커 (ChatGarmentServiceClient가 소유)
+    - 연결 실패 / 502·503·504는 다른 인스턴스로 재시도 (타임아웃은 작업이 진행 중일 수 있어 재시도하지 않음)
+    
+    ChatGarmentServiceClient와 같은 메서드를 제공하므로 도구 코드는 둘을 구분하지 않는다.
+    """
+    
+    def __init__(self, service_urls: List[str], max_retries: Optional[int] = None):
+        """
+        Args:
+            service_urls: 서비스 URL 목록
+            max_retries: 다른 인스턴스로 재시도하는 최대 횟수 (None이면 CHATGARMENT_SERVICE_RETRIES)
+        """
+        if not service_urls:
+            raise ValueError("서비스 URL이 하나 이상 필요합니다.")
+        self.service_url = ",".join(service_urls)
+        self.max_retries = CHATGARMENT_SERVICE_RETRIES if max_retries is None else max_retries
+        # 모든 인스턴스가 하나의 연결 풀을 공유 (호스트별로 연결이 따로 유지됨)
+        session = create_pooled_session(CHATGARMENT_HTTP_POOL_SIZE * len(service_urls))
+        self.clients = [ChatGarmentServiceClient(service_url=url, session=session) for url in service_urls]
+        self._outstanding: Dict[str, int] = {url: 0 for url in service_urls}
+        self._next = 0
+        self._lock = threading.Lock()
+    
+    def close(self):
+        """헬스 모니터와 연결 풀 정리"""
+        for client in self.clients:
+            client.health_monitor.stop()
+        self.clients[0].session.close()
+    
+    def is_available(self) -> bool:
+        """요청을 받을 수 있는 인스턴스가 하나라도 있는지 확인"""
+        for client in self.clients:
+            client.health_monitor.start()
+            if client.health_monitor.healthy is None:
+                client.health_monitor.check_now()
+        return any(client.is_candidate() for client in self.clients)
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """인스턴스별 상태와 진행 중 요청 수"""
+        with self._lock:
+            outstanding = dict(self._outstanding)
+        return {
+            "backends": [
+                {**client.snapshot(), "outstanding": outstanding[client.service_url]}
+                for client in self.clients
+            ]
+        }
+    
+    def _acquire(self, exclude: List[str]) -> Optional[ChatGarmentServiceClient]:
+        """진행 중 요청이 가장 적은 사용 가능 인스턴스 선택 후 진행 수 증가"""
+        with self._lock:
+            # 동률이면 순환하며 선택되도록 시작 위치를 돌림
+            start = self._next
+            self._next = (self._next + 1) % len(self.clients)
+            ordered = self.clients[start:] + self.clients[:start]
+            ordered = sorted(
+                (client for client in ordered if client.service_url not in exclude),
+                key=lambda client: self._outstanding[client.service_url]
+            )
+        for client in ordered:
+            if client.is_candidate() and client.is_available():
+                with self._lock:
+                    self._outstanding[client.service_url] += 1
+                return client
+        return None
+    
+    def _release(self, client: ChatGarmentServiceClient):
+        with self._lock:
+            self._outstanding[client.service_url] -= 1
+    
+    def _call(self, method: str, *args) -> Dict[str, Any]:
+        """선택한 인스턴스에서 실행하고, 재시도 가능한 실패면 다른 인스턴스로 재시도"""
+        tried: List[str] = []
+        result: Dict[str, Any] = {}
+        for _ in range(1 + self.max_retries):
+            client = self._acquire(tried)
+            if client is None:
+                break
+            tried.append(client.service_url)
+            try:
+                result = getattr(client, method)(*args)
+            finally:
+                self._release(client)
+            if result.get("status") == "success" or not result.get("retryable"):
+                return {**result, "service_url": client.service_url}
+            logger.info(f"[ChatGarmentServicePool] {client.service_url} 실패, 다른 인스턴스로 재시도: {result.get('error')}")
+        
+        if result:
+            return {**result, "tried": tried}
+        return {
+            "status": "error",
+            "error": "사용 가능한 ChatGarment 서비스 인스턴스가 없습니다",
+            "message": f"서비스 URL: {self.service_url}",
+            "tried": tried
+        }
+    
+    def analyze_image(self, image_path: str, text: Optional[str] = None) -> Dict[str, Any]:
+        """이미지 분석 (인스턴스 선택 + 재시도)"""
+        return self._call("analyze_image", image_path, text)
+    
+    def process_image(
+        self,
+        image_path: str,
+        text: Optional[str] = None,
+        output_dir: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """전체 파이프라인 실행 (인스턴스 선택 + 재시도)"""
+        return self._call("process_image", image_path, text, output_dir)
+
+
+ServiceClient = Union[ChatGarmentServiceClient, ChatGarmentServicePool]
+
+_service_clients: Dict[str, ServiceClient] = {}
+_service_clients_lock = threading.Lock()
+
+
+def get_service_client(service_url: Optional[str] = None) -> ServiceClient:
+    """
+    공용 서비스 클라이언트 (연결 풀을 호출 간에 재사용)
+    
+    Args:
+        service_url: 서비스 URL, 쉼표로 여러 개를 주면 로드 밸런싱 풀
+            (None이면 CHATGARMENT_SERVICE_URLS, 없으면 CHATGARMENT_SERVICE_URL)
+    """
+    if service_url is None:
+        service_url = ",".join(CHATGARMENT_SERVICE_URLS) or CHATGARMENT_SERVICE_URL
+    client = _service_clients.get(service_url)
+    if client is None:
+        with _service_clients_lock:
+            client = _service_clients.get(service_url)
+            if client is None:
+                urls = [url.strip() for url in service_url.split(",") if url.strip()]
+                if len(urls) > 1:
+                    client = ChatGarmentServicePool(urls)
+                else:
+                    client = ChatGarmentServiceClient(service_url=urls[0])
+                _service_clients[service_url] = client
+    return client
+
 def chatgarment_service_tool(action: str, parameters: Dict[str, Any], context: Dict[str, Any]) -> Dict[str, Any]:
     """
     ChatGarment 마이크로서비스 도구
@@ -146,25 +467,20 @@ def chatgarment_service_tool(action: str, parameters: Dict[str, Any], context: D
     Returns:
         실행 결과
     """
-    # 환경 변수 확인
-    service_url = os.getenv("CHATGARMENT_SERVICE_URL", "http://localhost:9000")
+    # 환경 변수 확인 (CHATGARMENT_SERVICE_URLS가 있으면 여러 인스턴스로 분산)
+    service_urls = os.getenv("CHATGARMENT_SERVICE_URLS")
+    service_url = service_urls or os.getenv("CHATGARMENT_SERVICE_URL", "http://localhost:9000")
     logger.info(f"[ChatGarmentServiceTool] 서비스 URL: {service_url}")
     
-    client = ChatGarmentServiceClient(service_url=service_url)
+    client = get_service_client(service_url)
     
-    # 서비스 헬스 체크
-    logger.info(f"[ChatGarmentServiceTool] 헬스 체크 시작: {service_url}/health")
-    if not client.health_check():
-        logger.error(f"[ChatGarmentServiceTool] 헬스 체크 실패")
+    if action not in ("analyze", "process"):
+        logger.error(f"[ChatGarmentServiceTool] 지원하지 않는 액션: {action}")
         return {
             "status": "error",
-            "error": "ChatGarment 서비스에 연결할 수 없습니다",
-            "message": f"서비스 URL: {client.service_url}",
-            "suggestion": "리눅스 서버에서 ChatGarment 서비스가 실행 중인지 확인하세요."
+            "error": f"지원하지 않는 액션: {action}"
         }
     
-    logger.info(f"[ChatGarmentServiceTool] 헬스 체크 성공")
-    
     image_path = parameters.get("image_path") or context.get("image_path")
     logger.info(f"[ChatGarmentServiceTool] 이미지 경로: {image_path}")
     if not image_path:
@@ -181,6 +497,17 @@ def chatgarment_service_tool(action: str, parameters: Dict[str, Any], context: D
             "error": f"이미지 파일을 찾을 수 없습니다: {image_path}"
         }
     
+    # 캐시된 헬스 상태 / 서킷 브레이커 확인 (요청마다 헬스 체크를 보내지 않음)
+    if not client.is_available():
+        logger.error(f"[ChatGarmentServiceTool] 서비스 사용 불가: {client.snapshot()}")
+        return {
+            "status": "error",
+            "error": "ChatGarment 서비스에 연결할 수 없습니다",
+            "message": f"서비스 URL: {client.service_url}",
+            "service_state": client.snapshot(),
+            "suggestion": "리눅스 서버에서 ChatGarment 서비스가 실행 중인지 확인하세요."
+        }
+    
     text = parameters.get("text_description") or context.get("text")
     logger.info(f"[ChatGarmentServiceTool] 액션: {action}, 텍스트: {text}")
     
@@ -190,16 +517,9 @@ def chatgarment_service_tool(action: str, parameters: Dict[str, Any], context: D
         logger.info(f"[ChatGarmentServiceTool] 이미지 분석 결과: status={result.get('status')}")
         return result
     
-    elif action == "process":
+    else:
         output_dir = parameters.get("output_dir") or context.get("output_dir")
         logger.info(f"[ChatGarmentServiceTool] 전체 파이프라인 처리 시작...")
         result = client.process_image(image_path, text, output_dir)
         logger.info(f"[ChatGarmentServiceTool] 전체 파이프라인 처리 결과: status={result.get('status')}")
         return result
-    
-    else:
-        logger.error(f"[ChatGarmentServiceTool] 지원하지 않는 액션: {action}")
-        return {
-            "status": "error",
-            "error": f"지원하지 않는 액션: {action}"
-        }
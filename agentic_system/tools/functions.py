@@ -6,6 +6,8 @@ PoC 단계에서는 Mock 구현
 
 from typing import Dict, Any, List, Optional
 
+from .registry import tool_registry
+
 
 class ProductSearchFunction:
     """
@@ -158,9 +160,13 @@ class ProductSearchFunction:
         }
 
 
+# 프로세스 수명 인스턴스로 등록 (상품 데이터베이스는 한 번만 초기화)
+tool_registry.register("function_product_search", ProductSearchFunction)
+
+
 # 도구 함수로 사용하기 위한 래퍼
 def product_search_function_tool(action: str, parameters: Dict[str, Any], context: Dict[str, Any]) -> Dict[str, Any]:
-    """도구 함수 래퍼"""
-    tool = ProductSearchFunction()
-    return tool.execute(action, parameters, context)
+    """도구 함수 래퍼 (레지스트리의 인스턴스 재사용)"""
+    with tool_registry.instance("function_product_search") as tool:
+        return tool.execute(action, parameters, context)
 
@@ -0,0 +1,239 @@
+"""
+GarmentCode Runner - 격리된 프로세스에서 GarmentCode 파서 실행
+
+GarmentCode 파서(run_garmentcode_parser_float50)는 ChatGarment 디렉토리 기준의
+상대 경로와 UTF-8 기본 인코딩을 가정한다. 이를 위해 프로세스 전역으로
+os.chdir / builtins.open 패치를 하는 대신, 파서만 별도 프로세스에서
+cwd=ChatGarment, PYTHONUTF8=1 환경으로 실행한다.
+
+API 서버 프로세스의 작업 디렉토리와 open()은 변경되지 않으므로
+ChatGarment 추론을 다른 스레드와 함께 안전하게 실행할 수 있다.
+
+파서 프로세스는 첫 요청 때 한 번 띄워 재사용한다 (torch / llava 임포트 비용을 요청마다 내지 않음).
+- 프로토콜: stdin / stdout으로 한 줄에 JSON 하나 (요청 1개 -> 응답 1개, 한 번에 한 요청)
+- 파서의 print 출력은 stderr로 보내 응답 줄과 섞이지 않게 함
+- 프로세스가 종료되었거나 시간 초과로 종료시킨 경우 다음 요청 때 다시 시작
+
+이 파일은 스크립트로도 실행되므로 최상위에서는 표준 라이브러리만 임포트한다.
+"""
+
+from typing import Dict, List, Optional, Any
+from pathlib import Path
+import atexit
+import json
+import os
+import queue
+import subprocess
+import sys
+import threading
+import traceback
+
+project_root = Path(__file__).parent.parent.parent
+chatgarment_path = project_root / "ChatGarment"
+garmentcode_path = project_root / "GarmentCodeRC"
+
+
+def isolated_env() -> Dict[str, str]:
+    """ChatGarment 하위 프로세스용 환경 변수 (UTF-8 모드 + 모듈 검색 경로)"""
+    env = dict(os.environ)
+    env["PYTHONUTF8"] = "1"
+    env["PYTHONIOENCODING"] = "utf-8"
+    python_path = [str(chatgarment_path), str(garmentcode_path), str(project_root)]
+    if env.get("PYTHONPATH"):
+        python_path.append(env["PYTHONPATH"])
+    env["PYTHONPATH"] = os.pathsep.join(python_path)
+    return env
+
+
+class GarmentCodeParserWorker:
+    """
+    GarmentCode 파서 장기 실행 프로세스
+
+    요청은 lock으로 직렬화하여 한 번에 하나씩 처리한다.
+    """
+
+    def __init__(self):
+        self._process: Optional[subprocess.Popen] = None
+        self._responses: "queue.Queue[Optional[str]]" = queue.Queue()
+        self._lock = threading.Lock()
+
+    @property
+    def pid(self) -> Optional[int]:
+        """실행 중인 파서 프로세스 PID (없으면 None)"""
+        process = self._process
+        return process.pid if process is not None and process.poll() is None else None
+
+    def request(self, payload: Dict[str, Any], timeout: Optional[float] = None) -> Dict[str, Any]:
+        """
+        파서 프로세스에 요청 1개를 보내고 응답을 기다림
+
+        Args:
+            payload: {"op": "parse" | "ping", ...}
+            timeout: 최대 대기 시간 (초과 시 프로세스를 종료하고 TimeoutError)
+
+        Returns:
+            Dict: 응답 ({"status": "success", ...} 또는 {"status": "error", "error": ...})
+        """
+        line = json.dumps(payload) + "\n"
+        with self._lock:
+            if self._process is None or self._process.poll() is not None:
+                self._start_locked()
+            try:
+                self._process.stdin.write(line)
+                self._process.stdin.flush()
+                response = self._responses.get(timeout=timeout)
+            except queue.Empty:
+                self._stop_locked(kill=True)
+                raise TimeoutError(f"GarmentCode 파서가 {timeout}초 안에 응답하지 않았습니다")
+            except OSError as e:
+                response = None
+                print(f"[GarmentCodeRunner] 파서 프로세스에 요청 전달 실패: {str(e)}")
+            if response is None:
+                returncode = self._process.poll()
+                self._stop_locked()
+                raise RuntimeError(f"GarmentCode 파서 프로세스가 종료되었습니다 (종료 코드: {returncode})")
+        return json.loads(response)
+
+    def stop(self):
+        """파서 프로세스 종료"""
+        with self._lock:
+            self._stop_locked()
+
+    def _start_locked(self):
+        """파서 프로세스 시작 (lock 보유 상태에서 호출)"""
+        self._stop_locked()
+        self._process = subprocess.Popen(
+            [sys.executable, str(Path(__file__).resolve())],
+            cwd=str(chatgarment_path if chatgarment_path.exists() else project_root),
+            env=isolated_env(),
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            text=True,
+            encoding="utf-8",
+            errors="replace"
+        )
+        # 응답 줄은 별도 스레드에서 읽어 시간 제한을 둘 수 있게 함 (EOF는 None)
+        self._responses = queue.Queue()
+        threading.Thread(
+            target=self._read_responses,
+            args=(self._process.stdout, self._responses),
+            name="garmentcode-parser-reader",
+            daemon=True
+        ).start()
+        print(f"[GarmentCodeRunner] 파서 프로세스 시작: pid={self._process.pid}")
+
+    def _stop_locked(self, kill: bool = False):
+        """파서 프로세스 종료 (stdin을 닫으면 스스로 종료, kill이면 즉시 종료)"""
+        process, self._process = self._process, None
+        if process is None:
+            return
+        if kill:
+            process.kill()
+        try:
+            process.stdin.close()
+        except OSError:
+            pass
+        try:
+            process.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+
+    @staticmethod
+    def _read_responses(stream, responses: "queue.Queue[Optional[str]]"):
+        for line in stream:
+            responses.put(line)
+        responses.put(None)
+
+
+_parser_worker = GarmentCodeParserWorker()
+atexit.register(_parser_worker.stop)
+
+
+def get_parser_worker() -> GarmentCodeParserWorker:
+    """프로세스 공용 GarmentCode 파서 워커"""
+    return _parser_worker
+
+
+def run_garmentcode_parser_isolated(
+    json_output: Any,
+    float_preds: Any,
+    saved_dir: str,
+    timeout: float = 600
+) -> List[str]:
+    """
+    GarmentCode 파서를 별도 프로세스에서 실행
+
+    Args:
+        json_output: ChatGarment가 생성한 패턴 JSON (repair_json 결과)
+        float_preds: float 예측값 (tensor 또는 list, 없으면 None)
+        saved_dir: 패턴 출력 디렉토리
+        timeout: 최대 실행 시간 (초)
+
+    Returns:
+        List[str]: 생성된 JSON specification 파일 경로 목록
+    """
+    saved_dir = os.path.abspath(saved_dir)
+    os.makedirs(saved_dir, exist_ok=True)
+
+    if float_preds is not None and hasattr(float_preds, "detach"):
+        float_preds = float_preds.detach().float().cpu().numpy().tolist()
+
+    response = _parser_worker.request({
+        "op": "parse",
+        "json_output": json_output,
+        "float_preds": float_preds,
+        "saved_dir": saved_dir
+    }, timeout=timeout)
+    if response.get("status") != "success":
+        raise RuntimeError(f"GarmentCode 파서 실패: {response.get('error')}\n{response.get('traceback', '')[-1000:]}")
+    return response.get("json_spec_files", [])
+
+
+def _parse(request: Dict[str, Any]) -> List[str]:
+    """파서 실행 (파서 프로세스 안에서 호출, 임포트는 첫 요청 이후 재사용)"""
+    import torch
+    from llava.garment_utils_v2 import run_garmentcode_parser_float50
+
+    float_preds: Optional[Any] = request.get("float_preds")
+    if float_preds is not None:
+        float_preds = torch.tensor(float_preds, dtype=torch.float32)
+
+    json_spec_files = run_garmentcode_parser_float50(
+        [],
+        request["json_output"],
+        float_preds,
+        request["saved_dir"]
+    )
+    return [str(p) for p in (json_spec_files or [])]
+
+
+def _serve():
+    """파서 프로세스 진입점: stdin의 요청을 한 줄씩 처리하고 stdout으로 응답"""
+    # 응답 전용 stdout 복제본을 만든 뒤, 파서의 print 출력은 stderr로 보냄
+    responses = os.fdopen(os.dup(sys.stdout.fileno()), "w", encoding="utf-8")
+    sys.stdout.flush()
+    os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        try:
+            request = json.loads(line)
+            if request.get("op") == "ping":
+                response = {
+                    "status": "success",
+                    "pid": os.getpid(),
+                    "cwd": os.getcwd(),
+                    "utf8_mode": sys.flags.utf8_mode
+                }
+            else:
+                response = {"status": "success", "json_spec_files": _parse(request)}
+        except Exception as e:
+            response = {"status": "error", "error": str(e), "traceback": traceback.format_exc()}
+        responses.write(json.dumps(response) + "\n")
+        responses.flush()
+
+
+if __name__ == "__main__":
+    _serve()
@@ -0,0 +1,163 @@
+"""
+Prefix KV Cache - 고정 프롬프트 접두사의 past_key_values 재사용
+
+ChatGarment의 모든 프롬프트는 같은 대화 템플릿 시스템 프롬프트("A chat between ... USER: ")로
+시작하고, 그 뒤에 이미지 특징과 요청별 텍스트가 온다. 인과(causal) 어텐션에서 접두사 위치의
+KV와 hidden state는 뒤에 오는 토큰과 무관하므로, 접두사만 한 번 미리 계산해 두고
+prefill 때마다 재사용할 수 있다.
+
+model.evaluate(→ generate)는 캐시 인자를 받지 않으므로 언어 모델(LlamaModel)의 forward를
+래퍼로 교체한다.
+- prefill 호출이고 inputs_embeds 앞부분이 접두사 임베딩과 같으면, 접두사 KV를 past_key_values로
+  넘기고 나머지 위치만 계산
+- 반환 시 접두사 위치의 hidden state를 앞에 붙여 원래 호출과 같은 형태로 돌려줌
+- 조건이 맞지 않는 호출(디코딩 단계, 다른 접두사, 앞쪽 패딩, output_attentions 등)은 그대로 실행
+"""
+
+from typing import Optional, Any, Tuple
+import torch
+
+# transformers 4.36+는 Cache 객체로 past_key_values를 다룸 (이전 버전은 층별 튜플)
+try:
+    from transformers.cache_utils import DynamicCache
+except ImportError:
+    DynamicCache = None
+
+
+class PrefixKVCache:
+    """
+    언어 모델 forward에 연결하는 접두사 KV 캐시
+
+    캐시된 텐서는 읽기 전용으로만 사용하므로 여러 스레드에서 동시에 호출해도 된다.
+    """
+
+    def __init__(self, language_model: torch.nn.Module):
+        """
+        Args:
+            language_model: 디코더 본체 (LLaVA의 model.get_model(), LlamaModel 계열)
+        """
+        self.language_model = language_model
+        self.hits = 0
+        # (접두사 길이, 임베딩 [1, P, H], 층별 (key, value), 마지막 hidden state, 층별 hidden states)
+        self._prefix: Optional[Tuple[int, torch.Tensor, tuple, torch.Tensor, tuple]] = None
+        self._forward = None
+
+    @property
+    def prefix_length(self) -> int:
+        return self._prefix[0] if self._prefix is not None else 0
+
+    def build(self, prefix_ids: torch.Tensor):
+        """
+        접두사 토큰의 KV / hidden state 계산
+
+        Args:
+            prefix_ids: 접두사 토큰 [P] (이미지 토큰 앞까지)
+        """
+        forward = self._forward or self.language_model.forward
+        embed_tokens = self.language_model.get_input_embeddings()
+        with torch.no_grad():
+            embeds = embed_tokens(prefix_ids.reshape(1, -1).to(embed_tokens.weight.device))
+            outputs = forward(
+                inputs_embeds=embeds,
+                use_cache=True,
+                output_hidden_states=True,
+                return_dict=True
+            )
+        past = outputs.past_key_values
+        if hasattr(past, "to_legacy_cache"):
+            past = past.to_legacy_cache()
+        past = tuple((layer[0], layer[1]) for layer in past)
+        self._prefix = (
+            embeds.shape[1],
+            embeds,
+            past,
+            outputs.last_hidden_state,
+            tuple(outputs.hidden_states)
+        )
+        print(f"[PrefixKVCache] 접두사 KV 계산 완료: {embeds.shape[1]} 토큰, {len(past)} 층")
+
+    def install(self):
+        """language_model.forward를 캐시 래퍼로 교체"""
+        if self._forward is not None:
+            return
+        self._forward = self.language_model.forward
+
+        def forward_with_prefix(*args, **kwargs):
+            if args or not self._applicable(kwargs):
+                return self._forward(*args, **kwargs)
+            return self._forward_from_prefix(kwargs)
+
+        self.language_model.forward = forward_with_prefix
+
+    def uninstall(self):
+        """원래 forward 복원"""
+        if self._forward is not None:
+            self.language_model.forward = self._forward
+            self._forward = None
+
+    def _applicable(self, kwargs: dict) -> bool:
+        """접두사 KV를 사용할 수 있는 prefill 호출인지 확인"""
+        if self._prefix is None:
+            return False
+        length, embeds = self._prefix[0], self._prefix[1]
+        inputs_embeds = kwargs.get("inputs_embeds")
+        if (
+            not isinstance(inputs_embeds, torch.Tensor)
+            or kwargs.get("input_ids") is not None
+            or kwargs.get("output_attentions")
+            or kwargs.get("use_cache") is False
+            or inputs_embeds.shape[1] <= length
+            or inputs_embeds.dtype != embeds.dtype
+        ):
+            return False
+        past = kwargs.get("past_key_values")
+        if past is not None:
+            seen = past.get_seq_length() if hasattr(past, "get_seq_length") else len(past)
+            if seen:
+                return False
+        attention_mask = kwargs.get("attention_mask")
+        if attention_mask is not None and not bool(attention_mask[:, :length].all()):
+            return False
+        return torch.equal(inputs_embeds[:, :length], embeds.expand(inputs_embeds.shape[0], -1, -1))
+
+    def _forward_from_prefix(self, kwargs: dict) -> Any:
+        """접두사 KV를 past_key_values로 넘기고 나머지 위치만 계산"""
+        length, _, past, last_hidden_state, hidden_states = self._prefix
+        batch_size = kwargs["inputs_embeds"].shape[0]
+
+        prefix_past = tuple(
+            (key.expand(batch_size, -1, -1, -1), value.expand(batch_size, -1, -1, -1))
+            for key, value in past
+        )
+        original_past = kwargs.get("past_key_values")
+        cache_type = DynamicCache
+        if original_past is not None and hasattr(type(original_past), "from_legacy_cache"):
+            cache_type = type(original_past)
+        if cache_type is not None:
+            prefix_past = cache_type.from_legacy_cache(prefix_past)
+
+        return_dict = kwargs.get("return_dict")
+        kwargs = dict(kwargs)
+        kwargs["inputs_embeds"] = kwargs["inputs_embeds"][:, length:]
+        kwargs["past_key_values"] = prefix_past
+        kwargs["use_cache"] = True
+        kwargs["return_dict"] = True
+        # attention_mask는 과거(접두사) 위치를 포함한 전체 길이 그대로 사용
+        for key in ("position_ids", "cache_position"):
+            if kwargs.get(key) is not None:
+                kwargs[key] = kwargs[key][..., length:]
+
+        outputs = self._forward(**kwargs)
+        self.hits += 1
+
+        def with_prefix(prefix: torch.Tensor, rest: torch.Tensor) -> torch.Tensor:
+            return torch.cat([prefix.expand(batch_size, -1, -1).to(rest.dtype), rest], dim=1)
+
+        outputs["last_hidden_state"] = with_prefix(last_hidden_state, outputs.last_hidden_state)
+        if outputs.hidden_states is not None:
+            outputs["hidden_states"] = tuple(
+                with_prefix(prefix, rest) for prefix, rest in zip(hidden_states, outputs.hidden_states)
+            )
+        if return_dict is False:
+            return outputs.to_tuple()
+        return outputs
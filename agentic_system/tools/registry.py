@@ -0,0 +1,165 @@
+"""
+Tool Registry - 도구 인스턴스 관리
+
+도구 래퍼 함수가 호출마다 도구 객체(및 내부 모델)를 새로 만드는 대신,
+프로세스 수명 동안 인스턴스를 재사용하도록 관리한다.
+
+- pool_size = 0: 프로세스 전역 싱글톤 (여러 스레드가 공유하므로 도구가 내부에서 추론을 직렬화해야 함)
+- pool_size > 0: 고정 크기 인스턴스 풀 (호출 동안 인스턴스를 독점 사용)
+
+도구 클래스가 warmup() / shutdown() 메서드를 제공하면
+레지스트리의 warmup() / shutdown()에서 호출된다.
+"""
+
+from typing import Dict, List, Optional, Any, Callable
+from contextlib import contextmanager
+import os
+import queue
+import threading
+
+
+class _ToolSpec:
+    """등록된 도구의 생성 정보와 인스턴스 보관"""
+
+    def __init__(self, name: str, factory: Callable[[], Any], pool_size: int):
+        self.name = name
+        self.factory = factory
+        self.pool_size = pool_size
+        self.instances: List[Any] = []
+        self.idle: "queue.Queue[Any]" = queue.Queue()
+        self.lock = threading.Lock()
+
+
+class ToolRegistry:
+    """
+    Tool Registry
+
+    도구 이름별 팩토리를 등록하고, 싱글톤 또는 인스턴스 풀로 도구 객체를 제공
+    """
+
+    def __init__(self):
+        self._specs: Dict[str, _ToolSpec] = {}
+        self._lock = threading.Lock()
+
+    def register(
+        self,
+        name: str,
+        factory: Callable[[], Any],
+        pool_size: Optional[int] = None
+    ):
+        """
+        도구 팩토리 등록
+
+        Args:
+            name: 도구 이름
+            factory: 인자 없이 도구 인스턴스를 생성하는 callable
+            pool_size: 인스턴스 풀 크기 (None이면 환경 변수 {NAME}_POOL_SIZE, 기본 0 = 싱글톤)
+        """
+        if pool_size is None:
+            pool_size = int(os.getenv(f"{name.upper()}_POOL_SIZE", "0"))
+        with self._lock:
+            self._specs[name] = _ToolSpec(name, factory, max(0, pool_size))
+
+    def is_registered(self, name: str) -> bool:
+        """도구 등록 여부"""
+        return name in self._specs
+
+    @contextmanager
+    def instance(self, name: str):
+        """
+        도구 인스턴스 획득 (컨텍스트 매니저)
+
+        싱글톤 모드에서는 공유 인스턴스를, 풀 모드에서는 유휴 인스턴스를
+        독점적으로 빌려주고 블록이 끝나면 반환한다.
+        """
+        spec = self._get_spec(name)
+        if spec.pool_size == 0:
+            yield self._get_singleton(spec)
+            return
+
+        tool = self._acquire(spec)
+        try:
+            yield tool
+        finally:
+            spec.idle.put(tool)
+
+    def warmup(self, names: Optional[List[str]] = None):
+        """
+        도구 인스턴스를 미리 생성하고 warmup() 훅 호출
+
+        Args:
+            names: 대상 도구 이름 목록 (None이면 전체)
+        """
+        for name in names or list(self._specs.keys()):
+            spec = self._get_spec(name)
+            if spec.pool_size == 0:
+                tools = [self._get_singleton(spec)]
+            else:
+                tools = self._fill_pool(spec)
+            for tool in tools:
+                hook = getattr(tool, "warmup", None)
+                if callable(hook):
+                    try:
+                        print(f"[ToolRegistry] warmup: {name}")
+                        hook()
+                    except Exception as e:
+                        print(f"[ToolRegistry] warmup 실패: {name} - {str(e)}")
+
+    def shutdown(self):
+        """생성된 모든 인스턴스의 shutdown() 훅 호출 후 정리"""
+        for spec in list(self._specs.values()):
+            with spec.lock:
+                tools = list(spec.instances)
+                spec.instances.clear()
+                spec.idle = queue.Queue()
+            for tool in tools:
+                hook = getattr(tool, "shutdown", None)
+                if callable(hook):
+                    try:
+                        hook()
+                    except Exception as e:
+                        print(f"[ToolRegistry] shutdown 실패: {spec.name} - {str(e)}")
+        print("[ToolRegistry] 모든 도구 인스턴스 정리 완료")
+
+    def _get_spec(self, name: str) -> _ToolSpec:
+        spec = self._specs.get(name)
+        if spec is None:
+            raise KeyError(f"등록되지 않은 도구입니다: {name}")
+        return spec
+
+    def _create(self, spec: _ToolSpec) -> Any:
+        """새 인스턴스 생성 (spec.lock 보유 상태에서 호출)"""
+        print(f"[ToolRegistry] 도구 인스턴스 생성: {spec.name} ({len(spec.instances) + 1}번째)")
+        tool = spec.factory()
+        spec.instances.append(tool)
+        return tool
+
+    def _get_singleton(self, spec: _ToolSpec) -> Any:
+        if spec.instances:
+            return spec.instances[0]
+        with spec.lock:
+            if not spec.instances:
+                self._create(spec)
+            return spec.instances[0]
+
+    def _acquire(self, spec: _ToolSpec) -> Any:
+        """풀에서 유휴 인스턴스를 꺼내거나, 여유가 있으면 새로 생성"""
+        try:
+            return spec.idle.get_nowait()
+        except queue.Empty:
+            pass
+        with spec.lock:
+            if len(spec.instances) < spec.pool_size:
+                return self._create(spec)
+        return spec.idle.get()
+
+    def _fill_pool(self, spec: _ToolSpec) -> List[Any]:
+        """풀을 최대 크기까지 채우고 전체 인스턴스 반환"""
+        with spec.lock:
+            while len(spec.instances) < spec.pool_size:
+                spec.idle.put(self._create(spec))
+            return list(spec.instances)
+
+
+# 프로세스 전역 레지스트리
+tool_registry = ToolRegistry()
@@ -0,0 +1,302 @@
+"""
+Result Cache - 2D→3D 파이프라인 결과 캐시
+
+같은 상품 이미지가 반복해서 들어올 때 ChatGarment 추론, GarmentCode 파서,
+시뮬레이션을 다시 실행하지 않도록 결과를 디스크에 저장한다.
+
+- 키: 이미지 바이트 SHA-256 + 텍스트 프롬프트 + 모델 버전 (+ 네임스페이스)
+- 저장: 항목당 JSON 파일 1개 (분석 JSON, float_preds, spec JSON 경로, 메시 경로 등)
+- 산출물: 저장 시 결과 디렉토리를 캐시 전용 디렉토리(<cache_dir>/artifacts/<key>/)로 복사하고,
+  적중 시 호출자의 출력 디렉토리로 다시 복사하여 경로를 바꿔 반환
+  (작업 공간 정리나 다른 요청의 출력 디렉토리에 영향을 받지 않음)
+- 정리: 최대 항목 수 / 최대 용량 초과 시 가장 오래 사용되지 않은 항목부터 삭제 (LRU)
+"""
+
+from typing import Dict, Optional, Any
+from pathlib import Path
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+
+from .workspace import atomic_write_json
+
+project_root = Path(__file__).parent.parent.parent
+
+# 캐시 적중 시 존재 여부를 확인하는 산출물 경로 키
+ARTIFACT_PATH_KEYS = ("json_spec_path", "mesh_path", "pattern_path")
+# 산출물이 들어 있는 결과 디렉토리 키
+ARTIFACT_DIR_KEY = "output_dir"
+
+
+def file_sha256(path: str, chunk_size: int = 1024 * 1024) -> str:
+    """파일 내용의 SHA-256 (청크 단위로 읽음)"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def model_version_of(*paths: Optional[str]) -> str:
+    """
+    모델/체크포인트 경로로부터 버전 문자열 생성
+
+    파일은 크기와 수정 시각을 포함하므로 체크포인트가 교체되면 버전이 바뀐다.
+    """
+    parts = []
+    for path in paths:
+        if not path:
+            continue
+        try:
+            stat = os.stat(path)
+            parts.append(f"{os.path.basename(os.path.normpath(path))}:{stat.st_size}:{int(stat.st_mtime)}")
+        except OSError:
+            parts.append(f"{os.path.basename(os.path.normpath(path))}:missing")
+    return "|".join(parts)
+
+
+def _link_or_copy(src: str, dst: str):
+    """하드 링크를 시도하고, 다른 파일 시스템 등으로 실패하면 복사"""
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
+
+
+def _tree_size(path: Path) -> int:
+    """디렉토리 아래 파일 크기 합계"""
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.path.getsize(os.path.join(root, name))
+            except OSError:
+                pass
+    return total
+
+
+def relocate_artifacts(value: Dict[str, Any], target_dir: str) -> Dict[str, Any]:
+    """
+    결과의 산출물 디렉토리를 target_dir로 복사하고 경로를 바꾼 결과 반환
+
+    파일은 가능하면 하드 링크로 연결하므로 원본이 삭제되어도 남는다.
+    산출물 디렉토리 밖을 가리키는 경로는 그대로 둔다.
+
+    Args:
+        value: output_dir / ARTIFACT_PATH_KEYS 경로를 포함한 결과
+        target_dir: 새 산출물 디렉토리 (이미 있으면 내용을 덮어씀)
+    """
+    source_dir = value.get(ARTIFACT_DIR_KEY)
+    if not isinstance(source_dir, str) or not os.path.isdir(source_dir):
+        return dict(value)
+    source_dir = os.path.abspath(source_dir)
+    target_dir = os.path.abspath(target_dir)
+    shutil.copytree(source_dir, target_dir, copy_function=_link_or_copy, dirs_exist_ok=True)
+
+    relocated = dict(value)
+    relocated[ARTIFACT_DIR_KEY] = target_dir
+    for path_key in ARTIFACT_PATH_KEYS:
+        artifact = value.get(path_key)
+        if not isinstance(artifact, str):
+            continue
+        relative = os.path.relpath(os.path.abspath(artifact), source_dir)
+        if not relative.startswith(os.pardir):
+            relocated[path_key] = os.path.join(target_dir, relative)
+    return relocated
+
+
+class ResultCache:
+    """
+    디스크 기반 내용 주소(content-addressed) 결과 캐시
+
+    항목 파일의 수정 시각을 마지막 사용 시각으로 사용하여 LRU 정리를 수행한다.
+    산출물 디렉토리가 있는 결과는 캐시 전용 디렉토리에 복사해 두며,
+    용량 계산과 정리에 항목 파일과 함께 포함한다.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Optional[str] = None,
+        max_entries: int = 1000,
+        max_bytes: int = 512 * 1024 * 1024
+    ):
+        self.cache_dir = Path(cache_dir or project_root / "cache" / "results")
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        # key -> (크기, 마지막 사용 시각)
+        self._index: Dict[str, tuple] = {}
+        self._load_index()
+
+    @staticmethod
+    def make_key(
+        image_path: str,
+        prompt: Optional[str] = None,
+        model_version: str = "",
+        namespace: str = "default",
+        image_hash: Optional[str] = None
+    ) -> str:
+        """
+        캐시 키 생성
+
+        Args:
+            image_path: 입력 이미지 경로
+            prompt: 텍스트 프롬프트 (없으면 빈 문자열)
+            model_version: 모델 버전 문자열 (model_version_of 참고)
+            namespace: 결과 종류 구분 (예: "analysis", "garment")
+            image_hash: 이미 계산된 이미지 SHA-256 (있으면 파일을 다시 읽지 않음)
+        """
+        image_hash = image_hash or file_sha256(image_path)
+        material = json.dumps(
+            [namespace, image_hash, prompt or "", model_version],
+            ensure_ascii=False
+        )
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """캐시 조회 (없거나 산출물이 사라졌으면 None)"""
+        entry_path = self._entry_path(key)
+        try:
+            with open(entry_path, "r", encoding="utf-8") as f:
+                value = json.load(f)["value"]
+        except (OSError, ValueError, KeyError):
+            with self._lock:
+                self._index.pop(key, None)
+            return None
+
+        # 산출물이 정리(GC)되었으면 무효화
+        for path_key in ARTIFACT_PATH_KEYS:
+            artifact = value.get(path_key) if isinstance(value, dict) else None
+            if isinstance(artifact, str) and not os.path.exists(artifact):
+                print(f"[ResultCache] 산출물 누락으로 캐시 무효화: {path_key}={artifact}")
+                self.invalidate(key)
+                return None
+
+        now = time.time()
+        try:
+            os.utime(entry_path, (now, now))
+        except OSError:
+            pass
+        with self._lock:
+            if key in self._index:
+                self._index[key] = (self._index[key][0], now)
+        return value
+
+    def get_into(self, key: str, output_dir: str) -> Optional[Dict[str, Any]]:
+        """
+        캐시 조회 후 산출물을 호출자의 출력 디렉토리로 복사
+
+        Args:
+            key: 캐시 키
+            output_dir: 산출물을 둘 디렉토리 (반환 결과의 output_dir)
+
+        Returns:
+            Optional[Dict]: 경로가 output_dir 기준으로 바뀐 결과 (없으면 None)
+        """
+        value = self.get(key)
+        if value is None:
+            return None
+        try:
+            return relocate_artifacts(value, output_dir)
+        except OSError as e:
+            # 복사 도중 정리(evict)된 경우 등은 캐시 미스로 처리
+            print(f"[ResultCache] 산출물 복사 실패: {str(e)}")
+            return None
+
+    def put(self, key: str, value: Dict[str, Any]):
+        """
+        캐시 저장 (임시 파일에 쓴 뒤 원자적으로 교체)
+
+        value에 산출물 디렉토리(output_dir)가 있으면 캐시 전용 디렉토리로 복사하고
+        복사본 경로로 바꿔 저장한다.
+        """
+        entry_path = self._entry_path(key)
+        artifact_dir = self._artifact_dir(key)
+        try:
+            shutil.rmtree(artifact_dir, ignore_errors=True)
+            value = relocate_artifacts(value, str(artifact_dir))
+            atomic_write_json(entry_path, {"created_at": time.time(), "value": value}, default=str)
+        except Exception as e:
+            print(f"[ResultCache] 캐시 저장 실패: {str(e)}")
+            shutil.rmtree(artifact_dir, ignore_errors=True)
+            return
+
+        size = entry_path.stat().st_size + _tree_size(artifact_dir)
+        with self._lock:
+            self._index[key] = (size, time.time())
+            self._evict_locked()
+
+    def invalidate(self, key: str):
+        """캐시 항목 삭제"""
+        with self._lock:
+            self._index.pop(key, None)
+        self._remove_entry(key)
+
+    def _entry_path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.json"
+
+    def _artifact_dir(self, key: str) -> Path:
+        return self.cache_dir / "artifacts" / key
+
+    def _remove_entry(self, key: str):
+        """항목 파일과 산출물 복사본 삭제"""
+        try:
+            os.remove(self._entry_path(key))
+        except OSError:
+            pass
+        shutil.rmtree(self._artifact_dir(key), ignore_errors=True)
+
+    def _load_index(self):
+        """기존 캐시 파일로부터 인덱스 구성"""
+        for entry_path in self.cache_dir.glob("*/*.json"):
+            try:
+                stat = entry_path.stat()
+            except OSError:
+                continue
+            artifact_size = _tree_size(self._artifact_dir(entry_path.stem))
+            self._index[entry_path.stem] = (stat.st_size + artifact_size, stat.st_mtime)
+        with self._lock:
+            self._evict_locked()
+
+    def _evict_locked(self):
+        """최대 항목 수 / 용량을 넘으면 LRU 순서로 삭제 (lock 보유 상태에서 호출)"""
+        total_bytes = sum(size for size, _ in self._index.values())
+        if len(self._index) <= self.max_entries and total_bytes <= self.max_bytes:
+            return
+        for key, (size, _) in sorted(self._index.items(), key=lambda item: item[1][1]):
+            if len(self._index) <= self.max_entries and total_bytes <= self.max_bytes:
+                break
+            del self._index[key]
+            total_bytes -= size
+            self._remove_entry(key)
+
+
+_result_cache: Optional[ResultCache] = None
+_result_cache_lock = threading.Lock()
+
+
+def get_result_cache() -> Optional[ResultCache]:
+    """
+    프로세스 공용 결과 캐시 (RESULT_CACHE_ENABLED=false이면 None)
+
+    환경 변수:
+        RESULT_CACHE_DIR: 캐시 디렉토리 (기본: <project_root>/cache/results)
+        RESULT_CACHE_MAX_ENTRIES: 최대 항목 수 (기본 1000)
+        RESULT_CACHE_MAX_BYTES: 최대 용량 (기본 512MB)
+    """
+    global _result_cache
+    if os.getenv("RESULT_CACHE_ENABLED", "true").lower() != "true":
+        return None
+    if _result_cache is None:
+        with _result_cache_lock:
+            if _result_cache is None:
+                _result_cache = ResultCache(
+                    cache_dir=os.getenv("RESULT_CACHE_DIR"),
+                    max_entries=int(os.getenv("RESULT_CACHE_MAX_ENTRIES", "1000")),
+                    max_bytes=int(os.getenv("RESULT_CACHE_MAX_BYTES", str(512 * 1024 * 1024)))
+                )
+    return _result_cache
@@ -0,0 +1,197 @@
+"""
+Service Health - 원격 서비스 상태 캐시와 서킷 브레이커
+
+요청마다 동기 헬스 체크를 보내는 대신
+- ServiceHealthMonitor: 백그라운드 스레드가 주기적으로 /health를 확인하고 결과를 캐시
+- CircuitBreaker: 연속 실패가 임계값을 넘으면 회로를 열어 즉시 실패(fail fast)시키고,
+  백오프 시간(지수 증가)이 지나면 half-open 상태에서 프로브 1회만 허용
+
+호출자는 is_available()만 확인하고, 사용할 수 없으면 Mock 모드 등으로 바로 대체한다.
+"""
+
+from typing import Dict, Any, Optional, Callable
+import threading
+import time
+
+
+class CircuitBreaker:
+    """
+    서킷 브레이커
+
+    closed: 정상 (모든 요청 허용)
+    open: 실패 누적으로 차단 (backoff 동안 요청 거부)
+    half_open: backoff 경과 후 프로브 요청 1개만 허용, 성공하면 closed / 실패하면 다시 open
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        failure_threshold: int = 3,
+        base_backoff: float = 5.0,
+        max_backoff: float = 300.0,
+        name: str = "service",
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Args:
+            failure_threshold: 회로를 여는 연속 실패 횟수
+            base_backoff: 처음 열렸을 때 차단 시간 (초), 다시 열릴 때마다 2배
+            max_backoff: 최대 차단 시간 (초)
+            name: 로그 이름
+            clock: 단조 증가 시계 (테스트에서 가짜 시계로 교체)
+        """
+        self.failure_threshold = max(1, failure_threshold)
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.name = name
+        self.clock = clock
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self._open_count = 0
+        self._open_until = 0.0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow_request(self) -> bool:
+        """요청을 보내도 되는지 확인 (half-open이면 프로브 1개만 허용)"""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN:
+                if self.clock() < self._open_until:
+                    return False
+                self.state = self.HALF_OPEN
+                self._probe_in_flight = False
+                print(f"[CircuitBreaker:{self.name}] half-open: 프로브 요청 허용")
+            if self._probe_in_flight:
+                return False
+            self._probe_in_flight = True
+            return True
+
+    def would_allow(self) -> bool:
+        """allow_request와 같은 판단이지만 half-open 프로브 자리를 차지하지 않음 (후보 선택용)"""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN:
+                return self.clock() >= self._open_until
+            return not self._probe_in_flight
+
+    def record_success(self):
+        """요청 성공 기록 (회로 닫기, 백오프 초기화)"""
+        with self._lock:
+            if self.state != self.CLOSED:
+                print(f"[CircuitBreaker:{self.name}] closed: 서비스 복구")
+            self.state = self.CLOSED
+            self.consecutive_failures = 0
+            self._open_count = 0
+            self._probe_in_flight = False
+
+    def record_failure(self):
+        """요청 실패 기록 (임계값 도달 또는 프로브 실패 시 회로 열기)"""
+        with self._lock:
+            self.consecutive_failures += 1
+            if self.state == self.HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+                self._open_count += 1
+                backoff = min(self.base_backoff * (2 ** (self._open_count - 1)), self.max_backoff)
+                self._open_until = self.clock() + backoff
+                self._probe_in_flight = False
+                if self.state != self.OPEN:
+                    print(f"[CircuitBreaker:{self.name}] open: {backoff:.0f}초 동안 요청 차단")
+                self.state = self.OPEN
+
+    def snapshot(self) -> Dict[str, Any]:
+        """현재 상태 (모니터링용)"""
+        with self._lock:
+            return {
+                "state": self.state,
+                "consecutive_failures": self.consecutive_failures,
+                "retry_in": max(0.0, self._open_until - self.clock()) if self.state == self.OPEN else 0.0
+            }
+
+
+class ServiceHealthMonitor:
+    """
+    백그라운드 헬스 모니터
+
+    probe()가 True/False를 반환하는 함수이면 어떤 서비스든 감시할 수 있다.
+    실패가 이어지면 확인 간격을 지수적으로 늘리고(max_interval까지), 결과는 서킷 브레이커에도 반영한다.
+    """
+
+    def __init__(
+        self,
+        probe: Callable[[], bool],
+        interval: float = 10.0,
+        max_interval: float = 120.0,
+        breaker: Optional[CircuitBreaker] = None,
+        name: str = "service"
+    ):
+        """
+        Args:
+            probe: 헬스 확인 함수 (정상이면 True, 예외는 실패로 처리)
+            interval: 정상 상태의 확인 간격 (초)
+            max_interval: 실패 시 늘어나는 확인 간격의 상한 (초)
+            breaker: 확인 결과를 반영할 서킷 브레이커
+            name: 로그/스레드 이름
+        """
+        self.probe = probe
+        self.interval = interval
+        self.max_interval = max(interval, max_interval)
+        self.breaker = breaker
+        self.name = name
+        self.healthy: Optional[bool] = None
+        self.last_checked: Optional[float] = None
+        self._failures = 0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        """모니터 스레드 시작 (이미 실행 중이면 무시)"""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._loop,
+                name=f"health-monitor-{self.name}",
+                daemon=True
+            )
+            self._thread.start()
+
+    def stop(self):
+        """모니터 스레드 종료"""
+        self._stop.set()
+
+    def check_now(self) -> bool:
+        """즉시 1회 확인하고 캐시 갱신"""
+        try:
+            healthy = bool(self.probe())
+        except Exception:
+            healthy = False
+        with self._lock:
+            if healthy != self.healthy and self.healthy is not None:
+                print(f"[ServiceHealthMonitor:{self.name}] 상태 변경: {'정상' if healthy else '비정상'}")
+            self.healthy = healthy
+            self.last_checked = time.time()
+            self._failures = 0 if healthy else self._failures + 1
+        if self.breaker is not None:
+            if healthy:
+                self.breaker.record_success()
+            else:
+                self.breaker.record_failure()
+        return healthy
+
+    def next_interval(self) -> float:
+        """다음 확인까지 대기 시간 (연속 실패마다 2배)"""
+        with self._lock:
+            failures = self._failures
+        return min(self.interval * (2 ** failures), self.max_interval)
+
+    def _loop(self):
+        while not self._stop.is_set():
+            self.check_now()
+            self._stop.wait(self.next_interval())
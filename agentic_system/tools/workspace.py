@@ -0,0 +1,166 @@
+"""
+Workspace Allocator - 요청별 출력 디렉토리 관리
+
+동시에 실행되는 3D 생성 작업이 같은 파일(pattern.json, garment.obj 등)을
+덮어쓰지 않도록 작업마다 고유한 작업 공간 디렉토리를 할당한다.
+
+- 할당: <base_dir>/<job_id>/ (job_id가 없으면 고유 ID 생성)
+- 쓰기: 임시 파일에 쓴 뒤 os.replace로 원자적 교체 (atomic_write_*)
+- 정리: 보존 기간이 지났거나 최대 개수를 넘는 오래된 작업 공간 삭제
+"""
+
+from typing import Optional, Any
+from pathlib import Path
+from datetime import datetime
+import json
+import os
+import re
+import shutil
+import threading
+import time
+import uuid
+
+project_root = Path(__file__).parent.parent.parent
+
+
+def _atomic_write(path: str, data: Any, mode: str, **open_kwargs):
+    """같은 디렉토리의 임시 파일에 쓴 뒤 원자적으로 교체"""
+    target = Path(path)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = target.with_name(f".{target.name}.{uuid.uuid4().hex}.tmp")
+    try:
+        with open(tmp_path, mode, **open_kwargs) as f:
+            f.write(data)
+        os.replace(tmp_path, target)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def atomic_write_text(path: str, text: str, encoding: str = "utf-8"):
+    """텍스트를 원자적으로 저장"""
+    _atomic_write(path, text, "w", encoding=encoding)
+
+
+def atomic_write_bytes(path: str, data: bytes):
+    """바이너리(이미지 등)를 원자적으로 저장"""
+    _atomic_write(path, data, "wb")
+
+
+def atomic_write_json(path: str, data: Any, **dump_kwargs):
+    """JSON을 원자적으로 저장"""
+    dump_kwargs.setdefault("ensure_ascii", False)
+    atomic_write_text(path, json.dumps(data, **dump_kwargs))
+
+
+class WorkspaceAllocator:
+    """
+    작업 공간 할당기
+
+    할당 시 주기적으로(gc_interval) 보존 정책에 따라 오래된 작업 공간을 정리한다.
+    """
+
+    def __init__(
+        self,
+        base_dir: Optional[str] = None,
+        retention_seconds: float = 24 * 3600,
+        max_workspaces: int = 500,
+        gc_interval: float = 600
+    ):
+        self.base_dir = Path(base_dir or project_root / "outputs" / "jobs")
+        self.retention_seconds = retention_seconds
+        self.max_workspaces = max_workspaces
+        self.gc_interval = gc_interval
+        self._last_gc = 0.0
+        self._lock = threading.Lock()
+
+    def allocate(self, job_id: Optional[str] = None) -> Path:
+        """
+        작업 공간 할당
+
+        Args:
+            job_id: 작업 ID (같은 ID는 같은 디렉토리를 반환하므로 계획의 여러 단계가 공유 가능)
+
+        Returns:
+            Path: 생성된 작업 공간 디렉토리
+        """
+        # 경로 구분자와 선행 점('..' 등)을 제거하여 base_dir 밖을 가리키지 않도록 함
+        name = re.sub(r"[^A-Za-z0-9_.-]", "_", str(job_id)).lstrip(".") if job_id else ""
+        if not name:
+            name = f"{datetime.now().strftime('%Y%m%d%H%M%S')}_{uuid.uuid4().hex[:12]}"
+        workspace = self.base_dir / name
+        workspace.mkdir(parents=True, exist_ok=True)
+        os.utime(workspace)
+        self._maybe_gc()
+        return workspace
+
+    def gc(self) -> int:
+        """
+        보존 정책에 따라 작업 공간 정리
+
+        Returns:
+            int: 삭제한 작업 공간 수
+        """
+        if not self.base_dir.exists():
+            return 0
+        now = time.time()
+        workspaces = []
+        for entry in os.scandir(self.base_dir):
+            if entry.is_dir(follow_symlinks=False):
+                try:
+                    workspaces.append((entry.stat().st_mtime, entry.path))
+                except OSError:
+                    continue
+        workspaces.sort()
+
+        expired = [path for mtime, path in workspaces if now - mtime > self.retention_seconds]
+        overflow = len(workspaces) - len(expired) - self.max_workspaces
+        if overflow > 0:
+            remaining = [path for mtime, path in workspaces if now - mtime <= self.retention_seconds]
+            expired.extend(remaining[:overflow])
+
+        for path in expired:
+            shutil.rmtree(path, ignore_errors=True)
+        if expired:
+            print(f"[WorkspaceAllocator] 작업 공간 {len(expired)}개 정리")
+        return len(expired)
+
+    def _maybe_gc(self):
+        """마지막 정리 후 gc_interval이 지났으면 정리 실행"""
+        now = time.time()
+        with self._lock:
+            if now - self._last_gc < self.gc_interval:
+                return
+            self._last_gc = now
+        try:
+            self.gc()
+        except Exception as e:
+            print(f"[WorkspaceAllocator] 작업 공간 정리 실패: {str(e)}")
+
+
+_workspace_allocator: Optional[WorkspaceAllocator] = None
+_workspace_allocator_lock = threading.Lock()
+
+
+def get_workspace_allocator() -> WorkspaceAllocator:
+    """
+    프로세스 공용 작업 공간 할당기
+
+    환경 변수:
+        WORKSPACE_DIR: 작업 공간 루트 (기본: <project_root>/outputs/jobs)
+        WORKSPACE_RETENTION_HOURS: 보존 기간 (기본 24시간)
+        WORKSPACE_MAX_COUNT: 최대 작업 공간 수 (기본 500)
+    """
+    global _workspace_allocator
+    if _workspace_allocator is None:
+        with _workspace_allocator_lock:
+            if _workspace_allocator is None:
+                _workspace_allocator = WorkspaceAllocator(
+                    base_dir=os.getenv("WORKSPACE_DIR"),
+                    retention_seconds=float(os.getenv("WORKSPACE_RETENTION_HOURS", "24")) * 3600,
+                    max_workspaces=int(os.getenv("WORKSPACE_MAX_COUNT", "500"))
+                )
+    return _workspace_allocator